@@ -31,7 +31,7 @@ from cuppa.output_processor import IncrementalSubProcess
 _MERGE_SKIP_KEYS = frozenset( {'BINPATH'} )
 _DONE_MARKER = '.cuppa_conan_ok'
 _META_NAME = '.cuppa_conan_meta.json'
-_LOCK_NAME = '.cuppa_conan.lock'
+_LOCK_SUFFIX = '.lock'
 
 
 def tool_variant_id( env ):
@@ -128,7 +128,11 @@ def sconsdeps_package_paths_exist( info ):
 
 @contextmanager
 def _exclusive_file_lock( lock_path ):
-    """Process-safe lock so parallel SCons workers do not race ``conan install``."""
+    """Process-safe lock so builds installing the same fingerprint do not race ``conan install``.
+
+    ``flock`` and ``msvcrt.locking`` hold per open file, so threads of one process exclude each
+    other as well as separate processes.
+    """
     parent = os.path.dirname( lock_path )
     if parent:
         os.makedirs( parent, exist_ok=True )
@@ -579,6 +583,7 @@ class base( object ):
     _remote = None
     _package_key = None  # optional per-require MergeFlags key; default whole graph
     _install_cache = {}
+    _install_failures = {}
 
     @classmethod
     def add_options( cls, add_option ):
@@ -743,7 +748,7 @@ class base( object ):
                 settings=settings,
         )
 
-    def _ensure_installed( self, env, toolchain, variant ):
+    def _ensure_installed( self, env, toolchain, variant, stream=True ):
         import SCons.Errors
 
         if self._generators_folder:
@@ -765,10 +770,16 @@ class base( object ):
         if cache_key in self._install_cache:
             return self._install_cache[cache_key]
 
+        # A concurrent pre-install that failed reports here, where it always has.
+        failure = self._install_failures.pop( cache_key, None )
+        if failure is not None:
+            raise failure
+
         install_dir = os.path.join( self._install_root( env ), fingerprint[:16] )
         done_path = os.path.join( install_dir, _DONE_MARKER )
         script_path = os.path.join( install_dir, 'SConscript_conandeps' )
-        lock_path = os.path.join( self._install_root( env ), _LOCK_NAME )
+        # Beside, not inside, the install directory: a reinstall may remove that.
+        lock_path = install_dir + _LOCK_SUFFIX
 
         with _exclusive_file_lock( lock_path ):
             if os.path.isfile( done_path ) and os.path.isfile( script_path ):
@@ -795,12 +806,37 @@ class base( object ):
                     pass
 
             self._run_conan_install(
-                    env, install_dir, conanfile_path, settings, fingerprint, toolchain
+                    env, install_dir, conanfile_path, settings, fingerprint, toolchain, stream=stream
             )
             self._install_cache[cache_key] = install_dir
             return install_dir
 
-    def _run_conan_install( self, env, install_dir, conanfile_path, settings, fingerprint, toolchain=None ):
+    def prefetch_install( self, env, toolchain, variant ):
+        """Install for ``env`` ahead of the sconscripts; ``True`` when it succeeded.
+
+        A failed ``conan install`` is held and raised by the first ``BuildWith`` needing this
+        fingerprint, so it is reported exactly as without pre-installation.
+        """
+        import SCons.Errors
+
+        fingerprint = None
+        try:
+            fingerprint, _settings = self._fingerprint(
+                    env, toolchain, variant, self._resolve_conanfile_path( env )
+            )
+            self._ensure_installed( env, toolchain, variant, stream=False )
+            return True
+        except SCons.Errors.StopError as error:
+            if fingerprint:
+                self._install_failures[ ( self._name, fingerprint ) ] = error
+        except Exception as error:
+            # Anything else is retried, and reported, by the ``BuildWith`` itself.
+            logger.debug( "Pre-installing Conan dependency [{}] failed: {}".format(
+                    as_notice( self._name ), str( error )
+            ) )
+        return False
+
+    def _run_conan_install( self, env, install_dir, conanfile_path, settings, fingerprint, toolchain=None, stream=True ):
         import SCons.Errors
 
         conan = _find_conan_executable()
@@ -861,10 +897,13 @@ class base( object ):
         logger.info( "Running [{}]".format( as_notice( ' '.join( cmd ) ) ) )
         # Stream Conan output live (downloads/builds can take minutes). Keep a
         # copy for StopError detail; do not invent a cuppa byte progress bar.
+        # Concurrent pre-installs keep only the copy so their output does not interleave.
         output_lines = []
 
         def _stdout_line( line ):
             output_lines.append( line )
+            if not stream:
+                return
             sys.stdout.write( line + '\n' )
             try:
                 sys.stdout.flush()
@@ -873,6 +912,8 @@ class base( object ):
 
         def _stderr_line( line ):
             output_lines.append( line )
+            if not stream:
+                return
             sys.stderr.write( line + '\n' )
             try:
                 sys.stderr.flush()
@@ -956,6 +997,7 @@ def conan_deps(
                 '_remote': remote,
                 '_package_key': None,
                 '_install_cache': {},
+                '_install_failures': {},
             }
     )
 
@@ -999,5 +1041,6 @@ def conan_dependency(
                 '_remote': remote,
                 '_package_key': name,
                 '_install_cache': {},
+                '_install_failures': {},
             }
     )
@@ -25,6 +25,7 @@ class base(object):
 
     _name = None
     _cached_locations = {}
+    _prefetch_errors = {}
     _default_location = None
     _default_develop = None
     _default_include = None
@@ -34,6 +35,8 @@ class base(object):
     _extra_sub_path = None
     _source_path = None
     _linktype = None
+    _sha256 = None
+    _size = None
     _prebuilt_objects = {}
     _prebuilt_libraries = {}
 
@@ -70,6 +73,10 @@ class base(object):
     def linktype_option( cls ):
         return cls._name + "-linktype"
 
+    @classmethod
+    def sha256_option( cls ):
+        return cls._name + "-sha256"
+
 
     @classmethod
     def add_options( cls, add_option ):
@@ -98,6 +105,9 @@ class base(object):
         add_option( '--' + cls.linktype_option(), dest=cls.linktype_option(), type='string', nargs=1, action='store',
                     help = cls._name + ' linktype: static (default) or shared. Optional' )
 
+        add_option( '--' + cls.sha256_option(), dest=cls.sha256_option(), type='string', nargs=1, action='store',
+                    help = cls._name + ' expected SHA-256 of a downloaded archive location. Optional' )
+
 
     @classmethod
     def add_to_env( cls, env, add_dependency  ):
@@ -134,6 +144,52 @@ class base(object):
         return (location, develop, branch_path, use_develop)
 
 
+    @classmethod
+    def expected_download( cls, env, location ):
+        """``(sha256, size)`` a downloaded archive for ``location`` must match, if known.
+
+        The command-line digest applies to whatever location is in use; the defaults given to
+        ``location_dependency`` only describe the default location.
+        """
+        sha256 = env.get_option( cls.sha256_option() )
+        if sha256:
+            return sha256, None
+        if cls._default_location and location == os.path.expanduser( cls._default_location ):
+            return cls._sha256, cls._size
+        return None, None
+
+
+    @classmethod
+    def _create_location( cls, env, location_id ):
+        location, develop, branch_path = location_id[0], location_id[1], location_id[2]
+        expected_sha256, expected_size = cls.expected_download( env, location )
+        return cuppa.location.Location(
+                env,
+                location,
+                develop=develop,
+                branch_path=branch_path,
+                extra_sub_path=cls._extra_sub_path,
+                expected_sha256=expected_sha256,
+                expected_size=expected_size,
+        )
+
+
+    @classmethod
+    def prefetch_location( cls, env, location_id ):
+        """Retrieve ``location_id`` ahead of its first use; return True when it succeeded.
+
+        A failure is held and raised by the first ``_get_location`` for the same id, so
+        errors surface where they would have without prefetching.
+        """
+        try:
+            location = cls._create_location( env, location_id )
+        except Exception as error:
+            cls._prefetch_errors[location_id] = error
+            return False
+        cls._cached_locations.setdefault( location_id, location )
+        return True
+
+
     @classmethod
     def _get_location( cls, env ):
 
@@ -148,13 +204,12 @@ class base(object):
             branch_path = location_id[2]
             use_develop = location_id[3]
             try:
-                cls._cached_locations[location_id] = cuppa.location.Location(
-                        env,
-                        location,
-                        develop=develop,
-                        branch_path=branch_path,
-                        extra_sub_path=cls._extra_sub_path
-                )
+                prefetch_error = cls._prefetch_errors.pop( location_id, None )
+                if prefetch_error is not None:
+                    # Retrieval already failed during prefetch; surface it here, where it
+                    # would have been raised without prefetching.
+                    raise prefetch_error
+                cls._cached_locations[location_id] = cls._create_location( env, location_id )
                 logger.debug( "Adding location [{}]({}) to cached locations".format(
                         as_notice( cls._name.title() ),
                         as_notice( str(location_id) )
@@ -399,7 +454,7 @@ class LibraryMethod(object):
 
 
 
-def location_dependency( name, location=None, develop=None, include=None, sys_include=None, extra_sub_path=None, source_path=None, linktype=None ):
+def location_dependency( name, location=None, develop=None, include=None, sys_include=None, extra_sub_path=None, source_path=None, linktype=None, sha256=None, size=None ):
 
     from SCons.Script import Flatten
 
@@ -416,6 +471,8 @@ def location_dependency( name, location=None, develop=None, include=None, sys_in
                 '_default_sys_include': flattened_sys_includes,
                 '_extra_sub_path': extra_sub_path,
                 '_source_path': source_path,
-                '_linktype': linktype
+                '_linktype': linktype,
+                '_sha256': sha256,
+                '_size': size
             }
     )
@@ -26,6 +26,8 @@ import cuppa.core.base_options
 import cuppa.core.storage_options
 import cuppa.core.storage_actions
 import cuppa.core.location_options
+import cuppa.core.location_prefetch
+import cuppa.core.conan_prefetch
 import cuppa.core.options
 import cuppa.core.build_layout
 import cuppa.modules.registration
@@ -37,6 +39,7 @@ import cuppa.configure
 import cuppa.version
 import cuppa.scms
 import cuppa.develop
+import cuppa.utility.test_pool
 #import cuppa.progress
 #import cuppa.tree
 #import cuppa.cpp.stdcpp
@@ -44,6 +47,7 @@ import cuppa.develop
 from cuppa.colourise import as_emphasised, as_info, as_error, as_notice, colour_items, as_info_label
 from cuppa.log import set_logging_level, reset_logging_format, logger, enable_thirdparty_logging
 from cuppa.utility.types import is_string
+from cuppa.test_report.captured_output import parse_line_limits
 from cuppa.utility.entry_points import iter_entry_points
 
 from cuppa.toolchains             import *
@@ -135,6 +139,8 @@ class Construct(object):
     methods_key      = 'methods'
     project_generators_key = 'project_generators'
 
+    sub_sconscripts_manifest_name = 'sub-sconscripts.json'
+
 
     def add_platforms( self, env ):
         platforms = self.platforms_key
@@ -266,6 +272,26 @@ class Construct(object):
                 print( "cuppa: Env[%s] = %s" % ( key, env[key] ) )
 
 
+    @classmethod
+    def _test_output_lines( cls, cuppa_env ):
+        option = cuppa_env.get_option( 'test-output-lines' )
+        try:
+            return parse_line_limits( option )
+        except ValueError:
+            logger.error( "Ignoring invalid --test-output-lines [{}], expected N, HEAD:TAIL or all".format(
+                    as_error( str(option) )
+            ) )
+            return parse_line_limits( None )
+
+
+    @classmethod
+    def _test_cache( cls, cuppa_env ):
+        test_cache = cuppa_env.get_option( 'test-cache' )
+        if not test_cache:
+            return None
+        return os.path.abspath( os.path.expanduser( test_cache ) )
+
+
     @classmethod
     def _set_verbosity_level( cls, cuppa_env ):
         verbosity = None
@@ -478,8 +504,12 @@ class Construct(object):
         cuppa_env['inherit_process_env'] = cuppa_env.get_option( 'inherit-process-env' ) and True or False
         cuppa_env['show_test_output']    = cuppa_env.get_option( 'show-test-output' )    and True or False
         cuppa_env['suppress_process_output'] = cuppa_env.get_option( 'suppress-process-output' ) and True or False
+        cuppa_env['test_output_lines']   = self._test_output_lines( cuppa_env )
+        cuppa_env['test_timeout']        = cuppa_env.get_option( 'test-timeout' )
+        cuppa_env['test_cache']          = self._test_cache( cuppa_env )
         cuppa_env['dump']                = cuppa_env.get_option( 'dump' )                and True or False
         cuppa_env['clean']               = cuppa_env.get_option( 'clean' )               and True or False
+        cuppa_env['cache_sub_sconscripts'] = cuppa_env.get_option( 'cache-sub-sconscripts' ) and True or False
 
         self.add_variants   ( cuppa_env )
         self.add_toolchains ( cuppa_env )
@@ -647,10 +677,23 @@ class Construct(object):
                         as_info( str( SCons.Script.GetOption( 'num_jobs') ) )
                 ) )
 
+            test_jobs = cuppa_env.get_option( 'test-jobs' )
+            if test_jobs and test_jobs > 0:
+                # Tests get slots of their own on top of the build's; the build keeps job_count.
+                cuppa.utility.test_pool.configure( test_jobs=test_jobs, build_jobs=job_count )
+                SCons.Script.SetOption( 'num_jobs', job_count + test_jobs )
+                logger.info( "Running tests with option [{}] set as [{}] alongside [{}] build jobs".format(
+                        as_info( "test-jobs" ),
+                        as_info( str(test_jobs) ),
+                        as_info( str(job_count) )
+                ) )
+
         if not help and self._configure.handle_conf_only():
             self._configure.save()
 
         if not help and not self._configure.handle_conf_only():
+            # Timed tests and Run actions leave the terminal's foreground group; pass Ctrl-C on.
+            cuppa.output_processor.forward_interrupts()
             self.build( cuppa_env )
             from cuppa.cpp.profiles_report_collector import ProfilesDiagnosticCollector
             ProfilesDiagnosticCollector.finalize_inventory_session()
@@ -849,7 +892,7 @@ class Construct(object):
         return build_envs
 
 
-    def get_sub_sconscripts( self, path, exclude_dirs ):
+    def get_sub_sconscripts( self, path, exclude_dirs, manifest=None ):
         file_regex = re.compile( r'([^.]+[.])?sconscript$', re.IGNORECASE )
         discard_if_subdir_contains_regex = re.compile( r'(SC|Sc|sc)onstruct' )
 
@@ -864,11 +907,22 @@ class Construct(object):
         # by default and absolute paths are already skipped above.
         exclude_dirs_regex = exclude_dirs and re.compile( "|".join( exclude_dirs ), re.IGNORECASE ) or None
 
-        return cuppa.recursive_glob.glob(
+        # VCS metadata and hidden folders never hold project sconscripts, so they are not entered.
+        glob = manifest and manifest.glob or cuppa.recursive_glob.glob
+        return glob(
                 path,
                 file_regex,
                 exclude_dirs_pattern= exclude_dirs_regex,
-                discard_pattern=discard_if_subdir_contains_regex
+                discard_pattern=discard_if_subdir_contains_regex,
+                prune=cuppa.recursive_glob.prune_hidden_and_vcs
+        )
+
+
+    def sub_sconscripts_manifest( self, cuppa_env ):
+        if not cuppa_env.get( 'cache_sub_sconscripts' ):
+            return None
+        return cuppa.recursive_glob.GlobManifest(
+                os.path.join( cuppa_env['abs_build_root'], self.sub_sconscripts_manifest_name )
         )
 
 
@@ -901,6 +955,25 @@ class Construct(object):
 #        pass
 
 
+    def declared_dependency_names( self, cuppa_env ):
+        names = []
+        for dependency in list( cuppa_env.get( 'declared_dependencies' ) or [] ) + list( cuppa_env['default_dependencies'] ):
+            name = is_string( dependency ) and dependency or dependency.name()
+            if name not in names:
+                names.append( name )
+        return names
+
+
+    def prefetch_locations( self, cuppa_env ):
+        cuppa.core.location_prefetch.prefetch_locations( cuppa_env, self.declared_dependency_names( cuppa_env ) )
+
+
+    def prefetch_conan_installs( self, cuppa_env, toolchain_envs ):
+        cuppa.core.conan_prefetch.prefetch_conan_installs(
+                cuppa_env, self.declared_dependency_names( cuppa_env ), toolchain_envs
+        )
+
+
     def build( self, cuppa_env ):
 
 #        cuppa.progress.NotifyProgress.register_callback( None, self.on_progress )
@@ -908,6 +981,7 @@ class Construct(object):
         cuppa_env['empty_env'] = cuppa_env.create_env()
         projects   = cuppa_env.get_option( 'projects' )
         toolchains = cuppa_env['active_toolchains']
+        manifest   = self.sub_sconscripts_manifest( cuppa_env )
 
         if not projects:
             projects = cuppa_env['default_projects']
@@ -915,7 +989,8 @@ class Construct(object):
             if not projects or not cuppa_env['run_from_launch_dir']:
                 sub_sconscripts = self.get_sub_sconscripts(
                         cuppa_env['launch_dir'],
-                        [ cuppa_env['build_root'], cuppa_env['artifacts_root'], cuppa_env['dependencies_root'] ]
+                        [ cuppa_env['build_root'], cuppa_env['artifacts_root'], cuppa_env['dependencies_root'] ],
+                        manifest
                 )
                 if sub_sconscripts:
                     projects = sub_sconscripts
@@ -939,7 +1014,8 @@ class Construct(object):
                         if os.path.isdir( path ):
                             sub_sconscripts = self.get_sub_sconscripts(
                                 project,
-                                [ cuppa_env['build_root'], cuppa_env['artifacts_root'], cuppa_env['dependencies_root'] ]
+                                [ cuppa_env['build_root'], cuppa_env['artifacts_root'], cuppa_env['dependencies_root'] ],
+                                manifest
                             )
                             if sub_sconscripts:
                                 logger.info( "Reading project folder [{}] and using sub-sconscripts [{}]".format(
@@ -952,7 +1028,8 @@ class Construct(object):
                 elif os.path.exists( project ) and os.path.isdir( project ):
                     sub_sconscripts = self.get_sub_sconscripts(
                             project,
-                            [ cuppa_env['build_root'], cuppa_env['artifacts_root'], cuppa_env['dependencies_root'] ]
+                            [ cuppa_env['build_root'], cuppa_env['artifacts_root'], cuppa_env['dependencies_root'] ],
+                            manifest
                     )
                     if sub_sconscripts:
                         logger.info( "Reading project folder [{}] and using sub-sconscripts [{}]".format(
@@ -962,8 +1039,15 @@ class Construct(object):
                 else:
                     sconscripts.append( project )
 
-            for toolchain in toolchains:
-                build_envs = self.create_build_envs( toolchain, cuppa_env )
+            if manifest:
+                manifest.save()
+
+            self.prefetch_locations( cuppa_env )
+
+            toolchain_envs = [ ( toolchain, self.create_build_envs( toolchain, cuppa_env ) ) for toolchain in toolchains ]
+            self.prefetch_conan_installs( cuppa_env, toolchain_envs )
+
+            for toolchain, build_envs in toolchain_envs:
                 for build_env in build_envs:
                     for sconscript in sconscripts:
                         decider = cuppa_env.get_option( 'decider' )
@@ -59,6 +59,10 @@ def add_base_options():
                             action='callback', callback=cuppa.core.options.list_parser( 'projects' ),
                             help="Sconscripts to run" )
 
+    add_option( '--cache-sub-sconscripts', dest='cache-sub-sconscripts', action='store_true',
+                            help="Remember the sub-sconscripts found under the launch directory in the build"
+                                 " root and reuse them while none of the folders searched has changed" )
+
     add_option( '--thirdparty', type='string', nargs=1, action='store',
                             dest='thirdparty',
                             metavar='DIR',
@@ -79,6 +83,30 @@ def add_base_options():
     add_option( '--show-test-output', dest='show-test-output', action='store_true',
                             help="When executing tests display all outout to stdout and stderr as appropriate" )
 
+    add_option( '--test-output-lines', dest='test-output-lines', type='string', nargs=1, action='store',
+                            help="How much of each test's stdout and stderr to keep in its report: N keeps the"
+                                 " first and last N lines, HEAD:TAIL sets them separately and 'all' keeps"
+                                 " everything (default 1000:1000). The full output is always in the test's"
+                                 " .stdout.log and .stderr.log files" )
+
+    add_option( '--test-jobs', dest='test-jobs', type='int', nargs=1, action='store',
+                            help="Run test and run-action processes in N slots of their own, alongside the"
+                                 " build's -j rather than in it. Waiting tests start longest first, by the"
+                                 " wall time in their previous report. Compiles, b2 and coverage tools stay"
+                                 " within -j; other Python actions that start processes themselves can use"
+                                 " all -j + N jobs" )
+
+    add_option( '--test-timeout', dest='test-timeout', type='float', nargs=1, action='store',
+                            metavar='SECONDS',
+                            help="Kill and fail any test or run-action process still running after SECONDS."
+                                 " A timeout passed to Test, BuildTest or Run takes precedence" )
+
+    add_option( '--test-cache', dest='test-cache', type='string', nargs=1, action='store',
+                            metavar='DIR',
+                            help="Keep the results of passing tests in DIR by the content of the test program,"
+                                 " its data, environment and command, and restore them instead of rerunning"
+                                 " unchanged tests. DIR can be shared between builds and machines" )
+
     add_option( '--suppress-process-output', dest='suppress-process-output', action='store_true',
                             help="When executing processes suppress all output to stdout and stderr" )
 
@@ -0,0 +1,149 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   Conan prefetch — run independent conan installs concurrently
+#-------------------------------------------------------------------------------
+
+"""Run ``conan install`` for every declared Conan dependency before sconscripts run.
+
+Each Conan dependency installs once per fingerprint (its settings, conanfile and lockfile), the
+first time a sconscript applies it to a toolchain and variant. Done there, the installs of a
+multi-toolchain or multi-variant build happen one after another. Pre-installing walks the same
+dependencies across every build environment up front, one install per distinct fingerprint, on
+a bounded thread pool. Installs of different fingerprints hold different locks, so they do not
+wait for each other; the ``BuildWith`` that later needs a fingerprint finds it in the install
+cache.
+
+Error behaviour is unchanged: a failed install is held by the dependency type and raised by the
+first ``BuildWith`` needing that fingerprint. Sconscripts that change the settings a fingerprint
+depends on (``stdcpp``, say) simply install their own fingerprint when they run.
+
+``--conan-jobs=N`` bounds the pool and is opt-in: the default of 1 leaves pre-installing off.
+Concurrent installs of different fingerprints write the shared Conan cache at the same time,
+which Conan 2 does not support, so only raise it where each install resolves to packages already
+in the cache or the cache is otherwise safe to share.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cuppa.log import logger
+from cuppa.colourise import as_info, as_notice, as_warning
+
+
+# Conan 2 does not support concurrent writers to one cache, so pre-installing is opt-in.
+DEFAULT_CONAN_JOBS = 1
+
+
+def conan_jobs( cuppa_env ):
+    jobs = cuppa_env.get( 'conan_jobs' )
+    if jobs is None:
+        return DEFAULT_CONAN_JOBS
+    return max( 1, int( jobs ) )
+
+
+def install_enabled( cuppa_env ):
+    return not (
+            cuppa_env.get( 'clean' )
+            or cuppa_env.get( 'dump' )
+            or cuppa_env.get( 'storage_resolve_only' )
+    )
+
+
+def _conan_type( factory ):
+    from cuppa.build_with_conan import base
+    dependency_type = getattr( factory, '__self__', factory )
+    if isinstance( dependency_type, type ) and issubclass( dependency_type, base ) and not dependency_type._generators_folder:
+        return dependency_type
+    return None
+
+
+def collect_install_plan( cuppa_env, names, toolchain_envs ):
+    """``[ ( name, dependency_type, env, toolchain, variant ) ]``, one per distinct install.
+
+    ``toolchain_envs`` is ``[ ( toolchain, build_envs ) ]`` as created for the sconscripts. Installs
+    already in the dependency's install cache are left out.
+    """
+    plan = []
+    seen = set()
+    dependencies = cuppa_env.get( 'dependencies' ) or {}
+    for name in names:
+        dependency_type = _conan_type( dependencies.get( name ) )
+        if not dependency_type:
+            continue
+        for toolchain, build_envs in toolchain_envs:
+            for build_env in build_envs:
+                env = build_env['env']
+                variant = env['variant'].name()
+                try:
+                    dependency = dependency_type( env )
+                    fingerprint, _settings = dependency._fingerprint(
+                            env, toolchain, variant, dependency._resolve_conanfile_path( env )
+                    )
+                except Exception as error:
+                    logger.trace( "Not pre-installing [{}]: {}".format( as_notice( name ), str( error ) ) )
+                    continue
+                key = ( dependency_type._name, fingerprint )
+                if key in seen or key in dependency_type._install_cache:
+                    continue
+                seen.add( key )
+                plan.append( ( name, dependency_type, env, toolchain, variant ) )
+    return plan
+
+
+class _InstallProgress(object):
+    """One shared, thread-safe progress line per finished install."""
+
+    def __init__( self, total ):
+        self._total = total
+        self._done = 0
+        self._lock = threading.Lock()
+
+    def finished( self, name, label, succeeded, elapsed ):
+        with self._lock:
+            self._done += 1
+            done = self._done
+        if succeeded:
+            logger.info( "Installed Conan dependency [{}] for [{}] ({}/{}) in {:.1f}s".format(
+                    as_info( name ), as_notice( label ), done, self._total, elapsed
+            ) )
+        else:
+            logger.info( "Installing Conan dependency [{}] for [{}] ({}/{}) {} after {:.1f}s".format(
+                    as_info( name ), as_notice( label ), done, self._total, as_warning( "failed" ), elapsed
+            ) )
+
+
+def prefetch_conan_installs( cuppa_env, names, toolchain_envs, max_workers=None ):
+    """Install the Conan dependencies behind ``names`` for every build env concurrently.
+
+    Returns the number of installs that succeeded.
+    """
+    workers = max_workers or conan_jobs( cuppa_env )
+    if workers <= 1 or not install_enabled( cuppa_env ):
+        return 0
+
+    plan = collect_install_plan( cuppa_env, names, toolchain_envs )
+    if len( plan ) < 2:
+        return 0
+
+    workers = min( workers, len( plan ) )
+    logger.info( "Installing [{}] Conan dependencies with up to [{}] concurrent installs".format(
+            as_info( str( len( plan ) ) ), as_info( str( workers ) )
+    ) )
+    progress = _InstallProgress( len( plan ) )
+
+    def install( entry ):
+        name, dependency_type, env, toolchain, variant = entry
+        started = time.time()
+        succeeded = dependency_type( env ).prefetch_install( env, toolchain, variant )
+        label = "{}, {}".format( toolchain.name(), variant )
+        progress.finished( name, label, succeeded, time.time() - started )
+        return succeeded
+
+    with ThreadPoolExecutor( max_workers=workers ) as executor:
+        results = list( executor.map( install, plan ) )
+    return sum( 1 for succeeded in results if succeeded )
@@ -32,7 +32,7 @@ from cuppa.core import (
     dependency_tree,
 )
 from cuppa.log import logger
-from cuppa.utility import storage
+from cuppa.utility import storage, tree_scanner
 
 
 INDENT = '  '
@@ -409,8 +409,8 @@ def add_dependency_action_options( add_option ):
     add_option(
         '--exact-sizes', dest='exact_sizes', action='store_true',
         help="Force a full remeasure of every dependency tree size (updates the inventory). "
-             "Without this flag, --list-dependencies still upgrades missing or estimated "
-             "sizes to exact on first encounter",
+             "Without this flag, --list-dependencies measures missing, estimated or changed "
+             "trees, reading only the directories whose mtime changed",
     )
     add_option(
         '--remove-dependencies', dest='remove_dependencies', type='string', nargs=1,
@@ -892,7 +892,7 @@ def _collect_rows( construct, cuppa_env, names=None, out=None ):
         if not os.path.isdir( path ):
             continue
         upgrade = dependency_inventory.size_should_upgrade_to_exact( entry )
-        stale = dependency_inventory.size_needs_refresh( entry, path )
+        stale = dependency_inventory.size_needs_refresh( entry, path, dependencies_root )
         if exact or upgrade or stale:
             measure_queue.append( ( real, entry, path, upgrade ) )
 
@@ -915,10 +915,17 @@ def _collect_rows( construct, cuppa_env, names=None, out=None ):
                     "Refreshing sizes for {} changed trees...".format( len( measure_queue ) )
             ) + "\n" )
 
+    # Listing always writes exact sizes so estimates are not sticky. The size index makes
+    # that cheap: only changed directories are read unless --exact-sizes starts it again.
+    # Each tree has its own index, so they are measured concurrently.
+    sizes = tree_scanner.in_parallel(
+            lambda queued: dependency_inventory.measure_size(
+                    queued[2], exact=exact, dependencies_root=dependencies_root
+            ),
+            measure_queue,
+    )
     measured_by_real = {}
-    for real, entry, path, _upgrade in measure_queue:
-        # Listing always writes exact sizes so estimates are not sticky.
-        size_info = dependency_inventory.measure_size( path, exact=True )
+    for ( real, entry, path, _upgrade ), size_info in zip( measure_queue, sizes ):
         measured_by_real[real] = size_info
         if not entry.get( '_provisional' ):
             entry['size'] = size_info
@@ -940,7 +947,9 @@ def _collect_rows( construct, cuppa_env, names=None, out=None ):
             continue
         size_info = measured_by_real.get( real ) or entry.get( 'size' )
         if not size_info:
-            size_info = dependency_inventory.measure_size( path, exact=True )
+            size_info = dependency_inventory.measure_size(
+                    path, exact=exact, dependencies_root=dependencies_root
+            )
             if not entry.get( '_provisional' ):
                 entry['size'] = size_info
                 try:
@@ -1289,6 +1298,49 @@ def write_unknown_remove_names_error( construct, cuppa_env, error, out=None ):
     emit_location_unqualified_duplicate_hints( out=out )
 
 
+def _boost_stage_cache_listing( cuppa_env ):
+    """Entries of the ``--boost-stage-cache`` directory, or ``None`` when none is configured."""
+    from cuppa.dependencies.boost.stage_cache import BoostStageCache, stage_cache_root
+    try:
+        root = stage_cache_root( cuppa_env )
+    except ( AttributeError, KeyError ):
+        return None
+    if not root:
+        return None
+    entries = BoostStageCache( root ).entries()
+    return {
+        'root': root,
+        'total_bytes': sum( entry['size_bytes'] for entry in entries ),
+        'entries': entries,
+    }
+
+
+def _write_boost_stage_cache( out, listing ):
+    from cuppa.dependencies.boost.stage_cache import describe
+    entries = listing['entries']
+    out.write( "\n" )
+    out.write( "Boost stage cache in {}: {} entr{}, {}\n".format(
+            as_info( storage.display_path( listing['root'] ) ),
+            len( entries ),
+            len( entries ) == 1 and 'y' or 'ies',
+            storage.human_size( listing['total_bytes'] ),
+    ) )
+    rows = [
+        [
+            describe( entry ),
+            "{} librar{}".format( len( entry['libraries'] ), len( entry['libraries'] ) == 1 and 'y' or 'ies' ),
+            storage.human_size( entry['size_bytes'] ),
+            storage.relative_age( entry['last_used'] ),
+        ]
+        for entry in entries
+    ]
+    widths = [ max( [ len( row[column] ) for row in rows ] or [ 0 ] ) for column in range( 4 ) ]
+    for row in rows:
+        out.write( INDENT + "  ".join(
+                cell.ljust( width ) for cell, width in zip( row, widths )
+        ).rstrip() + "\n" )
+
+
 def list_dependencies( construct, cuppa_env, out=None ):
     """``--list-dependencies``. Always exits 0 unless a storage error is raised."""
     out = out or sys.stdout
@@ -1343,6 +1395,9 @@ def list_dependencies( construct, cuppa_env, out=None ):
                 { 'dependency': s.dependency, 'reason': s.reason } for s in data['skips']
             ],
         }
+        boost_stage_cache = _boost_stage_cache_listing( cuppa_env )
+        if boost_stage_cache:
+            payload['boost_stage_cache'] = boost_stage_cache
         out.write( storage.render_json_payload( payload ) + "\n" )
         return 0
 
@@ -1393,6 +1448,10 @@ def list_dependencies( construct, cuppa_env, out=None ):
     for line in _render_skip_tree( data['skips'] ):
         out.write( line + "\n" )
 
+    boost_stage_cache = _boost_stage_cache_listing( cuppa_env )
+    if boost_stage_cache:
+        _write_boost_stage_cache( out, boost_stage_cache )
+
     if verbose and data.get( 'has_download_marks' ):
         downloads_root = data.get( 'downloads_root' ) or cuppa_env.get( 'downloads_root' )
         out.write( "\n" )
@@ -17,7 +17,7 @@ from cuppa.core import (
     dependency_storage,
     dependency_tree,
 )
-from cuppa.utility import storage
+from cuppa.utility import storage, tree_scanner
 
 
 def walk_download_files( downloads_root ):
@@ -300,6 +300,11 @@ def _product_label( storage_type, path, qualifier, tool_variant, dependencies_ro
 
 def collect_download_rows( construct, cuppa_env ):
     """Return listing data for ``--list-downloads``."""
+    with tree_scanner.scanning():
+        return _collect_download_rows( construct, cuppa_env )
+
+
+def _collect_download_rows( construct, cuppa_env ):
     dependencies_root = cuppa_env.get( 'dependencies_root' )
     if dependencies_root and not os.path.isabs( dependencies_root ):
         dependencies_root = os.path.abspath(
@@ -402,6 +407,11 @@ def collect_download_rows( construct, cuppa_env ):
         } )
 
     archive_files = list( walk_download_files( downloads_root ) ) if downloads_root else []
+    # Trees without an inventory size are measured; do them all at once.
+    tree_scanner.prefetch(
+            product['path'] for product in products_by_key
+            if product['path'] not in inventory_by_path and os.path.isdir( product['path'] )
+    )
     seen_archives = set()
     rows = []
 
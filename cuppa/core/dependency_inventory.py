@@ -11,6 +11,9 @@
 
 The inventory informs listings (size, last used, ownership). It never authorises deletion —
 every path is re-checked on disk before removal.
+
+Sizes are exact. Each entry has a size index under ``.cuppa-inventory/sizes/`` (see
+``cuppa.utility.size_index``) so re-measuring a tree only lists the directories that changed.
 """
 
 import hashlib
@@ -21,21 +24,27 @@ from datetime import datetime, timezone
 
 from cuppa.log import logger
 from cuppa.colourise import as_warning
-from cuppa.utility import storage
+from cuppa.utility import storage, tree_scanner
+from cuppa.utility.size_index import SizeIndex
 
 
 INVENTORY_DIR_NAME = '.cuppa-inventory'
-
-# Sampled sizing: walk at most this many files, then estimate the remainder.
-SAMPLE_FILE_LIMIT = 4000
-# Trees larger than this (by sampled estimate) keep method "sampled" until --exact-sizes.
-SAMPLE_BYTE_THRESHOLD = 64 * 1024 * 1024
+SIZE_INDEX_DIR_NAME = 'sizes'
 
 
 def inventory_dir( dependencies_root ):
     return os.path.join( os.path.expanduser( dependencies_root ), INVENTORY_DIR_NAME )
 
 
+def size_index_for( dependencies_root, path ):
+    """The persistent size index of the tree at ``path``."""
+    return SizeIndex( os.path.join(
+            inventory_dir( dependencies_root ),
+            SIZE_INDEX_DIR_NAME,
+            entry_key_for_path( path ) + '.json'
+    ) )
+
+
 def entry_key_for_path( path ):
     """Stable filename for an inventory entry (not the dependency name — paths can collide)."""
     digest = hashlib.sha256( storage.real_path( path ).encode( 'utf-8' ) ).hexdigest()[:16]
@@ -138,6 +147,7 @@ def delete_entry_for_path( dependencies_root, path ):
         os.unlink( target )
     except FileNotFoundError:
         pass
+    size_index_for( dependencies_root, path ).remove()
 
 
 def _tree_mtime( path ):
@@ -147,64 +157,41 @@ def _tree_mtime( path ):
         return 0
 
 
-def measure_size( path, exact=False ):
-    """Return ``{bytes, measured, method}`` for a dependency tree."""
+def measure_size( path, exact=False, dependencies_root=None ):
+    """Return ``{bytes, measured, method}`` for a dependency tree.
+
+    With ``dependencies_root`` the tree's size index is used, so only changed directories are
+    read; ``exact`` starts the index again, for files rewritten in place. The method is always
+    ``exact``; ``sampled`` only appears in entries written by older versions.
+    """
     if not os.path.exists( path ):
         return { 'bytes': 0, 'measured': _utc_now(), 'method': 'exact' }
 
-    if exact:
-        stats = storage.directory_stats( path )
-        return {
-            'bytes': stats.bytes,
-            'measured': _utc_now(),
-            'method': 'exact',
-        }
-
-    total = 0
-    files = 0
-    truncated = False
-    for root, _dirs, names in os.walk( path, followlinks=False ):
-        for name in names:
-            files += 1
-            if files > SAMPLE_FILE_LIMIT:
-                truncated = True
-                break
-            file_path = os.path.join( root, name )
-            try:
-                total += os.lstat( file_path ).st_size
-            except OSError:
-                pass
-        if truncated:
-            break
-
-    method = 'exact'
-    if truncated and files > 1:
-        # Estimate remaining from mean size of the sample.
-        # Rough multiplier: assume similar density for the rest of the tree depth.
-        # Prefer over-estimate slightly by scaling with a walk of directories.
-        dir_count = 0
-        for _root, dirs, _names in os.walk( path, followlinks=False ):
-            dir_count += 1
-            if dir_count > SAMPLE_FILE_LIMIT:
-                break
-        scale = max( 1.0, dir_count / max( 1.0, ( files / 20.0 ) ) )
-        total = int( total * max( 1.15, min( scale, 8.0 ) ) )
-        method = 'sampled'
-    elif total >= SAMPLE_BYTE_THRESHOLD and files >= SAMPLE_FILE_LIMIT // 2:
-        method = 'sampled'
-
+    if dependencies_root:
+        stats = size_index_for( dependencies_root, path ).measure( path, rescan=exact )
+    else:
+        stats = tree_scanner.directory_stats( path )
     return {
-        'bytes': int( total ),
+        'bytes': stats.bytes,
         'measured': _utc_now(),
-        'method': method,
+        'method': 'exact',
     }
 
 
-def size_needs_refresh( entry, path ):
+def size_needs_refresh( entry, path, dependencies_root=None ):
+    """True when the recorded size may no longer match the tree.
+
+    With a size index every directory of the tree is checked, not just its root; entries
+    without one (measured by older versions) fall back to the root directory's mtime.
+    """
     size = entry.get( 'size' ) or {}
     measured = size.get( 'measured' )
     if not measured:
         return True
+    if dependencies_root:
+        index = size_index_for( dependencies_root, path )
+        if index.exists():
+            return index.changed( path )
     try:
         # Compare tree mtime to measured stamp.
         measured_epoch = datetime.strptime(
@@ -289,9 +276,9 @@ def touch_entry(
     if refresh_size and (
             exact_sizes
             or 'size' not in entry
-            or size_needs_refresh( entry, path )
+            or size_needs_refresh( entry, path, dependencies_root )
     ):
-        entry['size'] = measure_size( path, exact=exact_sizes )
+        entry['size'] = measure_size( path, exact=exact_sizes, dependencies_root=dependencies_root )
 
     write_entry( dependencies_root, entry, key=key )
     entry['_key'] = key
@@ -40,7 +40,7 @@ from cuppa.core.storage_actions import (
     _judgement_tree_lines,
 )
 from cuppa.log import logger
-from cuppa.utility import storage
+from cuppa.utility import storage, tree_scanner
 
 
 INDENT = '  '
@@ -295,11 +295,29 @@ def _measure_bytes( path ):
     if not os.path.isdir( path ):
         return 0
     try:
-        return int( storage.directory_stats( path ).bytes )
+        return int( tree_scanner.directory_stats( path ).bytes )
     except ( OSError, storage.StorageError ):
         return 0
 
 
+def _with_sizes( items ):
+    """Fill in ``size_bytes`` for targets or leftovers planned without it.
+
+    Every tree is measured concurrently first (see ``tree_scanner``); a multi-path target is
+    the sum of its paths.
+    """
+    def paths_of( item ):
+        return ( item.path, ) + tuple( getattr( item, 'extra_paths', None ) or () )
+
+    tree_scanner.prefetch(
+            path for item in items for path in paths_of( item ) if os.path.isdir( path )
+    )
+    return [
+            item._replace( size_bytes=sum( _measure_bytes( path ) for path in paths_of( item ) ) )
+            for item in items
+    ]
+
+
 def _path_label( dependency, qualifier, tool_variant ):
     parts = [ dependency ]
     if qualifier:
@@ -341,11 +359,11 @@ def _sibling_leftovers( root, target, remove_reals ):
                 path=candidate,
                 qualifier=version,
                 tool_variant=name,
-                size_bytes=_measure_bytes( candidate ),
+                size_bytes=None,
                 label=_path_label( target.dependency, version, name ),
                 storage_type=target.storage_type,
             ) )
-        return leftovers
+        return _with_sizes( leftovers )
 
     if target.storage_type == 'conan' and len( parts ) >= 3 and parts[0] == 'conan':
         # conan/<name>/<fingerprint> — leave other fingerprints for the same name.
@@ -369,11 +387,11 @@ def _sibling_leftovers( root, target, remove_reals ):
                 path=candidate,
                 qualifier=fingerprint[:16],
                 tool_variant=None,
-                size_bytes=_measure_bytes( candidate ),
+                size_bytes=None,
                 label=_path_label( target.dependency, fingerprint[:16], None ),
                 storage_type=target.storage_type,
             ) )
-        return leftovers
+        return _with_sizes( leftovers )
 
     if (
             target.storage_type == 'toolchain'
@@ -401,11 +419,11 @@ def _sibling_leftovers( root, target, remove_reals ):
                 path=candidate,
                 qualifier=qualifier,
                 tool_variant=None,
-                size_bytes=_measure_bytes( candidate ),
+                size_bytes=None,
                 label=_path_label( target.dependency, qualifier, None ),
                 storage_type=target.storage_type,
             ) )
-        return leftovers
+        return _with_sizes( leftovers )
 
     # Location / archive (and unknown top-level): siblings share the stem (name before @).
     if dependency_storage.looks_like_tool_variant_dir( parts[0] ):
@@ -438,11 +456,11 @@ def _sibling_leftovers( root, target, remove_reals ):
             path=candidate,
             qualifier=other_qual,
             tool_variant=None,
-            size_bytes=_measure_bytes( candidate ),
+            size_bytes=None,
             label=_path_label( target.dependency, other_qual or '@', None ),
             storage_type=target.storage_type,
         ) )
-    return leftovers
+    return _with_sizes( leftovers )
 
 
 def enumerate_archive_product_dirs( home ):
@@ -648,7 +666,6 @@ def _product_leftovers( dependency, extract, home, remove_reals, storage_type, q
             remaining.append( path )
         if not remaining:
             continue
-        size_bytes = sum( _measure_bytes( path ) for path in remaining )
         try:
             label = os.path.relpath( display_path, extract or home )
         except ValueError:
@@ -660,16 +677,20 @@ def _product_leftovers( dependency, extract, home, remove_reals, storage_type, q
             extract_rel = _relative_removal_path( extract, root )
             if extract_rel and not label.startswith( extract_rel + '/' ) and label != extract_rel:
                 label = "{}/{}".format( extract_rel, label )
-        leftovers.append( Leftover(
+        leftovers.append( ( remaining, Leftover(
             dependency=dependency,
             path=remaining[0],
             qualifier=qualifier,
             tool_variant=( tool_variant or label ).replace( '\\', '/' ),
-            size_bytes=size_bytes,
+            size_bytes=None,
             label=label,
             storage_type='archive',
-        ) )
-    return leftovers
+        ) ) )
+    tree_scanner.prefetch( path for remaining, _leftover in leftovers for path in remaining )
+    return [
+            leftover._replace( size_bytes=sum( _measure_bytes( path ) for path in remaining ) )
+            for remaining, leftover in leftovers
+    ]
 
 
 def collect_removal_plan( construct, cuppa_env, names, wipe=False ):
@@ -678,6 +699,11 @@ def collect_removal_plan( construct, cuppa_env, names, wipe=False ):
     When ``wipe`` is True, archive extracts are queued for full deletion even when the
     dependency implements ``storage_clean`` (product-only clean is skipped).
     """
+    with tree_scanner.scanning():
+        return _collect_removal_plan( construct, cuppa_env, names, wipe=wipe )
+
+
+def _collect_removal_plan( construct, cuppa_env, names, wipe=False ):
     root = _dependencies_root( cuppa_env )
     selections = dependency_storage.selection_build_envs( construct, cuppa_env )
     owned, skips = dependency_storage.resolve_named_dependencies(
@@ -736,7 +762,7 @@ def collect_removal_plan( construct, cuppa_env, names, wipe=False ):
             qualifier=item.qualifier,
             tool_variant=item.tool_variant,
             storage_type=item.storage_type,
-            size_bytes=_measure_bytes( path ),
+            size_bytes=None,
             label=None,
             extra_paths=(),
         ) )
@@ -798,17 +824,17 @@ def collect_removal_plan( construct, cuppa_env, names, wipe=False ):
             else:
                 display = label
 
-            size_bytes = sum( _measure_bytes( path ) for path in paths )
             targets.append( RemovalTarget(
                 dependency=name,
                 path=primary,
                 qualifier=clean.get( 'qualifier' ),
                 tool_variant=tool_variant or label,
                 storage_type=clean.get( 'storage_type' ) or 'archive',
-                size_bytes=size_bytes,
+                size_bytes=None,
                 label=display,
                 extra_paths=extra,
             ) )
+    targets = _with_sizes( targets )
 
     leftovers = []
     leftover_seen = set()
@@ -1069,6 +1095,10 @@ def _path_under_extract( path, extract_real ):
 def _archive_contexts( root, clean_by_name, targets, leftovers ):
     """Per-extract size context so removal reports can match ``--list-dependencies``."""
     archives = []
+    tree_scanner.prefetch(
+            clean.get( 'extract' ) for clean in clean_by_name.values()
+            if clean.get( 'extract' ) and os.path.isdir( clean['extract'] )
+    )
     for name, clean in clean_by_name.items():
         extract = clean.get( 'extract' )
         if not extract or not os.path.isdir( extract ):
@@ -2426,11 +2456,11 @@ def _staying_extracts_from_owned( owned, targets, leftovers ):
             qualifier=item.qualifier,
             tool_variant=item.tool_variant,
             storage_type=item.storage_type,
-            size_bytes=_measure_bytes( item.path ),
+            size_bytes=None,
             label=os.path.basename( item.path.rstrip( '\\/' ) ),
             extra_paths=(),
         ) )
-    return staying
+    return _with_sizes( staying )
 
 
 def _item_field( item, name, default=None ):
@@ -2601,36 +2631,39 @@ def remove_dependencies( construct, cuppa_env, out=None ):
                         downloads_root_check
                 )
             )
-    plan = collect_removal_plan( construct, cuppa_env, names, wipe=wipe )
-    from cuppa.core import dependency_actions
-    targets = plan['targets']
-    leftovers = plan['leftovers']
-    archives = plan.get( 'archives' ) or []
-    develop_skips = plan['develop_skips']
-    owned = plan.get( 'owned' ) or []
-    planning = dry_run( cuppa_env )
-
-    download_targets = []
-    download_leftovers = []
-    downloads_root = None
-    staying_extracts = []
-    if purge:
-        download_targets, download_leftovers, downloads_root = collect_purge_downloads(
-                construct, cuppa_env, names, owned=owned,
+    # One scan for the whole plan: trees sized for removal are reused by the purge and
+    # staying-extract sizing. Deletion below is not part of it.
+    with tree_scanner.scanning():
+        plan = collect_removal_plan( construct, cuppa_env, names, wipe=wipe )
+        from cuppa.core import dependency_actions
+        targets = plan['targets']
+        leftovers = plan['leftovers']
+        archives = plan.get( 'archives' ) or []
+        develop_skips = plan['develop_skips']
+        owned = plan.get( 'owned' ) or []
+        planning = dry_run( cuppa_env )
+
+        download_targets = []
+        download_leftovers = []
+        downloads_root = None
+        staying_extracts = []
+        if purge:
+            download_targets, download_leftovers, downloads_root = collect_purge_downloads(
+                    construct, cuppa_env, names, owned=owned,
+            )
+            if not wipe:
+                staying_extracts = _staying_extracts_from_owned( owned, targets, leftovers )
+
+        (
+                targets, leftovers, archives, download_targets, download_leftovers,
+        ) = _filter_plan_by_tokens(
+                cuppa_env, targets, leftovers, archives,
+                download_targets=download_targets,
+                download_leftovers=download_leftovers,
         )
-        if not wipe:
+        if purge and not wipe:
             staying_extracts = _staying_extracts_from_owned( owned, targets, leftovers )
 
-    (
-            targets, leftovers, archives, download_targets, download_leftovers,
-    ) = _filter_plan_by_tokens(
-            cuppa_env, targets, leftovers, archives,
-            download_targets=download_targets,
-            download_leftovers=download_leftovers,
-    )
-    if purge and not wipe:
-        staying_extracts = _staying_extracts_from_owned( owned, targets, leftovers )
-
     actionable_downloads = [ item for item in download_targets if not item.missing ]
     if not targets and not actionable_downloads:
         out.write( "nothing to remove" )
@@ -3580,8 +3613,9 @@ def force_wipe_dependencies( construct, cuppa_env, out=None ):
             "refusing to wipe under suspicious downloads root [{}]".format( downloads_root )
         )
 
-    rows = dependency_actions._collect_rows( construct, cuppa_env ).get( 'rows' ) or []
-    dl_rows = dependency_downloads.collect_download_rows( construct, cuppa_env ).get( 'rows' ) or []
+    with tree_scanner.scanning():
+        rows = dependency_actions._collect_rows( construct, cuppa_env ).get( 'rows' ) or []
+        dl_rows = dependency_downloads.collect_download_rows( construct, cuppa_env ).get( 'rows' ) or []
     by_path = _inventory_by_path( root )
     this_project = cuppa_env.get( 'sconstruct_dir' )
     planning = dry_run( cuppa_env )
@@ -3768,16 +3802,17 @@ def force_wipe_unreferenced_dependencies( construct, cuppa_env, out=None ):
             "refusing to wipe under suspicious downloads root [{}]".format( downloads_root )
         )
 
-    dep_data = dependency_actions.apply_list_scope(
-            dependency_actions._collect_rows( construct, cuppa_env ),
-            'unreferenced',
-            tree_builder=dependency_tree.build_tree,
-    )
-    dl_data = dependency_actions.apply_list_scope(
-            dependency_downloads.collect_download_rows( construct, cuppa_env ),
-            'unreferenced',
-            tree_builder=dependency_downloads.build_downloads_tree,
-    )
+    with tree_scanner.scanning():
+        dep_data = dependency_actions.apply_list_scope(
+                dependency_actions._collect_rows( construct, cuppa_env ),
+                'unreferenced',
+                tree_builder=dependency_tree.build_tree,
+        )
+        dl_data = dependency_actions.apply_list_scope(
+                dependency_downloads.collect_download_rows( construct, cuppa_env ),
+                'unreferenced',
+                tree_builder=dependency_downloads.build_downloads_tree,
+        )
 
     this_project = cuppa_env.get( 'sconstruct_dir' )
     planning = dry_run( cuppa_env )
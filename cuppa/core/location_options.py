@@ -52,6 +52,22 @@ def add_location_options( add_option ):
                      " attempt to check those locations out on the same tag as specified, if it exists"
                      " or the default branch otherwise." )
 
+    add_option( '--location-jobs', dest='location_jobs', nargs=1, action='store',
+                type='int', default=None,
+                help="How many remote locations (git, hg, svn or archive URLs) to retrieve"
+                     " concurrently before the sconscripts run (default 8). Use 1 to retrieve"
+                     " each location only when a sconscript first asks for it. Also bounds how"
+                     " many develop copies --list-develop and --update-develop inspect or fetch"
+                     " at once." )
+
+    add_option( '--conan-jobs', dest='conan_jobs', nargs=1, action='store',
+                type='int', default=None,
+                help="How many Conan dependencies to install concurrently, one per distinct"
+                     " toolchain and variant fingerprint, before the sconscripts run (default 1:"
+                     " install each only when a sconscript first builds with it). Concurrent"
+                     " installs write the shared Conan cache at the same time, which Conan 2"
+                     " does not support; raise it only where the cache is safe to share." )
+
     add_option( '--list-develop', dest='list_develop', action='store_true',
                 help="Report the state of the local working copies that --develop builds against,"
                      " and exit. Shows the branch each copy is on, whether it is behind its"
@@ -103,3 +119,5 @@ def process_location_options( cuppa_env ):
     cuppa_env['location_explicit_default_branch'] = cuppa_env.get_option( 'location_explicit_default_branch' )
     cuppa_env['location_match_branch']            = cuppa_env.get_option( 'location_match_branch' )
     cuppa_env['location_match_tag']               = cuppa_env.get_option( 'location_match_tag' )
+    cuppa_env['location_jobs']                    = cuppa_env.get_option( 'location_jobs' )
+    cuppa_env['conan_jobs']                       = cuppa_env.get_option( 'conan_jobs' )
@@ -0,0 +1,145 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   Location prefetch — retrieve declared location dependencies concurrently
+#-------------------------------------------------------------------------------
+
+"""Clone, update or download every declared location dependency before sconscripts run.
+
+Without this each ``Location`` is created, and so retrieved, the first time a sconscript asks
+for its dependency, one network round trip after another. Prefetching creates them up front on a
+bounded thread pool and stores them in the same cache ``_get_location`` consults, so the later
+lookups are free.
+
+Error behaviour is unchanged: a failed retrieval is held by the dependency type and raised by its
+first ``_get_location``, which reports it exactly as before. Only remote (URL) locations are
+prefetched; local paths cost nothing to resolve and relative ones depend on the sconscript.
+
+``--location-jobs=N`` bounds the pool; ``--location-jobs=1`` turns prefetching off.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cuppa.log import logger
+from cuppa.colourise import as_info, as_notice, as_warning
+from cuppa.utility.download import transfer_progress_suppressed
+from cuppa.utility.pip_imports import pip_is_url
+
+
+# Retrieval is network bound; beyond a handful of concurrent clones remote hosts throttle anyway.
+DEFAULT_LOCATION_JOBS = 8
+
+
+def location_jobs( cuppa_env ):
+    jobs = cuppa_env.get( 'location_jobs' )
+    if jobs is None:
+        return DEFAULT_LOCATION_JOBS
+    return max( 1, int( jobs ) )
+
+
+def retrieval_enabled( cuppa_env ):
+    return not (
+            cuppa_env.get( 'offline' )
+            or cuppa_env.get( 'clean' )
+            or cuppa_env.get( 'dump' )
+            or cuppa_env.get( 'storage_resolve_only' )
+    )
+
+
+def _is_location_type( factory ):
+    from cuppa.build_with_location import base
+    return isinstance( factory, type ) and issubclass( factory, base )
+
+
+def collect_prefetch_plan( cuppa_env, names ):
+    """``[ ( name, factory, location_id ) ]`` for the remote locations behind ``names``.
+
+    Each distinct location URL appears once, and locations already cached or replaced by a
+    develop path under ``--develop`` are left out.
+    """
+    plan = []
+    seen = set()
+    dependencies = cuppa_env.get( 'dependencies' ) or {}
+    for name in names:
+        factory = dependencies.get( name )
+        if not _is_location_type( factory ):
+            continue
+        try:
+            location_id = factory.location_id( cuppa_env )
+        except Exception as error:
+            logger.trace( "Not prefetching [{}]: {}".format( as_notice( name ), str( error ) ) )
+            continue
+        if not location_id or location_id in factory._cached_locations:
+            continue
+        location, develop, _, use_develop = location_id
+        if use_develop and develop:
+            continue
+        if location.startswith( 'file:' ) or not pip_is_url( location ):
+            continue
+        if location in seen:
+            continue
+        seen.add( location )
+        plan.append( ( name, factory, location_id ) )
+    return plan
+
+
+class _RetrievalProgress(object):
+    """One shared, thread-safe progress line per finished retrieval."""
+
+    def __init__( self, total ):
+        self._total = total
+        self._done = 0
+        self._lock = threading.Lock()
+
+    def finished( self, name, succeeded, elapsed ):
+        with self._lock:
+            self._done += 1
+            done = self._done
+        if succeeded:
+            logger.info( "Retrieved location [{}] ({}/{}) in {:.1f}s".format(
+                    as_info( name ), done, self._total, elapsed
+            ) )
+        else:
+            logger.info( "Retrieving location [{}] ({}/{}) {} after {:.1f}s".format(
+                    as_info( name ), done, self._total, as_warning( "failed" ), elapsed
+            ) )
+
+
+def prefetch_locations( cuppa_env, names, max_workers=None ):
+    """Retrieve the remote locations behind ``names`` concurrently.
+
+    Returns the number of locations retrieved successfully.
+    """
+    workers = max_workers or location_jobs( cuppa_env )
+    if workers <= 1 or not retrieval_enabled( cuppa_env ):
+        return 0
+
+    plan = collect_prefetch_plan( cuppa_env, names )
+    if len( plan ) < 2:
+        return 0
+
+    import cuppa.core.storage_options
+    cuppa.core.storage_options.report_roots( cuppa_env )
+
+    workers = min( workers, len( plan ) )
+    logger.info( "Retrieving [{}] locations with up to [{}] concurrent retrievals".format(
+            as_info( str( len( plan ) ) ), as_info( str( workers ) )
+    ) )
+    progress = _RetrievalProgress( len( plan ) )
+
+    def retrieve( entry ):
+        name, factory, location_id = entry
+        started = time.time()
+        with transfer_progress_suppressed():
+            succeeded = factory.prefetch_location( cuppa_env, location_id )
+        progress.finished( name, succeeded, time.time() - started )
+        return succeeded
+
+    with ThreadPoolExecutor( max_workers=workers ) as executor:
+        results = list( executor.map( retrieve, plan ) )
+    return sum( 1 for succeeded in results if succeeded )
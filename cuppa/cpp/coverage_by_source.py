@@ -35,6 +35,8 @@ DETAIL_NAME_RE_LOOSE = re.compile(
     re.I,
 )
 
+EXCLUDED_DIRECTORIES = frozenset( ( "_build", "_artefacts", "_artifacts", ".git", "node_modules" ) )
+
 LINE_STATUS_RE = re.compile(
     r'class="lineno"[^>]*>.*?>(\d+)</a>.*?'
     r'class="linecount\s+([^"]*)"[^>]*>',
@@ -102,7 +104,65 @@ def normalize_repo_path( repo_root, file_path ):
         return path
 
 
-def resolve_source_path( repo_root, fname, source_roots ):
+def _source_rank( rel ):
+    if rel.startswith( "include/" ):
+        bucket = 0
+    elif rel.startswith( "src/" ) or rel.startswith( "source/" ):
+        bucket = 1
+    else:
+        bucket = 2
+    return ( bucket, rel.count( "/" ), rel )
+
+
+class source_basename_index(object):
+    """Basename -> ranked repo-relative candidates, built by one walk of the source roots.
+
+    Excluded directories (build output, VCS metadata, ``node_modules``) are pruned during the walk
+    rather than filtered afterwards, so lookups for every detail page of a report run are dict hits.
+    The walk happens on the first lookup.
+    """
+
+    def __init__( self, repo_root, source_roots ):
+        self._repo_root = repo_root
+        self._source_roots = source_roots
+        self._candidates = None
+
+
+    def _build( self ):
+        candidates = defaultdict( list )
+        for root in self._source_roots:
+            try:
+                root_rel = os.path.relpath( root, self._repo_root ).replace( "\\", "/" )
+            except ValueError:
+                continue
+            if any( part in EXCLUDED_DIRECTORIES for part in root_rel.split( "/" ) ):
+                continue
+            for dirpath, dirnames, filenames in os.walk( root ):
+                dirnames[:] = [ name for name in dirnames if name not in EXCLUDED_DIRECTORIES ]
+                try:
+                    dir_rel = os.path.relpath( dirpath, self._repo_root ).replace( "\\", "/" )
+                except ValueError:
+                    continue
+                for filename in filenames:
+                    rel = dir_rel == "." and filename or dir_rel + "/" + filename
+                    candidates[filename].append( rel )
+        for rels in candidates.values():
+            rels.sort( key=_source_rank )
+        return candidates
+
+
+    def candidates( self, fname ):
+        if self._candidates is None:
+            self._candidates = self._build()
+        return self._candidates.get( fname, [] )
+
+
+    def resolve( self, fname ):
+        rels = self.candidates( fname )
+        return rels and rels[0] or None
+
+
+def resolve_source_path( repo_root, fname, source_roots, index=None ):
     """Map a detail-page basename to a repo-relative path."""
     if "/" in fname or os.sep in fname:
         rel = fname.replace( "\\", "/" )
@@ -117,39 +177,9 @@ def resolve_source_path( repo_root, fname, source_roots ):
                     return rel
         return rel
 
-    matches = []
-    for root in source_roots:
-        for dirpath, _dirnames, filenames in os.walk( root ):
-            if fname in filenames:
-                matches.append( os.path.join( dirpath, fname ) )
-
-    if not matches:
-        return None
-
-    rels = []
-    for match_path in matches:
-        try:
-            rel = os.path.relpath( match_path, repo_root ).replace( "\\", "/" )
-        except ValueError:
-            continue
-        if any( part in ( "_build", "_artefacts", "_artifacts", ".git", "node_modules" ) for part in rel.split( "/" ) ):
-            continue
-        rels.append( rel )
-
-    if not rels:
-        return None
-
-    def rank( rel ):
-        if rel.startswith( "include/" ):
-            bucket = 0
-        elif rel.startswith( "src/" ) or rel.startswith( "source/" ):
-            bucket = 1
-        else:
-            bucket = 2
-        return ( bucket, rel.count( "/" ), rel )
-
-    rels.sort( key=rank )
-    return rels[0]
+    if index is None:
+        index = source_basename_index( repo_root, source_roots )
+    return index.resolve( fname )
 
 
 def sanitized_source_filename( source_path ):
@@ -268,6 +298,7 @@ def load_source_text( repo_root, source_path, source_text_cache ):
 def collect_union_coverage_from_json( search_roots, repo_root ):
     """Union line/branch coverage from coverage--*.json files."""
     source_roots = default_source_roots( repo_root )
+    source_index = source_basename_index( repo_root, source_roots )
     # source_path -> lineno -> executed(bool); False means seen but never executed
     line_executed = defaultdict( dict )
     # source_path -> branch_key -> taken(bool)
@@ -299,10 +330,10 @@ def collect_union_coverage_from_json( search_roots, repo_root ):
             if not source_path:
                 continue
             if "/" not in source_path:
-                resolved = resolve_source_path( repo_root, source_path, source_roots )
+                resolved = resolve_source_path( repo_root, source_path, source_roots, source_index )
                 if resolved:
                     source_path = resolved
-            if any( part in ( "_build", "_artefacts", "_artifacts", ".git", "node_modules" ) for part in source_path.split( "/" ) ):
+            if any( part in EXCLUDED_DIRECTORIES for part in source_path.split( "/" ) ):
                 continue
 
             json_counts[source_path] += 1
@@ -359,6 +390,7 @@ def collect_union_coverage_from_json( search_roots, repo_root ):
 def collect_union_coverage_from_html( search_roots, repo_root ):
     """Fallback: union line status from gcovr HTML detail pages (no branches)."""
     source_roots = default_source_roots( repo_root )
+    source_index = source_basename_index( repo_root, source_roots )
     union = defaultdict( dict )
     detail_counts = defaultdict( int )
     source_text_cache = {}
@@ -367,7 +399,7 @@ def collect_union_coverage_from_html( search_roots, repo_root ):
         fname = basename_from_detail_name( os.path.basename( html_path ) )
         if not fname:
             continue
-        source_path = resolve_source_path( repo_root, fname, source_roots )
+        source_path = resolve_source_path( repo_root, fname, source_roots, source_index )
         if not source_path:
             logger.trace(
                 "Skipping coverage detail [{}]: could not resolve source for [{}]".format(
@@ -7,6 +7,7 @@
 #   C++20 modules compile helpers (named modules + header units)
 #-------------------------------------------------------------------------------
 
+import atexit
 import os
 
 from SCons.Node import Node
@@ -16,13 +17,13 @@ import cuppa.progress
 from cuppa.colourise import as_error, as_info, as_notice, as_warning
 from cuppa.cpp.module_scanner import (
     ModuleScan,
+    ModuleScanCache,
     is_interface_source,
     module_bmi_name,
     owning_module_name,
     parse_header_unit_declaration,
     qualify_relative_import,
     sanitize_module_filename,
-    scan_file,
     std_module_imports_from_scan,
 )
 from cuppa.log import logger
@@ -32,6 +33,9 @@ import shutil
 
 
 REGISTRY_KEY = '_cuppa_module_registry'
+SCAN_CACHE_FILE = 'module-scans.json'
+
+_scan_caches = {}
 
 
 def get_registry( env ):
@@ -79,10 +83,30 @@ def _source_abspath( source ):
     return str( source )
 
 
-def _scan_source( source ):
+def _save_scan_caches():
+    for cache in _scan_caches.values():
+        try:
+            cache.save()
+        except OSError as exc:
+            logger.debug( "Could not save module scan cache: {}".format( str( exc ) ) )
+
+
+def scan_cache_for( env ):
+    """The persistent module scan cache kept alongside this build's BMIs."""
+    path = os.path.join( modules_dir( env ), SCAN_CACHE_FILE )
+    cache = _scan_caches.get( path )
+    if cache is None:
+        if not _scan_caches:
+            atexit.register( _save_scan_caches )
+        cache = ModuleScanCache( path )
+        _scan_caches[path] = cache
+    return cache
+
+
+def _scan_source( source, cache ):
     path = _source_abspath( source )
     try:
-        return scan_file( path )
+        return cache.scan( path )
     except Exception as exc:
         logger.warn(
             "Could not scan [{}] for modules: {}"
@@ -318,6 +342,7 @@ def compile_with_modules( env, sources, obj_builder, obj_prefix, obj_suffix, dep
     toolchain = env['toolchain']
     modules_dir( env )
     get_registry( env )
+    scan_cache = scan_cache_for( env )
 
     classified = []
     for source in Flatten( [ sources ] ):
@@ -326,7 +351,7 @@ def compile_with_modules( env, sources, obj_builder, obj_prefix, obj_suffix, dep
         if os.path.splitext( str( source ) )[1] == obj_suffix:
             classified.append( ( 'object', source, None ) )
             continue
-        scan = _scan_source( source )
+        scan = _scan_source( source, scan_cache )
         bmi_name = module_bmi_name( scan )
         if bmi_name or is_interface_source( str( source ), scan ):
             classified.append( ( 'bmi', source, scan ) )
@@ -8,8 +8,11 @@
 #-------------------------------------------------------------------------------
 
 from collections import namedtuple
+import hashlib
+import json
 import os
 import re
+import tempfile
 
 
 ModuleImport = namedtuple( 'ModuleImport', [ 'kind', 'name' ] )
@@ -49,25 +52,16 @@ _IMPORT_ANGLE_RE = re.compile(
 INTERFACE_SUFFIXES = ( '.cppm', '.cxxm', '.ccm', '.ixx' )
 
 
+# Leftmost-first, so a `//` inside a block comment (or `/*` after `//`) is consumed by whichever
+# comment opened first; an unterminated block comment runs to the end of the text.
+_COMMENT_RE = re.compile( r'//[^\n]*|/\*.*?(?:\*/|\Z)', re.DOTALL )
+
+
 def strip_comments( text ):
     """Remove // line and /* */ block comments (string-literal unaware)."""
-    out = []
-    i = 0
-    n = len( text )
-    while i < n:
-        if text[i:i+2] == '//':
-            while i < n and text[i] != '\n':
-                i += 1
-            continue
-        if text[i:i+2] == '/*':
-            i += 2
-            while i + 1 < n and text[i:i+2] != '*/':
-                i += 1
-            i = min( i + 2, n )
-            continue
-        out.append( text[i] )
-        i += 1
-    return ''.join( out )
+    if '/' not in text:
+        return text
+    return _COMMENT_RE.sub( '', text )
 
 
 def scan_source_text( text ):
@@ -123,6 +117,110 @@ def scan_file( path ):
         return scan_source_text( handle.read() )
 
 
+def scan_to_json( scan ):
+    return [
+        scan.export_module,
+        scan.module_declaration,
+        [ [ item.kind, item.name ] for item in scan.imports ],
+        scan.private_fragment,
+    ]
+
+
+def scan_from_json( value ):
+    export_module, module_declaration, imports, private_fragment = value
+    return ModuleScan(
+        export_module,
+        module_declaration,
+        [ ModuleImport( kind, name ) for kind, name in imports ],
+        bool( private_fragment ),
+    )
+
+
+class ModuleScanCache(object):
+    """Persistent ``ModuleScan`` results keyed by source path, size, mtime and content hash.
+
+    A source whose size and mtime are unchanged is not opened. When either changed, the file is
+    read and hashed; if the digest still matches (a checkout or ``touch``), the stored scan is
+    reused and only the stat fields are refreshed. Otherwise the source is scanned again.
+    """
+
+    FORMAT = 1
+
+    def __init__( self, cache_path=None ):
+        self._cache_path = cache_path
+        self._entries = {}
+        self._dirty = False
+        self.hits = 0
+        self.rehashed = 0
+        self.scanned = 0
+        self._load()
+
+
+    def _load( self ):
+        if not self._cache_path:
+            return
+        try:
+            with open( self._cache_path, encoding='utf-8' ) as handle:
+                payload = json.load( handle )
+        except ( OSError, ValueError, TypeError ):
+            return
+        if isinstance( payload, dict ) and payload.get( 'format' ) == self.FORMAT:
+            entries = payload.get( 'sources' )
+            if isinstance( entries, dict ):
+                self._entries = entries
+
+
+    def dirty( self ):
+        return self._dirty
+
+
+    def scan( self, path ):
+        status = os.stat( path )
+        entry = self._entries.get( path )
+        if entry and entry['size'] == status.st_size and entry['mtime'] == status.st_mtime_ns:
+            self.hits += 1
+            return scan_from_json( entry['scan'] )
+
+        with open( path, 'rb' ) as handle:
+            data = handle.read()
+        digest = hashlib.sha256( data ).hexdigest()
+
+        if entry and entry['sha256'] == digest:
+            self.rehashed += 1
+            scan_json = entry['scan']
+        else:
+            self.scanned += 1
+            scan_json = scan_to_json( scan_source_text( data.decode( 'utf-8', errors='replace' ) ) )
+
+        self._entries[path] = {
+            'size'  : status.st_size,
+            'mtime' : status.st_mtime_ns,
+            'sha256': digest,
+            'scan'  : scan_json,
+        }
+        self._dirty = True
+        return scan_from_json( scan_json )
+
+
+    def save( self ):
+        if not self._dirty or not self._cache_path:
+            return
+        directory = os.path.dirname( self._cache_path ) or '.'
+        os.makedirs( directory, exist_ok=True )
+        fd, temporary = tempfile.mkstemp( prefix='.module-scans-', suffix='.tmp', dir=directory )
+        try:
+            with os.fdopen( fd, 'w', encoding='utf-8' ) as handle:
+                json.dump( { 'format': self.FORMAT, 'sources': self._entries }, handle, sort_keys=True )
+            os.replace( temporary, self._cache_path )
+        except Exception:
+            try:
+                os.unlink( temporary )
+            except OSError:
+                pass
+            raise
+        self._dirty = False
+
+
 def primary_module_name( module_name ):
     """geo:point -> geo; geo -> geo; :point -> None."""
     if not module_name:
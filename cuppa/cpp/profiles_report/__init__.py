@@ -12,12 +12,14 @@ from cuppa.cpp.profiles_report.constants import DEFAULT_COMPILER, UNCLASSIFIED_R
 from cuppa.cpp.profiles_report.inventory import (
     ProfilesInventory,
     ProfilesScopeStack,
+    capture_line_key,
     format_capture_summary,
     location_dedupe_key,
     parse_progress_line,
     parse_variant_scope_fields,
     profiles_scope_from_construction_env,
     replay_profiles_capture,
+    replay_profiles_capture_file,
 )
 from cuppa.cpp.profiles_report.types import (
     ProfilesDiagnostic,
@@ -40,6 +42,7 @@ __all__ = [
     'ProfilesScope',
     'ProfilesScopeStack',
     'UNCLASSIFIED_RULE_ID',
+    'capture_line_key',
     'classify_rule',
     'format_capture_summary',
     'location_dedupe_key',
@@ -51,5 +54,6 @@ __all__ = [
     'parse_variant_scope_fields',
     'profiles_scope_from_construction_env',
     'replay_profiles_capture',
+    'replay_profiles_capture_file',
     'unscoped_profiles_scope',
 ]
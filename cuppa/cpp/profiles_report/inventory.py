@@ -7,7 +7,10 @@
 #   Profiles violation inventory — scope, dedupe, replay, report model
 #-------------------------------------------------------------------------------
 
+import hashlib
 import re
+import struct
+from array import array
 
 from cuppa.cpp.profiles_report.build_catalog import build_key_from_scope
 from cuppa.cpp.profiles_report.parse import parse_profiles_diagnostic
@@ -160,8 +163,18 @@ def _strip_capture_line( line ):
     return AnsiEscape.strip( line )
 
 
+def capture_line_key( line ):
+    """Return a compact 16-byte key identifying one stripped capture line."""
+    text = line.rstrip( '\r\n' ).encode( 'utf-8', 'surrogateescape' )
+    return hashlib.blake2b( text, digest_size=16 ).digest()
+
+
 def replay_profiles_capture( lines ):
-    """Replay saved build output lines into a scoped ``ProfilesInventory``."""
+    """Replay saved build output lines into a scoped ``ProfilesInventory``.
+
+    ``lines`` may be any iterable, including an open file, and is consumed once. Scoped lines
+    are remembered by ``capture_line_key`` so unscoped repeats of them are not counted twice.
+    """
     inventory = ProfilesInventory()
     stack = ProfilesScopeStack()
     unscoped_diagnostics = 0
@@ -178,7 +191,7 @@ def replay_profiles_capture( lines ):
         if diagnostic is None:
             continue
 
-        line_key = capture_line.rstrip( '\r\n' )
+        line_key = capture_line_key( capture_line )
         scope = stack.current_scope()
         if scope.sconscript == '_unscoped':
             if line_key in seen_scoped_lines:
@@ -192,6 +205,12 @@ def replay_profiles_capture( lines ):
     return inventory, unscoped_diagnostics
 
 
+def replay_profiles_capture_file( capture_path ):
+    """Stream a saved capture file through ``replay_profiles_capture`` one line at a time."""
+    with open( capture_path, encoding='utf-8', errors='replace' ) as handle:
+        return replay_profiles_capture( handle )
+
+
 def format_capture_summary( inventory, unscoped_diagnostics=0 ):
     """Return a human-readable summary of a replayed capture."""
     lines = [
@@ -831,56 +850,132 @@ def _build_session_rollup( locations ):
     }
 
 
+class _StringTable:
+    """Interned strings addressed by small integer ids."""
+
+    __slots__ = ( '_ids', '_strings' )
+
+    def __init__( self ):
+        self._ids = {}
+        self._strings = []
+
+    def intern( self, text ):
+        index = self._ids.get( text )
+        if index is None:
+            index = len( self._strings )
+            self._ids[ text ] = index
+            self._strings.append( text )
+        return index
+
+    def __getitem__( self, index ):
+        return self._strings[ index ]
+
+
+# Dedupe key: string ids of sconscript, variant_dir, path, profile and normalised message, with
+# line and column, packed into one small ``bytes`` rather than a tuple of seven objects.
+_DEDUPE_KEY = struct.Struct( '<7I' )
+
+
 class ProfilesInventory:
-    """In-memory Profiles violation inventory with scope-aware dedupe."""
+    """In-memory Profiles violation inventory with scope-aware dedupe.
+
+    Locations are held column-wise: every string is interned once in a shared table and each
+    location is a row of integer ids across ``array`` columns, with its reference count updated in
+    place. ``locations()`` builds the ``ProfilesLocation`` tuples when asked.
+    """
 
     def __init__( self ):
-        self._locations = {}
-
-    def record( self, scope, diagnostic ):
-        """Record one parsed diagnostic, incrementing reference counts for duplicates."""
-        key = location_dedupe_key( scope, diagnostic )
-        existing = self._locations.get( key )
-        if existing is not None:
-            self._locations[ key ] = existing._replace(
-                reference_count=existing.reference_count + 1,
-            )
-            return existing
-
-        location = ProfilesLocation(
-            scope=scope,
-            path=diagnostic.path,
-            line=diagnostic.line,
-            column=diagnostic.column,
-            profile=diagnostic.profile,
-            normalised_message=diagnostic.normalised_message,
-            rule_id=diagnostic.rule_id,
-            reference_count=1,
-            raw_message=diagnostic.message,
+        self._strings = _StringTable()
+        self._scope_ids = {}
+        self._scopes = []
+        self._rows = {}
+        self._scope = array( 'I' )
+        self._path = array( 'I' )
+        self._line = array( 'I' )
+        self._column = array( 'I' )
+        self._profile = array( 'I' )
+        self._normalised_message = array( 'I' )
+        self._rule_id = array( 'I' )
+        self._raw_message = array( 'I' )
+        self._references = array( 'Q' )
+
+    def _scope_id( self, scope ):
+        index = self._scope_ids.get( scope )
+        if index is None:
+            index = len( self._scopes )
+            self._scope_ids[ scope ] = index
+            self._scopes.append( scope )
+        return index
+
+    def record( self, scope, diagnostic, references=1 ):
+        """Record one parsed diagnostic, incrementing reference counts for duplicates.
+
+        ``references`` records that many occurrences at once, as when loading saved reports.
+        """
+        intern = self._strings.intern
+        path = intern( diagnostic.path )
+        profile = intern( diagnostic.profile )
+        normalised_message = intern( diagnostic.normalised_message )
+        key = _DEDUPE_KEY.pack(
+            intern( scope.sconscript ),
+            intern( scope.variant_dir ),
+            path,
+            diagnostic.line,
+            diagnostic.column,
+            profile,
+            normalised_message,
+        )
+        row = self._rows.get( key )
+        if row is not None:
+            self._references[ row ] += references
+            return
+
+        self._rows[ key ] = len( self._references )
+        self._scope.append( self._scope_id( scope ) )
+        self._path.append( path )
+        self._line.append( diagnostic.line )
+        self._column.append( diagnostic.column )
+        self._profile.append( profile )
+        self._normalised_message.append( normalised_message )
+        self._rule_id.append( intern( diagnostic.rule_id ) )
+        self._raw_message.append( intern( diagnostic.message ) )
+        self._references.append( references )
+
+    def _location( self, row ):
+        strings = self._strings
+        return ProfilesLocation(
+            scope=self._scopes[ self._scope[ row ] ],
+            path=strings[ self._path[ row ] ],
+            line=self._line[ row ],
+            column=self._column[ row ],
+            profile=strings[ self._profile[ row ] ],
+            normalised_message=strings[ self._normalised_message[ row ] ],
+            rule_id=strings[ self._rule_id[ row ] ],
+            reference_count=self._references[ row ],
+            raw_message=strings[ self._raw_message[ row ] ],
         )
-        self._locations[ key ] = location
-        return location
 
     def locations( self ):
-        return tuple( self._locations.values() )
+        return tuple( self._location( row ) for row in range( len( self._references ) ) )
 
     def total_references( self ):
-        return sum( location.reference_count for location in self._locations.values() )
+        return sum( self._references )
 
     def session_union_references( self ):
-        return _union_reference_total( self._locations.values() )
+        return _union_reference_total( self.locations() )
 
     def unique_locations( self ):
-        return len( self._locations )
+        return len( self._references )
 
     def unique_violation_count( self ):
         """Count distinct rule violations unioned across variants and toolchains."""
-        return _union_violation_count( self._locations.values() )
+        return _union_violation_count( self.locations() )
 
     def as_report_model( self ):
         """Return a minimal JSON-serialisable view model for tests and later HTML."""
+        locations = self.locations()
         scopes = {}
-        for location in self._locations.values():
+        for location in locations:
             scope_key = (
                 location.scope.sconscript,
                 location.scope.variant_dir,
@@ -1100,7 +1195,7 @@ class ProfilesInventory:
             )
             scope_build_refs = sum(
                 location.reference_count
-                for location in self._locations.values()
+                for location in locations
                 if (
                     location.scope.sconscript,
                     location.scope.variant_dir,
@@ -1126,7 +1221,7 @@ class ProfilesInventory:
         serialised_scopes.sort(
             key=lambda entry: ( -entry[ 'total_references' ], entry[ 'sconscript' ] ),
         )
-        session_rollup = _build_session_rollup( self._locations.values() )
+        session_rollup = _build_session_rollup( locations )
 
         return {
             'scopes': serialised_scopes,
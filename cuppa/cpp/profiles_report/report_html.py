@@ -25,6 +25,7 @@ from cuppa.cpp.profiles_report.breadcrumbs import scope_breadcrumbs
 from cuppa.cpp.profiles_report.source_pages import format_rule_label_html
 from cuppa.cpp.profiles_report.source_pages import format_violation_message_html
 from cuppa.cpp.profiles_report.source_pages import write_source_pages
+from cuppa.cpp.profiles_report.source_pages import BY_SOURCE_DIR, SOURCE_PAGES_MANIFEST
 from cuppa.test_report.html_report import initialise_test_linking
 
 _jinja2_env = None
@@ -651,6 +652,7 @@ def render_profiles_reports(
             link_base,
             INDEX_BASENAME,
             lambda: templates.get_template( 'cxx_profiles_source_file.html' ),
+            jobs=env.get( 'job_count' ),
         )
 
     enrich_model_for_html(
@@ -773,6 +775,8 @@ def render_profiles_reports(
     if write_json:
         session_paths.append( json_path )
     session_paths.extend( source_written )
+    if source_written:
+        session_paths.append( os.path.join( destination, BY_SOURCE_DIR, SOURCE_PAGES_MANIFEST ) )
     return {
         'index_path': index_path,
         'session_paths': session_paths,
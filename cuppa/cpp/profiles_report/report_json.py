@@ -235,9 +235,10 @@ def load_report_model( json_path ):
     return unwrap_report_payload( data )
 
 
-def inventory_from_flat_locations( locations ):
-    """Rebuild inventory from a flat ``locations[]`` array."""
-    inventory = ProfilesInventory()
+def inventory_from_flat_locations( locations, inventory=None ):
+    """Rebuild inventory from a flat ``locations[]`` array, or add it to ``inventory``."""
+    if inventory is None:
+        inventory = ProfilesInventory()
     for row in locations:
         scope = ProfilesScope(
             sconscript=row[ 'sconscript' ],
@@ -254,10 +255,7 @@ def inventory_from_flat_locations( locations ):
             normalised_message=row.get( 'normalised_message', '' ),
             rule_id=row[ 'rule_id' ],
         )
-        references = row.get( 'references', 1 )
-        inventory.record( scope, diagnostic )
-        for _unused in range( references - 1 ):
-            inventory.record( scope, diagnostic )
+        inventory.record( scope, diagnostic, references=row.get( 'references', 1 ) )
     return inventory
 
 
@@ -290,13 +288,80 @@ def inventory_from_report_model( model, flat_locations=None ):
                             normalised_message=location.get( 'normalised_message', '' ),
                             rule_id=rule_id,
                         )
-                        references = location.get( 'references', 1 )
-                        inventory.record( scope, diagnostic )
-                        for _unused in range( references - 1 ):
-                            inventory.record( scope, diagnostic )
+                        inventory.record(
+                            scope,
+                            diagnostic,
+                            references=location.get( 'references', 1 ),
+                        )
     return inventory
 
 
+def _merge_report_metadata( shards ):
+    """Combine shard metadata: session fields from the first, matrix fields unioned."""
+    from cuppa.cpp.profiles_report.anonymise import metadata_is_anonymised
+
+    anonymised = { metadata_is_anonymised( metadata ) for metadata in shards }
+    if len( anonymised ) > 1:
+        raise ValueError( 'Cannot merge anonymised and non-anonymised Profiles reports' )
+
+    merged = dict( shards[ 0 ] )
+    for field in ( 'variant_labels', 'incomplete_scopes', 'profiles_enforce' ):
+        merged[ field ] = sorted(
+            { value for metadata in shards for value in metadata.get( field ) or [] },
+        )
+    merged[ 'partial' ] = bool( merged[ 'incomplete_scopes' ] ) or any(
+        metadata.get( 'partial' ) for metadata in shards
+    )
+    merged[ 'merged_shards' ] = len( shards )
+    return merged
+
+
+def merge_report_files( json_paths ):
+    """Union the report JSON of several build shards into one report payload.
+
+    Each shard's ``locations[]`` (or, for reports without them, its nested report) is added to
+    one inventory through ``inventory_from_flat_locations``; a location reported by more than
+    one shard sums its references. Shards are loaded one at a time and no build log is parsed.
+    The Overview ``context`` is rebuilt from the merged rules only, since shard file and
+    translation-unit sets cannot be unioned from their counts.
+    """
+    if not json_paths:
+        raise ValueError( 'No Profiles report JSON files to merge' )
+
+    inventory = ProfilesInventory()
+    shard_metadata = []
+    for json_path in json_paths:
+        model, metadata, extras = load_report_model( json_path )
+        locations = extras.get( 'locations' ) or build_flat_locations(
+            inventory_from_report_model( model ),
+        )
+        inventory_from_flat_locations( locations, inventory=inventory )
+        shard_metadata.append( metadata )
+
+    metadata = _merge_report_metadata( shard_metadata )
+    model = inventory.as_report_model()
+    attach_rule_doc_hrefs( model )
+
+    from cuppa.cpp.profiles_report.context_summary import build_report_context
+
+    payload = {
+        'schema_version': REPORT_JSON_SCHEMA_VERSION,
+        'generated_at': _utc_timestamp(),
+        'metadata': metadata,
+        'summary': build_report_summary( model ),
+        'report': model,
+        'locations': build_flat_locations( inventory ),
+    }
+    context = build_report_context(
+        model,
+        { 'cxx_profiles_enforce': metadata[ 'profiles_enforce' ] },
+        context_mode='rules-only',
+    )
+    if context is not None:
+        payload[ 'context' ] = context
+    return payload
+
+
 def env_from_report_metadata( metadata, arguments ):
     """Merge CLI arguments with metadata saved in a report JSON file."""
     from cuppa.cpp.profiles_report.anonymise import (
@@ -9,9 +9,14 @@
 
 import html
 import hashlib
+import json
+import multiprocessing
 import os
 import re
+import tempfile
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from cuppa.core.dependency_identity import enrich_described
 from cuppa.core.dependency_storage import describe_tree_path, split_location_folder_name
@@ -21,6 +26,12 @@ from cuppa.cpp.coverage_by_source import language_for_source
 from cuppa.log import logger
 
 BY_SOURCE_DIR = 'by-source'
+# Digests of the inputs each ``by-source`` page was last rendered from.
+SOURCE_PAGES_MANIFEST = '.source-pages.json'
+# Bump when page rendering changes in a way the template digest does not capture.
+SOURCE_PAGES_FORMAT = 1
+# Starting worker processes costs more than rendering a handful of pages inline.
+_MIN_POOLED_PAGES = 16
 _GIT_SSH_PREFIX = 'git_ssh_'
 # First path segment names commonly used as ``location_dependency(..., include=...)`` roots.
 _COMMON_INCLUDE_DIR_NAMES = frozenset(
@@ -625,6 +636,124 @@ def build_source_view_lines( source_path, file_entry ):
     return rendered
 
 
+def _file_digest( path ):
+    digest = hashlib.sha256()
+    try:
+        with open( path, 'rb' ) as handle:
+            for block in iter( lambda: handle.read( 1024 * 1024 ), b'' ):
+                digest.update( block )
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _template_digest( template ):
+    """Digest of every template of the page template's type its loader can see, includes and all.
+
+    A page renders ``{% include %}``-d templates too, so hashing only the top-level file would
+    keep pages stale when an included one changes.
+    """
+    environment = getattr( template, 'environment', None )
+    loader = getattr( environment, 'loader', None )
+    extension = os.path.splitext( getattr( template, 'name', None ) or '' )[ 1 ].lstrip( '.' )
+    if loader is not None and extension:
+        try:
+            digest = hashlib.sha256()
+            for name in environment.list_templates( extensions=[ extension ] ):
+                source = loader.get_source( environment, name )[ 0 ]
+                digest.update( name.encode( 'utf-8' ) + b'\0' )
+                digest.update( source.encode( 'utf-8' ) + b'\0' )
+            return digest.hexdigest()
+        except TypeError:
+            # The loader cannot list its templates.
+            pass
+    filename = getattr( template, 'filename', None )
+    return ( filename and _file_digest( filename ) ) or str( getattr( template, 'name', '' ) )
+
+
+def source_page_digest( source_path, file_entry, context, template_digest ):
+    """Digest of everything a source page is rendered from."""
+    text = json.dumps(
+        {
+            'format': SOURCE_PAGES_FORMAT,
+            'template': template_digest,
+            'source': _file_digest( source_path ),
+            'violations': file_entry[ 'violations' ],
+            'context': context,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256( text.encode( 'utf-8' ) ).hexdigest()
+
+
+def _read_page_digests( output_dir ):
+    try:
+        with open( os.path.join( output_dir, SOURCE_PAGES_MANIFEST ), encoding='utf-8' ) as handle:
+            manifest = json.load( handle )
+    except ( OSError, ValueError ):
+        return {}
+    if manifest.get( 'format' ) != SOURCE_PAGES_FORMAT:
+        return {}
+    return manifest.get( 'pages' ) or {}
+
+
+def _write_page_digests( output_dir, digests ):
+    handle, temporary = tempfile.mkstemp( prefix='.source-pages-', dir=output_dir )
+    try:
+        with os.fdopen( handle, 'w', encoding='utf-8' ) as output:
+            json.dump( { 'format': SOURCE_PAGES_FORMAT, 'pages': digests }, output, indent=2, sort_keys=True )
+        os.replace( temporary, os.path.join( output_dir, SOURCE_PAGES_MANIFEST ) )
+    finally:
+        if os.path.exists( temporary ):
+            os.remove( temporary )
+
+
+def _render_source_page( template, job ):
+    """Read the source, mark it up and write one page; runs in a pool worker or inline."""
+    file_entry = job[ 'file_entry' ]
+    rendered = template.render(
+        file_entry=file_entry,
+        source_lines=build_source_view_lines( job[ 'source_path' ], file_entry ),
+        gutter_width_ch=compute_gutter_width_ch( file_entry ),
+        **job[ 'context' ]
+    )
+    page_abs = job[ 'page_abs' ]
+    handle, temporary = tempfile.mkstemp( prefix='.page-', dir=os.path.dirname( page_abs ) )
+    try:
+        with os.fdopen( handle, 'w', encoding='utf-8' ) as output:
+            output.write( rendered )
+        os.replace( temporary, page_abs )
+    finally:
+        if os.path.exists( temporary ):
+            os.remove( temporary )
+    return page_abs
+
+
+def _render_source_page_in_worker( job ):
+    from cuppa.cpp.profiles_report.report_html import jinja2_templates
+
+    return _render_source_page( jinja2_templates().get_template( job[ 'template_name' ] ), job )
+
+
+def _render_source_pages( template, jobs, workers ):
+    """Render ``jobs`` on up to ``workers`` processes, inline when a pool is not worth it."""
+    workers = min( workers or 1, len( jobs ) )
+    if workers > 1 and len( jobs ) >= _MIN_POOLED_PAGES:
+        # ``spawn`` everywhere: forking a build that may hold locks in other threads is unsafe.
+        context = multiprocessing.get_context( 'spawn' )
+        try:
+            with ProcessPoolExecutor( max_workers=workers, mp_context=context ) as executor:
+                list( executor.map( _render_source_page_in_worker, jobs, chunksize=8 ) )
+            return
+        except ( BrokenProcessPool, OSError ) as error:
+            logger.debug(
+                "Profiles source pages: rendering inline, process pool failed: {}".format( error )
+            )
+    for job in jobs:
+        _render_source_page( template, job )
+
+
 def write_source_pages(
     inventory,
     destination,
@@ -633,8 +762,14 @@ def write_source_pages(
     link_base,
     index_basename,
     get_template,
+    jobs=None,
 ):
-    """Write marked-up source pages and return ``path -> page_relpath`` map."""
+    """Write marked-up source pages and return ``path -> page_relpath`` map.
+
+    Pages whose source content, violations and links match the digest recorded for them in
+    ``by-source/.source-pages.json`` by the previous report are left as they are; the rest are
+    rendered on up to ``jobs`` processes.
+    """
     from cuppa.cpp.profiles_report.report_html import source_href
 
     files = collect_file_violations( inventory )
@@ -645,8 +780,12 @@ def write_source_pages(
     os.makedirs( output_dir, exist_ok=True )
 
     template = get_template()
+    template_digest = _template_digest( template )
+    previous = _read_page_digests( output_dir )
+    digests = {}
     page_map = {}
     written = []
+    pending = []
     for source_path in sorted( files.keys() ):
         file_entry = files[ source_path ]
         display = display_path_for_report( source_path, env )
@@ -654,9 +793,7 @@ def write_source_pages(
         page_abs = os.path.join( destination, page_rel )
         page_map[ source_path ] = page_rel
 
-        source_lines = build_source_view_lines( source_path, file_entry )
         title = build_source_page_title( display, source_path, env )
-        gutter_width_ch = compute_gutter_width_ch( file_entry )
         index_href = '../{}'.format( index_basename )
         href_path = href_display_path( source_path, env, link_style, display )
         original_href = source_href(
@@ -681,31 +818,53 @@ def write_source_pages(
             link_base,
             href_path,
         )
-        with open( page_abs, 'w', encoding='utf-8' ) as handle:
-            handle.write(
-                template.render(
-                    file_entry=file_entry,
-                    source_path=source_path,
-                    source_path_display=source_path_display,
-                    display_path=display,
-                    source_lines=source_lines,
-                    source_language=language_for_source( source_path ),
-                    gutter_width_ch=gutter_width_ch,
-                    index_href=index_href,
-                    breadcrumbs=source_breadcrumbs(
-                        index_href,
-                        display,
-                        title_split=title.get( 'title_split', False ),
-                        title_prefix=title.get( 'title_prefix', '' ),
-                        title_suffix=title.get( 'title_suffix', '' ),
-                    ),
-                    original_href=original_href,
-                    source_path_display_html=source_path_display_html,
-                    **title,
-                )
-            )
+        context = dict(
+            source_path=source_path,
+            source_path_display=source_path_display,
+            display_path=display,
+            source_language=language_for_source( source_path ),
+            index_href=index_href,
+            breadcrumbs=source_breadcrumbs(
+                index_href,
+                display,
+                title_split=title.get( 'title_split', False ),
+                title_prefix=title.get( 'title_prefix', '' ),
+                title_suffix=title.get( 'title_suffix', '' ),
+            ),
+            original_href=original_href,
+            source_path_display_html=source_path_display_html,
+            **title
+        )
+        digest = source_page_digest( source_path, file_entry, context, template_digest )
+        digests[ page_rel ] = digest
         written.append( page_abs )
+        if previous.get( page_rel ) == digest and os.path.isfile( page_abs ):
+            continue
+        pending.append(
+            {
+                'page_abs': page_abs,
+                'source_path': source_path,
+                'file_entry': file_entry,
+                'context': context,
+                'template_name': template.name,
+            },
+        )
+
+    _render_source_pages( template, pending, jobs )
 
+    # Pages of files that no longer have violations would otherwise linger from older reports.
+    for page_rel in set( previous ) - set( digests ):
+        stale = os.path.join( destination, page_rel )
+        if os.path.dirname( stale ) == output_dir and os.path.isfile( stale ):
+            os.remove( stale )
+    _write_page_digests( output_dir, digests )
+
+    if previous:
+        logger.debug(
+            "Profiles source pages: rendered [{}], unchanged [{}]".format(
+                len( pending ), len( written ) - len( pending ),
+            )
+        )
     return page_map, written
 
 
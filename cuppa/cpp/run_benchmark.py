@@ -0,0 +1,308 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   RunBenchmark
+#-------------------------------------------------------------------------------
+
+"""Run a benchmark program repeatedly and record how long it took and how much memory it used.
+
+Warm-up runs are made first and thrown away. Each measured run records wall, user and system
+time and the peak resident set size of the child (``wait4``; wall time only where that is not
+available). Benchmarks run one at a time even under ``-j`` so they do not disturb each other.
+"""
+
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+
+from SCons.Errors import BuildError
+from SCons.Script import Flatten
+
+from cuppa.colourise import as_emphasised, as_highlighted, as_error, as_notice, as_info
+from cuppa.log import logger
+from cuppa.output_processor import IncrementalSubProcess
+from cuppa.test_report import benchmark_results
+from cuppa.test_report.benchmark_results import BenchmarkStore
+
+
+_exclusive = threading.Lock()
+
+
+def stdout_file_name_from( program_file ):
+    return program_file + '.stdout.log'
+
+
+def stderr_file_name_from( program_file ):
+    return program_file + '.stderr.log'
+
+
+def results_file_name_from( program_file ):
+    return program_file + '.benchmark.json'
+
+
+def html_file_name_from( program_file ):
+    return program_file + '.benchmark.html'
+
+
+def success_file_name_from( program_file ):
+    return program_file + '.success'
+
+
+def _max_rss_bytes( max_rss ):
+    # Linux reports KiB, macOS bytes.
+    if sys.platform == 'darwin':
+        return max_rss
+    return max_rss * 1024
+
+
+def _exit_code( status ):
+    if hasattr( os, 'waitstatus_to_exitcode' ):
+        return os.waitstatus_to_exitcode( status )
+    if os.WIFSIGNALED( status ):
+        return -os.WTERMSIG( status )
+    return os.WEXITSTATUS( status )
+
+
+def run_once( args, cwd=None, env=None, stdout_path=os.devnull, stderr_path=os.devnull ):
+    """Run ``args`` once; returns ``( return_code, sample )``."""
+    with open( stdout_path, 'w' ) as stdout, open( stderr_path, 'w' ) as stderr:
+        started = time.perf_counter()
+        process = subprocess.Popen( args, cwd=cwd, env=env, stdout=stdout, stderr=stderr )
+        if hasattr( os, 'wait4' ):
+            _pid, status, usage = os.wait4( process.pid, 0 )
+            wall_time = time.perf_counter() - started
+            # Reaped here, so tell Popen rather than let it wait again.
+            process.returncode = _exit_code( status )
+            return process.returncode, {
+                'wall_time' : wall_time,
+                'user_time' : usage.ru_utime,
+                'sys_time'  : usage.ru_stime,
+                'max_rss'   : _max_rss_bytes( usage.ru_maxrss ),
+            }
+        return_code = process.wait()
+        return return_code, {
+            'wall_time' : time.perf_counter() - started,
+            'user_time' : None,
+            'sys_time'  : None,
+            'max_rss'   : None,
+        }
+
+
+def current_commit( path ):
+    """The commit ``path`` is checked out at, ``<commit>-dirty`` with local changes, else ``unknown``.
+
+    ``path`` may be anywhere inside the working copy; the SConstruct need not sit at its root.
+    """
+    from cuppa.scms.git import Git
+    try:
+        snapshot = Git.snapshot( Git.working_copy_root( path ), refresh=True )
+    except Exception as error:
+        logger.debug( "No git commit for benchmark results under [{}]: {}".format(
+                as_notice( path ), str(error)
+        ) )
+        return 'unknown'
+    if not snapshot.commit:
+        return 'unknown'
+    return snapshot.modified and snapshot.commit + '-dirty' or snapshot.commit
+
+
+def format_metric( metric, value ):
+    if value is None:
+        return '-'
+    if metric == 'max_rss':
+        return "{:.1f} MiB".format( value / ( 1024.0 * 1024.0 ) )
+    return "{:.6f} s".format( value )
+
+
+class RunBenchmarkEmitter(object):
+
+    def __init__( self, final_dir, target=None, **ignored_kwargs ):
+        self._final_dir = final_dir
+        self._targets = target and Flatten( target ) or None
+
+
+    def __call__( self, target, source, env ):
+        program_file = str(source[0])
+        if not program_file.startswith( self._final_dir ):
+            program_file = os.path.split( program_file )[1]
+        target = []
+        target.append( stdout_file_name_from( program_file ) )
+        target.append( stderr_file_name_from( program_file ) )
+        target.append( results_file_name_from( program_file ) )
+        target.append( html_file_name_from( program_file ) )
+        target.append( success_file_name_from( program_file ) )
+        if self._targets:
+            for t in self._targets:
+                target.append( t )
+        return target, source
+
+
+class RunBenchmark(object):
+
+    def __init__(
+            self,
+            expected,
+            final_dir,
+            command=None,
+            expected_exit_code=None,
+            working_dir=None,
+            inherit_process_env=None,
+            repeats=None,
+            warmup=None,
+            threshold=None,
+            baseline=None,
+            store=None,
+            **ignored_kwargs
+    ):
+        self._expected = expected
+        self._final_dir = final_dir
+        self._command = command
+        self._expected_exit_code = expected_exit_code
+        self._working_dir = working_dir
+        self._inherit_process_env = inherit_process_env
+        self._repeats = max( 1, repeats or benchmark_results.DEFAULT_REPEATS )
+        self._warmup = max( 0, benchmark_results.DEFAULT_WARMUP if warmup is None else warmup )
+        self._threshold = benchmark_results.DEFAULT_THRESHOLD if threshold is None else threshold
+        self._baseline = baseline
+        self._store = store
+
+
+    def __call__( self, target, source, env ):
+
+        executable = str( source[0].abspath )
+        working_dir, name = os.path.split( executable )
+        if self._working_dir:
+            working_dir = self._working_dir
+        program_path = source[0].path
+
+        command = executable
+        args = [ executable ]
+        if self._command:
+            command = self._command
+            args = shlex.split( command )
+            working_dir = self._working_dir and self._working_dir or self._final_dir
+
+        process_env = None
+        if env.get( 'ENV' ) is not None:
+            process_env = IncrementalSubProcess._subprocess_env(
+                    env['ENV'], scons_env=env, inherit_process_env=self._inherit_process_env
+            )
+
+        sys.stdout.write( as_emphasised( "\nBenchmark [{}]...".format( name ) ) + '\n' )
+
+        try:
+            with _exclusive:
+                for _run in range( self._warmup ):
+                    run_once( args, working_dir, process_env )
+                samples = []
+                for _run in range( self._repeats ):
+                    return_code, sample = run_once(
+                            args, working_dir, process_env,
+                            stdout_file_name_from( program_path ),
+                            stderr_file_name_from( program_path )
+                    )
+                    if return_code != 0 and return_code != self._expected_exit_code:
+                        break
+                    samples.append( sample )
+        except OSError as e:
+            logger.error( "Execution of [{}] failed with error: {}".format( as_notice(command), as_notice(str(e)) ) )
+            raise BuildError( e )
+
+        if return_code != 0 and return_code != self._expected_exit_code:
+            self._remove_success_file( success_file_name_from( program_path ) )
+            logger.error( "Benchmark returned with error code: {}".format( as_error(str(return_code)) ) )
+            raise BuildError( node=source[0], errstr="Benchmark returned with error code: {}".format( str(return_code) ) )
+
+        summary = benchmark_results.summarise( samples )
+        tool_variant = env.get( 'tool_variant_dir' ) or 'default'
+        commit = current_commit( env.get( 'sconstruct_dir' ) or working_dir )
+        store = BenchmarkStore( self._store or self.default_store( env ) )
+
+        comparison = {}
+        baseline_summary = None
+        if self._baseline:
+            baseline_summary = store.baseline( tool_variant, program_path, self._baseline, commit=commit )
+            if baseline_summary:
+                comparison = benchmark_results.compare( summary, baseline_summary, self._threshold )
+            else:
+                logger.warn( "No baseline [{}] recorded for benchmark [{}]".format(
+                        as_notice( self._baseline ), as_notice( program_path )
+                ) )
+
+        store.record( tool_variant, commit, program_path, summary )
+
+        result = {
+            'name'        : program_path,
+            'command'     : command,
+            'tool_variant': tool_variant,
+            'commit'      : commit,
+            'repeats'     : self._repeats,
+            'warmup'      : self._warmup,
+            'threshold'   : self._threshold,
+            'baseline'    : self._baseline,
+            'summary'     : summary,
+            'comparison'  : comparison,
+            'regressions' : benchmark_results.regressions( comparison ),
+            'store'       : store.path(),
+        }
+        self._write_results( results_file_name_from( program_path ), result )
+        benchmark_results.render_html( result, html_file_name_from( program_path ) )
+        self._write_summary( result )
+
+        if result['regressions']:
+            self._remove_success_file( success_file_name_from( program_path ) )
+            errstr = "Benchmark regressed against baseline [{}]: {}".format(
+                    self._baseline, ", ".join( result['regressions'] )
+            )
+            logger.error( errstr )
+            raise BuildError( node=source[0], errstr=errstr )
+
+        self._write_success_file( success_file_name_from( program_path ) )
+        return None
+
+
+    @classmethod
+    def default_store( cls, env ):
+        return os.path.join( env.get( 'abs_build_root' ) or env['build_root'], 'benchmarks.json' )
+
+
+    def _write_summary( self, result ):
+        for metric in benchmark_results.METRICS:
+            stats = result['summary'].get( metric )
+            if not stats:
+                continue
+            line = "  {:<10} median {} ± {}".format(
+                    metric, format_metric( metric, stats['median'] ), format_metric( metric, stats['mad'] )
+            )
+            compared = result['comparison'].get( metric )
+            if compared:
+                meaning = compared['regressed'] and 'failed' or 'passed'
+                line += " " + as_highlighted( meaning, " {:+.1f}% ".format( compared['percent'] ) )
+            sys.stdout.write( line + '\n' )
+        sys.stdout.write( "  {} runs after {} warm-up, results in [{}]\n".format(
+                as_info( str(result['repeats']) ), as_info( str(result['warmup']) ), as_notice( result['store'] )
+        ) )
+
+
+    def _write_results( self, file_name, result ):
+        with open( file_name, "w" ) as results_file:
+            json.dump( result, results_file, sort_keys=True, indent=4, separators=(',', ': ') )
+
+
+    def _write_success_file( self, file_name ):
+        with open( file_name, "w" ) as success_file:
+            success_file.write( "success" )
+
+
+    def _remove_success_file( self, file_name ):
+        try:
+            os.remove( file_name )
+        except OSError:
+            pass
@@ -10,6 +10,7 @@
 import os
 import sys
 import shlex
+import subprocess
 import re
 import six
 
@@ -17,9 +18,11 @@ from SCons.Errors import BuildError
 
 import cuppa.timer
 import cuppa.test_report.cuppa_json
+from cuppa.test_report.captured_output import CapturedLines, DEFAULT_HEAD_LINES, DEFAULT_TAIL_LINES
 import cuppa.build_platform
 import cuppa.utility.preprocess
 from cuppa.output_processor import IncrementalSubProcess
+from cuppa.utility import test_pool
 from cuppa.colourise import as_emphasised, as_highlighted, as_colour, start_colour, colour_reset, as_error, as_notice
 from cuppa.log import logger
 
@@ -268,8 +271,10 @@ class State:
 
 class ProcessStdout:
 
-    def __init__( self, log, notify, preprocess ):
+    def __init__( self, log, notify, preprocess, line_limits=None ):
         self.log = open( log, "w" )
+        self.log_path = log
+        self.line_limits = line_limits or ( DEFAULT_HEAD_LINES, DEFAULT_TAIL_LINES )
         self.preprocess = preprocess
         self.notify = notify
         self.state = State.waiting
@@ -286,29 +291,33 @@ class ProcessStdout:
             line.strip() )
 
         if matches and matches.group('suite') != self.master_test_suite:
-            self.suite = matches.group('suite')
-            self.test_suites[self.suite] = {}
+            self._add_test_suite( matches.group('suite') )
+            return True
+        return False
 
-            self.test_suites[self.suite]['name'] = self.suite
 
-            self.test_suites[self.suite]['total_tests']       = 0
-            self.test_suites[self.suite]['expected_failures'] = 0
-            self.test_suites[self.suite]['passed_tests']      = 0
-            self.test_suites[self.suite]['failed_tests']      = 0
-            self.test_suites[self.suite]['skipped_tests']     = []
-            self.test_suites[self.suite]['aborted_tests']     = 0
-            self.test_suites[self.suite]['total_assertions']  = 0
-            self.test_suites[self.suite]['passed_assertions'] = 0
-            self.test_suites[self.suite]['warned_assertions'] = 0
-            self.test_suites[self.suite]['failed_assertions'] = 0
+    def _add_test_suite( self, name ):
+        self.suite = name
+        self.test_suites[self.suite] = {}
 
-            self.test_suites[self.suite]['total_cpu_times']   = cuppa.timer.CpuTimes( 0, 0, 0, 0 )
+        self.test_suites[self.suite]['name'] = self.suite
 
-            self.test_suites[self.suite]['tests'] = []
+        self.test_suites[self.suite]['total_tests']       = 0
+        self.test_suites[self.suite]['expected_failures'] = 0
+        self.test_suites[self.suite]['passed_tests']      = 0
+        self.test_suites[self.suite]['failed_tests']      = 0
+        self.test_suites[self.suite]['skipped_tests']     = []
+        self.test_suites[self.suite]['aborted_tests']     = 0
+        self.test_suites[self.suite]['total_assertions']  = 0
+        self.test_suites[self.suite]['passed_assertions'] = 0
+        self.test_suites[self.suite]['warned_assertions'] = 0
+        self.test_suites[self.suite]['failed_assertions'] = 0
 
-            self.notify.enter_suite(self.suite)
-            return True
-        return False
+        self.test_suites[self.suite]['total_cpu_times']   = cuppa.timer.CpuTimes( 0, 0, 0, 0 )
+
+        self.test_suites[self.suite]['tests'] = []
+
+        self.notify.enter_suite(self.suite)
 
 
     def leaving_test_suite( self, line ):
@@ -356,30 +365,33 @@ class ProcessStdout:
             line.strip() )
 
         if matches:
-            name = matches.group('test')
-
-            self.test_suites[self.suite]['tests'].append( {} )
-            test_case = self.test_suites[self.suite]['tests'][-1]
-
-            test_case['suite']      = self.suite
-            test_case['fixture']    = self.suite
-            test_case['key']        =  '[' + self.suite + '] ' + name
-            test_case['name']       = name
-            test_case['stdout']     = []
-            test_case['total']      = 0
-            test_case['assertions'] = 0
-            test_case['passed']     = 0
-            test_case['warned']     = 0
-            test_case['failed']     = 0
-            test_case['skipped']    = False
-            test_case['aborted']    = 0
-            test_case['line']       = matches.group('line')
-            test_case['file']       = matches.group('file')
-            test_case['_state_']    = 'handle_asserts'
-            self.notify.enter_test_case( test_case )
+            self._add_test_case( matches.group('test'), matches.group('line'), matches.group('file') )
             return True
         return False
 
+
+    def _add_test_case( self, name, line=None, file=None ):
+        self.test_suites[self.suite]['tests'].append( {} )
+        test_case = self.test_suites[self.suite]['tests'][-1]
+
+        test_case['suite']      = self.suite
+        test_case['fixture']    = self.suite
+        test_case['key']        =  '[' + self.suite + '] ' + name
+        test_case['name']       = name
+        test_case['stdout']     = CapturedLines( *self.line_limits, log=self.log_path )
+        test_case['stdout_log'] = self.log_path
+        test_case['total']      = 0
+        test_case['assertions'] = 0
+        test_case['passed']     = 0
+        test_case['warned']     = 0
+        test_case['failed']     = 0
+        test_case['skipped']    = False
+        test_case['aborted']    = 0
+        test_case['line']       = line
+        test_case['file']       = file
+        test_case['_state_']    = 'handle_asserts'
+        self.notify.enter_test_case( test_case )
+
     def leaving_test_case( self, line ):
         test_case = self.test_suites[self.suite]['tests'][-1]
 
@@ -470,8 +482,8 @@ class ProcessStdout:
 
         line = self.preprocess( line )
 
-        if not self.state == State.test_case:
-            self.log.write( line + '\n' )
+        # Every line goes to the log: test case output is only kept in part on the test case.
+        self.log.write( line + '\n' )
 
         if self.state == State.waiting:
             if self.entered_test_suite( line ):
@@ -497,6 +509,29 @@ class ProcessStdout:
                     self.state = State.test_suite
 
 
+    def timed_out( self, name ):
+        """Report the test case running when the test was killed as aborted, with ``timed_out`` set.
+
+        A test killed outside any test case is reported as a test case called ``name``.
+        """
+        if self.state != State.test_case:
+            if self.state == State.waiting:
+                self._add_test_suite( name )
+            self._add_test_case( name )
+        test_case = self.test_suites[self.suite]['tests'][-1]
+
+        test_case['timer'].stop()
+        test_case['cpu_times'] = test_case['timer'].elapsed()
+        test_case['aborted']   = 1
+        test_case['timed_out'] = True
+        self.collate_test_case_results( test_case )
+        test_case['status'] = 'aborted'
+
+        self.test_case_names.append( test_case['key'] )
+        self.notify.exit_test_case( test_case )
+        self.state = State.test_suite
+
+
     def __exit__( self, type, value, traceback ):
         if self.log:
             self.log.close()
@@ -688,14 +723,21 @@ class RunBoostTest:
     def default_preprocess( cls, line ):
         return line
 
-    def __init__( self, expected, final_dir,working_dir=None, inherit_process_env=None, **ignored_kwargs ):
+    def __init__( self, expected, final_dir, working_dir=None, inherit_process_env=None, timeout=None, **ignored_kwargs ):
         self._expected = expected
         self._final_dir = final_dir
         self._working_dir = working_dir
         self._inherit_process_env = inherit_process_env
+        self._timeout = timeout
 
 
     def __call__( self, target, source, env ):
+        previous = test_pool.previous_wall_time( report_file_name_from( source[0].path ) )
+        with test_pool.test_slot( previous ):
+            return self._test( target, source, env )
+
+
+    def _test( self, target, source, env ):
 
         executable   = str( source[0].abspath )
         working_dir  = self._working_dir and self._working_dir or os.path.split( executable )[0]
@@ -730,13 +772,16 @@ class RunBoostTest:
             elif boost_version >= 1.60:
                 test_command = executable + " --{0}log_format=HRF --{0}log_level=all --{0}report_level=no".format( argument_prefix )
 
+        timeout = test_pool.timeout_from( self._timeout, env )
+
         try:
             return_code, tests = self.__run_test( program_path,
                                                   test_command,
                                                   working_dir,
                                                   notifier,
                                                   preprocess,
-                                                  env )
+                                                  env,
+                                                  timeout )
 
             cuppa.test_report.cuppa_json.write_report( report_file_name_from( program_path ), tests )
 
@@ -761,21 +806,39 @@ class RunBoostTest:
 
             return None
 
+        except subprocess.TimeoutExpired:
+            errstr = "Test timed out after {:g} seconds".format( timeout )
+            logger.error( errstr )
+            self._remove_success_file( success_file_name_from( program_path ) )
+            raise BuildError( node=source[0], errstr=errstr )
+
         except OSError as e:
             logger.error( "Execution of [{}] failed with error: {}".format( as_notice(test_command), as_notice(str(e)) ) )
             raise BuildError( e )
 
 
-    def __run_test( self, program_path, test_command, working_dir, notifier, preprocess, env ):
-        process_stdout = ProcessStdout( stdout_file_name_from( program_path ), notifier, preprocess )
+    def __run_test( self, program_path, test_command, working_dir, notifier, preprocess, env, timeout=None ):
+        process_stdout = ProcessStdout(
+                stdout_file_name_from( program_path ),
+                notifier,
+                preprocess,
+                line_limits=env.get( 'test_output_lines' )
+        )
         process_stderr = ProcessStderr( stderr_file_name_from( program_path ), notifier, preprocess )
 
-        return_code = IncrementalSubProcess.Popen2( process_stdout,
-                                                    process_stderr,
-                                                    shlex.split( test_command ),
-                                                    cwd=working_dir,
-                                                    scons_env=env,
-                                                    inherit_process_env=self._inherit_process_env )
+        try:
+            return_code = IncrementalSubProcess.Popen2( process_stdout,
+                                                        process_stderr,
+                                                        shlex.split( test_command ),
+                                                        cwd=working_dir,
+                                                        scons_env=env,
+                                                        inherit_process_env=self._inherit_process_env,
+                                                        timeout=timeout )
+        except subprocess.TimeoutExpired:
+            # Keep whatever the test cases that did finish reported, and the one that was killed.
+            process_stdout.timed_out( os.path.basename( program_path ) )
+            cuppa.test_report.cuppa_json.write_report( report_file_name_from( program_path ), process_stdout.tests() )
+            raise
 
         return return_code, process_stdout.tests()
 
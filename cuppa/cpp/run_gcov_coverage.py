@@ -19,6 +19,8 @@ import glob
 import sys
 import six
 import collections
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from jinja2 import Environment, PackageLoader, select_autoescape
 
@@ -30,6 +32,7 @@ from cuppa.colourise import as_notice, as_info, as_error, as_warning, colour_ite
 from cuppa.log import logger
 from cuppa.progress import NotifyProgress
 from cuppa.utility.python2to3 import as_str
+from cuppa.utility import test_pool
 import cuppa.recursive_glob
 import cuppa.path
 
@@ -86,10 +89,12 @@ class WriteToString(object):
 
 def run_command( command, working_dir, env ):
     process_output = WriteToString()
-    return_code = IncrementalSubProcess.Popen( process_output,
-                                               shlex.split( command ),
-                                               cwd=working_dir,
-                                               scons_env=env )
+    # gcov and gcovr run inside SCons actions, outside the build's SPAWN; hold them to its -j.
+    with test_pool.build_slot():
+        return_code = IncrementalSubProcess.Popen( process_output,
+                                                   shlex.split( command ),
+                                                   cwd=working_dir,
+                                                   scons_env=env )
     return return_code, process_output.string()
 
 
@@ -316,6 +321,34 @@ def iter_grouped( items, step=2, fillvalue=None ):
     return zip_longest( *[it]*step, fillvalue=fillvalue )
 
 
+# SCons may run -j coverage actions at once, each with its own pool; every gcov process takes one
+# of these shared slots so at most job_count of them run across all of the actions together.
+_gcov_slots = {}
+_gcov_slots_lock = threading.Lock()
+
+
+def gcov_output_files( source_path ):
+    """The ``.gcov`` files ``gcov -l -p`` writes for ``source_path``.
+
+    That is ``<source>.gcov`` and ``<source>##<included>.gcov``, with path separators mangled
+    to ``#``. The names are matched exactly so ``foo.c`` never collects the ``foo.cpp##...gcov``
+    files of another source.
+    """
+    mangled = source_path.replace( os.path.sep, '#' )
+    gcov_files = sorted( glob.glob( glob.escape( mangled ) + '##*.gcov' ) )
+    if os.path.exists( mangled + '.gcov' ):
+        gcov_files.insert( 0, mangled + '.gcov' )
+    return gcov_files
+
+
+def _shared_gcov_slots( job_count ):
+    with _gcov_slots_lock:
+        slots = _gcov_slots.get( job_count )
+        if slots is None:
+            slots = _gcov_slots[ job_count ] = threading.BoundedSemaphore( job_count )
+        return slots
+
+
 class RunGcovCoverage(object):
 
     def __init__( self, program, final_dir, coverage_tool, include_patterns=[], exclude_patterns=[] ):
@@ -339,17 +372,61 @@ class RunGcovCoverage(object):
 
         # Each source will result in one or more targets so we need to slice the targets to pick up
         # the gcov target (the first one) before we perform the zip iteration
+        gcov_jobs = []
         for s, t in zip( source, itertools.islice( target, 0, None, len(target)//len(source) ) ):
 
             gcov_path = os.path.splitext( os.path.splitext( t.path )[0] )[0]
             gcov_log = t.path
             logger.trace( "gcov_path = [{}]".format( as_notice( str(gcov_path) ) ) )
-            self._run_gcov( env, s.path, gcov_path, gcov_log )
+            gcov_jobs.append( ( s.path, gcov_path, gcov_log ) )
+
+        # gcov is run with -l -p so every .gcov file it writes is named after its own mangled
+        # source path, and each run collects exactly those names (see gcov_output_files), so
+        # concurrent runs in the shared working directory never move each other's files.
+        slots = _shared_gcov_slots( self._job_count( env ) )
+
+        def run_gcov( job ):
+            with slots:
+                return self._run_gcov( env, *job )
+
+        workers = self._gcov_workers( env, len(gcov_jobs) )
+        if workers > 1:
+            with ThreadPoolExecutor( max_workers=workers ) as executor:
+                succeeded = list( executor.map( run_gcov, gcov_jobs ) )
+        else:
+            succeeded = [ run_gcov( job ) for job in gcov_jobs ]
+
+        # gcovr reads every .gcov file for the program, so one run after all sources have been
+        # processed produces the same report as re-running it after each source.
+        if any( succeeded ):
+            self._coverage_suite( env ).run_suite( self._target )
 
         target = self._target
 
         return None
 
+
+    @classmethod
+    def _job_count( cls, env ):
+        try:
+            return max( 1, int( env.get( 'job_count' ) or 1 ) )
+        except ( TypeError, ValueError ):
+            return 1
+
+
+    @classmethod
+    def _gcov_workers( cls, env, job_count ):
+        return max( 1, min( cls._job_count( env ), job_count ) )
+
+
+    def _coverage_suite( self, env ):
+        final_dir = self._final_dir
+        if not os.path.isabs( self._final_dir ):
+            final_dir = os.path.normpath( os.path.join( env['build_dir'], self._final_dir ) )
+
+        suite_name = env['working_dir'] + self._program_id
+        return CoverageSuite.create( self._program_id, suite_name, env, final_dir, include_patterns=self._include_patterns, exclude_patterns=self._exclude_patterns )
+
     # Example gcov commands
     # gcov-8 -o _build/include/xstd/property_tree/properties_parser/gcc82/cov/x86_64/c++2a/working/properties_parser_test -l -p -r -c -b include/xstd/property_tree/properties_parser_test.cpp
     # gcov-8 -o _build/include/xstd/application/main_test/gcc82/cov/x86_64/c++2a/working/main_test -l -p -r -c -b _build/include/xstd/application/main_test/gcc82/cov/x86_64/c++2a/working/main_test.o
@@ -357,7 +434,6 @@ class RunGcovCoverage(object):
     def _run_gcov( self, env, source_path, gcov_path, gcov_log_path ):
         working_dir       = env['working_dir']
         build_dir         = env['build_dir']
-        final_dir         = self._final_dir
 
         qualified_base = source_path.startswith( env['build_dir'] ) and env['build_dir'] or env['offset_dir']
         if qualified_base.startswith( "./" ):
@@ -366,12 +442,6 @@ class RunGcovCoverage(object):
 
         logger.trace( "Qualified base = [{}]".format( as_notice(str(qualified_base)) ) )
 
-        if not os.path.isabs( self._final_dir ):
-            final_dir = os.path.normpath( os.path.join( build_dir, self._final_dir ) )
-
-        suite_name = working_dir + self._program_id
-        coverage_suite = CoverageSuite.create( self._program_id, suite_name, env, final_dir, include_patterns=self._include_patterns, exclude_patterns=self._exclude_patterns )
-
         relative_only = "-r"
         if self._coverage_tool.startswith( "llvm-cov" ):
             relative_only = ""
@@ -381,10 +451,7 @@ class RunGcovCoverage(object):
         return_code, output = run_command( command, working_dir, env )
 
         if return_code == 0:
-            gcov_source_path = source_path.replace( os.path.sep, '#' )
-            gcov_files = glob.glob( gcov_source_path + '*gcov' )
-
-            for gcov_file in gcov_files:
+            for gcov_file in gcov_output_files( source_path ):
 
                 filename, ext = os.path.splitext( str(gcov_file) )
                 filename = filename + self._program_id + ext
@@ -404,11 +471,11 @@ class RunGcovCoverage(object):
 
             with open( gcov_log_path, 'w', encoding='utf-8' ) as summary_file:
                 summary_file.write( output )
-
-                coverage_suite.run_suite( self._target )
+            return True
         else:
             sys.stdout.write( output + "\n" )
             os.remove( gcov_log_path )
+            return False
 
 
 def destination_subdir( env ):
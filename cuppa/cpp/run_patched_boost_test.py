@@ -11,6 +11,7 @@
 import os
 import sys
 import shlex
+import subprocess
 import re
 import six
 
@@ -18,9 +19,11 @@ from SCons.Errors import BuildError
 
 import cuppa.timer
 import cuppa.test_report.cuppa_json
+from cuppa.test_report.captured_output import CapturedLines, DEFAULT_HEAD_LINES, DEFAULT_TAIL_LINES
 import cuppa.build_platform
 import cuppa.utility.preprocess
 from cuppa.output_processor import IncrementalSubProcess
+from cuppa.utility import test_pool
 from cuppa.colourise import as_emphasised, as_highlighted, as_colour, emphasise_time_by_digit, start_colour, colour_reset, as_notice
 from cuppa.log import logger
 
@@ -280,8 +283,10 @@ class State:
 
 class ProcessStdout:
 
-    def __init__( self, log, branch_root, notify, preprocess ):
+    def __init__( self, log, branch_root, notify, preprocess, line_limits=None ):
         self._log = open( log, "w" )
+        self._log_path = log
+        self._line_limits = line_limits or ( DEFAULT_HEAD_LINES, DEFAULT_TAIL_LINES )
         self._branch_root = branch_root
         self._notify = notify
         self._preprocess = preprocess
@@ -298,34 +303,38 @@ class ProcessStdout:
             line.strip() )
 
         if matches and matches.group('suite') != self._master_test_suite:
-            self.suite = matches.group('suite')
-            self._test_suites[self.suite] = {}
-
-            self._test_suites[self.suite]['name'] = self.suite
-
-            self._test_suites[self.suite]['total_tests']       = 0
-            self._test_suites[self.suite]['expected_failures'] = 0
-            self._test_suites[self.suite]['passed_tests']      = 0
-            self._test_suites[self.suite]['failed_tests']      = 0
-            self._test_suites[self.suite]['skipped_tests']     = 0
-            self._test_suites[self.suite]['aborted_tests']     = 0
-            self._test_suites[self.suite]['total_assertions']  = 0
-            self._test_suites[self.suite]['passed_assertions'] = 0
-            self._test_suites[self.suite]['warned_assertions'] = 0
-            self._test_suites[self.suite]['failed_assertions'] = 0
-
-            self._test_suites[self.suite]['cpu_time']          = 0
-            self._test_suites[self.suite]['wall_time']         = 0
-            self._test_suites[self.suite]['user_time']         = 0
-            self._test_suites[self.suite]['sys_time']          = 0
-
-            self._test_suites[self.suite]['tests'] = []
-
-            self._notify.enter_suite(self.suite)
+            self._add_test_suite( matches.group('suite') )
             return True
         return False
 
 
+    def _add_test_suite( self, name ):
+        self.suite = name
+        self._test_suites[self.suite] = {}
+
+        self._test_suites[self.suite]['name'] = self.suite
+
+        self._test_suites[self.suite]['total_tests']       = 0
+        self._test_suites[self.suite]['expected_failures'] = 0
+        self._test_suites[self.suite]['passed_tests']      = 0
+        self._test_suites[self.suite]['failed_tests']      = 0
+        self._test_suites[self.suite]['skipped_tests']     = 0
+        self._test_suites[self.suite]['aborted_tests']     = 0
+        self._test_suites[self.suite]['total_assertions']  = 0
+        self._test_suites[self.suite]['passed_assertions'] = 0
+        self._test_suites[self.suite]['warned_assertions'] = 0
+        self._test_suites[self.suite]['failed_assertions'] = 0
+
+        self._test_suites[self.suite]['cpu_time']          = 0
+        self._test_suites[self.suite]['wall_time']         = 0
+        self._test_suites[self.suite]['user_time']         = 0
+        self._test_suites[self.suite]['sys_time']          = 0
+
+        self._test_suites[self.suite]['tests'] = []
+
+        self._notify.enter_suite(self.suite)
+
+
     def leaving_test_suite( self, line ):
 
         matches = re.match(
@@ -372,33 +381,36 @@ class ProcessStdout:
             line.strip() )
 
         if matches:
-            name = matches.group('test')
-
-            self._test_suites[self.suite]['tests'].append( {} )
-            test_case = self._test_suites[self.suite]['tests'][-1]
-
-            test_case['suite']      = self.suite
-            test_case['fixture']    = self.suite
-            test_case['key']        =  '[' + self.suite + '] ' + name
-            test_case['name']       = name
-            test_case['stdout']     = []
-            test_case['total']      = 0
-            test_case['assertions'] = 0
-            test_case['passed']     = 0
-            test_case['warned']     = 0
-            test_case['failed']     = 0
-            test_case['skipped']    = False
-            test_case['aborted']    = 0
-            test_case['line']       = matches.group('line')
-            test_case['file']       = matches.group('file')
-            test_case['cpu_time']   = 0
-            test_case['branch_dir'] = os.path.relpath( matches.group('file'), self._branch_root )
-
-            self._notify.enter_test( test_case )
+            self._add_test_case( matches.group('test'), matches.group('line'), matches.group('file') )
             return True
         return False
 
 
+    def _add_test_case( self, name, line=None, file=None ):
+        self._test_suites[self.suite]['tests'].append( {} )
+        test_case = self._test_suites[self.suite]['tests'][-1]
+
+        test_case['suite']      = self.suite
+        test_case['fixture']    = self.suite
+        test_case['key']        =  '[' + self.suite + '] ' + name
+        test_case['name']       = name
+        test_case['stdout']     = CapturedLines( *self._line_limits, log=self._log_path )
+        test_case['stdout_log'] = self._log_path
+        test_case['total']      = 0
+        test_case['assertions'] = 0
+        test_case['passed']     = 0
+        test_case['warned']     = 0
+        test_case['failed']     = 0
+        test_case['skipped']    = False
+        test_case['aborted']    = 0
+        test_case['line']       = line
+        test_case['file']       = file
+        test_case['cpu_time']   = 0
+        test_case['branch_dir'] = file and os.path.relpath( file, self._branch_root )
+
+        self._notify.enter_test( test_case )
+
+
     def leaving_test_case( self, line ):
         test_case = self._test_suites[self.suite]['tests'][-1]
 
@@ -542,6 +554,27 @@ class ProcessStdout:
                     self._state = State.test_suite
 
 
+    def timed_out( self, name ):
+        """Report the test case running when the test was killed as aborted, with ``timed_out`` set.
+
+        A test killed outside any test case is reported as a test case called ``name``.
+        """
+        if self._state != State.test_case:
+            if self._state == State.waiting:
+                self._add_test_suite( name )
+            self._add_test_case( name )
+        test_case = self._test_suites[self.suite]['tests'][-1]
+
+        test_case['aborted']   = 1
+        test_case['timed_out'] = True
+        self.collate_test_case_results( test_case )
+        test_case['status'] = 'aborted'
+
+        self._test_case_names.append( test_case['key'] )
+        self._notify.exit_test( test_case )
+        self._state = State.test_suite
+
+
     def __exit__( self, type, value, traceback ):
         if self._log:
             self._log.close()
@@ -712,6 +745,10 @@ def success_file_name_from( program_file ):
 
 
 
+# Patched Boost.Test reports times in nanoseconds.
+NANOSECONDS = 1e-9
+
+
 class RunPatchedBoostTestEmitter:
 
     def __init__( self, final_dir, **ignored_kwargs ):
@@ -739,14 +776,23 @@ class RunPatchedBoostTest:
         return line
 
 
-    def __init__( self, expected, final_dir, working_dir=None, inherit_process_env=None, **ignored_kwargs ):
+    def __init__( self, expected, final_dir, working_dir=None, inherit_process_env=None, timeout=None, **ignored_kwargs ):
         self._expected = expected
         self._final_dir = final_dir
         self._working_dir = working_dir
         self._inherit_process_env = inherit_process_env
+        self._timeout = timeout
 
 
     def __call__( self, target, source, env ):
+        previous = test_pool.previous_wall_time(
+                report_file_name_from( source[0].path ), scale=NANOSECONDS
+        )
+        with test_pool.test_slot( previous ):
+            return self._test( target, source, env )
+
+
+    def _test( self, target, source, env ):
 
         executable   = str( source[0].abspath )
         working_dir  = self._working_dir and self._working_dir or os.path.split( executable )[0]
@@ -781,6 +827,8 @@ class RunPatchedBoostTest:
             elif boost_version >= 1.60:
                 test_command = executable + " --{0}log_format=HRF --{0}log_level=test_suite --{0}report_level=no".format( argument_prefix )
 
+        timeout = test_pool.timeout_from( self._timeout, env )
+
         try:
             return_code, tests = self._run_test(
                     program_path,
@@ -789,7 +837,8 @@ class RunPatchedBoostTest:
                     env['branch_root'],
                     notifier,
                     preprocess,
-                    env
+                    env,
+                    timeout
             )
 
             cuppa.test_report.cuppa_json.write_report( report_file_name_from( program_path ), tests )
@@ -815,21 +864,40 @@ class RunPatchedBoostTest:
 
             return None
 
+        except subprocess.TimeoutExpired:
+            errstr = "Test timed out after {:g} seconds".format( timeout )
+            logger.error( errstr )
+            self._remove_success_file( success_file_name_from( program_path ) )
+            raise BuildError( node=source[0], errstr=errstr )
+
         except OSError as e:
             logger.error( "Execution of [{}] failed with error: {}".format( as_notice(test_command), as_notice(str(e)) ) )
             raise BuildError( e )
 
 
-    def _run_test( self, program_path, test_command, working_dir, branch_root, notifier, preprocess, env ):
-        process_stdout = ProcessStdout( stdout_file_name_from( program_path ), branch_root, notifier, preprocess )
+    def _run_test( self, program_path, test_command, working_dir, branch_root, notifier, preprocess, env, timeout=None ):
+        process_stdout = ProcessStdout(
+                stdout_file_name_from( program_path ),
+                branch_root,
+                notifier,
+                preprocess,
+                line_limits=env.get( 'test_output_lines' )
+        )
         process_stderr = ProcessStderr( stderr_file_name_from( program_path ), notifier, preprocess )
 
-        return_code = IncrementalSubProcess.Popen2( process_stdout,
-                                                    process_stderr,
-                                                    shlex.split( test_command ),
-                                                    cwd=working_dir,
-                                                    scons_env=env,
-                                                    inherit_process_env=self._inherit_process_env )
+        try:
+            return_code = IncrementalSubProcess.Popen2( process_stdout,
+                                                        process_stderr,
+                                                        shlex.split( test_command ),
+                                                        cwd=working_dir,
+                                                        scons_env=env,
+                                                        inherit_process_env=self._inherit_process_env,
+                                                        timeout=timeout )
+        except subprocess.TimeoutExpired:
+            # Keep whatever the test cases that did finish reported, and the one that was killed.
+            process_stdout.timed_out( os.path.basename( program_path ) )
+            cuppa.test_report.cuppa_json.write_report( report_file_name_from( program_path ), process_stdout.tests() )
+            raise
 
         return return_code, process_stdout.tests()
 
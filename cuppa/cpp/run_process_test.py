@@ -11,6 +11,7 @@
 import os
 import sys
 import shlex
+import subprocess
 
 from SCons.Errors import BuildError
 from SCons.Script import Flatten
@@ -18,7 +19,9 @@ from SCons.Script import Flatten
 import cuppa.timer
 import cuppa.progress
 import cuppa.test_report.cuppa_json
+from cuppa.test_report.captured_output import CapturedLines, DEFAULT_HEAD_LINES, DEFAULT_TAIL_LINES
 from cuppa.output_processor import IncrementalSubProcess
+from cuppa.utility import test_pool
 from cuppa.colourise import as_emphasised, as_highlighted, as_colour, as_error, as_notice
 from cuppa.log import logger
 
@@ -311,12 +314,20 @@ class RunProcessTestEmitter(object):
         return target, source
 
 
+def capture_lines( test_case, stream, log, line_limits ):
+    """Replace ``test_case[stream]`` with a bounded capture that refers to ``log``."""
+    head, tail = line_limits or ( DEFAULT_HEAD_LINES, DEFAULT_TAIL_LINES )
+    test_case[stream] = CapturedLines( head, tail, log=log )
+    test_case[stream + '_log'] = log
+
+
 class ProcessStdout(object):
 
-    def __init__( self, test_case, show_test_output, log ):
+    def __init__( self, test_case, show_test_output, log, line_limits=None ):
         self._test_case = test_case
         self._show_test_output = show_test_output
         self.log = open( log, "w" )
+        capture_lines( test_case, 'stdout', log, line_limits )
 
 
     def __call__( self, line ):
@@ -333,10 +344,11 @@ class ProcessStdout(object):
 
 class ProcessStderr(object):
 
-    def __init__( self, test_case, show_test_output, log ):
+    def __init__( self, test_case, show_test_output, log, line_limits=None ):
         self._test_case = test_case
         self._show_test_output = show_test_output
         self.log = open( log, "w" )
+        capture_lines( test_case, 'stderr', log, line_limits )
 
 
     def __call__( self, line ):
@@ -353,16 +365,23 @@ class ProcessStderr(object):
 
 class RunProcessTest(object):
 
-    def __init__( self, expected, final_dir, command=None, expected_exit_code=None, working_dir=None, inherit_process_env=None, **ignored_kwargs ):
+    def __init__( self, expected, final_dir, command=None, expected_exit_code=None, working_dir=None, inherit_process_env=None, timeout=None, **ignored_kwargs ):
         self._expected = expected
         self._final_dir = final_dir
         self._command = command
         self._expected_exit_code = expected_exit_code
         self._working_dir = working_dir
         self._inherit_process_env = inherit_process_env
+        self._timeout = timeout
 
 
     def __call__( self, target, source, env ):
+        previous = test_pool.previous_wall_time( report_file_name_from( source[0].path ) )
+        with test_pool.test_slot( previous ):
+            return self._test( target, source, env )
+
+
+    def _test( self, target, source, env ):
 
         executable = str( source[0].abspath )
         working_dir, test = os.path.split( executable )
@@ -385,6 +404,7 @@ class RunProcessTest(object):
         test_case = test_suite.enter_test( test, expected=self._expected )
 
         show_test_output = env['show_test_output']
+        timeout = test_pool.timeout_from( self._timeout, env )
 
         try:
             return_code = self._run_test(
@@ -393,7 +413,8 @@ class RunProcessTest(object):
                     program_path,
                     test_command,
                     working_dir,
-                    env
+                    env,
+                    timeout
             )
 
             if return_code == self._expected_exit_code:
@@ -424,6 +445,15 @@ class RunProcessTest(object):
 
             return None
 
+        except subprocess.TimeoutExpired:
+            errstr = "Test timed out after {:g} seconds".format( timeout )
+            logger.error( errstr )
+            test_case['timed_out'] = True
+            test_suite.exit_test( test_case, 'aborted' )
+            cuppa.test_report.cuppa_json.write_report( report_file_name_from( program_path ), test_suite.tests() )
+            self._remove_success_file( success_file_name_from( program_path ) )
+            raise BuildError( node=source[0], errstr=errstr )
+
         except OSError as e:
             logger.error( "Execution of [{}] failed with error: {}".format( as_notice(test_command), as_notice(str(e)) ) )
             test_suite.exit_test( test_case, 'aborted' )
@@ -442,16 +472,18 @@ class RunProcessTest(object):
             pass
 
 
-    def _run_test( self, test_case, show_test_output, program_path, test_command, working_dir, env ):
-        process_stdout = ProcessStdout( test_case, show_test_output, stdout_file_name_from( program_path ) )
-        process_stderr = ProcessStderr( test_case, show_test_output, stderr_file_name_from( program_path ) )
+    def _run_test( self, test_case, show_test_output, program_path, test_command, working_dir, env, timeout=None ):
+        line_limits = env.get( 'test_output_lines' )
+        process_stdout = ProcessStdout( test_case, show_test_output, stdout_file_name_from( program_path ), line_limits )
+        process_stderr = ProcessStderr( test_case, show_test_output, stderr_file_name_from( program_path ), line_limits )
 
         return_code = IncrementalSubProcess.Popen2( process_stdout,
                                                     process_stderr,
                                                     shlex.split( test_command ),
                                                     cwd=working_dir,
                                                     scons_env=env,
-                                                    inherit_process_env=self._inherit_process_env)
+                                                    inherit_process_env=self._inherit_process_env,
+                                                    timeout=timeout)
         return return_code
 
 
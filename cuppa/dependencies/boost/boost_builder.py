@@ -19,12 +19,14 @@ import cuppa.build_platform
 from cuppa.output_processor import IncrementalSubProcess
 from cuppa.colourise        import as_info, as_notice, colour_items
 from cuppa.log              import logger
+from cuppa.utility          import test_pool
 
 # Boost Imports
 from cuppa.dependencies.boost.b2                   import B2OutputProcessor, BuildB2, b2_exe, b2_command
 from cuppa.dependencies.boost.configjam            import WriteToolsetConfigJam
 from cuppa.dependencies.boost.library_naming       import stage_directory, variant_name, static_library_name, shared_library_name, extract_library_name_from_path
 from cuppa.dependencies.boost.library_dependencies import add_dependent_libraries
+from cuppa.dependencies.boost.stage_cache          import BoostStageCache, log_restored, stage_cache_root, stage_inputs, stage_key
 
 
 _prebuilt_boost_libraries = { 'action': {}, 'emitter': {}, 'builder': {} }
@@ -173,12 +175,27 @@ class BoostLibraryAction(object):
         self._parallel       = env['parallel']
         self._threading      = True
 
+        # A source tree that may change between builds cannot be shared by version.
+        cache_root = not env.get_option( 'boost-build-always' ) and stage_cache_root( env )
+        self._stage_cache  = cache_root and BoostStageCache( cache_root ) or None
+        self._stage_inputs = self._stage_cache and stage_inputs(
+                env, boost, self._toolchain, self._variant, self._target_arch, linktype
+        ) or None
+        self._stage_key    = self._stage_inputs and stage_key( self._stage_inputs ) or None
+
 
     def __call__( self, target, source, env ):
 
         if not self._libraries:
             return None
 
+        libraries = [ str(t) for t in target ]
+        if self._stage_cache:
+            if self._stage_cache.restore( self._stage_key, libraries ):
+                log_restored( self._stage_key, self._stage_dir, libraries )
+                return None
+            self._stage_cache.detach( os.path.dirname( library ) for library in libraries )
+
         args = b2_command(
                     env,
                     self._boost_version,
@@ -198,11 +215,13 @@ class BoostLibraryAction(object):
 
         processor = B2OutputProcessor( env, self._verbose_build, self._verbose_config, self._toolchain )
 
-        returncode = IncrementalSubProcess.Popen(
-                processor,
-                args,
-                cwd=self._location
-        )
+        # b2 is a build command like any compile, so it counts against the build's -j.
+        with test_pool.build_slot():
+            returncode = IncrementalSubProcess.Popen(
+                    processor,
+                    args,
+                    cwd=self._location
+            )
 
         summary = processor.summary( returncode )
 
@@ -212,6 +231,9 @@ class BoostLibraryAction(object):
         if returncode:
             return returncode
 
+        if self._stage_cache:
+            self._stage_cache.store( self._stage_key, libraries, self._stage_inputs )
+
         return None
 
 
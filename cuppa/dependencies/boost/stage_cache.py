@@ -0,0 +1,232 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   Boost Stage Cache
+#-------------------------------------------------------------------------------
+
+"""Share staged Boost libraries between checkouts, worktrees and CI jobs on one machine.
+
+With ``--boost-stage-cache=DIR`` the libraries ``b2`` stages for a build are copied into
+``DIR/<key[:2]>/<key>/``, where the key is a digest of the Boost version (and revisions), the
+toolchain identity, variant, target architecture, linktype and ``defines()``. A later build
+with the same key - in any workspace - hard-links (or copies, across file systems) the
+libraries into its stage directory instead of running ``b2``.
+
+Every file is written to a temporary name in the entry and renamed into place, so any number
+of builds can fill the same entry at once: a reader only ever sees complete libraries, and two
+writers of the same key write the same thing. Before ``b2`` runs into a stage directory that
+holds hard links into the cache, the links are replaced by copies so ``b2`` cannot rewrite a
+cached library in place.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from cuppa.colourise import as_info, as_notice, as_warning
+from cuppa.log import logger
+
+
+FORMAT = 1
+
+MANIFEST = 'manifest.json'
+
+
+def stage_cache_root( env ):
+    """The ``--boost-stage-cache`` directory as an absolute path, or ``None`` when not set."""
+    root = env.get_option( 'boost-stage-cache' )
+    if not root:
+        return None
+    return os.path.abspath( os.path.expanduser( str( root ) ) )
+
+
+def stage_inputs( env, boost, toolchain, variant, target_arch, linktype ):
+    """Everything that decides what ``b2`` stages for one stage directory."""
+    from cuppa.dependencies.boost.library_naming import toolset_from_toolchain
+    target_store = getattr( toolchain, 'target_store', None )
+    return {
+        'format'      : FORMAT,
+        'boost'       : boost.full_version(),
+        'revisions'   : [ str( revision ) for revision in ( boost.revisions() or [] ) ],
+        'patched_test': bool( boost.patched_test() ),
+        'toolchain'   : {
+            'name'        : toolchain.name(),
+            'toolset'     : toolset_from_toolchain( toolchain ),
+            'version'     : str( toolchain.version() ),
+            'binary'      : str( toolchain.binary() ),
+            'abi_flag'    : toolchain.abi_flag( env ) or '',
+            'stdlib_flag' : toolchain.stdlib_flag( env ) or '',
+            'target_store': toolchain.family() == 'cl' and target_store and target_store() or '',
+        },
+        'variant'     : variant,
+        'target_arch' : target_arch,
+        'linktype'    : linktype,
+        'defines'     : list( boost.defines() ),
+    }
+
+
+def stage_key( inputs ):
+    text = json.dumps( inputs, sort_keys=True, default=str )
+    return hashlib.sha256( text.encode( 'utf-8' ) ).hexdigest()
+
+
+def _replace_with( target, fill ):
+    """Create ``target`` atomically: ``fill( temporary_path )`` then rename it into place."""
+    directory = os.path.dirname( target ) or '.'
+    handle, temporary = tempfile.mkstemp( prefix='.' + os.path.basename( target ) + '-', dir=directory )
+    os.close( handle )
+    try:
+        os.remove( temporary )
+        fill( temporary )
+        os.replace( temporary, target )
+    finally:
+        if os.path.lexists( temporary ):
+            os.remove( temporary )
+
+
+def _link_or_copy( source, destination ):
+    try:
+        os.link( source, destination )
+    except OSError:
+        shutil.copy2( source, destination )
+
+
+class BoostStageCache(object):
+
+    def __init__( self, root ):
+        self._root = root
+
+
+    def root( self ):
+        return self._root
+
+
+    def entry_path( self, key ):
+        return os.path.join( self._root, key[:2], key )
+
+
+    def restore( self, key, targets ):
+        """Link the cached libraries over ``targets``; ``False`` unless every one is cached."""
+        entry = self.entry_path( key )
+        sources = [ os.path.join( entry, os.path.basename( target ) ) for target in targets ]
+        if not targets or not all( os.path.isfile( source ) for source in sources ):
+            return False
+        try:
+            for source, target in zip( sources, targets ):
+                directory = os.path.dirname( target )
+                if directory:
+                    os.makedirs( directory, exist_ok=True )
+                _replace_with( target, lambda temporary, source=source: _link_or_copy( source, temporary ) )
+        except OSError as error:
+            logger.warn( "Could not restore Boost libraries from [{}]: {}".format(
+                    as_notice( entry ), as_warning( str(error) )
+            ) )
+            return False
+        try:
+            # Record the use so listings can show how recently an entry was needed.
+            os.utime( os.path.join( entry, MANIFEST ) )
+        except OSError:
+            pass
+        return True
+
+
+    def store( self, key, targets, inputs ):
+        """Copy the ``targets`` that exist into the entry for ``key``, alongside its manifest."""
+        entry = self.entry_path( key )
+        try:
+            os.makedirs( entry, exist_ok=True )
+            for target in targets:
+                if not os.path.isfile( target ):
+                    continue
+                cached = os.path.join( entry, os.path.basename( target ) )
+                if os.path.isfile( cached ):
+                    continue
+                _replace_with( cached, lambda temporary, target=target: shutil.copy2( target, temporary ) )
+            libraries = sorted( name for name in os.listdir( entry ) if not name.startswith( '.' ) and name != MANIFEST )
+            manifest = { 'key': key, 'inputs': inputs, 'libraries': libraries }
+
+            def write_manifest( temporary ):
+                with open( temporary, 'w', encoding='utf-8' ) as output:
+                    json.dump( manifest, output, indent=2, sort_keys=True )
+
+            _replace_with( os.path.join( entry, MANIFEST ), write_manifest )
+        except OSError as error:
+            logger.warn( "Could not store Boost libraries in [{}]: {}".format(
+                    as_notice( self._root ), as_warning( str(error) )
+            ) )
+
+
+    @classmethod
+    def detach( cls, directories ):
+        """Replace hard-linked files under ``directories`` by copies before ``b2`` writes there."""
+        for directory in set( directories ):
+            if not os.path.isdir( directory ):
+                continue
+            for name in os.listdir( directory ):
+                path = os.path.join( directory, name )
+                if os.path.islink( path ) or not os.path.isfile( path ) or os.stat( path ).st_nlink < 2:
+                    continue
+                _replace_with( path, lambda temporary, path=path: shutil.copy2( path, temporary ) )
+
+
+    def entries( self ):
+        """One summary per cached stage directory, most recently used first."""
+        entries = []
+        if not os.path.isdir( self._root ):
+            return entries
+        for prefix in sorted( os.listdir( self._root ) ):
+            prefix_dir = os.path.join( self._root, prefix )
+            if not os.path.isdir( prefix_dir ):
+                continue
+            for key in sorted( os.listdir( prefix_dir ) ):
+                entry = os.path.join( prefix_dir, key )
+                manifest_path = os.path.join( entry, MANIFEST )
+                try:
+                    with open( manifest_path, encoding='utf-8' ) as handle:
+                        manifest = json.load( handle )
+                    last_used = os.path.getmtime( manifest_path )
+                except ( OSError, ValueError ):
+                    continue
+                inputs = manifest.get( 'inputs' ) or {}
+                toolchain = inputs.get( 'toolchain' ) or {}
+                libraries = manifest.get( 'libraries' ) or []
+                size = 0
+                for library in libraries:
+                    try:
+                        size += os.path.getsize( os.path.join( entry, library ) )
+                    except OSError:
+                        pass
+                entries.append( {
+                    'key'        : key,
+                    'path'       : entry,
+                    'boost'      : inputs.get( 'boost' ),
+                    'toolchain'  : toolchain.get( 'name' ),
+                    'variant'    : inputs.get( 'variant' ),
+                    'target_arch': inputs.get( 'target_arch' ),
+                    'linktype'   : inputs.get( 'linktype' ),
+                    'libraries'  : libraries,
+                    'size_bytes' : size,
+                    'last_used'  : last_used,
+                } )
+        entries.sort( key=lambda entry: entry['last_used'], reverse=True )
+        return entries
+
+
+def describe( entry ):
+    return "boost {} {} {} {} {}".format(
+            entry.get( 'boost' ), entry.get( 'toolchain' ), entry.get( 'variant' ),
+            entry.get( 'target_arch' ), entry.get( 'linktype' )
+    )
+
+
+def log_restored( key, stage_dir, libraries ):
+    logger.info( "Using cached Boost libraries [{}] for [{}] from the stage cache [{}]".format(
+            ", ".join( as_info( os.path.basename( library ) ) for library in libraries ),
+            as_notice( stage_dir ),
+            as_notice( key[:12] )
+    ) )
@@ -47,6 +47,13 @@ class Boost(object):
                     help="Pass this if your boost source may change (for example you are patching it)"
                          " and you want boost build to be executed each time the library is asked for" )
 
+        add_option( '--boost-stage-cache', dest='boost-stage-cache', type='string', nargs=1, action='store',
+                    metavar='DIR',
+                    help="Keep the Boost libraries b2 stages in DIR, keyed by the Boost version, toolchain,"
+                         " variant, architecture, linktype and defines, and link them into other"
+                         " workspaces' stage directories instead of running b2 again. DIR can be shared"
+                         " by concurrent builds. Ignored with --boost-build-always" )
+
         add_option( '--boost-verbose-build', dest='boost-verbose-build', action='store_true',
                     help="Pass this option if you wish to see the command-line output of boost build" )
 
@@ -27,6 +27,7 @@ import os
 import re
 
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 from cuppa.colourise import (
     as_error,
@@ -36,11 +37,13 @@ from cuppa.colourise import (
     as_subdued,
     as_warning,
 )
+from cuppa.core.location_prefetch import location_jobs
 from cuppa.core.storage_actions import _judgement_tree_lines
 from cuppa.location import develop_location
 from cuppa.log import logger
 from cuppa.scms import scms
 from cuppa.scms.git import Git
+from cuppa.utility.download import transfer_progress_suppressed
 from cuppa.utility.storage import (
     WIDEST_PROSE,
     emphasised_count_phrase,
@@ -366,7 +369,8 @@ def inspect( name, path ):
         return Copy( name, path )
 
     try:
-        state = Git.get_working_copy_state( path )
+        # Fresh each time: the copy may have been edited, fetched or moved since it was last seen.
+        state = Git.snapshot( path, refresh=True )
         return Copy(
                 name            = name,
                 path            = path,
@@ -425,9 +429,29 @@ def configured_develop( dependency, cuppa_env ):
     return None
 
 
+def in_order( function, items, jobs ):
+    """`function` applied to each item on up to `jobs` threads, results in the order of `items`.
+
+    Fetching and observing copies is independent per copy and mostly waiting on git or the
+    network, so it fans out; the callers report the results in table order afterwards. Git
+    progress is suppressed while several run at once, since the lines would overwrite each other.
+    """
+    items = list( items )
+    workers = min( max( 1, jobs ), len( items ) )
+    if workers <= 1:
+        return [ function( item ) for item in items ]
+
+    def quietly( item ):
+        with transfer_progress_suppressed():
+            return function( item )
+
+    with ThreadPoolExecutor( max_workers=workers ) as executor:
+        return list( executor.map( quietly, items ) )
+
+
 def survey( cuppa_env ):
     """Every dependency with a develop location, observed, whether or not --develop is active."""
-    copies = []
+    located = []
     without_develop = []
 
     for name in sorted( cuppa_env['dependencies'] ):
@@ -435,10 +459,11 @@ def survey( cuppa_env ):
         dependency = getattr( factory, '__self__', factory )
         path = configured_develop( dependency, cuppa_env )
         if path:
-            copies.append( inspect( name, path ) )
+            located.append( ( name, path ) )
         else:
             without_develop.append( name )
 
+    copies = in_order( lambda entry: inspect( *entry ), located, location_jobs( cuppa_env ) )
     return copies, without_develop
 
 
@@ -760,8 +785,7 @@ def update_develop( cuppa_env, out=write ):
     failures = 0
     updated = []
 
-    for copy in copies:
-        observed, failed = _fetch( copy, dry_run, out )
+    for observed, failed in fetch_all( copies, dry_run, cuppa_env, out ):
         failures += failed
 
         action = update_action( observed )
@@ -809,24 +833,36 @@ def update_develop( cuppa_env, out=write ):
     return severity == ERROR and 1 or 0
 
 
-def _fetch( copy, dry_run, out ):
-    """Fetch, then observe again: the decision must be taken on what is true after the fetch."""
+def _fetch( copy, dry_run ):
+    """Fetch, then observe again: the decision must be taken on what is true after the fetch.
+
+    Returns `( observed, failed, lines )`; the lines are written by the caller, in table order,
+    because fetches run concurrently.
+    """
     if not copy.exists or copy.scm != 'git':
-        return copy, 0
+        return copy, 0, []
 
     if dry_run:
-        out( action_line( "Would fetch [{}] in [{}]".format(
-                copy.name, display_path( copy.path ) ) ) )
-        return copy, 0
+        return copy, 0, [ action_line( "Would fetch [{}] in [{}]".format(
+                copy.name, display_path( copy.path ) ) ) ]
 
     try:
         Git.fetch( copy.path )
     except Git.Error as error:
-        out( action_line( "Could not fetch [{}]: {}".format(
-                copy.name, str(error) ), as_error ) )
-        return copy, 1
+        return copy, 1, [ action_line( "Could not fetch [{}]: {}".format(
+                copy.name, str(error) ), as_error ) ]
+
+    return inspect( copy.name, copy.path ), 0, []
+
 
-    return inspect( copy.name, copy.path ), 0
+def fetch_all( copies, dry_run, cuppa_env, out ):
+    """`_fetch` every copy concurrently, yielding `( observed, failed )` in order once its lines
+    have been written."""
+    fetched = in_order( lambda copy: _fetch( copy, dry_run ), copies, location_jobs( cuppa_env ) )
+    for observed, failed, lines in fetched:
+        for line in lines:
+            out( line )
+        yield observed, failed
 
 
 #-------------------------------------------------------------------------------
@@ -1176,8 +1212,7 @@ def checkout_develop_branch( cuppa_env, out=write ):
     changed = []
     skipped_person = False
 
-    for copy in copies:
-        observed, failed = _fetch( copy, dry_run, out )
+    for observed, failed in fetch_all( copies, dry_run, cuppa_env, out ):
         failures += failed
         action = checkout_branch_action( observed, target, base_branch )
         if not action.act:
@@ -1257,8 +1292,7 @@ def reset_develop_branch( cuppa_env, out=write ):
     changed = []
     skipped_person = False
 
-    for copy in copies:
-        observed, failed = _fetch( copy, dry_run, out )
+    for observed, failed in fetch_all( copies, dry_run, cuppa_env, out ):
         failures += failed
         action = reset_branch_action( observed, target )
         if not action.act:
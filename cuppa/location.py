@@ -516,6 +516,8 @@ class Location(object):
                             location,
                             cached_archive,
                             label=os.path.basename( cached_archive ) or location,
+                            expected_sha256=self._expected_sha256,
+                            expected_size=self._expected_size,
                     )
                     logger.info( "[{}] successfully downloaded to [{}]".format(
                             as_info( location ),
@@ -530,6 +532,8 @@ class Location(object):
                                 location,
                                 filename,
                                 label=os.path.basename( self._local_folder ) or location,
+                                expected_sha256=self._expected_sha256,
+                                expected_size=self._expected_size,
                         )
                         logger.info( "[{}] successfully downloaded to [{}]".format(
                                 as_info( location ),
@@ -537,8 +541,9 @@ class Location(object):
                         ) )
                         self.extract( filename, local_dir_with_sub_dir )
                     finally:
-                        if os.path.isfile( filename ):
-                            os.remove( filename )
+                        for leftover in ( filename, filename + '.partial', filename + '.partial.validator' ):
+                            if os.path.isfile( leftover ):
+                                os.remove( leftover )
             except DownloadError as error:
                 logger.error( "Download of [{}] failed with error [{}]".format(
                         as_error( location ),
@@ -865,7 +870,17 @@ class Location(object):
         return scms.get_scms( vc_type ), vc_type, repo_location, versioning
 
 
-    def __init__( self, cuppa_env, location, develop=None, branch_path=None, extra_sub_path=None, name_hint=None ):
+    def __init__(
+            self,
+            cuppa_env,
+            location,
+            develop=None,
+            branch_path=None,
+            extra_sub_path=None,
+            name_hint=None,
+            expected_sha256=None,
+            expected_size=None,
+    ):
 
         logger.debug( "Create location using location=[{}], develop=[{}], branch_path=[{}], extra_sub_path=[{}], name_hint=[{}]".format(
                 as_info( location ),
@@ -1020,6 +1035,8 @@ class Location(object):
         self._full_url   = urlparse( self._location )
         self._sub_dir    = None
         self._name_hint  = name_hint
+        self._expected_sha256 = expected_sha256
+        self._expected_size   = expected_size
 
         if extra_sub_path:
             if os.path.isabs( extra_sub_path ):
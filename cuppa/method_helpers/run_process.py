@@ -11,6 +11,7 @@
 import os
 import sys
 import shlex
+import subprocess
 import re
 
 from SCons.Errors import BuildError
@@ -24,6 +25,7 @@ from cuppa.log import logger
 from cuppa.path import unique_short_filename
 from cuppa.utility.dict_tools import args_from_dict
 from cuppa.utility.env import merge_callable_exports
+from cuppa.utility import test_pool
 
 
 class Monitor(object):
@@ -173,7 +175,7 @@ class ProcessStderr(object):
 
 class RunProcessAction(object):
 
-    def __init__( self, final_dir, command=None, command_args=None, expected_exit_code=None, working_dir=None, retry_count=None, inherit_process_env=None, **ignored_kwargs ):
+    def __init__( self, final_dir, command=None, command_args=None, expected_exit_code=None, working_dir=None, retry_count=None, inherit_process_env=None, timeout=None, **ignored_kwargs ):
         self._final_dir = final_dir
         self._command = command
         self._command_args = command_args
@@ -181,6 +183,7 @@ class RunProcessAction(object):
         self._working_dir = working_dir
         self._retry_count = retry_count and retry_count or 0
         self._inherit_process_env = inherit_process_env
+        self._timeout = timeout
 
 
     def _run_command( self, source, suppress_output, program_path, command, working_dir, env, retry ):
@@ -191,13 +194,16 @@ class RunProcessAction(object):
         monitor = Monitor( program_path, env )
         monitor.start()
 
+        timeout = test_pool.timeout_from( self._timeout, env )
+
         try:
             return_code = self._run(
                     suppress_output,
                     program_path,
                     command,
                     working_dir,
-                    env
+                    env,
+                    timeout
             )
 
             if return_code == self._expected_exit_code:
@@ -229,6 +235,15 @@ class RunProcessAction(object):
 
             return success
 
+        except subprocess.TimeoutExpired:
+            errstr = "Command timed out after {:g} seconds".format( timeout )
+            log_failure( errstr )
+            monitor.stop( status='aborted', treat_error_as_warning=retry )
+            self._remove_success_file( success_file_name_from( program_path ) )
+            if not retry:
+                raise BuildError( node=source and source[0] or None, errstr=errstr )
+            return False
+
         except OSError as e:
             log_failure( "Execution of [{}] failed with error: {}".format( as_notice(command), as_notice(str(e)) ) )
             monitor.stop( status='failed', treat_error_as_warning=retry )
@@ -292,7 +307,8 @@ class RunProcessAction(object):
 
                 retry = ( retry_count > 0 )
 
-                success = self._run_command( source, suppress_output, program_path, command, working_dir, env, retry )
+                with test_pool.test_slot():
+                    success = self._run_command( source, suppress_output, program_path, command, working_dir, env, retry )
 
                 if not success and retry:
                     logger.info( "Retrying [{}]...".format( as_notice(command) ) )
@@ -317,7 +333,7 @@ class RunProcessAction(object):
             pass
 
 
-    def _run( self, suppress_output, program_path, command, working_dir, env ):
+    def _run( self, suppress_output, program_path, command, working_dir, env, timeout=None ):
         process_stdout = ProcessStdout( not suppress_output, stdout_file_name_from( program_path ) )
         process_stderr = ProcessStderr( not suppress_output, stderr_file_name_from( program_path ) )
 
@@ -326,7 +342,8 @@ class RunProcessAction(object):
                                                     shlex.split( command ),
                                                     cwd=working_dir,
                                                     scons_env=env,
-                                                    inherit_process_env=self._inherit_process_env)
+                                                    inherit_process_env=self._inherit_process_env,
+                                                    timeout=timeout)
         return return_code
 
 
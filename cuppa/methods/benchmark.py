@@ -32,7 +32,11 @@ class BenchmarkMethod(object):
             command=None,
             expected_exit_code=None,
             working_dir=None,
-            inherit_process_env=None
+            inherit_process_env=None,
+            repeats=None,
+            warmup=None,
+            threshold=None,
+            baseline=None
     ):
 
         actions = env['variant_actions']
@@ -53,6 +57,7 @@ class BenchmarkMethod(object):
                 target=target,
                 working_dir=working_dir,
                 inherit_process_env=inherit_process_env,
+                **self.settings( env, repeats, warmup, threshold, baseline )
             )
 
             env['BUILDERS']['BenchmarkBuilder'] = env.Builder( action=benchmark_builder, emitter=benchmark_emitter )
@@ -71,6 +76,20 @@ class BenchmarkMethod(object):
         return []
 
 
+    @classmethod
+    def settings( cls, env, repeats=None, warmup=None, threshold=None, baseline=None ):
+        """Repeat, warm-up and baseline settings; arguments win over the command line."""
+        def choose( value, option ):
+            return value if value is not None else env.get_option( option )
+
+        return {
+            'repeats'  : choose( repeats, 'benchmark-repeats' ),
+            'warmup'   : choose( warmup, 'benchmark-warmup' ),
+            'threshold': choose( threshold, 'benchmark-threshold' ),
+            'baseline' : choose( baseline, 'benchmark-baseline' ),
+            'store'    : env.get_option( 'benchmark-store' ),
+        }
+
 
     @classmethod
     def add_to_env( cls, cuppa_env ):
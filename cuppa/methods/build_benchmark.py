@@ -37,6 +37,10 @@ class BuildBenchmarkMethod:
             cov_exclude_patterns=None,
             working_dir=None,
             inherit_process_env=None,
+            repeats=None,
+            warmup=None,
+            threshold=None,
+            baseline=None,
             **kwargs
     ):
 
@@ -71,6 +75,10 @@ class BuildBenchmarkMethod:
                 expected_exit_code=expected_exit_code,
                 working_dir=working_dir,
                 inherit_process_env=inherit_process_env,
+                repeats=repeats,
+                warmup=warmup,
+                threshold=threshold,
+                baseline=baseline,
             )
 
             nodes.append( benchmark )
@@ -37,6 +37,7 @@ class BuildTestMethod:
             cov_exclude_patterns=None,
             working_dir=None,
             inherit_process_env=None,
+            timeout=None,
             **kwargs
     ):
 
@@ -71,6 +72,7 @@ class BuildTestMethod:
                 expected_exit_code=expected_exit_code,
                 working_dir=working_dir,
                 inherit_process_env=inherit_process_env,
+                timeout=timeout,
             )
 
             nodes.append( test )
@@ -11,9 +11,13 @@
 # cuppa imports
 import cuppa.progress
 
+from cuppa.package_managers.gitlab import PACKAGE_ARCHIVE_CODECS
+
 
 class PublishPackageMethod(object):
 
+    _codecs = tuple( PACKAGE_ARCHIVE_CODECS )
+
     def __call__( self, env, source, publisher=None ):
 
         package = env.File( publisher.package() )
@@ -44,6 +48,14 @@ class PublishPackageMethod(object):
         add_option( '--publish-package', dest='publish-package', action='store_true',
                     help='Specify that you want to publish a package.' )
 
+        add_option( '--package-codec', dest='package-codec', choices=cls._codecs, nargs=1, action='store',
+                    help="Compress package archives with one of {}. Defaults to zip on Windows and gzip"
+                         " elsewhere".format( ", ".join( cls._codecs ) ) )
+
+        add_option( '--package-jobs', dest='package-jobs', type='int', nargs=1, action='store',
+                    help="Threads to compress package archives with when the codec's compressor (zstd, xz"
+                         " or pigz) is installed. Defaults to all cores" )
+
 
 
 class InstallPackageMethod(object):
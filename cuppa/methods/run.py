@@ -31,7 +31,7 @@ class RunMethod(object):
         ]
 
 
-    def __call__( self, env, source=None, target=None, final_dir=None, data=None, depends_on=None, command=None, command_args=None, expected_exit_code=None, working_dir=None, retry_count=None, inherit_process_env=None ):
+    def __call__( self, env, source=None, target=None, final_dir=None, data=None, depends_on=None, command=None, command_args=None, expected_exit_code=None, working_dir=None, retry_count=None, inherit_process_env=None, timeout=None ):
 
         actions = env['variant_actions']
 
@@ -49,6 +49,7 @@ class RunMethod(object):
                 working_dir=working_dir,
                 retry_count=retry_count,
                 inherit_process_env=inherit_process_env,
+                timeout=timeout,
             )
 
             env['BUILDERS']['RunBuilder'] = env.Builder( action=action, emitter=emitter )
@@ -11,6 +11,7 @@
 import cuppa.progress
 
 from cuppa.utility.depends import with_depends
+from cuppa.utility.test_result_cache import CachedTest
 
 
 class TestMethod(object):
@@ -32,7 +33,8 @@ class TestMethod(object):
             command=None,
             expected_exit_code=None,
             working_dir=None,
-            inherit_process_env=None
+            inherit_process_env=None,
+            timeout=None
     ):
 
         actions = env['variant_actions']
@@ -53,8 +55,22 @@ class TestMethod(object):
                 target=target,
                 working_dir=working_dir,
                 inherit_process_env=inherit_process_env,
+                timeout=timeout,
             )
 
+            # A restored result writes no .gcda files, so coverage builds always run the test.
+            if env.get( 'test_cache' ) and not 'force_test' in actions.keys() and not 'cov' in actions.keys():
+                test_builder = CachedTest(
+                    test_builder,
+                    env['test_cache'],
+                    inherit_process_env=inherit_process_env,
+                    runner=runner,
+                    expected=expected,
+                    command=command,
+                    expected_exit_code=expected_exit_code,
+                    working_dir=working_dir,
+                )
+
             env['BUILDERS']['TestBuilder'] = env.Builder( action=test_builder, emitter=test_emitter )
 
             # depends_on is preferred; data is a legacy alias. Both merge into
@@ -47,113 +47,157 @@ def init_env_for_variant( module_name, sconscript_exports ):
 
 #-------------------------------------------------------------------------------
 
+import importlib
+import importlib.util
 import inspect
+import os
 import sys
 import logging
+import threading
 
 
 def try_load_module( package, name, path ):
-    module = None
-    pathname = None
-
-    try:
-        import imp
+    """Return ``( module, pathname )`` for ``package.name`` found under ``path``, else ``( None, None )``.
+
+    ``pathname`` is the package directory for packages (so their members can be searched in
+    turn) and the source file for plain modules.
+    """
+    qualified_name = package and package + "." + name or name
+    module = sys.modules.get( qualified_name )
+
+    if module is None:
+        if not path or not os.path.isdir( path ):
+            return None, None
+        spec = importlib.machinery.PathFinder.find_spec( name, [ path ] )
+        if spec is None:
+            return None, None
         try:
-            filehandle, pathname, description = imp.find_module( name, path and [ path ] or None )
-            try:
-                try:
-                    qualified_name = package and package + "." + name or name
-                    module = sys.modules[ qualified_name ]
-                except KeyError:
-                    try:
-                        module = imp.load_module( name, filehandle, pathname, description )
-                        # print( "Load module [{}] from [{}]".format( str(module), str(pathname) ) )
-                    except ImportError:
-                        pass
-            finally:
-                if filehandle:
-                    filehandle.close()
+            module = _import_from_spec( qualified_name, spec )
         except ImportError:
-            pass
-
-    except ImportError:
-        import importlib
-        try:
-            qualified_name = package and package + "." + name or name
-            module = sys.modules[ qualified_name ]
-        except KeyError:
-            spec = importlib.machinery.PathFinder.find_spec( name, path and [ path ] or None )
-            if spec is not None:
-                #try:
-                module = importlib.util.module_from_spec( spec )
-                # we shouldn't do this but review to be clear why
-                # -> sys.modules[spec.name] = module
-                spec.loader.exec_module( module )
-                pathname = spec.origin
-                #except ModuleNotFoundError:
-                #    pass
-
-    return module, pathname
+            return None, None
 
+    search_path = getattr( module, '__path__', None )
+    if search_path:
+        return module, list( search_path )[0]
+    return module, getattr( module, '__file__', None )
 
-def __package( name ):
-    package = None
 
-    try:
-        import imp
+def _import_from_spec( qualified_name, spec ):
+    if '.' in qualified_name:
         try:
-            filehandle, pathname, description = imp.find_module( name, None )
-            try:
-                try:
-                    module = sys.modules[ name ]
-                except KeyError:
-                    module = imp.load_module( name, filehandle, pathname, description )
-                package = pathname
-            finally:
-                if filehandle:
-                    filehandle.close()
+            return importlib.import_module( qualified_name )
         except ImportError:
             pass
+    # Not reachable through sys.path (a plugin directory, say): load it from where it was found.
+    module = importlib.util.module_from_spec( spec )
+    sys.modules[qualified_name] = module
+    try:
+        spec.loader.exec_module( module )
+    except BaseException:
+        sys.modules.pop( qualified_name, None )
+        raise
+    return module
 
-    except ImportError:
-        import importlib
-        spec = importlib.machinery.BuiltinImporter.find_spec( name )
-        if spec:
-            module = importlib.util.module_from_spec( spec )
-            sys.modules[spec.name] = module
-            spec.loader.exec_module( module )
-            package = spec.parent
 
-    return package
+def __package( name ):
+    try:
+        module = importlib.import_module( name )
+    except ImportError:
+        return None
+    return os.path.dirname( module.__file__ )
 
 
-def __call_classmethod_for_classes_in_module( package, name, path, method, *args, **kwargs ):
+def _classes_in_module( package, name, path ):
+    """Yield every class reachable from ``package.name``, recursing into its sub-packages.
 
+    Order and repetition follow ``dir()`` of each module, so a class visible from two modules is
+    yielded twice, exactly as the registration hooks have always been called.
+    """
     module, pathname = try_load_module( package, name, path )
-    if module:
-        for member_name in dir( module ):
+    if not module:
+        return
+
+    parent_package = package and package + "." + name or name
+    for member_name in dir( module ):
+
+        member = getattr( module, member_name )
 
-            member = getattr( module, member_name )
+        if inspect.ismodule( member ):
+            for cls in _classes_in_module( parent_package, member_name, pathname ):
+                yield cls
 
-            if inspect.ismodule( member ):
-                if package:
-                    parent_package = package + "." + name
-                else:
-                    parent_package = name
-                __call_classmethod_for_classes_in_module( parent_package, member_name, pathname, method, *args, **kwargs )
+        elif inspect.isclass( member ):
+            yield member
 
-            elif inspect.isclass( member ):
+
+class ModuleRegistry(object):
+    """Classes found under each registered package, walked once per process.
+
+    Registration hooks (``add_options``, ``add_to_env``, ``init_env_for_variant`` …) are called
+    for every sconscript and variant; walking the package tree with ``dir()`` and ``inspect`` each
+    time dominated that cost. The walk happens on first use of a package and the classes
+    defining each hook are remembered separately.
+    """
+
+    def __init__( self ):
+        self._lock = threading.Lock()
+        self._classes = {}
+        self._hooks = {}
+
+
+    def classes( self, package, name, path ):
+        key = ( package, name )
+        with self._lock:
+            classes = self._classes.get( key )
+        if classes is None:
+            classes = list( _classes_in_module( package, name, path ) )
+            with self._lock:
+                classes = self._classes.setdefault( key, classes )
+        return classes
+
+
+    def hooks( self, package, name, path, method ):
+        """``[ ( class, hook ) ]`` for the classes under ``package.name`` that define ``method``."""
+        key = ( package, name, method )
+        with self._lock:
+            hooks = self._hooks.get( key )
+        if hooks is None:
+            hooks = []
+            for member in self.classes( package, name, path ):
                 try:
                     function = getattr( member, method )
-                    if callable( function ):
-                        try:
-                            function( *args, **kwargs )
-                        except Exception as error:
-                            if logger.isEnabledFor( logging.EXCEPTION ):
-                                logger.error( "[{}] in [{}] failed with error [{}]".format( as_info(str(method)), as_notice(str(member)), as_info(str(error)) ) )
-                                traceback.print_exc()
-                            raise error
                 except AttributeError:
-                    pass
+                    continue
+                if callable( function ):
+                    hooks.append( ( member, function ) )
+            with self._lock:
+                hooks = self._hooks.setdefault( key, hooks )
+        return hooks
+
+
+    def clear( self ):
+        with self._lock:
+            self._classes.clear()
+            self._hooks.clear()
+
+
+_registry = ModuleRegistry()
+
+
+def registry():
+    return _registry
+
+
+def __call_classmethod_for_classes_in_module( package, name, path, method, *args, **kwargs ):
+
+    for member, function in _registry.hooks( package, name, path, method ):
+        try:
+            function( *args, **kwargs )
+        except Exception as error:
+            if logger.isEnabledFor( logging.EXCEPTION ):
+                logger.error( "[{}] in [{}] failed with error [{}]".format( as_info(str(method)), as_notice(str(member)), as_info(str(error)) ) )
+                traceback.print_exc()
+            if not isinstance( error, AttributeError ):
+                raise error
 
 #-------------------------------------------------------------------------------
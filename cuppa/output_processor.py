@@ -8,10 +8,12 @@
 #   Output Processor
 #-------------------------------------------------------------------------------
 
+import atexit
 import subprocess
 import sys
 import os
 import re
+import signal
 import time
 import threading
 import shlex
@@ -26,6 +28,7 @@ from cuppa.cpp.cxx_profiles_report import parse_profiles_diagnostic
 from cuppa.cpp.profiles_report_collector import ProfilesDiagnosticCollector
 from cuppa.log import logger
 from cuppa.progress import NotifyProgress
+from cuppa.utility import test_pool
 from cuppa.utility.python2to3 import as_str, errno, Queue
 
 
@@ -39,11 +42,88 @@ def command_available( command ):
     return True
 
 
+class OutputSink(object):
+    """Process-wide stdout for the output of spawned commands.
+
+    Each command collects its lines in a ``CommandOutput`` and hands them over in one write
+    when it finishes, or sooner once ``threshold`` bytes are waiting, so the output of
+    concurrent commands (``-j``) does not interleave and stdout is written once per batch
+    rather than once per line. ``streaming`` writes every line as it arrives instead, which
+    is what ``--show-test-output`` wants.
+    """
+
+    _lock = threading.Lock()
+    streaming = False
+    threshold = 64 * 1024
+
+
+    @classmethod
+    def configure( cls, streaming=None, threshold=None ):
+        if streaming is not None:
+            cls.streaming = streaming
+        if threshold is not None:
+            cls.threshold = threshold
+
+
+    @classmethod
+    def command( cls ):
+        return CommandOutput( streaming=cls.streaming, threshold=cls.threshold )
+
+
+    @classmethod
+    def emit( cls, text ):
+        with cls._lock:
+            sys.stdout.write( text )
+            sys.stdout.flush()
+
+
+
+class CommandOutput(object):
+    """The buffered output of one command. Safe to share between its stdout and stderr readers."""
+
+    def __init__( self, streaming=False, threshold=OutputSink.threshold ):
+        self._streaming = streaming
+        self._threshold = threshold
+        self._lines = []
+        self._size = 0
+        self._lock = threading.Lock()
+
+
+    def write( self, line ):
+        if self._streaming:
+            OutputSink.emit( line + "\n" )
+            return
+        with self._lock:
+            self._lines.append( line )
+            self._size += len( line ) + 1
+            if self._size >= self._threshold:
+                self._flush()
+
+
+    def _flush( self ):
+        if self._lines:
+            text = "\n".join( self._lines ) + "\n"
+            self._lines = []
+            self._size = 0
+            OutputSink.emit( text )
+
+
+    def flush( self ):
+        with self._lock:
+            self._flush()
+
+
+    def close( self ):
+        self.flush()
+
+
+
 class LineConsumer:
 
-    def __init__( self, call_readline, processor=None ):
+    def __init__( self, call_readline, processor=None, output=None ):
         self.call_readline = call_readline
         self.processor = processor
+        self.output = output or CommandOutput( streaming=True )
 
 
     def __call__( self ):
@@ -54,11 +134,127 @@ class LineConsumer:
                     if self.processor:
                         line = self.processor( line )
                         if line:
-                            print( line )
+                            self.output.write( line )
                     else:
-                        print( line )
+                        self.output.write( line )
         except UnicodeDecodeError as error:
-            print( "WARNING: Ignoring unicode error {}".format( error ) )
+            self.output.write( "WARNING: Ignoring unicode error {}".format( error ) )
+
+
+
+# Timed commands run in a process group of their own so a timeout can kill everything they
+# started. That also takes them out of the terminal's foreground group, the one Ctrl-C reaches,
+# so interrupts are forwarded to the groups still running and any left are killed at exit.
+_process_groups = set()
+_process_groups_lock = threading.Lock()
+_forwarded_signals = tuple(
+        getattr( signal, name ) for name in ( 'SIGINT', 'SIGTERM', 'SIGHUP' ) if hasattr( signal, name )
+)
+_signal_wakeup = None
+
+
+def _signal_process_groups( signum ):
+    with _process_groups_lock:
+        groups = list( _process_groups )
+    for group in groups:
+        try:
+            os.killpg( group, signum )
+        except OSError:
+            pass
+
+
+def _kill_process_groups():
+    if hasattr( signal, 'SIGKILL' ):
+        _signal_process_groups( signal.SIGKILL )
+
+
+atexit.register( _kill_process_groups )
+
+
+def _watch_signals( wakeup ):
+    while True:
+        try:
+            received = wakeup.recv( 64 )
+        except OSError:
+            return
+        if not received:
+            return
+        for signum in bytearray( received ):
+            if signum in _forwarded_signals:
+                _signal_process_groups( signum )
+
+
+def forward_interrupts():
+    """Forward SIGINT, SIGTERM and SIGHUP to the process groups of running timed commands.
+
+    Python writes every signal it handles to the wakeup fd whatever the handler, so forwarding
+    holds while SCons has its own handlers installed for the build. Must be called from the main
+    thread; returns ``False`` when forwarding cannot be set up (another wakeup fd is in use).
+    """
+    global _signal_wakeup
+    if _signal_wakeup is not None:
+        return True
+    if not hasattr( os, 'killpg' ) or threading.current_thread() is not threading.main_thread():
+        return False
+
+    import socket
+    receive, send = socket.socketpair()
+    send.setblocking( False )
+    try:
+        previous = signal.set_wakeup_fd( send.fileno(), warn_on_full_buffer=False )
+    except ValueError:
+        previous = None
+    if previous != -1:
+        if previous is not None:
+            signal.set_wakeup_fd( previous )
+        receive.close()
+        send.close()
+        return False
+
+    _signal_wakeup = ( receive, send )
+    watcher = threading.Thread( target=_watch_signals, args=( receive, ), name="cuppa-signal-forwarder" )
+    watcher.daemon = True
+    watcher.start()
+    return True
+
+
+def _own_process_group( kwargs ):
+    if sys.version_info >= ( 3, 11 ):
+        kwargs['process_group'] = 0
+    else:
+        kwargs['preexec_fn'] = os.setpgrp
+
+
+
+class Watchdog(object):
+    """Kill a process once ``timeout`` seconds have passed.
+
+    Started in a process group of its own (POSIX) the whole group is killed, so children that
+    inherited the output pipes cannot keep the readers waiting.
+    """
+
+    def __init__( self, process, timeout, group=False ):
+        self._process = process
+        self._group = group
+        self.expired = False
+        self._timer = threading.Timer( timeout, self._expire )
+        self._timer.daemon = True
+        self._timer.start()
+
+
+    def _expire( self ):
+        self.expired = True
+        try:
+            if self._group:
+                os.killpg( self._process.pid, signal.SIGKILL )
+            else:
+                self._process.kill()
+        except OSError:
+            pass
+
+
+    def cancel( self ):
+        self._timer.cancel()
 
 
 
@@ -98,6 +294,18 @@ class IncrementalSubProcess:
             suppress_output = kwargs['suppress_output']
             del kwargs['suppress_output']
 
+        # Callers that have more to say about the command (a summary) pass their own output
+        # and close it themselves.
+        output = kwargs.pop( 'output', None )
+        owns_output = output is None
+        if owns_output:
+            output = OutputSink.command()
+
+        timeout = kwargs.pop( 'timeout', None )
+        kill_group = bool( timeout ) and hasattr( os, 'killpg' )
+        if kill_group:
+            _own_process_group( kwargs )
+
         use_shell = False
         inherit_process_env = kwargs.pop( 'inherit_process_env', None )
         if 'scons_env' in kwargs:
@@ -118,6 +326,7 @@ class IncrementalSubProcess:
         try:
             process = None
             stderr_thread = None
+            watchdog = None
 
             timer = timing_enabled and cuppa.timer.Timer() or None
             if timer:
@@ -126,15 +335,22 @@ class IncrementalSubProcess:
             close_fds = platform.system() == "Windows" and False or True
 
             if not suppress_output:
-                sys.stdout.write( " ".join(args_list) + "\n" )
+                output.write( " ".join(args_list) )
 
             process = subprocess.Popen(
                 use_shell and " ".join(args_list) or args_list,
                 **dict( kwargs, close_fds=close_fds, shell=use_shell, universal_newlines=True )
             )
 
-            stderr_consumer = LineConsumer( process.stderr.readline, stderr_processor )
-            stdout_consumer = LineConsumer( process.stdout.readline, stdout_processor )
+            if kill_group:
+                with _process_groups_lock:
+                    _process_groups.add( process.pid )
+
+            if timeout:
+                watchdog = Watchdog( process, timeout, group=kill_group )
+
+            stderr_consumer = LineConsumer( process.stderr.readline, stderr_processor, output )
+            stdout_consumer = LineConsumer( process.stdout.readline, stdout_processor, output )
 
             stderr_thread = threading.Thread( target=stderr_consumer )
             stderr_thread.start()
@@ -147,8 +363,16 @@ class IncrementalSubProcess:
                 timer.stop()
                 logger.debug( "Command [{}] - Elapsed {}".format( as_notice(str(timer.timer_id())), cuppa.timer.as_string( timer.elapsed() ) ) )
 
+            if watchdog:
+                watchdog.cancel()
+                if watchdog.expired:
+                    raise subprocess.TimeoutExpired( args_list, timeout )
+
             return process.returncode
 
+        except subprocess.TimeoutExpired:
+            raise
+
         except Exception as e:
             if timer:
                 timer.stop()
@@ -162,6 +386,15 @@ class IncrementalSubProcess:
                 stderr_thread.join()
             raise e
 
+        finally:
+            if watchdog:
+                watchdog.cancel()
+            if kill_group and process:
+                with _process_groups_lock:
+                    _process_groups.discard( process.pid )
+            if owns_output:
+                output.close()
+
 
     @classmethod
     def Popen( cls, processor, args_list, **kwargs ):
@@ -198,10 +431,11 @@ class PSpawn(object):
 
 class Stream(object):
 
-    def __init__( self, processor, name ):
+    def __init__( self, processor, name, output=None ):
         self._queue = Queue.Queue()
         self._processor = processor
         self._name = name
+        self._output = output or CommandOutput( streaming=True )
 
     def flush( self ):
         pass
@@ -219,9 +453,9 @@ class Stream(object):
                     if self._processor:
                         line = self._processor( line )
                         if line:
-                            print( line )
+                            self._output.write( line )
                     else:
-                        print( line )
+                        self._output.write( line )
             self._queue.task_done()
         except Queue.Empty:
             logger.trace( "Stream Queue.Empty raised [{}]".format( self._name ) )
@@ -257,6 +491,7 @@ class Processor:
     def install( cls, env ):
         global _pspawn
         _pspawn = env['PSPAWN']
+        OutputSink.configure( streaming=bool( env.get( 'show_test_output' ) ) )
         output_processor = cls( env )
         if platform.system() == "Windows":
             env['SPAWN'] = output_processor.windows_spawn
@@ -267,18 +502,24 @@ class Processor:
     def posix_spawn( self, sh, escape, cmd, args, env ):
 
         processor = SpawnedProcessor( self.scons_env )
+        output = OutputSink.command()
 
-        returncode = IncrementalSubProcess.Popen(
-            processor,
-            [ arg.strip('"') for arg in args ],
-            env=env,
-            suppress_output=True,
-        )
-
-        summary = processor.summary( returncode )
-
-        if summary:
-            print( summary )
+        try:
+            with test_pool.build_slot():
+                returncode = IncrementalSubProcess.Popen(
+                    processor,
+                    [ arg.strip('"') for arg in args ],
+                    env=env,
+                    suppress_output=True,
+                    output=output,
+                )
+
+            summary = processor.summary( returncode )
+
+            if summary:
+                output.write( summary )
+        finally:
+            output.close()
 
         return returncode
 
@@ -286,24 +527,27 @@ class Processor:
     def windows_spawn( self, sh, escape, cmd, args, env ):
 
         processor = SpawnedProcessor( self.scons_env )
+        output = OutputSink.command()
 
-        stdout = Stream( processor, "stdout" )
-        stderr = Stream( processor, "stderr" )
+        stdout = Stream( processor, "stdout", output )
+        stderr = Stream( processor, "stderr", output )
 
         pspawn = PSpawn( _pspawn, sh, escape, cmd, args, env, stdout, stderr )
 
         pspawn_thread = threading.Thread( target=pspawn )
 
         finished = threading.Event()
-        pspawn_thread.start()
 
-        stdout_thread = threading.Thread( target = Reader( stdout, finished ) )
-        stdout_thread.start()
+        with test_pool.build_slot():
+            pspawn_thread.start()
 
-        stderr_thread = threading.Thread( target = Reader( stderr, finished ) )
-        stderr_thread.start()
+            stdout_thread = threading.Thread( target = Reader( stdout, finished ) )
+            stdout_thread.start()
+
+            stderr_thread = threading.Thread( target = Reader( stderr, finished ) )
+            stderr_thread.start()
 
-        pspawn_thread.join()
+            pspawn_thread.join()
         logger.trace( "Processor - PSPAWN joined" )
         finished.set()
 
@@ -317,12 +561,15 @@ class Processor:
         stderr_thread.join()
         logger.trace( "Processor - STDERR thread joined" )
 
-        returncode = pspawn.returncode()
+        try:
+            returncode = pspawn.returncode()
 
-        summary = processor.summary( returncode )
+            summary = processor.summary( returncode )
 
-        if summary:
-            print( summary )
+            if summary:
+                output.write( summary )
+        finally:
+            output.close()
 
         return returncode
 
@@ -348,10 +595,86 @@ class SpawnedProcessor(object):
 
 
 
+class CompiledInterpretors(object):
+    """Output interpretors for a toolchain class, compiled once per process.
+
+    The individual interpretor regexes are joined into a single anchored
+    alternation so each line is dispatched in one ``match`` call. Alternation
+    tries each branch in declaration order, so the first interpretor that
+    matches wins exactly as it did when the regexes were tried one by one.
+    The winning interpretor's own compiled regex is then re-run so callers see
+    the group numbering declared in ``output_interpretors()``.
+    """
+
+    _tables = {}
+    _lock = threading.Lock()
+
+
+    @classmethod
+    def for_toolchain( cls, toolchain ):
+        toolchain_class = isinstance( toolchain, type ) and toolchain or type( toolchain )
+        table = cls._tables.get( toolchain_class )
+        if table is None:
+            with cls._lock:
+                table = cls._tables.get( toolchain_class )
+                if table is None:
+                    table = cls( toolchain.output_interpretors() )
+                    cls._tables[toolchain_class] = table
+        return table
+
+
+    @classmethod
+    def clear( cls ):
+        with cls._lock:
+            cls._tables = {}
+
+
+    def __init__( self, interpretors ):
+        self._interpretors = [
+            ( interpretor, re.compile( interpretor['regex'] ) ) for interpretor in interpretors
+        ]
+        self._combined = None
+        self._branch_for_group = {}
+
+        branches = []
+        group_index = 1
+        for index, ( interpretor, regex ) in enumerate( self._interpretors ):
+            branches.append( "(" + interpretor['regex'] + ")" )
+            self._branch_for_group[group_index] = index
+            group_index += 1 + regex.groups
+
+        if branches:
+            try:
+                self._combined = re.compile( "|".join( branches ) )
+            except re.error as error:
+                logger.debug( "Falling back to sequential output interpretors [{}]".format( str(error) ) )
+
+
+    def interpretors( self ):
+        return [ interpretor for interpretor, regex in self._interpretors ]
+
+
+    def match( self, line ):
+        if self._combined is not None:
+            combined = self._combined.match( line )
+            if not combined:
+                return ( None, None )
+            interpretor, regex = self._interpretors[ self._branch_for_group[ combined.lastindex ] ]
+            return ( regex.match( line ), interpretor )
+
+        for interpretor, regex in self._interpretors:
+            matches = regex.match( line )
+            if matches:
+                return ( matches, interpretor )
+        return ( None, None )
+
+
+
 class ToolchainProcessor:
 
     def __init__( self, toolchain, minimal_output, ignore_duplicates, profiles_scope=None ):
         self.toolchain              = toolchain
+        self._interpretors          = CompiledInterpretors.for_toolchain( toolchain )
         self.minimal_output         = minimal_output
         self.ignore_duplicates      = ignore_duplicates
         self._profiles_scope        = profiles_scope
@@ -492,25 +815,21 @@ class ToolchainProcessor:
 
 
     def interpret( self, line ):
-        Interpretors = self.toolchain.output_interpretors()
-
-        for interpretor in Interpretors:
-            Regex = interpretor['regex']
-            Matches = re.match( Regex, line )
+        Matches, interpretor = self._interpretors.match( line )
 
-            if Matches:
-                error_id = 0
-                warning_id = 0
+        if Matches:
+            error_id = 0
+            warning_id = 0
 
-                if interpretor['meaning'] == 'error':
-                    self.errors += 1
-                    error_id = self.errors
+            if interpretor['meaning'] == 'error':
+                self.errors += 1
+                error_id = self.errors
 
-                elif interpretor['meaning'] == 'warning':
-                    self.warnings += 1
-                    warning_id = self.warnings
+            elif interpretor['meaning'] == 'warning':
+                self.warnings += 1
+                warning_id = self.warnings
 
-                return ( Matches, interpretor, error_id, warning_id, )
+            return ( Matches, interpretor, error_id, warning_id, )
 
         return ( None, None, None, None, )
 
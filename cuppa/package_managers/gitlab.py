@@ -9,11 +9,14 @@
 #-------------------------------------------------------------------------------
 
 # Python imports
+import hashlib
+import json
 import platform
 import os
 import shlex
 import shutil
 import subprocess
+import tempfile
 import zipfile
 
 # cuppa imports
@@ -61,20 +64,46 @@ def os_release_id():
         return system or 'unknown'
 
 
-def package_archive_extension():
-    """Preferred package archive suffix: ``.zip`` on Windows, ``.tar.gz`` elsewhere."""
+# Archive codecs a package can be published with, and the extension each is named with.
+PACKAGE_ARCHIVE_CODECS = {
+    'zip'  : '.zip',
+    'gzip' : '.tar.gz',
+    'xz'   : '.tar.xz',
+    'zstd' : '.tar.zst',
+}
+
+# Members are written with this mtime (1980-01-01, the earliest a zip can hold) unless
+# SOURCE_DATE_EPOCH is set, so the same staged files always give the same archive.
+PACKAGE_ARCHIVE_MTIME = 315532800
+
+
+def default_package_codec():
+    """``zip`` on Windows, ``gzip`` elsewhere."""
     if platform.system() == 'Windows':
-        return '.zip'
-    return '.tar.gz'
+        return 'zip'
+    return 'gzip'
+
 
+def package_archive_extension( codec=None ):
+    """Archive suffix for ``codec``; by default ``.zip`` on Windows, ``.tar.gz`` elsewhere."""
+    return PACKAGE_ARCHIVE_CODECS[ codec or default_package_codec() ]
 
-def package_archive_extensions():
+
+def package_archive_extensions( codec=None ):
     """Preferred then alternate archive suffixes for resolve fallback."""
-    preferred = package_archive_extension()
+    preferred = package_archive_extension( codec )
     alternate = '.tar.gz' if preferred == '.zip' else '.zip'
     return preferred, alternate
 
 
+def package_archive_codec( archive_path ):
+    """The codec an archive was written with, from its extension, or ``None``."""
+    for codec, extension in PACKAGE_ARCHIVE_CODECS.items():
+        if str( archive_path ).endswith( extension ):
+            return codec
+    return None
+
+
 def package_file_stem( env, package=None, variant=None ):
     """Basename without archive extension: ``{package}_{os}_{tool_variant}``."""
     return "{package}_{system}_{build_name}".format(
@@ -84,14 +113,14 @@ def package_file_stem( env, package=None, variant=None ):
     )
 
 
-def package_file_name( env, package=None, variant=None, target_dir=None ):
-    name = package_file_stem( env, package=package, variant=variant ) + package_archive_extension()
+def package_file_name( env, package=None, variant=None, target_dir=None, codec=None ):
+    name = package_file_stem( env, package=package, variant=variant ) + package_archive_extension( codec )
     if target_dir:
         return os.path.join( target_dir, name )
     return name
 
 
-def resolve_existing_package_archive( directory, stem ):
+def resolve_existing_package_archive( directory, stem, codec=None ):
     """Return an existing archive path under ``directory`` for ``stem``, preferring the platform extension.
 
     Looks for ``stem`` + preferred extension, then the alternate (``.zip`` / ``.tar.gz``), so a
@@ -99,7 +128,7 @@ def resolve_existing_package_archive( directory, stem ):
     """
     if not directory or not stem:
         return None
-    for extension in package_archive_extensions():
+    for extension in package_archive_extensions( codec ):
         candidate = os.path.join( directory, stem + extension )
         if os.path.isfile( candidate ):
             return candidate
@@ -107,60 +136,275 @@ def resolve_existing_package_archive( directory, stem ):
 
 
 def strip_package_archive_extension( name ):
-    """Remove a trailing ``.tar.gz`` or ``.zip`` from an archive basename."""
+    """Remove a trailing package archive extension (``.tar.gz``, ``.tar.xz``, ``.tar.zst`` or ``.zip``)."""
     text = str( name )
-    for extension in ( '.tar.gz', '.zip' ):
+    for extension in PACKAGE_ARCHIVE_CODECS.values():
         if text.endswith( extension ):
             return text[:-len( extension )]
     return text
 
 
-def create_package_archive( archive_path, working_dir, source_dir ):
-    """Create ``archive_path`` from ``working_dir/source_dir`` (zip on Windows, tar.gz elsewhere)."""
-    if archive_path.endswith( '.zip' ):
-        root = os.path.join( working_dir, source_dir )
-        with zipfile.ZipFile( archive_path, 'w', zipfile.ZIP_DEFLATED ) as archive:
-            for dirpath, _dirnames, filenames in os.walk( root ):
-                for filename in filenames:
-                    full = os.path.join( dirpath, filename )
-                    arcname = os.path.relpath( full, working_dir )
-                    archive.write( full, arcname )
-        return 0
-    command = 'tar -C {working_dir} -czf {package_file} {source_dir}'.format(
-            working_dir = working_dir,
-            package_file = archive_path,
-            source_dir = source_dir,
-    )
-    completion = subprocess.run( shlex.split( command ) )
-    return completion.returncode
-
-
-def newest_mtime_under( root ):
-    """Return the newest file mtime under ``root``, or ``0.0`` when absent or empty."""
-    if not root or not os.path.exists( root ):
-        return 0.0
-    newest = 0.0
-    for dirpath, _dirnames, filenames in os.walk( root ):
-        for filename in filenames:
-            path = os.path.join( dirpath, filename )
+def _archive_mtime():
+    try:
+        return int( os.environ['SOURCE_DATE_EPOCH'] )
+    except ( KeyError, ValueError ):
+        return PACKAGE_ARCHIVE_MTIME
+
+
+def _archive_members( working_dir, source_dir ):
+    """Paths under ``working_dir/source_dir``, relative to ``working_dir``, in a fixed order."""
+    root = os.path.join( working_dir, source_dir )
+    members = [ source_dir ]
+    for dirpath, dirnames, filenames in os.walk( root ):
+        dirnames.sort()
+        relative = os.path.relpath( dirpath, working_dir )
+        for name in dirnames + sorted( filenames ):
+            members.append( os.path.join( relative, name ) )
+    return sorted( members, key=lambda member: member.replace( os.sep, '/' ) )
+
+
+def _normalised_mode( mode, is_dir ):
+    if is_dir or mode & 0o111:
+        return 0o755
+    return 0o644
+
+
+def _write_tar( fileobj, working_dir, members, mtime ):
+    import tarfile
+    with tarfile.open( fileobj=fileobj, mode='w|', format=tarfile.GNU_FORMAT ) as archive:
+        for member in members:
+            path = os.path.join( working_dir, member )
+            info = archive.gettarinfo( path, member.replace( os.sep, '/' ) )
+            info.mtime = mtime
+            info.uid = info.gid = 0
+            info.uname = info.gname = ''
+            if not info.issym():
+                info.mode = _normalised_mode( info.mode, info.isdir() )
+            if info.isreg():
+                with open( path, 'rb' ) as content:
+                    archive.addfile( info, content )
+            else:
+                archive.addfile( info )
+
+
+def _write_zip( path, working_dir, members, mtime ):
+    import time
+    date_time = time.gmtime( max( mtime, PACKAGE_ARCHIVE_MTIME ) )[:6]
+    with zipfile.ZipFile( path, 'w', zipfile.ZIP_DEFLATED ) as archive:
+        for member in members:
+            full = os.path.join( working_dir, member )
+            if not os.path.isfile( full ):
+                continue
+            info = zipfile.ZipInfo( member.replace( os.sep, '/' ), date_time=date_time )
+            info.compress_type = zipfile.ZIP_DEFLATED
+            stat = os.stat( full )
+            info.external_attr = ( 0o100000 | _normalised_mode( stat.st_mode, False ) ) << 16
+            # The size up front lets the entry choose ZIP64 just as writestr() would.
+            info.file_size = stat.st_size
+            with open( full, 'rb' ) as content, archive.open( info, 'w' ) as entry:
+                shutil.copyfileobj( content, entry, 1024 * 1024 )
+
+
+# Threaded xz splits its output into blocks sized from the core count unless told otherwise;
+# 24 MiB is what the default preset (-6) uses, pinned so every machine splits alike.
+XZ_BLOCK_SIZE = '24MiB'
+
+
+def _compressor_command( codec, jobs ):
+    """A threaded compressor from stdin to stdout for ``codec``, or ``None`` if none is installed."""
+    threads = str( jobs or 0 )
+    if codec == 'zstd' and shutil.which( 'zstd' ):
+        return [ 'zstd', '-q', '-c', '-T' + threads ]
+    if codec == 'xz' and shutil.which( 'xz' ):
+        return [ 'xz', '-c', '-T' + threads, '--block-size=' + XZ_BLOCK_SIZE ]
+    if codec == 'gzip' and shutil.which( 'pigz' ):
+        # -n leaves the name and mtime out of the gzip header.
+        return [ 'pigz', '-c', '-n', '-p', str( jobs or os.cpu_count() or 1 ) ]
+    return None
+
+
+def _python_compressor( codec, output, jobs ):
+    """A file object compressing into ``output`` when no command line compressor is available."""
+    if codec == 'gzip':
+        import gzip
+        return gzip.GzipFile( filename='', mode='wb', fileobj=output, mtime=0 )
+    if codec == 'xz':
+        import lzma
+        return lzma.LZMAFile( output, 'wb', format=lzma.FORMAT_XZ )
+    if codec == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            return None
+        return zstandard.ZstdCompressor( threads=jobs or -1 ).stream_writer( output, closefd=False )
+    return None
+
+
+def _write_compressed_tar( path, working_dir, members, mtime, codec, jobs ):
+    with open( path, 'wb' ) as output:
+        command = _compressor_command( codec, jobs )
+        if command:
+            logger.debug( "Compressing package archive with [{}]".format( as_notice( " ".join( command ) ) ) )
+            process = subprocess.Popen( command, stdin=subprocess.PIPE, stdout=output )
             try:
-                newest = max( newest, os.path.getmtime( path ) )
-            except OSError:
-                pass
-    return newest
+                _write_tar( process.stdin, working_dir, members, mtime )
+            finally:
+                process.stdin.close()
+                returncode = process.wait()
+            return returncode
+
+        compressor = _python_compressor( codec, output, jobs )
+        if compressor is None:
+            logger.error( "No compressor is available for package archive codec [{}]".format( as_error( codec ) ) )
+            return 1
+        with compressor:
+            _write_tar( compressor, working_dir, members, mtime )
+    return 0
+
+
+def create_package_archive( archive_path, working_dir, source_dir, codec=None, jobs=None ):
+    """Create ``archive_path`` from ``working_dir/source_dir`` with ``codec`` (by default from its extension).
+
+    Members are written in sorted order with a fixed mtime, owner and normalised permissions so
+    the same staged files give the same tar, and a byte-identical archive from the same
+    compressor. ``gzip``, ``xz`` and ``zstd`` tars are compressed by ``pigz``, ``xz`` or ``zstd``
+    using ``jobs`` threads (all cores by default) when installed, falling back to Python's
+    single-threaded compressors, whose output differs from the tools'. The archive is written to
+    a temporary file and renamed into place.
+    """
+    codec = codec or package_archive_codec( archive_path ) or 'gzip'
+    members = _archive_members( working_dir, source_dir )
+    mtime = _archive_mtime()
+
+    directory = os.path.dirname( os.path.abspath( archive_path ) )
+    handle, temporary = tempfile.mkstemp( prefix='.' + os.path.basename( archive_path ) + '-', dir=directory )
+    os.close( handle )
+    try:
+        if codec == 'zip':
+            _write_zip( temporary, working_dir, members, mtime )
+            returncode = 0
+        else:
+            returncode = _write_compressed_tar( temporary, working_dir, members, mtime, codec, jobs )
+        if returncode == 0:
+            os.replace( temporary, archive_path )
+        return returncode
+    except OSError as error:
+        logger.error( "Writing package archive [{}] failed: {}".format( as_error( archive_path ), as_error( str(error) ) ) )
+        return 1
+    finally:
+        if os.path.exists( temporary ):
+            os.remove( temporary )
+
+
+def package_manifest_path( archive_path ):
+    """The manifest recorded beside ``archive_path`` of the staged files it was made from."""
+    return str( archive_path ) + '.manifest.json'
+
+
+def _file_digest( path ):
+    digest = hashlib.sha256()
+    with open( path, 'rb' ) as content:
+        for block in iter( lambda: content.read( 1024 * 1024 ), b'' ):
+            digest.update( block )
+    return digest.hexdigest()
+
+
+def staged_files( staging_roots, previous=None ):
+    """``{ "<root index>/<relative path>": [ size, mtime_ns, sha256 ] }`` for files under ``staging_roots``.
+
+    A file whose size and mtime match its entry in ``previous`` keeps that entry's digest
+    rather than being read again.
+    """
+    previous = previous or {}
+    files = {}
+    for index, root in enumerate( staging_roots ):
+        if not root or not os.path.isdir( root ):
+            continue
+        for dirpath, _dirnames, filenames in os.walk( root ):
+            for filename in filenames:
+                path = os.path.join( dirpath, filename )
+                key = "{}/{}".format( index, os.path.relpath( path, root ).replace( os.sep, '/' ) )
+                try:
+                    status = os.stat( path )
+                    known = previous.get( key )
+                    if known and known[0] == status.st_size and known[1] == status.st_mtime_ns:
+                        digest = known[2]
+                    else:
+                        digest = _file_digest( path )
+                except OSError:
+                    continue
+                files[key] = [ status.st_size, status.st_mtime_ns, digest ]
+    return files
+
+
+def manifest_digest( files ):
+    """Digest of the names and contents of ``files``; mtimes do not count."""
+    digest = hashlib.sha256()
+    for key in sorted( files ):
+        digest.update( "{}\0{}\0".format( key, files[key][2] ).encode( 'utf-8' ) )
+    return digest.hexdigest()
+
+
+def _archive_stamp( archive_path ):
+    status = os.stat( archive_path )
+    return [ status.st_size, status.st_mtime_ns ]
+
+
+def read_package_manifest( archive_path ):
+    try:
+        with open( package_manifest_path( archive_path ), encoding='utf-8' ) as handle:
+            manifest = json.load( handle )
+    except ( OSError, ValueError ):
+        return None
+    return isinstance( manifest, dict ) and manifest or None
+
+
+def write_package_manifest( archive_path, staging_roots, files=None ):
+    """Record the digest of the staged files ``archive_path`` was created from."""
+    if files is None:
+        previous = read_package_manifest( archive_path ) or {}
+        files = staged_files( staging_roots, previous.get( 'files' ) )
+    manifest = {
+        'archive': _archive_stamp( archive_path ),
+        'digest' : manifest_digest( files ),
+        'files'  : files,
+    }
+    path = package_manifest_path( archive_path )
+    handle, temporary = tempfile.mkstemp( prefix='.manifest-', dir=os.path.dirname( os.path.abspath( path ) ) )
+    try:
+        with os.fdopen( handle, 'w', encoding='utf-8' ) as output:
+            json.dump( manifest, output, indent=1, sort_keys=True )
+        os.replace( temporary, path )
+    except OSError:
+        if os.path.exists( temporary ):
+            os.remove( temporary )
+        raise
 
 
 def package_archive_is_up_to_date( archive_path, staging_roots ):
-    """Return True when ``archive_path`` exists and is not older than staged package content."""
+    """Return True when ``archive_path`` was created from staged files with the same content as now.
+
+    Compares the digest of the staged files with the one recorded in the archive's manifest; an
+    archive without a manifest, or replaced since it was written, is out of date.
+    """
     if not archive_path or not os.path.isfile( archive_path ):
         return False
+    manifest = read_package_manifest( archive_path )
     try:
-        archive_mtime = os.path.getmtime( archive_path )
+        if not manifest or manifest.get( 'archive' ) != _archive_stamp( archive_path ):
+            return False
     except OSError:
         return False
-    for root in staging_roots:
-        if newest_mtime_under( root ) > archive_mtime:
-            return False
+    previous = manifest.get( 'files' ) or {}
+    files = staged_files( staging_roots, previous )
+    if manifest_digest( files ) != manifest.get( 'digest' ):
+        return False
+    if files != previous:
+        # Touched but unchanged files; remember their new mtimes so they are not read again.
+        try:
+            write_package_manifest( archive_path, staging_roots, files )
+        except OSError:
+            pass
     return True
 
 
@@ -225,9 +469,10 @@ def registry_auth_headers( custom_token=None ):
     return { name: value }
 
 
-def download_registry_package( url, dest_path, custom_token=None, label=None ):
+def download_registry_package( url, dest_path, custom_token=None, label=None, expected_sha256=None ):
     """Fetch a GitLab generic package archive via ``download_file`` (progress + auth headers).
 
+    ``expected_sha256`` pins the archive; it is verified while the archive streams in.
     Raises ``DownloadError`` on failure (callers map that to their own exception types).
     """
     from cuppa.utility.download import download_file
@@ -236,6 +481,7 @@ def download_registry_package( url, dest_path, custom_token=None, label=None ):
             dest_path,
             label=label or os.path.basename( dest_path ) or url,
             headers=registry_auth_headers( custom_token ),
+            expected_sha256=expected_sha256,
     )
 
 
@@ -251,7 +497,9 @@ class GitlabPackagePublisher:
         package=None,
         version=None,
         variant=None,
-        custom_token=None
+        custom_token=None,
+        codec=None,
+        jobs=None
     ):
         from SCons.Script import Flatten
 
@@ -266,7 +514,9 @@ class GitlabPackagePublisher:
 
         self._target_lib_dir    = env.Dir( os.path.join( env['final_dir'], self._package_folder, "lib" ) )
         self._package_variant   = tool_variant( env, variant=variant )
-        self._package_file_name = package_file_name( env, package=package, variant=variant )
+        self._codec = codec or env.get_option( 'package-codec' ) or default_package_codec()
+        self._jobs  = jobs or env.get_option( 'package-jobs' )
+        self._package_file_name = package_file_name( env, package=package, variant=variant, codec=self._codec )
         self._package_archive = env.File(
                 os.path.join( env['abs_final_dir'], self._package_file_name )
         )
@@ -346,6 +596,8 @@ class GitlabPackagePublisher:
                 archive_path,
                 env['abs_final_dir'],
                 self._package_source_dir,
+                codec=self._codec,
+                jobs=self._jobs,
         )
         if returncode != 0:
             logger.error( "Creating package archive [{}] failed with return code [{}]".format(
@@ -354,6 +606,8 @@ class GitlabPackagePublisher:
             )
             return returncode
 
+        write_package_manifest( archive_path, staging_roots )
+
         env.Execute( Touch( target[0] ) )
         logger.info( "Package [{}] created".format( as_info( archive_path ) ) )
 
@@ -418,7 +672,8 @@ class GitlabPackageInstaller:
             variant=None,
             library_prefix=None,
             pkg_config_dir=None,
-            custom_token=None
+            custom_token=None,
+            codec=None
         ):
 
         self._env = env
@@ -429,11 +684,11 @@ class GitlabPackageInstaller:
         else:
             self._target_dir = str(target_dir)
 
-        package_file = package_file_name( env, package=package, variant=variant )
+        package_file = package_file_name( env, package=package, variant=variant, codec=codec )
         stem = package_file_stem( env, package=package, variant=variant )
         # package_variant_dir = remove_prefix( package_file, package + "_" ).split(".")[0]
         preferred_target = os.path.join( self._target_dir, package_file )
-        existing = resolve_existing_package_archive( self._target_dir, stem )
+        existing = resolve_existing_package_archive( self._target_dir, stem, codec )
         self._download_target = existing or preferred_target
         download_dir = os.path.split( self._download_target )[0]
         self._extraction_dir = os.path.join( download_dir, tool_variant( env, variant=variant ) )
@@ -578,7 +833,9 @@ class GitlabPackageDependency:
         "library-prefix" : { "help": "package library prefix that can be used (or omitted) when referencing libs from the package", },
         "pkg-config-dir" : { "help": "package pkg-config folder to use to find pc files", },
         "develop"        : { "help": "local package to build against when in develop mode", },
-        "custom-token"   : { "help": "custom token that should be used to authenticate with the registry", }
+        "custom-token"   : { "help": "custom token that should be used to authenticate with the registry", },
+        "sha256"         : { "help": "expected SHA-256 of the downloaded package archive", },
+        "codec"          : { "help": "archive codec the package was published with (zip, gzip, xz or zstd)", }
     }
 
 
@@ -688,7 +945,9 @@ class GitlabPackageDependency:
             library_prefix=None,
             pkg_config_dir=None,
             custom_token=None,
-            develop=None
+            develop=None,
+            sha256=None,
+            codec=None
         ):
 
         self._cuppa_env = cuppa_env
@@ -719,10 +978,10 @@ class GitlabPackageDependency:
         cuppa.core.storage_options.report_roots( cuppa_env )
 
         cache_dir = os.path.join( cuppa_env['downloads_root'], 'packages', package, version )
-        package_file = package_file_name( cuppa_env, package=package, variant=variant )
+        package_file = package_file_name( cuppa_env, package=package, variant=variant, codec=codec )
         stem = package_file_stem( cuppa_env, package=package, variant=variant )
         preferred_target = os.path.join( cache_dir, package_file )
-        existing = resolve_existing_package_archive( cache_dir, stem )
+        existing = resolve_existing_package_archive( cache_dir, stem, codec )
         self._download_target = existing or preferred_target
 
         extraction_root = cuppa_env['dependencies_root']
@@ -766,7 +1025,7 @@ class GitlabPackageDependency:
             os.makedirs( self._extraction_dir )
 
         # Prefer an already-cached alternate extension (e.g. legacy Windows .tar.gz).
-        existing = resolve_existing_package_archive( cache_dir, stem )
+        existing = resolve_existing_package_archive( cache_dir, stem, codec )
         if existing:
             self._download_target = existing
             package_file = os.path.basename( existing )
@@ -799,6 +1058,7 @@ class GitlabPackageDependency:
                             self._download_target,
                             custom_token=custom_token,
                             label=package_file,
+                            expected_sha256=sha256,
                     )
                 except DownloadError as error:
                     logger.error( "Downloading package archive [{}] failed: {}".format(
@@ -1,4 +1,3 @@
-
 #          Copyright Jamie Allsop 2012-2015
 # Distributed under the Boost Software License, Version 1.0.
 #    (See accompanying file LICENSE_1_0.txt or copy at
@@ -8,15 +7,61 @@
 #   RecursiveGlob
 #-------------------------------------------------------------------------------
 import fnmatch
+import json
 import re
 import os
+import tempfile
+import time
 
 from cuppa.utility.types import is_string
 from cuppa.log import logger
-from cuppa.colourise import as_notice
-
-
-def glob( start, file_pattern, exclude_dirs_pattern=None, discard_pattern=None ):
+from cuppa.colourise import as_notice, as_info, as_warning
+
+
+# Version control metadata never holds project files; pruned by sub-sconscript discovery.
+VCS_DIRECTORIES = ( '.git', '.hg', '.svn', '.bzr', 'CVS', '_darcs' )
+
+
+def prune_hidden_and_vcs( name ):
+    """Default directory pruning for discovery: VCS metadata and hidden (dot) directories."""
+    return name.startswith( '.' ) or name in VCS_DIRECTORIES
+
+
+def _scan( directory ):
+    """Split ``directory`` into ``( dirnames, filenames )`` with one ``os.scandir`` pass.
+
+    As with ``os.walk``, a symlink to a directory is neither a file nor descended into, so
+    ``dirnames`` holds only real directories.
+    """
+    dirnames = []
+    filenames = []
+    try:
+        with os.scandir( directory ) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                    is_link = is_dir and entry.is_symlink()
+                except OSError:
+                    is_dir = is_link = False
+                if is_link:
+                    continue
+                if is_dir:
+                    dirnames.append( entry.name )
+                else:
+                    filenames.append( entry.name )
+    except OSError:
+        pass
+    return dirnames, filenames
+
+
+def glob( start, file_pattern, exclude_dirs_pattern=None, discard_pattern=None, prune=None, visited=None ):
+    """Paths under ``start`` whose file name matches ``file_pattern``, in top-down walk order.
+
+    Directories matching ``exclude_dirs_pattern``, or for which ``prune( name )`` is true, are
+    not entered. A sub-directory containing a file that matches ``discard_pattern`` is dropped
+    together with everything below it. Each directory read is appended to ``visited`` when a
+    list is given.
+    """
 
     if is_string( file_pattern ):
         file_pattern = re.compile( fnmatch.translate( file_pattern ) )
@@ -30,15 +75,24 @@ def glob( start, file_pattern, exclude_dirs_pattern=None, discard_pattern=None )
             discard_pattern = re.compile( fnmatch.translate( discard_pattern ) )
 
     matches = []
-    subdir = False
 
     logger.trace( "file_pattern = [{}], start = [{}]".format( as_notice( file_pattern.pattern ), as_notice( start ) ) )
 
-    for root, dirnames, filenames in os.walk( start ):
+    # Depth-first, parents before children, siblings in directory order: the order os.walk used.
+    pending = [ start ]
+    subdir = False
+
+    while pending:
+        root = pending.pop()
+        dirnames, filenames = _scan( root )
+        if visited is not None:
+            visited.append( root )
 
         if exclude_dirs_pattern:
             # remove any directories from the search that match the exclude regex
-            dirnames[:] = [ d for d in dirnames if not exclude_dirs_pattern.match(d) ]
+            dirnames = [ d for d in dirnames if not exclude_dirs_pattern.match(d) ]
+        if prune:
+            dirnames = [ d for d in dirnames if not prune( d ) ]
 
         exclude_this_dir = False
         matches_in_this_dir = []
@@ -46,8 +100,7 @@ def glob( start, file_pattern, exclude_dirs_pattern=None, discard_pattern=None )
         for filename in filenames:
             if subdir and discard_pattern and discard_pattern.match( filename ):
                 # if we are in a subdir and it contains a file that matches the discard_pattern
-                # set exclude_this_dir to True so later we can discard any local matches we'd
-                # already encountered while walking the directory
+                # then discard any local matches and do not descend any further
                 exclude_this_dir = True
                 break
             if file_pattern.match( filename ):
@@ -55,11 +108,134 @@ def glob( start, file_pattern, exclude_dirs_pattern=None, discard_pattern=None )
 
         if not exclude_this_dir:
             matches += matches_in_this_dir
-        else:
-            # We are excluding this directory and therefore all of its subdirs
-            dirnames[:] = []
+            pending.extend( os.path.join( root, d ) for d in reversed( dirnames ) )
 
         # After the first pass through the loop we will be in a subdirectory
         subdir = True
 
     return matches
+
+
+def _pattern_text( pattern ):
+    if not pattern:
+        return None
+    if is_string( pattern ):
+        return pattern
+    return pattern.pattern
+
+
+class GlobManifest(object):
+    """Remember ``glob`` results and reuse them while no directory they covered has changed.
+
+    Adding, removing or renaming an entry updates its directory's mtime, so comparing the mtime
+    of every directory read by the original walk is enough to tell whether the walk would now
+    find anything different. That is one ``stat`` per directory instead of reading each one.
+    Directories modified within ``RACY_WINDOW_NS`` of the walk are not trusted, because a second
+    change in the same timestamp tick would go unnoticed; such entries are rescanned next time.
+    """
+
+    FORMAT = 1
+    RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+    def __init__( self, path ):
+        self._path = path
+        self._entries = {}
+        self._dirty = False
+        self.reused = 0
+        self.scanned = 0
+        self._load()
+
+
+    def _load( self ):
+        try:
+            with open( self._path, encoding='utf-8' ) as handle:
+                payload = json.load( handle )
+        except FileNotFoundError:
+            return
+        except ( OSError, ValueError, TypeError ) as error:
+            logger.debug( "Ignoring unreadable glob manifest [{}]: {}".format(
+                    as_notice( self._path ), as_warning( str( error ) )
+            ) )
+            return
+        if isinstance( payload, dict ) and payload.get( 'format' ) == self.FORMAT:
+            entries = payload.get( 'entries' )
+            if isinstance( entries, dict ):
+                self._entries = entries
+
+
+    def save( self ):
+        if not self._dirty:
+            return
+        directory = os.path.dirname( self._path ) or '.'
+        try:
+            os.makedirs( directory, exist_ok=True )
+            fd, temporary = tempfile.mkstemp( prefix='.glob-manifest-', suffix='.tmp', dir=directory )
+            try:
+                with os.fdopen( fd, 'w', encoding='utf-8' ) as handle:
+                    json.dump( { 'format': self.FORMAT, 'entries': self._entries }, handle )
+                os.replace( temporary, self._path )
+            except Exception:
+                try:
+                    os.unlink( temporary )
+                except OSError:
+                    pass
+                raise
+            self._dirty = False
+        except OSError as error:
+            logger.debug( "Unable to write glob manifest [{}]: {}".format(
+                    as_notice( self._path ), as_warning( str( error ) )
+            ) )
+
+
+    @classmethod
+    def _still_valid( cls, entry ):
+        scanned_at = entry.get( 'scanned_at_ns', 0 )
+        for directory, mtime in entry.get( 'directories', {} ).items():
+            if mtime >= scanned_at - cls.RACY_WINDOW_NS:
+                return False
+            try:
+                if os.stat( directory ).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+
+    def glob( self, start, file_pattern, exclude_dirs_pattern=None, discard_pattern=None, prune=None ):
+        """``glob`` with the same arguments, answered from the manifest while it is still valid.
+
+        ``prune`` is not part of the manifest key, so a given manifest should always be used
+        with the same pruning rule.
+        """
+        key = json.dumps( [
+                os.path.abspath( start ),
+                _pattern_text( file_pattern ),
+                _pattern_text( exclude_dirs_pattern ),
+                _pattern_text( discard_pattern ),
+        ] )
+
+        entry = self._entries.get( key )
+        if entry and self._still_valid( entry ):
+            self.reused += 1
+            logger.trace( "Reusing [{}] manifest matches under [{}]".format(
+                    as_info( str( len( entry['matches'] ) ) ), as_notice( start )
+            ) )
+            return list( entry['matches'] )
+
+        scanned_at = time.time_ns()
+        visited = []
+        matches = glob( start, file_pattern, exclude_dirs_pattern, discard_pattern, prune=prune, visited=visited )
+        directories = {}
+        for directory in visited:
+            try:
+                directories[directory] = os.stat( directory ).st_mtime_ns
+            except OSError:
+                pass
+        self._entries[key] = {
+            'scanned_at_ns': scanned_at,
+            'directories'  : directories,
+            'matches'      : matches,
+        }
+        self._dirty = True
+        self.scanned += 1
+        return list( matches )
@@ -30,6 +30,78 @@ WorkingCopyState = namedtuple(
 )
 
 
+# Everything cuppa reads from a working copy, gathered at once. `commit` is None before the
+# first commit, `rebasing` names the branch being rebased, `refs` lists the refs decorating a
+# detached HEAD in `git show --decorate` order and `url` is the origin remote (None when there
+# is none).
+WorkingCopySnapshot = namedtuple(
+        'WorkingCopySnapshot',
+        [ 'commit', 'branch', 'detached', 'rebasing', 'upstream', 'ahead', 'behind', 'modified',
+          'revision', 'refs', 'url' ]
+)
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def _read_text( path ):
+    try:
+        with open( path, encoding='utf-8' ) as handle:
+            return handle.read().strip()
+    except ( OSError, ValueError ):
+        return None
+
+
+def _git_dirs( path ):
+    """``( git_dir, common_dir )`` for the working copy at ``path``, following ``gitdir:`` files."""
+    dot_git = os.path.join( path, ".git" )
+    if os.path.isdir( dot_git ):
+        git_dir = dot_git
+    else:
+        pointer = _read_text( dot_git ) or ''
+        if not pointer.startswith( "gitdir:" ):
+            return None, None
+        git_dir = os.path.normpath( os.path.join( path, pointer[len("gitdir:"):].strip() ) )
+    common = _read_text( os.path.join( git_dir, "commondir" ) )
+    common_dir = common and os.path.normpath( os.path.join( git_dir, common ) ) or git_dir
+    return git_dir, common_dir
+
+
+def _origin_url_from_config( config_path ):
+    """``( found, url )`` for ``remote.origin.url``; ``found`` is None when git must be asked."""
+    text = _read_text( config_path )
+    if text is None:
+        return None, None
+    in_origin = False
+    url = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line.startswith( '[' ):
+            header = line[1:line.find( ']' )].strip()
+            if header.lower().startswith( ( 'include', 'includeif' ) ):
+                return None, None
+            section, _, subsection = header.partition( ' ' )
+            if not subsection and '.' in section:
+                # The deprecated [remote.origin] spelling of [remote "origin"].
+                section, _, subsection = section.partition( '.' )
+                subsection = subsection.lower()
+            in_origin = section.lower() == 'remote' and subsection.strip().strip( '"' ) == 'origin'
+            continue
+        if in_origin:
+            key, equals, value = line.partition( '=' )
+            if equals and key.strip().lower() == 'url':
+                value = value.strip()
+                if value.startswith( '"' ):
+                    value = value[1:value.find( '"', 1 )]
+                else:
+                    value = re.split( r'\s[#;]', value, 1 )[0].strip()
+                url = value
+    return True, url
+
+
 class Git:
 
     class Error(Exception):
@@ -128,8 +200,10 @@ class Git:
 
     @classmethod
     def _progress_enabled( cls ):
-        """Match HTTP/extract progress: show git ``--progress`` only at INFO or finer."""
-        return logger.isEnabledFor( logging.INFO )
+        """Match HTTP/extract progress: show git ``--progress`` only at INFO or finer, and not
+        while concurrent retrievals have suppressed progress on this thread."""
+        from cuppa.utility.download import transfer_progress_allowed
+        return transfer_progress_allowed() and logger.isEnabledFor( logging.INFO )
 
 
     @classmethod
@@ -277,174 +351,228 @@ class Git:
 
 
     @classmethod
-    def get_branch( cls, path ):
-        branch = None
-        remote = None
+    def _branch_and_remote( cls, path, snapshot ):
+        if snapshot.rebasing:
+            logger.warn( as_warning( "Currently rebasing branch [{}]".format( snapshot.rebasing ) ) )
+            return snapshot.rebasing, None
+
+        if not snapshot.detached:
+            return snapshot.branch, snapshot.upstream
+
+        # A detached HEAD takes its branch from the first ref decorating it: a local branch, or
+        # the first path segment after the remote of a remote-tracking ref (so origin/feature/x
+        # gives feature, as it always has); none when that ref is a tag.
+        logger.trace( "Refs for detached HEAD in [{}] are [{}]".format(
+                as_notice(path),
+                colour_items( snapshot.refs )
+        ) )
 
-        head_detached = False
-        command = "{git} branch".format( git=cls.binary() )
-        branch_info = cls.execute_command( command, path )
-        if branch_info:
-            match = re.search( r'^[*] [(]HEAD detached ', branch_info )
-            if match:
-                head_detached = True
-
-        if not head_detached:
-            result = cls.execute_command( "{git} status -sb".format( git=cls.binary() ), path )
-            if result:
-                match = re.search( r'## (?P<branch>(?:(?!\.\.)[^\^~:\s\\\n])+)(?:\.\.\.(?P<remote>[^\^~:\s\\\n]+))?', result )
-                if match:
-                    branch = match.group("branch")
-                    remote = match.group("remote")
-                match = re.search( r'## HEAD (no branch)', result )
-                # Check if we are rebasing
-                if match:
-                    command = "{git} branch".format( git=cls.binary() )
-                    branch_info = cls.execute_command( command, path )
-                    if branch_info:
-                        match = re.search( r'(no branch, rebasing (?P<branch>[^)]+))', branch_info )
-                        if match:
-                            branch = match.group("branch")
-                            logger.warn( as_warning( "Currently rebasing branch [{}]".format( branch ) ) )
-
-            return branch, remote
-
-        else:
-            result = cls.execute_command(
-                    r"{git} show -s --pretty=\%d --decorate=full HEAD".format( git=cls.binary() ),
-                    path
-            )
+        branch = None
+        first = snapshot.refs and snapshot.refs[0] or ''
+        if first.startswith( "refs/heads/" ):
+            branch = first[len("refs/heads/"):]
+        elif first.startswith( "refs/remotes/" ):
+            branch = first[len("refs/remotes/"):].split('/')[1]
+        remote = next( ( r[len("refs/remotes/"):] for r in snapshot.refs if r.startswith( "refs/remotes/" ) ), None )
+
+        logger.trace( "Branch for detached HEAD in [{}] is [{}]".format( as_notice(path), as_info(str(branch)) ) )
+        return branch, remote
 
-            match = re.search( r'HEAD(?:(?:[^ ]* -> |[^,]*, )(?P<refs>[^)]+))?', result )
-
-            if match and match.group("refs"):
-                refs = [ { "ref":r.strip(), "type": "" } for r in match.group("refs").split(',') ]
-                logger.trace( "Refs (using show) for [{}] are [{}]".format(
-                        as_notice(path),
-                        colour_items( (r["ref"] for r in refs) )
-                ) )
-                if refs:
-                    for ref in refs:
-                        if ref["ref"].startswith("refs/heads/"):
-                            ref["ref"] = ref["ref"][len("refs/heads/"):]
-                            ref["type"] = "L"
-                        elif ref["ref"].startswith("refs/tags/"):
-                            ref["ref"] = ref["ref"][len("refs/tags/"):]
-                            ref["type"] = "T"
-                        elif ref["ref"].startswith("tag: refs/tags/"):
-                            ref["ref"] = ref["ref"][len("tag: refs/tags/"):]
-                            ref["type"] = "T"
-                        elif ref["ref"].startswith("refs/remotes/"):
-                            ref["ref"] = ref["ref"][len("refs/remotes/"):]
-                            ref["type"] = "R"
-                        else:
-                            ref["type"] = "U"
-
-                    logger.trace( "Refs (after classification) for [{}] are [{}]".format(
-                            as_notice(path),
-                            colour_items( (":".join([r["type"], r["ref"]]) for r in refs) )
-                    ) )
-
-                    if refs[0]["type"] == "L":
-                        branch = refs[0]["ref"]
-                    #elif refs[0]["type"] == "T":
-                        #branch = refs[0]["ref"]
-                    elif refs[0]["type"] == "R":
-                        branch = refs[0]["ref"].split('/')[1]
-
-                    remote = next( ( ref["ref"] for ref in refs if ref["type"]=="R" ), None )
-
-                logger.trace( "Branch (using show) for [{}] is [{}]".format( as_notice(path), as_info(str(branch)) ) )
-            else:
-                if result == "(HEAD)":
-                    command = "{git} branch".format( git=cls.binary() )
-                    branch_info = cls.execute_command( command )
-                    if branch_info:
-                        match = re.search( r'(no branch, rebasing (?P<branch>[^)]+))', branch_info )
-                        if match:
-                            branch = match.group("branch")
-                            logger.warn( as_warning( "Currently rebasing branch [{}]".format( branch ) ) )
 
-        return branch, remote
+    @classmethod
+    def get_branch( cls, path ):
+        return cls._branch_and_remote( path, cls.snapshot( path ) )
 
 
     @classmethod
     def get_revision( cls, path ):
-        guessed_revision = None
-        revision = None
+        return cls.snapshot( path ).revision
 
-        command = "{git} describe --always".format( git=cls.binary() )
-        revision = cls.execute_command( command, path )
-        if revision.strip():
-            guessed_revision = revision
 
-        command = "{git} rev-parse HEAD".format( git=cls.binary() )
-        commit_sha = cls.execute_command( command, path )
+    @classmethod
+    def _snapshot_key( cls, path ):
+        """Size and mtime of the files a commit, checkout, fetch or rebase rewrites."""
+        git_dir, common_dir = _git_dirs( path )
+        if not git_dir:
+            return None
+        files = [
+            os.path.join( git_dir, "HEAD" ),
+            os.path.join( git_dir, "index" ),
+            os.path.join( git_dir, "ORIG_HEAD" ),
+            os.path.join( git_dir, "rebase-merge" ),
+            os.path.join( git_dir, "rebase-apply" ),
+            os.path.join( common_dir, "FETCH_HEAD" ),
+            os.path.join( common_dir, "packed-refs" ),
+            os.path.join( common_dir, "config" ),
+        ]
+        head = _read_text( files[0] ) or ''
+        if head.startswith( "ref:" ):
+            files.append( os.path.join( common_dir, head[len("ref:"):].strip() ) )
+        key = [ head ]
+        for name in files:
+            try:
+                stat = os.stat( name )
+                key.append( ( stat.st_mtime_ns, stat.st_size ) )
+            except OSError:
+                key.append( None )
+        return tuple( key )
+
 
-        command = "{git} name-rev --tags --name-only {commit_sha}".format( git=cls.binary(), commit_sha=commit_sha.strip() )
-        revision = cls.execute_command( command, path )
-        if revision.strip() != "undefined":
-            guessed_revision = revision
-        return guessed_revision
+    @classmethod
+    def _parse_status( cls, status ):
+        """Read ``git status --porcelain=v2 --branch`` into a dict of the branch headers."""
+        fields = {
+            'commit': None, 'branch': None, 'detached': False, 'upstream': None,
+            'ahead': None, 'behind': None, 'modified': False
+        }
+        for line in status.splitlines():
+            if line.startswith( "# branch.oid " ):
+                oid = line[len("# branch.oid "):].strip()
+                fields['commit'] = oid != "(initial)" and oid or None
+            elif line.startswith( "# branch.head " ):
+                head = line[len("# branch.head "):].strip()
+                if head == "(detached)":
+                    fields['detached'] = True
+                else:
+                    fields['branch'] = head
+            elif line.startswith( "# branch.upstream " ):
+                fields['upstream'] = line[len("# branch.upstream "):].strip()
+            elif line.startswith( "# branch.ab " ):
+                counts = line[len("# branch.ab "):].split()
+                if len(counts) == 2:
+                    fields['ahead'] = abs( int( counts[0] ) )
+                    fields['behind'] = abs( int( counts[1] ) )
+            elif line and not line.startswith( "#" ):
+                fields['modified'] = True
+        return fields
 
 
     @classmethod
-    def get_working_copy_state( cls, path ):
-        """Branch, upstream, ahead, behind and modified, without touching the network.
+    def _take_snapshot( cls, path ):
+        git_dir, common_dir = _git_dirs( path )
 
-        The counts describe the working copy against the upstream ref as it stood after the last
-        fetch. `modified` ignores untracked files: they are not what stops a fast-forward.
-        """
-        if not path or not os.path.exists( os.path.join( path, ".git" ) ):
-            raise cls.Error("Not a Git working copy")
+        status = cls.execute_command(
+                "{git} status --porcelain=v2 --branch --untracked-files=no".format( git=cls.binary() ),
+                path
+        )
+        fields = cls._parse_status( status )
 
-        branch = None
-        detached = False
-        try:
-            branch = cls.execute_command(
-                    "{git} symbolic-ref --short -q HEAD".format( git=cls.binary() ), path
+        rebasing = None
+        for state in ( "rebase-merge", "rebase-apply" ):
+            head_name = git_dir and _read_text( os.path.join( git_dir, state, "head-name" ) )
+            if head_name:
+                rebasing = head_name.startswith( "refs/heads/" ) and head_name[len("refs/heads/"):] or head_name
+                break
+
+        revision = None
+        refs = ()
+        if fields['commit']:
+            revision = cls.execute_command(
+                    "{git} name-rev --tags --name-only HEAD".format( git=cls.binary() ), path
             )
-        except cls.Error:
-            detached = True
+            if not revision.strip() or revision.strip() == "undefined":
+                revision = cls.execute_command( "{git} describe --always".format( git=cls.binary() ), path )
+            if fields['detached'] and not rebasing:
+                decorations = cls.execute_command(
+                        "{git} show -s --format=%D --decorate=full HEAD".format( git=cls.binary() ), path
+                )
+                refs = tuple(
+                        ref.strip()[len("tag: "):] if ref.strip().startswith( "tag: " ) else ref.strip()
+                        for ref in decorations.split( ',' )
+                        if ref.strip() and ref.strip() != "HEAD"
+                )
 
-        upstream = None
-        if branch:
+        found, url = common_dir and _origin_url_from_config( os.path.join( common_dir, "config" ) ) or ( None, None )
+        if not found or url is None:
             try:
-                upstream = cls.execute_command(
-                        "{git} rev-parse --abbrev-ref --symbolic-full-name @{{upstream}}".format(
-                                git=cls.binary()
-                        ),
-                        path
-                )
+                url = cls.execute_command(
+                        "{git} config --get remote.origin.url".format( git=cls.binary() ), path
+                ) or None
             except cls.Error:
-                logger.trace( "No upstream branch for [{}] in [{}]".format(
-                        as_notice(branch), as_notice(path)
-                ) )
-
-        ahead = None
-        behind = None
-        if upstream:
-            counts = cls.execute_command(
-                    "{git} rev-list --left-right --count @{{upstream}}...HEAD".format(
-                            git=cls.binary()
-                    ),
-                    path
-            )
-            fields = counts.split()
-            if len(fields) == 2:
-                behind, ahead = int(fields[0]), int(fields[1])
-
-        status = cls.execute_command(
-                "{git} status --porcelain --untracked-files=no".format( git=cls.binary() ), path
+                url = None
+
+        return WorkingCopySnapshot(
+                commit   = fields['commit'],
+                branch   = fields['branch'],
+                detached = fields['detached'],
+                rebasing = rebasing,
+                upstream = fields['upstream'],
+                ahead    = fields['ahead'],
+                behind   = fields['behind'],
+                modified = fields['modified'],
+                revision = revision,
+                refs     = refs,
+                url      = url
         )
 
+
+    @classmethod
+    def snapshot( cls, path, refresh=False ):
+        """Branch, upstream, counts, modified, revision and origin URL of a working copy.
+
+        Usually two ``git`` processes (``status --porcelain=v2 --branch`` and ``name-rev``); the
+        origin URL is read from the repository config. The result is remembered per path for the
+        rest of the run and reused while HEAD, the index, the current branch ref, packed refs,
+        FETCH_HEAD and the config are unchanged. Edits to tracked files that have not been staged
+        do not touch any of those, so pass ``refresh=True`` where they matter.
+        """
+        if not path or not os.path.exists( os.path.join( path, ".git" ) ):
+            raise cls.Error("Not a Git working copy")
+
+        path = os.path.abspath( path )
+        if not refresh:
+            with _snapshots_lock:
+                cached = _snapshots.get( path )
+            if cached and cached[0] == cls._snapshot_key( path ):
+                return cached[1]
+
+        snapshot = cls._take_snapshot( path )
+        # Keyed after the fact: `git status` may itself rewrite the index to refresh stat data.
+        key = cls._snapshot_key( path )
+        if key is not None:
+            # Without a resolvable gitdir nothing would show the working copy moving on.
+            with _snapshots_lock:
+                _snapshots[path] = ( key, snapshot )
+        return snapshot
+
+
+    @classmethod
+    def forget_snapshots( cls, path=None ):
+        """Drop remembered snapshots, for ``path`` only when given."""
+        with _snapshots_lock:
+            if path:
+                _snapshots.pop( os.path.abspath( path ), None )
+            else:
+                _snapshots.clear()
+
+
+    @classmethod
+    def working_copy_root( cls, path ):
+        """The nearest directory at or above ``path`` holding ``.git``, or ``None`` outside one."""
+        path = os.path.abspath( path )
+        while not os.path.exists( os.path.join( path, ".git" ) ):
+            parent = os.path.dirname( path )
+            if parent == path:
+                return None
+            path = parent
+        return path
+
+
+    @classmethod
+    def get_working_copy_state( cls, path ):
+        """Branch, upstream, ahead, behind and modified, without touching the network.
+
+        The counts describe the working copy against the upstream ref as it stood after the last
+        fetch. `modified` ignores untracked files: they are not what stops a fast-forward.
+        """
+        snapshot = cls.snapshot( path, refresh=True )
         return WorkingCopyState(
-                branch   = branch,
-                detached = detached,
-                upstream = upstream,
-                ahead    = ahead,
-                behind   = behind,
-                modified = bool( status.strip() )
+                branch   = snapshot.branch,
+                detached = snapshot.detached,
+                upstream = snapshot.upstream,
+                ahead    = snapshot.ahead,
+                behind   = snapshot.behind,
+                modified = snapshot.modified
         )
 
 
@@ -555,23 +683,14 @@ class Git:
         if not path:
             raise cls.Error("No working copy path specified for calling git commands with.")
 
-        url        = None
-        repository = None
-        branch     = None
-        remote     = None
-        revision   = None
-
-        if not os.path.exists( os.path.join( path, ".git" ) ):
-            raise cls.Error("Not a Git working copy")
-
-        revision = cls.get_revision( path )
-
-        branch, remote = cls.get_branch( path )
+        snapshot = cls.snapshot( path )
+        if not snapshot.commit:
+            raise cls.Error("Git working copy [{}] has no commits".format( path ))
+        if not snapshot.url:
+            raise cls.Error("Git working copy [{}] has no origin remote".format( path ))
 
-        command = "{git} config --get remote.origin.url".format( git=cls.binary() )
-        repository = cls.execute_command( command, path )
-        repository = repository.strip()
-        url = repository
+        branch, remote = cls._branch_and_remote( path, snapshot )
+        repository = snapshot.url.strip()
 
-        return url, repository, branch, remote, revision
+        return repository, repository, branch, remote, snapshot.revision
 
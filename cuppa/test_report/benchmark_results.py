@@ -0,0 +1,200 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   Benchmark Results — statistics, the results store and baseline comparison
+#-------------------------------------------------------------------------------
+
+"""Summarise repeated benchmark runs and keep them for comparison with later runs.
+
+Each metric is summarised by its median and its median absolute deviation (MAD), which are not
+thrown by the odd slow run the way a mean and standard deviation are. Summaries are kept in a
+JSON store under ``results[<toolchain/variant>][<commit>][<benchmark>]``; a later run on the same
+toolchain and variant can be compared with the summary recorded for a baseline commit.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+
+from cuppa.log import logger
+from cuppa.colourise import as_notice, as_warning
+
+
+FORMAT = 1
+
+METRICS = ( 'wall_time', 'user_time', 'sys_time', 'max_rss' )
+
+# Metrics a regression is judged on. User and system time of short runs move in whole clock
+# ticks, so they are recorded but not judged.
+CHECKED_METRICS = ( 'wall_time', 'max_rss' )
+
+DEFAULT_REPEATS = 5
+DEFAULT_WARMUP = 1
+DEFAULT_THRESHOLD = 10.0
+
+# A difference must also be this many baseline MADs to count; smaller moves are noise.
+NOISE_MADS = 3.0
+
+PREVIOUS = 'previous'
+
+
+def median( values ):
+    ordered = sorted( values )
+    count = len( ordered )
+    if not count:
+        return None
+    middle = count // 2
+    if count % 2:
+        return ordered[middle]
+    return ( ordered[middle - 1] + ordered[middle] ) / 2.0
+
+
+def median_absolute_deviation( values ):
+    centre = median( values )
+    if centre is None:
+        return None
+    return median( [ abs( value - centre ) for value in values ] )
+
+
+def summarise( samples ):
+    """``{ metric: { median, mad, min, max, samples } }`` for the metrics every sample has."""
+    summary = {}
+    for metric in METRICS:
+        values = [ sample[metric] for sample in samples if sample.get( metric ) is not None ]
+        if not values or len( values ) != len( samples ):
+            continue
+        summary[metric] = {
+            'median'  : median( values ),
+            'mad'     : median_absolute_deviation( values ),
+            'min'     : min( values ),
+            'max'     : max( values ),
+            'samples' : values,
+        }
+    return summary
+
+
+def compare( summary, baseline, threshold=DEFAULT_THRESHOLD ):
+    """Per checked metric: the change from ``baseline`` and whether it is a regression.
+
+    A regression is a median more than ``threshold`` percent above the baseline median, by more
+    than ``NOISE_MADS`` baseline MADs.
+    """
+    comparison = {}
+    for metric in CHECKED_METRICS:
+        current = summary.get( metric )
+        previous = ( baseline or {} ).get( metric )
+        if not current or not previous or not previous.get( 'median' ):
+            continue
+        base = previous['median']
+        change = current['median'] - base
+        percent = 100.0 * change / base
+        regressed = percent > threshold and change > NOISE_MADS * ( previous.get( 'mad' ) or 0 )
+        comparison[metric] = {
+            'baseline'  : base,
+            'median'    : current['median'],
+            'percent'   : percent,
+            'regressed' : regressed,
+        }
+    return comparison
+
+
+def regressions( comparison ):
+    return [ metric for metric, result in sorted( comparison.items() ) if result['regressed'] ]
+
+
+def _utc_now():
+    return datetime.now( timezone.utc ).strftime( '%Y-%m-%dT%H:%M:%SZ' )
+
+
+class BenchmarkStore(object):
+    """Benchmark summaries by toolchain/variant, commit and benchmark, in one JSON file.
+
+    Benchmarks of one build record into the same store from several threads, so every update
+    re-reads the file under a lock and replaces it atomically.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__( self, path ):
+        self._path = path
+
+
+    def path( self ):
+        return self._path
+
+
+    def _load( self ):
+        try:
+            with open( self._path, encoding='utf-8' ) as handle:
+                payload = json.load( handle )
+        except FileNotFoundError:
+            return {}
+        except ( OSError, ValueError ) as error:
+            logger.warn( "Ignoring unreadable benchmark store [{}]: {}".format(
+                    as_notice( self._path ), as_warning( str(error) )
+            ) )
+            return {}
+        if not isinstance( payload, dict ) or payload.get( 'format' ) != FORMAT:
+            return {}
+        return payload.get( 'results' ) or {}
+
+
+    def _save( self, results ):
+        directory = os.path.dirname( self._path ) or '.'
+        os.makedirs( directory, exist_ok=True )
+        fd, temporary = tempfile.mkstemp( prefix='.benchmarks-', suffix='.tmp', dir=directory )
+        try:
+            with os.fdopen( fd, 'w', encoding='utf-8' ) as handle:
+                json.dump( { 'format': FORMAT, 'results': results }, handle, indent=2, sort_keys=True )
+                handle.write( '\n' )
+            os.replace( temporary, self._path )
+        except Exception:
+            try:
+                os.unlink( temporary )
+            except OSError:
+                pass
+            raise
+
+
+    def record( self, tool_variant, commit, name, summary ):
+        with self._lock:
+            results = self._load()
+            entry = dict( summary )
+            entry['recorded'] = _utc_now()
+            results.setdefault( tool_variant, {} ).setdefault( commit, {} )[name] = entry
+            self._save( results )
+
+
+    def baseline( self, tool_variant, name, baseline, commit=None ):
+        """The recorded summary of ``name`` to compare with, or ``None``.
+
+        ``baseline`` is a commit (a unique prefix is enough) or ``previous`` for the most recent
+        recording from a commit other than ``commit``.
+        """
+        with self._lock:
+            commits = self._load().get( tool_variant ) or {}
+        candidates = [
+                ( sha, by_name[name] ) for sha, by_name in commits.items() if by_name.get( name )
+        ]
+        if baseline == PREVIOUS:
+            others = [ summary for sha, summary in candidates if sha != commit ]
+            if not others:
+                return None
+            return max( others, key=lambda summary: summary.get( 'recorded' ) or '' )
+        matches = [ summary for sha, summary in candidates if sha.startswith( baseline ) ]
+        if len( matches ) == 1:
+            return matches[0]
+        return None
+
+
+def render_html( result, destination_path ):
+    """Write the HTML page for one benchmark result."""
+    from cuppa.test_report.html_report import jinja2_templates
+    template = jinja2_templates().get_template( 'benchmark_report.html' )
+    with open( destination_path, 'w', encoding='utf-8' ) as report:
+        report.write( template.render( result=result, metrics=METRICS ) )
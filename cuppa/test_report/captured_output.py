@@ -0,0 +1,89 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   Captured Output — bounded head/tail capture of test process output
+#-------------------------------------------------------------------------------
+
+"""Keep the first and last lines of a test's output in memory; the log file has the rest.
+
+Test runners write every line to a ``.stdout.log``/``.stderr.log`` file and also keep the
+lines on the test case for the JSON and HTML reports. A test that prints millions of lines
+would otherwise hold all of them in the SCons process. ``CapturedLines`` keeps a head and a
+tail and, when lines were dropped, reports them with a marker line naming the log file.
+"""
+
+from collections import deque
+
+
+DEFAULT_HEAD_LINES = 1000
+DEFAULT_TAIL_LINES = 1000
+
+
+def parse_line_limits( value ):
+    """``( head, tail )`` from ``--test-output-lines``: ``N``, ``HEAD:TAIL`` or ``all``.
+
+    ``all`` gives ``( None, None )``, meaning keep every line. Raises ``ValueError``.
+    """
+    if value is None:
+        return DEFAULT_HEAD_LINES, DEFAULT_TAIL_LINES
+    text = str( value ).strip().lower()
+    if text == 'all':
+        return None, None
+    if ':' in text:
+        head, tail = text.split( ':', 1 )
+    else:
+        head = tail = text
+    head, tail = int( head ), int( tail )
+    if head < 0 or tail < 0:
+        raise ValueError( "line limits must not be negative [{}]".format( value ) )
+    return head, tail
+
+
+class CapturedLines(object):
+    """The head and tail of a stream of lines. Iterates like the list it replaces."""
+
+    def __init__( self, head=DEFAULT_HEAD_LINES, tail=DEFAULT_TAIL_LINES, log=None ):
+        self._head_limit = head
+        self._head = []
+        self._tail = deque( maxlen=tail ) if head is not None else None
+        self._log = log
+        self.total = 0
+
+
+    def append( self, line ):
+        self.total += 1
+        if self._head_limit is None or len( self._head ) < self._head_limit:
+            self._head.append( line )
+        elif self._tail.maxlen:
+            self._tail.append( line )
+
+
+    @property
+    def omitted( self ):
+        return self.total - len( self._head ) - ( len( self._tail ) if self._tail is not None else 0 )
+
+
+    def lines( self ):
+        """The kept lines, with a marker where lines were dropped."""
+        if not self.omitted:
+            return list( self._head ) + list( self._tail or [] )
+        marker = "... {} lines omitted{} ...".format(
+                self.omitted,
+                self._log and ", see {}".format( self._log ) or ""
+        )
+        return self._head + [ marker ] + list( self._tail )
+
+
+    def __iter__( self ):
+        return iter( self.lines() )
+
+
+    def __len__( self ):
+        return len( self.lines() )
+
+
+    def __bool__( self ):
+        return self.total > 0
@@ -12,6 +12,7 @@ import json
 
 # cuppa imports
 from cuppa.timer import CpuTimes, Timer
+from cuppa.test_report.captured_output import CapturedLines
 
 
 class Encoder( json.JSONEncoder ):
@@ -32,6 +33,8 @@ class Encoder( json.JSONEncoder ):
                 "system_time"  : obj.elapsed().system,
                 "user_time"    : obj.elapsed().user
             }
+        elif isinstance( obj, CapturedLines ):
+            return obj.lines()
 
         return json.JSONEncoder.default( self, obj )
 
@@ -26,6 +26,7 @@ from cuppa.cpp.create_version_file_cpp import CreateVersionHeaderCpp, CreateVers
 from cuppa.cpp.run_boost_test import RunBoostTestEmitter, RunBoostTest
 from cuppa.cpp.run_patched_boost_test import RunPatchedBoostTestEmitter, RunPatchedBoostTest
 from cuppa.cpp.run_process_test import RunProcessTestEmitter, RunProcessTest
+from cuppa.cpp.run_benchmark import RunBenchmarkEmitter, RunBenchmark
 from cuppa.colourise import as_info, as_notice, as_warning
 from cuppa.log import logger
 
@@ -503,7 +504,7 @@ class Cl(object):
 
     def benchmark_runner( self, benchmarker, final_dir, expected, **kwargs ):
         if not benchmarker or benchmarker =='process':
-            return RunProcessTest( expected, final_dir, **kwargs ), RunProcessTestEmitter( final_dir, **kwargs )
+            return RunBenchmark( expected, final_dir, **kwargs ), RunBenchmarkEmitter( final_dir, **kwargs )
         elif benchmarker == 'boost':
             return RunBoostTest( expected, final_dir, **kwargs ), RunBoostTestEmitter( final_dir, **kwargs )
         elif benchmarker == 'patched_boost':
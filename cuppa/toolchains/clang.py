@@ -13,7 +13,6 @@ import SCons.Script
 from subprocess import Popen, PIPE
 import os
 import re
-import shlex
 import collections
 import platform
 import six
@@ -24,8 +23,9 @@ from cuppa.cpp.create_version_file_cpp import CreateVersionHeaderCpp, CreateVers
 from cuppa.cpp.run_boost_test import RunBoostTestEmitter, RunBoostTest
 from cuppa.cpp.run_patched_boost_test import RunPatchedBoostTestEmitter, RunPatchedBoostTest
 from cuppa.cpp.run_process_test import RunProcessTestEmitter, RunProcessTest
+from cuppa.cpp.run_benchmark import RunBenchmarkEmitter, RunBenchmark
 from cuppa.cpp.run_gcov_coverage import RunGcovCoverageEmitter, RunGcovCoverage, CollateCoverageFilesEmitter, CollateCoverageFilesAction, CollateCoverageIndexEmitter, CollateCoverageIndexAction
-from cuppa.output_processor import command_available
+from cuppa.toolchains import probe_cache
 from cuppa.colourise import as_info, as_notice, as_warning
 from cuppa.log import logger
 from cuppa.utility.python2to3 import as_str, Exception
@@ -64,9 +64,9 @@ class Clang(object):
     @classmethod
     def version_from_command( cls, cxx ):
         command = "{} --version".format( cxx )
-        if command_available( command ):
+        version_string = probe_cache.version_output( command )
+        if version_string is not None:
             reported_version = None
-            version_string = as_str( Popen( shlex.split( command ), stdout=PIPE).communicate()[0] )
             is_apple = bool( re.search( r'Apple (?:clang|LLVM) version', version_string ) )
             matches = re.search( r'based on LLVM (?P<major>\d+)\.(?P<minor>\d)', version_string )
             if not matches:
@@ -139,29 +139,49 @@ class Clang(object):
 
 
     @classmethod
-    def available_versions( cls ):
-        if not hasattr( cls, '_available_versions' ):
-            cls._available_versions = collections.OrderedDict()
-            for version in cls.supported_versions():
+    def _split_supported_version( cls, version ):
+        matches = re.match( r'clang(?P<version>(\d+)?)?', version )
 
-                matches = re.match( r'clang(?P<version>(\d+)?)?', version )
+        if not matches:
+            raise ClangException("Clang toolchain [{}] is not recognised as supported!".format( version ) )
 
-                if not matches:
-                    raise ClangException("Clang toolchain [{}] is not recognised as supported!".format( version ) )
+        major = None
+        minor = None
+
+        version_string = matches.group('version')
+
+        if len(version_string):
+            if int(version_string) <= 30:
+                major = int(version_string)
+            elif len(version_string) == 2:
+                major = int(version_string[0])
+                minor = int(version_string[1])
+            else:
+                major = int(version_string)
+
+        return major, minor
 
-                major = None
-                minor = None
 
-                version_string = matches.group('version')
+    @classmethod
+    def _probe_commands( cls ):
+        commands = [ "clang++ --version --version" ]
+        for version in cls.supported_versions():
+            major, minor = cls._split_supported_version( version )
+            if major and minor:
+                commands.append( "clang++-{}.{} --version".format( major, minor ) )
+            elif major:
+                commands.append( "clang++-{} --version".format( major ) )
+        return commands
+
+
+    @classmethod
+    def available_versions( cls ):
+        if not hasattr( cls, '_available_versions' ):
+            cls._available_versions = collections.OrderedDict()
+            probe_cache.prefetch( cls._probe_commands() )
+            for version in cls.supported_versions():
 
-                if len(version_string):
-                    if int(version_string) <= 30:
-                        major = int(version_string)
-                    elif len(version_string) == 2:
-                        major = int(version_string[0])
-                        minor = int(version_string[1])
-                    else:
-                        major = int(version_string)
+                major, minor = cls._split_supported_version( version )
 
                 if not major and not minor:
                     default_ver, default_cxx = cls.default_version()
@@ -213,8 +233,8 @@ class Clang(object):
     @classmethod
     def llvm_version_from( cls, llvm_tool ):
         command = "{} --version".format( llvm_tool )
-        if command_available( command ):
-            reported_version = as_str( Popen( shlex.split( command ), stdout=PIPE).communicate()[0] )
+        reported_version = probe_cache.version_output( command )
+        if reported_version is not None:
             version = re.search( r'(?:LLVM version|clang version)\s+(\d+)(?:\.(\d+)\.(\d+))?', reported_version )
             if version:
                 return version.group(1)
@@ -533,7 +553,7 @@ class Clang(object):
 
     def benchmark_runner( self, benchmarker, final_dir, expected, **kwargs ):
         if not benchmarker or benchmarker == 'process':
-            return RunProcessTest( expected, final_dir, **kwargs ), RunProcessTestEmitter( final_dir, **kwargs )
+            return RunBenchmark( expected, final_dir, **kwargs ), RunBenchmarkEmitter( final_dir, **kwargs )
         elif benchmarker == 'boost':
             return RunBoostTest( expected, final_dir, **kwargs ), RunBoostTestEmitter( final_dir, **kwargs )
         elif benchmarker == 'patched_boost':
@@ -10,10 +10,8 @@
 
 import SCons.Script
 
-from subprocess import Popen, PIPE
 import os
 import re
-import shlex
 import collections
 import platform
 import six
@@ -22,12 +20,13 @@ from cuppa.cpp.create_version_file_cpp import CreateVersionHeaderCpp, CreateVers
 from cuppa.cpp.run_boost_test import RunBoostTestEmitter, RunBoostTest
 from cuppa.cpp.run_patched_boost_test import RunPatchedBoostTestEmitter, RunPatchedBoostTest
 from cuppa.cpp.run_process_test import RunProcessTestEmitter, RunProcessTest
+from cuppa.cpp.run_benchmark import RunBenchmarkEmitter, RunBenchmark
 from cuppa.cpp.run_gcov_coverage import RunGcovCoverageEmitter, RunGcovCoverage, CollateCoverageFilesEmitter, CollateCoverageFilesAction, CollateCoverageIndexEmitter, CollateCoverageIndexAction
-from cuppa.output_processor import command_available
+from cuppa.toolchains import probe_cache
 from cuppa.log import logger
 from cuppa.colourise import as_notice, as_info
 import cuppa.build_platform
-from cuppa.utility.python2to3 import as_str, Exception
+from cuppa.utility.python2to3 import Exception
 
 
 class GccException(Exception):
@@ -63,9 +62,9 @@ class Gcc(object):
     @classmethod
     def version_from_command( cls, cxx, prefix ):
         command = "{} --version".format( cxx )
-        if command_available( command ):
+        version_string = probe_cache.version_output( command )
+        if version_string is not None:
             reported_version = None
-            version_string = as_str( Popen( shlex.split( command ), stdout=PIPE).communicate()[0] )
             matches = re.search( r'(?P<major>\d+)\.(?P<minor>\d)', version_string )
             if matches:
                 major = matches.group('major')
@@ -105,31 +104,51 @@ class Gcc(object):
 
 
     @classmethod
-    def available_versions( cls ):
-        if not hasattr( cls, '_available_versions' ):
-            cls._available_versions = collections.OrderedDict()
-            for version in cls.supported_versions():
+    def _split_supported_version( cls, version ):
+        matches = re.match( r'gcc(?P<version>(\d+)?)?', version )
+
+        if not matches:
+            raise GccException("GCC toolchain [{}] is not recognised as supported!".format( version ) )
 
-                matches = re.match( r'gcc(?P<version>(\d+)?)?', version )
+        major = None
+        minor = None
 
-                if not matches:
-                    raise GccException("GCC toolchain [{}] is not recognised as supported!".format( version ) )
+        version_string = matches.group('version')
 
-                major = None
-                minor = None
+        if len(version_string) and len(version_string) <= 2 and int(version_string[0]) >= 3:
+            matches = re.match( r'(?P<major>(\d))?(?P<minor>(\d))?', version_string )
+            if matches:
+                major = matches.group('major')
+                minor = matches.group('minor')
+        elif len(version_string) >= 2:
+            matches = re.match( r'(?P<major>(\d\d))?(?P<minor>(\d))?', version_string )
+            if matches:
+                major = matches.group('major')
+                minor = matches.group('minor')
 
-                version_string = matches.group('version')
+        return major, minor
 
-                if len(version_string) and len(version_string) <= 2 and int(version_string[0]) >= 3:
-                    matches = re.match( r'(?P<major>(\d))?(?P<minor>(\d))?', version_string )
-                    if matches:
-                        major = matches.group('major')
-                        minor = matches.group('minor')
-                elif len(version_string) >= 2:
-                    matches = re.match( r'(?P<major>(\d\d))?(?P<minor>(\d))?', version_string )
-                    if matches:
-                        major = matches.group('major')
-                        minor = matches.group('minor')
+
+    @classmethod
+    def _probe_commands( cls ):
+        commands = [ "g++ --version --version" ]
+        for version in cls.supported_versions():
+            major, minor = cls._split_supported_version( version )
+            if major and minor:
+                commands.append( "g++-{}.{} --version".format( major, minor ) )
+            elif major:
+                commands.append( "g++-{} --version".format( major ) )
+        return commands
+
+
+    @classmethod
+    def available_versions( cls ):
+        if not hasattr( cls, '_available_versions' ):
+            cls._available_versions = collections.OrderedDict()
+            probe_cache.prefetch( cls._probe_commands() )
+            for version in cls.supported_versions():
+
+                major, minor = cls._split_supported_version( version )
 
                 if not major and not minor:
                     default_ver, default_cxx = cls.default_version()
@@ -407,7 +426,7 @@ class Gcc(object):
 
     def benchmark_runner( self, benchmarker, final_dir, expected, **kwargs ):
         if not benchmarker or benchmarker == 'process':
-            return RunProcessTest( expected, final_dir, **kwargs ), RunProcessTestEmitter( final_dir, **kwargs )
+            return RunBenchmark( expected, final_dir, **kwargs ), RunBenchmarkEmitter( final_dir, **kwargs )
         elif benchmarker == 'boost':
             return RunBoostTest( expected, final_dir, **kwargs ), RunBoostTestEmitter( final_dir, **kwargs )
         elif benchmarker == 'patched_boost':
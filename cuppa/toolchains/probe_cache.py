@@ -0,0 +1,210 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   Toolchain probe cache — persistent, concurrent `<compiler> --version` probes
+#-------------------------------------------------------------------------------
+
+"""Run toolchain ``--version`` probes once, concurrently, and remember the answers.
+
+Toolchain discovery asks every supported compiler name for its version. Each probe resolves the
+executable on ``PATH`` first, so names that are not installed cost a ``stat`` rather than a
+process spawn, and installed compilers are spawned once. Results are kept in a JSON file keyed by
+``PATH`` and by each compiler binary's path, mtime and size; while none of those change, a repeat
+invocation answers every probe without starting a subprocess.
+
+Set ``CUPPA_TOOLCHAIN_PROBE_CACHE`` to a file path to move the cache, or to an empty string to
+keep probe results in memory only.
+"""
+
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cuppa.log import logger
+from cuppa.colourise import as_notice, as_warning
+from cuppa.utility.python2to3 import as_str
+
+
+CACHE_ENV_VAR = 'CUPPA_TOOLCHAIN_PROBE_CACHE'
+CACHE_FILE_NAME = 'toolchain-probes.json'
+CACHE_FORMAT = 1
+
+# Probes are dominated by process start-up, not CPU; a modest pool saturates that quickly.
+MAX_PROBE_WORKERS = 16
+
+
+def default_cache_path():
+    """Where the probe cache lives, or ``None`` when persistence is disabled."""
+    override = os.environ.get( CACHE_ENV_VAR )
+    if override is not None:
+        return override.strip() and os.path.expanduser( override.strip() ) or None
+    base = os.environ.get( 'XDG_CACHE_HOME' ) or os.path.join( os.path.expanduser( '~' ), '.cache' )
+    return os.path.join( base, 'cuppa', CACHE_FILE_NAME )
+
+
+def _binary_identity( executable ):
+    try:
+        status = os.stat( executable )
+    except OSError:
+        return None
+    return { 'executable': executable, 'mtime': status.st_mtime_ns, 'size': status.st_size }
+
+
+def _run_probe( arguments ):
+    try:
+        with open( os.devnull, 'w' ) as devnull:
+            output = subprocess.Popen( arguments, stdout=subprocess.PIPE, stderr=devnull ).communicate()[0]
+    except OSError:
+        return None
+    return as_str( output )
+
+
+class ToolchainProbeCache(object):
+
+    def __init__( self, cache_path=None, search_path=None ):
+        self._cache_path = cache_path
+        self._search_path = search_path if search_path is not None else os.environ.get( 'PATH', '' )
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+        self._load()
+
+
+    def _load( self ):
+        if not self._cache_path:
+            return
+        try:
+            with open( self._cache_path, encoding='utf-8' ) as handle:
+                payload = json.load( handle )
+        except FileNotFoundError:
+            return
+        except ( OSError, ValueError, TypeError ) as error:
+            logger.debug( "Ignoring unreadable toolchain probe cache [{}]: {}".format(
+                    as_notice( self._cache_path ), as_warning( str( error ) )
+            ) )
+            return
+        if not isinstance( payload, dict ):
+            return
+        if payload.get( 'format' ) != CACHE_FORMAT or payload.get( 'path' ) != self._search_path:
+            return
+        entries = payload.get( 'probes' )
+        if isinstance( entries, dict ):
+            self._entries = entries
+
+
+    def save( self ):
+        with self._lock:
+            if not self._dirty or not self._cache_path:
+                return
+            payload = {
+                'format': CACHE_FORMAT,
+                'path'  : self._search_path,
+                'probes': dict( self._entries ),
+            }
+            self._dirty = False
+
+        directory = os.path.dirname( self._cache_path ) or '.'
+        try:
+            os.makedirs( directory, exist_ok=True )
+            fd, temporary = tempfile.mkstemp( prefix='.probes-', suffix='.tmp', dir=directory )
+            try:
+                with os.fdopen( fd, 'w', encoding='utf-8' ) as handle:
+                    json.dump( payload, handle, indent=2, sort_keys=True )
+                    handle.write( '\n' )
+                os.replace( temporary, self._cache_path )
+            except Exception:
+                try:
+                    os.unlink( temporary )
+                except OSError:
+                    pass
+                raise
+        except OSError as error:
+            logger.debug( "Unable to write toolchain probe cache [{}]: {}".format(
+                    as_notice( self._cache_path ), as_warning( str( error ) )
+            ) )
+
+
+    def _resolve( self, command ):
+        arguments = shlex.split( command )
+        if not arguments:
+            return None, None
+        executable = shutil.which( arguments[0], path=self._search_path )
+        if not executable:
+            return arguments, None
+        return arguments, _binary_identity( os.path.abspath( executable ) )
+
+
+    def version_output( self, command, save=True ):
+        """Standard output of ``command``, or ``None`` when its executable is not available."""
+        arguments, identity = self._resolve( command )
+        if not identity:
+            return None
+
+        with self._lock:
+            entry = self._entries.get( command )
+        if entry and entry.get( 'binary' ) == identity:
+            return entry.get( 'output' )
+
+        logger.trace( "Probing toolchain with [{}]".format( as_notice( command ) ) )
+        output = _run_probe( [ identity['executable'] ] + arguments[1:] )
+
+        with self._lock:
+            self._entries[command] = { 'binary': identity, 'output': output }
+            self._dirty = True
+        if save:
+            self.save()
+        return output
+
+
+    def prefetch( self, commands, max_workers=None ):
+        """Probe ``commands`` concurrently so later ``version_output`` calls are cache hits."""
+        pending = []
+        for command in commands:
+            if command not in pending:
+                pending.append( command )
+        if not pending:
+            return
+        workers = max( 1, min( max_workers or MAX_PROBE_WORKERS, len( pending ) ) )
+        if workers == 1:
+            for command in pending:
+                self.version_output( command, save=False )
+        else:
+            with ThreadPoolExecutor( max_workers=workers ) as executor:
+                list( executor.map( lambda command: self.version_output( command, save=False ), pending ) )
+        self.save()
+
+
+_probe_cache = None
+_probe_cache_lock = threading.Lock()
+
+
+def probe_cache():
+    """The process-wide probe cache, created on first use."""
+    global _probe_cache
+    with _probe_cache_lock:
+        if _probe_cache is None:
+            _probe_cache = ToolchainProbeCache( default_cache_path() )
+        return _probe_cache
+
+
+def reset_probe_cache( cache=None ):
+    """Replace (or drop) the process-wide probe cache; used by tests."""
+    global _probe_cache
+    with _probe_cache_lock:
+        _probe_cache = cache
+
+
+def version_output( command ):
+    return probe_cache().version_output( command )
+
+
+def prefetch( commands ):
+    probe_cache().prefetch( commands )
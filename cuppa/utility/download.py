@@ -15,19 +15,23 @@ for secret masking — those pipes are not TTYs and are consumed line-by-line.
 
 from __future__ import print_function
 
+from contextlib import contextmanager
+import hashlib
 import logging
 import os
 import shutil
 import subprocess
 import sys
 import tarfile
+import threading
 import time
 import zipfile
 
 try:
     from urllib.request import urlopen, Request
+    from urllib.error import HTTPError
 except ImportError:
-    from urllib2 import urlopen, Request
+    from urllib2 import urlopen, Request, HTTPError
 
 from cuppa.colourise import as_emphasised, as_info, as_subdued
 from cuppa.log import logger
@@ -44,6 +48,10 @@ class DownloadError( CuppaException ):
 
 
 _CHUNK_SIZE = 256 * 1024
+# Extra attempts within one ``download_file`` call, each resuming where the last stopped.
+_RESUME_RETRIES = 3
+# Beside ``<dest>.partial``: the ``If-Range`` validator of the response the partial came from.
+_VALIDATOR_SUFFIX = '.validator'
 _TTY_INTERVAL_S = 0.35
 _LINE_INTERVAL_S = 2.0
 _LINE_PERCENT_STEP = 5
@@ -327,9 +335,35 @@ def _content_length( response ):
     return length if length > 0 else None
 
 
+_quiet_transfers = threading.local()
+
+
+@contextmanager
+def transfer_progress_suppressed():
+    """Suppress default per-transfer progress on this thread.
+
+    Used while several retrievals run concurrently and report through a shared summary
+    instead; rewriting progress lines from many threads would overwrite each other.
+    """
+    previous = getattr( _quiet_transfers, 'active', False )
+    _quiet_transfers.active = True
+    try:
+        yield
+    finally:
+        _quiet_transfers.active = previous
+
+
+def transfer_progress_allowed():
+    """False while ``transfer_progress_suppressed`` is active on this thread."""
+    return not getattr( _quiet_transfers, 'active', False )
+
+
 def _maybe_reporter( show_progress, reporter, action ):
     if show_progress is None:
-        show_progress = logger.isEnabledFor( logging.INFO )
+        show_progress = (
+                transfer_progress_allowed()
+                and logger.isEnabledFor( logging.INFO )
+        )
     if not show_progress:
         return None
     if reporter is not None:
@@ -506,6 +540,150 @@ def extract_zip_archive(
     return extract_root
 
 
+def _partial_size( path ):
+    try:
+        return os.path.getsize( path )
+    except OSError:
+        return 0
+
+
+def _discard( path ):
+    if os.path.isfile( path ):
+        try:
+            os.remove( path )
+        except OSError:
+            pass
+
+
+def _discard_partial( tmp_path ):
+    _discard( tmp_path )
+    _discard( tmp_path + _VALIDATOR_SUFFIX )
+
+
+def _header( response, name ):
+    headers = getattr( response, 'headers', None ) or {}
+    try:
+        return headers.get( name )
+    except AttributeError:
+        return None
+
+
+def _validator( response ):
+    """A strong ``ETag`` of ``response``, else its ``Last-Modified``, for use in ``If-Range``."""
+    etag = ( _header( response, 'ETag' ) or '' ).strip()
+    if etag and not etag.startswith( 'W/' ):
+        return etag
+    modified = ( _header( response, 'Last-Modified' ) or '' ).strip()
+    return modified or None
+
+
+def _read_validator( tmp_path ):
+    try:
+        with open( tmp_path + _VALIDATOR_SUFFIX, encoding='utf-8' ) as handle:
+            return handle.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_validator( tmp_path, validator ):
+    if not validator:
+        _discard( tmp_path + _VALIDATOR_SUFFIX )
+        return
+    with open( tmp_path + _VALIDATOR_SUFFIX, 'w', encoding='utf-8' ) as handle:
+        handle.write( validator )
+
+
+def _status_code( response ):
+    code = getattr( response, 'status', None )
+    if code is None:
+        getcode = getattr( response, 'getcode', None )
+        code = getcode() if callable( getcode ) else None
+    return code or 200
+
+
+def _content_range( response ):
+    """``(first_byte, complete_length)`` from a ``Content-Range`` header, if present.
+
+    A ``416`` answer carries ``bytes */<complete_length>``, giving a ``first_byte`` of None.
+    """
+    value = _header( response, 'Content-Range' )
+    if not value:
+        return None, None
+    try:
+        unit, _, span = value.strip().partition( ' ' )
+        if unit.lower() != 'bytes':
+            return None, None
+        byte_range, _, complete = span.partition( '/' )
+        first = int( byte_range.split( '-' )[0] ) if byte_range.strip() != '*' else None
+        length = int( complete ) if complete.strip() not in ( '', '*' ) else None
+        return first, length
+    except ( TypeError, ValueError ):
+        return None, None
+
+
+def _hash_file_into( digest, path ):
+    with open( path, 'rb' ) as handle:
+        while True:
+            chunk = handle.read( _CHUNK_SIZE )
+            if not chunk:
+                break
+            digest.update( chunk )
+
+
+class _RangeNotSatisfiable( Exception ):
+
+    def __init__( self, complete_length ):
+        super( _RangeNotSatisfiable, self ).__init__( complete_length )
+        self.complete_length = complete_length
+
+
+def _open_request( url, headers, offset, validator=None ):
+    request = Request( url )
+    if headers:
+        for name, value in headers.items():
+            if name is None or value is None:
+                continue
+            request.add_header( str( name ), str( value ) )
+    if offset:
+        request.add_header( 'Range', 'bytes={}-'.format( offset ) )
+        if validator:
+            # A server holding a different file ignores the range and sends all of it.
+            request.add_header( 'If-Range', validator )
+    try:
+        return urlopen( request )
+    except HTTPError as error:
+        if offset and error.code == 416:
+            raise _RangeNotSatisfiable( _content_range( error )[1] )
+        raise
+
+
+def verify_download( path, expected_sha256=None, expected_size=None, sha256=None ):
+    """Raise ``DownloadError`` when ``path`` does not match the expected size or SHA-256.
+
+    Pass ``sha256`` when the digest was already computed while streaming; otherwise the
+    file is read once to compute it.
+    """
+    if expected_size is not None:
+        actual_size = _partial_size( path )
+        if actual_size != int( expected_size ):
+            raise DownloadError(
+                "size mismatch for [{}]: expected {} bytes, got {}".format(
+                    path, int( expected_size ), actual_size
+                )
+            )
+    if expected_sha256:
+        if sha256 is None:
+            digest = hashlib.sha256()
+            _hash_file_into( digest, path )
+            sha256 = digest.hexdigest()
+        if sha256.lower() != expected_sha256.strip().lower():
+            raise DownloadError(
+                "sha256 mismatch for [{}]: expected {}, got {}".format(
+                    path, expected_sha256.strip().lower(), sha256.lower()
+                )
+            )
+
+
 def download_file(
         url,
         dest_path,
@@ -514,6 +692,9 @@ def download_file(
         show_progress=None,
         reporter=None,
         headers=None,
+        expected_sha256=None,
+        expected_size=None,
+        retries=_RESUME_RETRIES,
 ):
     """Download ``url`` to ``dest_path`` via a ``.partial`` file then rename.
 
@@ -524,55 +705,136 @@ def download_file(
     ``headers`` is an optional mapping of HTTP header name to value (for example
     GitLab ``PRIVATE-TOKEN`` / ``JOB-TOKEN``). Header values must not appear in
     ``label`` or other logged progress text.
+
+    An interrupted transfer leaves its ``.partial`` file behind. The next attempt, either a
+    retry within this call (up to ``retries`` while bytes keep arriving) or a later call,
+    asks for the remainder with an HTTP ``Range`` request and appends to it; servers that
+    ignore ``Range`` simply send the whole file again. The ``ETag`` (or ``Last-Modified``) of
+    the response that started the partial is kept beside it and sent as ``If-Range``, so a
+    file changed on the server is sent whole rather than appended to old bytes. A partial with
+    no such validator is only resumed when ``expected_sha256`` can catch a mismatch; a
+    partial the server reports as already complete is kept. ``expected_sha256`` and
+    ``expected_size`` are checked against the bytes as they stream (a resumed prefix is
+    hashed from disk first); a mismatch discards the partial and raises ``DownloadError``.
     """
     progress = _maybe_reporter( show_progress, reporter, 'Downloading' )
 
     parent = os.path.dirname( dest_path )
     if parent and not os.path.isdir( parent ):
-        os.makedirs( parent )
+        os.makedirs( parent, exist_ok=True )
 
     tmp_path = dest_path + '.partial'
     display = label or os.path.basename( dest_path ) or url
 
     bytes_so_far = 0
+    digest = None
+    attempts = 0
+    restarted = False
+    began = False
     try:
-        request = Request( url )
-        if headers:
-            for name, value in headers.items():
-                if name is None or value is None:
-                    continue
-                request.add_header( str( name ), str( value ) )
-        response = urlopen( request )
-        try:
-            total = _content_length( response )
-            if progress:
-                progress.begin( display, total, action='Downloading' )
-            with open( tmp_path, 'wb' ) as handle:
-                while True:
-                    chunk = response.read( _CHUNK_SIZE )
-                    if not chunk:
-                        break
-                    handle.write( chunk )
-                    bytes_so_far += len( chunk )
-                    if progress:
-                        progress.update( bytes_so_far )
-            if total is not None and bytes_so_far < total:
-                raise DownloadError(
-                    "retrieval incomplete: got only {} out of {} bytes from [{}]".format(
-                        bytes_so_far, total, url
+        while True:
+            offset = _partial_size( tmp_path )
+            validator = _read_validator( tmp_path ) if offset else None
+            if offset and not validator and not expected_sha256:
+                # Nothing would show the partial is still a prefix of the remote file.
+                logger.debug( "Not resuming [{}]: no validator for its partial download".format( display ) )
+                _discard_partial( tmp_path )
+                offset = 0
+            attempt_start = offset
+            try:
+                response = _open_request( url, headers, offset, validator )
+            except _RangeNotSatisfiable as error:
+                if error.complete_length == offset:
+                    # The partial already holds the whole file; verification below checks it.
+                    bytes_so_far = offset
+                    digest = None
+                    break
+                # The partial no longer lines up with what the server holds; start over once.
+                if restarted:
+                    raise DownloadError(
+                        "server rejected every byte range for [{}]".format( url )
                     )
-                )
-        finally:
+                restarted = True
+                _discard_partial( tmp_path )
+                continue
             try:
-                response.close()
+                first, total = None, None
+                if offset and _status_code( response ) == 206:
+                    first, total = _content_range( response )
+                    if total is None:
+                        length = _content_length( response )
+                        total = offset + length if length is not None else None
+                if first != offset:
+                    # Range ignored (plain 200) or answered from elsewhere: take the full body.
+                    offset = 0
+                    total = _content_length( response )
+                if expected_size is not None and total is not None and total != int( expected_size ):
+                    raise DownloadError(
+                        "size mismatch for [{}]: expected {} bytes, server reports {}".format(
+                            url, int( expected_size ), total
+                        )
+                    )
+
+                digest = hashlib.sha256() if expected_sha256 else None
+                if not offset:
+                    _write_validator( tmp_path, _validator( response ) )
+                if offset:
+                    logger.debug( "Resuming download of [{}] from byte {}".format( display, offset ) )
+                    if digest is not None:
+                        _hash_file_into( digest, tmp_path )
+                bytes_so_far = attempt_start = offset
+                if progress:
+                    if not began:
+                        progress.begin( display, total, action='Downloading' )
+                        began = True
+                    progress.update( bytes_so_far, force=True )
+                with open( tmp_path, 'ab' if offset else 'wb' ) as handle:
+                    while True:
+                        chunk = response.read( _CHUNK_SIZE )
+                        if not chunk:
+                            break
+                        handle.write( chunk )
+                        if digest is not None:
+                            digest.update( chunk )
+                        bytes_so_far += len( chunk )
+                        if progress:
+                            progress.update( bytes_so_far )
+                if total is not None and bytes_so_far < total:
+                    raise IOError(
+                        "retrieval incomplete: got only {} out of {} bytes from [{}]".format(
+                            bytes_so_far, total, url
+                        )
+                    )
+                break
+            except DownloadError:
+                raise
             except Exception:
-                pass
+                if bytes_so_far > attempt_start and attempts < retries:
+                    attempts += 1
+                    logger.debug( "Download of [{}] interrupted at byte {}; retrying ({}/{})".format(
+                            display, bytes_so_far, attempts, retries
+                    ) )
+                    continue
+                raise
+            finally:
+                try:
+                    response.close()
+                except Exception:
+                    pass
+
+        verify_download(
+                tmp_path,
+                expected_sha256=expected_sha256,
+                expected_size=expected_size,
+                sha256=digest.hexdigest() if digest is not None else None,
+        )
 
         if progress:
             progress.done( bytes_so_far )
         if os.path.isfile( dest_path ):
             os.remove( dest_path )
         os.rename( tmp_path, dest_path )
+        _discard( tmp_path + _VALIDATOR_SUFFIX )
         return dest_path
     except Exception as error:
         if progress is not None:
@@ -580,13 +842,13 @@ def download_file(
                 progress.done( bytes_so_far )
             except Exception:
                 pass
-        if os.path.isfile( tmp_path ):
-            try:
-                os.remove( tmp_path )
-            except OSError:
-                pass
         if isinstance( error, DownloadError ):
+            # Verification failures mean the partial is not the file we want.
+            _discard_partial( tmp_path )
             raise
+        # Keep whatever arrived so the next attempt can resume it; an empty partial is noise.
+        if _partial_size( tmp_path ) == 0:
+            _discard_partial( tmp_path )
         raise DownloadError(
             "failed to download [{}]: {}".format( url, error )
         )
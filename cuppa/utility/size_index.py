@@ -0,0 +1,198 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   Size index — incremental, exact sizing of large directory trees
+#-------------------------------------------------------------------------------
+
+"""Remember, per directory, the bytes and newest mtime of the files directly inside it.
+
+A later measurement stats each remembered directory and only lists again those whose mtime has
+moved; adding, removing or renaming an entry always updates its parent directory's mtime, so
+the totals stay exact for the way dependency trees change (checkouts, extracts, removals).
+Rewriting an existing file in place does not touch its directory, so an index can be told to
+start again (``rescan=True``), which is what ``--exact-sizes`` does.
+
+Directories modified within ``RACY_WINDOW_NS`` of being read are read again next time, because
+a second change within the same timestamp tick would otherwise go unnoticed.
+
+Totals follow ``storage.directory_stats``: regular files and symlinks count their ``lstat``
+size, symlinks to directories are neither followed nor counted.
+"""
+
+import json
+import os
+import stat
+import tempfile
+import time
+
+from cuppa.log import logger
+from cuppa.colourise import as_notice, as_warning
+from cuppa.utility import storage
+
+
+FORMAT = 1
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+
+def _read_directory( path ):
+    """``( bytes, newest, subdirs )`` for the entries directly inside ``path``."""
+    total = 0
+    newest = None
+    subdirs = []
+    try:
+        entries = os.scandir( path )
+    except OSError:
+        return 0, None, []
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir( follow_symlinks=False ):
+                    subdirs.append( entry.name )
+                    continue
+                info = entry.stat( follow_symlinks=False )
+                if stat.S_ISLNK( info.st_mode ):
+                    try:
+                        if stat.S_ISDIR( os.stat( entry.path ).st_mode ):
+                            continue
+                    except OSError:
+                        pass
+                elif not stat.S_ISREG( info.st_mode ):
+                    continue
+            except OSError:
+                continue
+            total += info.st_size
+            newest = info.st_mtime if newest is None else max( newest, info.st_mtime )
+    return total, newest, sorted( subdirs )
+
+
+class SizeIndex(object):
+    """The size index for one tree, kept in ``index_path``."""
+
+    def __init__( self, index_path ):
+        self._index_path = index_path
+        self._directories = {}
+        self._scanned_at_ns = 0
+        self.read = 0
+        self.reused = 0
+        self._load()
+
+
+    def _load( self ):
+        try:
+            with open( self._index_path, encoding='utf-8' ) as handle:
+                payload = json.load( handle )
+        except FileNotFoundError:
+            return
+        except ( OSError, ValueError, TypeError ) as error:
+            logger.debug( "Ignoring unreadable size index [{}]: {}".format(
+                    as_notice( self._index_path ), as_warning( str( error ) )
+            ) )
+            return
+        if isinstance( payload, dict ) and payload.get( 'format' ) == FORMAT:
+            directories = payload.get( 'directories' )
+            if isinstance( directories, dict ):
+                self._directories = directories
+                self._scanned_at_ns = int( payload.get( 'scanned_at_ns' ) or 0 )
+
+
+    def exists( self ):
+        return bool( self._directories )
+
+
+    def _trusted( self, record, mtime_ns ):
+        return (
+                record is not None
+                and record[0] == mtime_ns
+                and mtime_ns < self._scanned_at_ns - RACY_WINDOW_NS
+        )
+
+
+    def changed( self, path ):
+        """True when a measurement would read any directory again. Stats directories only."""
+        if not self._directories:
+            return True
+        for relative, record in self._directories.items():
+            try:
+                mtime_ns = os.lstat( os.path.join( path, relative ) if relative else path ).st_mtime_ns
+            except OSError:
+                return True
+            if not self._trusted( record, mtime_ns ):
+                return True
+        return False
+
+
+    def measure( self, path, rescan=False ):
+        """Exact ``storage.DirectoryStats`` for ``path``, reading only changed directories."""
+        if not os.path.exists( path ):
+            return storage.DirectoryStats( 0, None )
+        if os.path.islink( path ) or os.path.isfile( path ):
+            return storage.directory_stats( path )
+
+        scanned_at_ns = time.time_ns()
+        previous = {} if rescan else self._directories
+        directories = {}
+        total = 0
+        newest = None
+        pending = [ '' ]
+
+        while pending:
+            relative = pending.pop()
+            directory = os.path.join( path, relative ) if relative else path
+            try:
+                info = os.lstat( directory )
+            except OSError:
+                continue
+            record = previous.get( relative )
+            if self._trusted( record, info.st_mtime_ns ):
+                self.reused += 1
+            else:
+                self.read += 1
+                bytes_, files_newest, subdirs = _read_directory( directory )
+                record = [ info.st_mtime_ns, bytes_, files_newest, subdirs ]
+            directories[relative] = record
+
+            total += record[1]
+            for candidate in ( info.st_mtime, record[2] ):
+                if candidate is not None:
+                    newest = candidate if newest is None else max( newest, candidate )
+            pending.extend( os.path.join( relative, name ) if relative else name for name in record[3] )
+
+        self._directories = directories
+        self._scanned_at_ns = scanned_at_ns
+        self._save()
+        return storage.DirectoryStats( total, newest )
+
+
+    def _save( self ):
+        directory = os.path.dirname( self._index_path ) or '.'
+        try:
+            os.makedirs( directory, exist_ok=True )
+            fd, temporary = tempfile.mkstemp( prefix='.sizes-', suffix='.tmp', dir=directory )
+            try:
+                with os.fdopen( fd, 'w', encoding='utf-8' ) as handle:
+                    json.dump( {
+                        'format': FORMAT,
+                        'scanned_at_ns': self._scanned_at_ns,
+                        'directories': self._directories,
+                    }, handle, separators=( ',', ':' ) )
+                os.replace( temporary, self._index_path )
+            except Exception:
+                try:
+                    os.unlink( temporary )
+                except OSError:
+                    pass
+                raise
+        except OSError as error:
+            logger.debug( "Unable to write size index [{}]: {}".format(
+                    as_notice( self._index_path ), as_warning( str( error ) )
+            ) )
+
+
+    def remove( self ):
+        try:
+            os.unlink( self._index_path )
+        except FileNotFoundError:
+            pass
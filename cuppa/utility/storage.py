@@ -314,25 +314,32 @@ def directory_stats( path ):
         info = os.lstat( path )
         return DirectoryStats( info.st_size, info.st_mtime )
 
-    for root, dirnames, filenames in os.walk( path, followlinks=False ):
-        dirnames[:] = [
-            name for name in dirnames
-            if not os.path.islink( os.path.join( root, name ) )
-        ]
+    # os.scandir reports entry types from the directory listing itself, so only files are
+    # stat'ed; that matters on network filesystems where every stat is a round trip.
+    pending = [ path ]
+    while pending:
+        root = pending.pop()
         try:
             root_mtime = os.lstat( root ).st_mtime
             newest = root_mtime if newest is None else max( newest, root_mtime )
+            entries = os.scandir( root )
         except OSError:
-            pass
-        for name in filenames:
-            filepath = os.path.join( root, name )
-            try:
-                info = os.lstat( filepath )
-            except OSError:
-                continue
-            if stat.S_ISREG( info.st_mode ) or stat.S_ISLNK( info.st_mode ):
-                total += info.st_size
-                newest = info.st_mtime if newest is None else max( newest, info.st_mtime )
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir( follow_symlinks=False ):
+                        pending.append( entry.path )
+                        continue
+                    info = entry.stat( follow_symlinks=False )
+                    if stat.S_ISLNK( info.st_mode ) and os.path.isdir( entry.path ):
+                        # Symlinked directories are neither followed nor counted.
+                        continue
+                except OSError:
+                    continue
+                if stat.S_ISREG( info.st_mode ) or stat.S_ISLNK( info.st_mode ):
+                    total += info.st_size
+                    newest = info.st_mtime if newest is None else max( newest, info.st_mtime )
     return DirectoryStats( total, newest )
 
 
@@ -0,0 +1,144 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   Test pool — test and run processes in their own slots, longest first
+#-------------------------------------------------------------------------------
+
+"""Run test and run-action processes in slots of their own rather than in the build's ``-j``.
+
+With ``--test-jobs=N`` SCons is given ``N`` more jobs than the build asked for. Build commands
+(everything spawned through the toolchain, plus Boost's ``b2`` and the coverage tools run by
+cuppa's actions) are held to the original ``-j`` by ``build_slot`` and test processes to ``N``
+by ``test_slot``, so a long test no longer occupies a compile slot and the test phase is not
+limited by how many compiles the machine can take. Other Python actions that start processes
+themselves are not held and may use any of the ``-j + N`` workers. Conan installs happen while
+sconscripts are read, before any worker runs.
+
+When more tests are ready than there are slots, the one that took longest last time starts
+first, using the ``wall_time`` of the previous run's cuppa JSON report; tests without a report
+go before all of them. Without ``--test-jobs`` neither kind of slot limits anything.
+"""
+
+import heapq
+import itertools
+import json
+import threading
+from contextlib import contextmanager
+
+
+class ExecutionPool(object):
+    """At most ``jobs`` holders at once; waiting holders are admitted longest expected first."""
+
+    def __init__( self, jobs ):
+        self._jobs = max( 1, int( jobs ) )
+        self._running = 0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+
+    def jobs( self ):
+        return self._jobs
+
+
+    @classmethod
+    def _priority( cls, expected_duration ):
+        # Unknown durations first, then longest first.
+        if expected_duration is None:
+            return ( 0, 0.0 )
+        return ( 1, -expected_duration )
+
+
+    @contextmanager
+    def slot( self, expected_duration=None ):
+        ticket = ( self._priority( expected_duration ), next( self._sequence ) )
+        with self._condition:
+            heapq.heappush( self._waiting, ticket )
+            while self._running >= self._jobs or self._waiting[0] != ticket:
+                self._condition.wait()
+            heapq.heappop( self._waiting )
+            self._running += 1
+            # The next waiter may be admitted too if there is another free slot.
+            self._condition.notify_all()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._running -= 1
+                self._condition.notify_all()
+
+
+_lock = threading.Lock()
+_test_pool = None
+_build_slots = None
+
+
+def configure( test_jobs=None, build_jobs=None ):
+    """Give tests ``test_jobs`` slots of their own and hold build commands to ``build_jobs``.
+
+    ``test_jobs`` of ``None`` or ``0`` removes both limits.
+    """
+    global _test_pool, _build_slots
+    with _lock:
+        if test_jobs:
+            _test_pool = ExecutionPool( test_jobs )
+            _build_slots = threading.BoundedSemaphore( max( 1, int( build_jobs or 1 ) ) )
+        else:
+            _test_pool = None
+            _build_slots = None
+
+
+def test_jobs():
+    pool = _test_pool
+    return pool and pool.jobs() or None
+
+
+@contextmanager
+def test_slot( expected_duration=None ):
+    pool = _test_pool
+    if pool is None:
+        yield
+        return
+    with pool.slot( expected_duration ):
+        yield
+
+
+@contextmanager
+def build_slot():
+    slots = _build_slots
+    if slots is None:
+        yield
+        return
+    with slots:
+        yield
+
+
+def previous_wall_time( report_path, scale=1.0 ):
+    """The total ``wall_time`` of the test cases in a cuppa JSON report, in seconds, or ``None``.
+
+    ``scale`` converts the report's unit to seconds (patched Boost.Test reports nanoseconds).
+    """
+    try:
+        with open( report_path ) as report:
+            test_cases = json.load( report )
+    except ( OSError, ValueError ):
+        return None
+    if not isinstance( test_cases, list ):
+        return None
+    wall_times = [
+            test_case['wall_time'] for test_case in test_cases
+            if isinstance( test_case, dict ) and isinstance( test_case.get( 'wall_time' ), ( int, float ) )
+    ]
+    if not wall_times:
+        return None
+    return sum( wall_times ) * scale
+
+
+def timeout_from( timeout, env ):
+    """The timeout in seconds for one test: its own, else ``--test-timeout``; ``None`` for none."""
+    if timeout is None:
+        timeout = env.get( 'test_timeout' )
+    return timeout and timeout > 0 and timeout or None
@@ -0,0 +1,211 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   Test result cache — skip tests whose inputs have not changed
+#-------------------------------------------------------------------------------
+
+"""Keep the outputs of passing tests by the content of everything the test run depends on.
+
+A test's key is a digest of the test program and the shared libraries it was linked with, its
+data dependencies (``depends_on`` / ``test_depends_on``), the environment it runs in and how it
+is run (runner, command, working directory, expected outcome). When ``--test-cache=DIR`` is set
+and an entry for the key exists, the ``.success`` file, the cuppa JSON report and the logs are
+copied back from it instead of running the test, so a clean build or a fresh checkout does not
+rerun unchanged tests. Only passing runs are stored; ``--force-test`` always runs.
+
+Entries live under ``DIR/<key[:2]>/<key>/`` and are written to a temporary directory and renamed
+into place, so several builds (or machines) can share one cache directory.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from cuppa.colourise import as_emphasised, as_highlighted, as_notice, as_warning
+from cuppa.log import logger
+
+
+FORMAT = 1
+
+MANIFEST = 'manifest.json'
+
+
+def file_digest( path ):
+    digest = hashlib.sha256()
+    with open( path, 'rb' ) as content:
+        for block in iter( lambda: content.read( 1024 * 1024 ), b'' ):
+            digest.update( block )
+    return digest.hexdigest()
+
+
+def tree_digest( path ):
+    """Digest of a file, or of the names and contents of every file under a directory."""
+    if not os.path.isdir( path ):
+        return os.path.exists( path ) and file_digest( path ) or None
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk( path ):
+        dirs.sort()
+        for name in sorted( files ):
+            file_path = os.path.join( root, name )
+            digest.update( os.path.relpath( file_path, path ).replace( os.sep, '/' ).encode( 'utf-8' ) )
+            digest.update( file_digest( file_path ).encode( 'utf-8' ) )
+    return digest.hexdigest()
+
+
+def _relative_to( path, base ):
+    if base:
+        try:
+            return os.path.relpath( path, base ).replace( os.sep, '/' )
+        except ValueError:
+            pass
+    return path
+
+
+def _shared_libraries( program, env ):
+    suffix = env.get( 'SHLIBSUFFIX' )
+    children = getattr( program, 'children', None )
+    if not suffix or not children:
+        return []
+    return sorted( str( child.abspath ) for child in children() if str( child ).endswith( suffix ) )
+
+
+def _process_env( env, inherit_process_env ):
+    if env.get( 'ENV' ) is None:
+        return {}
+    from cuppa.output_processor import IncrementalSubProcess
+    return IncrementalSubProcess._subprocess_env(
+            env['ENV'], scons_env=env, inherit_process_env=inherit_process_env
+    )
+
+
+def test_key( source, env, settings, inherit_process_env=None ):
+    """The cache key for running ``source[0]`` with ``settings`` in ``env``."""
+    base = env.get( 'sconstruct_dir' )
+    program = source[0]
+    inputs = {
+        'format'   : FORMAT,
+        'program'  : [ os.path.basename( str( program.abspath ) ), file_digest( str( program.abspath ) ) ],
+        'libraries': [
+                [ os.path.basename( library ), tree_digest( library ) ]
+                for library in _shared_libraries( program, env )
+        ],
+        'data'     : [
+                [ _relative_to( str( node.abspath ), base ), tree_digest( str( node.abspath ) ) ]
+                for node in source[1:]
+        ],
+        'env'      : sorted( _process_env( env, inherit_process_env ).items() ),
+        'settings' : {
+                # Absolute paths (a working_dir) differ between checkouts of the same tree.
+                name: isinstance( value, str ) and os.path.isabs( value ) and _relative_to( value, base ) or value
+                for name, value in settings.items()
+        },
+    }
+    text = json.dumps( inputs, sort_keys=True, default=str )
+    return hashlib.sha256( text.encode( 'utf-8' ) ).hexdigest()
+
+
+class TestResultCache(object):
+
+    def __init__( self, root ):
+        self._root = root
+
+
+    def entry_path( self, key ):
+        return os.path.join( self._root, key[:2], key )
+
+
+    def restore( self, key, targets ):
+        """Copy an entry's files over ``targets``; ``False`` if there is no usable entry."""
+        entry = self.entry_path( key )
+        try:
+            with open( os.path.join( entry, MANIFEST ), encoding='utf-8' ) as handle:
+                manifest = json.load( handle )
+        except ( OSError, ValueError ):
+            return False
+        files = manifest.get( 'files' ) or {}
+        if manifest.get( 'format' ) != FORMAT or not all( os.path.basename( t ) in files for t in targets ):
+            return False
+        try:
+            for target in targets:
+                directory = os.path.dirname( target )
+                if directory:
+                    os.makedirs( directory, exist_ok=True )
+                shutil.copyfile( os.path.join( entry, files[ os.path.basename( target ) ] ), target )
+        except OSError as error:
+            logger.warn( "Could not restore cached test result [{}]: {}".format(
+                    as_notice( key ), as_warning( str(error) )
+            ) )
+            return False
+        return True
+
+
+    def store( self, key, targets ):
+        entry = self.entry_path( key )
+        if os.path.exists( entry ):
+            return
+        parent = os.path.dirname( entry )
+        try:
+            os.makedirs( parent, exist_ok=True )
+            staging = tempfile.mkdtemp( prefix='.' + key[:8] + '-', dir=parent )
+        except OSError as error:
+            logger.warn( "Could not store test result in [{}]: {}".format(
+                    as_notice( self._root ), as_warning( str(error) )
+            ) )
+            return
+        try:
+            files = {}
+            for index, target in enumerate( targets ):
+                name = str( index )
+                shutil.copyfile( target, os.path.join( staging, name ) )
+                files[ os.path.basename( target ) ] = name
+            with open( os.path.join( staging, MANIFEST ), 'w', encoding='utf-8' ) as handle:
+                json.dump( { 'format': FORMAT, 'files': files }, handle, indent=2, sort_keys=True )
+            # Another build may have stored the same key meanwhile; either copy will do.
+            os.rename( staging, entry )
+        except OSError as error:
+            if not os.path.exists( entry ):
+                logger.warn( "Could not store test result in [{}]: {}".format(
+                        as_notice( self._root ), as_warning( str(error) )
+                ) )
+        finally:
+            shutil.rmtree( staging, ignore_errors=True )
+
+
+class CachedTest(object):
+    """Wrap a test action so that unchanged, previously passing tests are restored, not run."""
+
+    def __init__( self, action, cache_root, inherit_process_env=None, **settings ):
+        self._action = action
+        self._cache = TestResultCache( cache_root )
+        self._inherit_process_env = inherit_process_env
+        self._settings = settings
+        # SCons names the action after the callable; keep the runner's name.
+        self.__name__ = getattr( action, '__name__', type( action ).__name__ )
+
+
+    def __call__( self, target, source, env ):
+        targets = [ str( node ) for node in target ]
+        try:
+            key = test_key( source, env, self._settings, self._inherit_process_env )
+        except OSError as error:
+            logger.debug( "Not caching test [{}]: {}".format( as_notice( str( source[0] ) ), str(error) ) )
+            return self._action( target, source, env )
+
+        if self._cache.restore( key, targets ):
+            sys.stdout.write(
+                as_emphasised( "\nTest [{}]...".format( os.path.basename( str( source[0] ) ) ) )
+                + " " + as_highlighted( 'passed', " = PASSED = " ) + " (cached)\n"
+            )
+            return None
+
+        result = self._action( target, source, env )
+        succeeded = [ t for t in targets if t.endswith( '.success' ) ]
+        if not result and succeeded and all( os.path.exists( t ) for t in targets ):
+            self._cache.store( key, targets )
+        return result
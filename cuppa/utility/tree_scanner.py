@@ -0,0 +1,134 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+#-------------------------------------------------------------------------------
+#   Tree scanner — concurrent, memoised sizing for storage listings and removal
+#-------------------------------------------------------------------------------
+
+"""Measure independent trees concurrently and never measure the same path twice in a command.
+
+Listing and removal planning size many dependency trees and download archives. Each tree is
+independent, and on network filesystems each one is mostly waiting on ``stat`` round trips, so
+``prefetch`` walks them on a thread pool. Results are remembered by path while a ``scanning``
+block is active; ``directory_stats`` answers from that memo, falling back to a direct walk when
+no block is active.
+
+A scan is a snapshot: open the block around planning, not around the removal that follows it.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from cuppa.utility import storage
+
+
+# Mostly waiting on the filesystem; more threads than this rarely helps even on NFS.
+DEFAULT_SCAN_JOBS = 8
+
+
+def _key( path ):
+    return os.path.normpath( os.path.abspath( os.path.expanduser( path ) ) )
+
+
+def in_parallel( function, items, max_workers=None ):
+    """``[ function( item ) for item in items ]`` on a thread pool, results in order."""
+    items = list( items )
+    workers = min( max_workers or DEFAULT_SCAN_JOBS, len( items ) )
+    if workers <= 1:
+        return [ function( item ) for item in items ]
+    with ThreadPoolExecutor( max_workers=workers ) as executor:
+        return list( executor.map( function, items ) )
+
+
+class TreeScanner(object):
+
+    def __init__( self, max_workers=DEFAULT_SCAN_JOBS ):
+        self._max_workers = max( 1, int( max_workers or 1 ) )
+        self._stats = {}
+        self._lock = threading.Lock()
+        self.walked = 0
+
+
+    def _measure( self, key ):
+        stats = storage.directory_stats( key )
+        with self._lock:
+            self.walked += 1
+            return self._stats.setdefault( key, stats )
+
+
+    def stats( self, path ):
+        """``storage.DirectoryStats`` for ``path``, walked at most once per scanner."""
+        key = _key( path )
+        with self._lock:
+            known = self._stats.get( key )
+        if known is not None:
+            return known
+        return self._measure( key )
+
+
+    def prefetch( self, paths ):
+        """Measure every path not yet known, concurrently."""
+        with self._lock:
+            pending = []
+            for path in paths:
+                if not path:
+                    continue
+                key = _key( path )
+                if key not in self._stats:
+                    pending.append( key )
+            pending = list( dict.fromkeys( pending ) )
+        if not pending:
+            return
+        in_parallel( self._measure, pending, self._max_workers )
+
+
+    def forget( self, path=None ):
+        with self._lock:
+            if path is None:
+                self._stats.clear()
+            else:
+                self._stats.pop( _key( path ), None )
+
+
+_active = None
+_active_lock = threading.Lock()
+
+
+@contextmanager
+def scanning( max_workers=None ):
+    """Share one ``TreeScanner`` for the duration of the block. Nested blocks reuse the outer one."""
+    global _active
+    with _active_lock:
+        outer = _active
+        if outer is None:
+            _active = TreeScanner( max_workers or DEFAULT_SCAN_JOBS )
+        scanner = _active
+    try:
+        yield scanner
+    finally:
+        if outer is None:
+            with _active_lock:
+                _active = None
+
+
+def active():
+    return _active
+
+
+def directory_stats( path ):
+    """``storage.directory_stats``, from the active scanner when there is one."""
+    scanner = _active
+    if scanner is None:
+        return storage.directory_stats( path )
+    return scanner.stats( path )
+
+
+def prefetch( paths ):
+    """Measure ``paths`` concurrently for the active scanner; nothing to do without one."""
+    scanner = _active
+    if scanner is not None:
+        scanner.prefetch( paths )
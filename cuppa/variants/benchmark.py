@@ -22,6 +22,29 @@ class Benchmark:
                 '--benchmark', dest=cls.name(), action='store_true',
                 help='Execute any build outputs created using the BuildBenchmark() method' )
 
+        add_option(
+                '--benchmark-repeats', dest='benchmark-repeats', type='int', nargs=1, action='store',
+                help='How many measured runs to make of each benchmark (default 5)' )
+
+        add_option(
+                '--benchmark-warmup', dest='benchmark-warmup', type='int', nargs=1, action='store',
+                help='How many runs to make and discard before measuring each benchmark (default 1)' )
+
+        add_option(
+                '--benchmark-baseline', dest='benchmark-baseline', type='string', nargs=1, action='store',
+                help="Compare each benchmark with the results recorded for this commit (a unique prefix"
+                     " will do), or 'previous' for the latest results from another commit, and fail"
+                     " the benchmark if it regressed" )
+
+        add_option(
+                '--benchmark-threshold', dest='benchmark-threshold', type='float', nargs=1, action='store',
+                help='How many percent slower (or larger) than the baseline a benchmark may be'
+                     ' before it counts as a regression (default 10)' )
+
+        add_option(
+                '--benchmark-store', dest='benchmark-store', type='string', nargs=1, action='store',
+                help='The JSON file benchmark results are recorded in (default <build-root>/benchmarks.json)' )
+
 
     @classmethod
     def add_to_env( cls, env, add_variant, add_action ):
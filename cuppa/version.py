@@ -7,10 +7,29 @@
 #   version.py
 #-------------------------------------------------------------------------------
 
+"""Report the installed cuppa version and whether PyPI has a newer one.
+
+The PyPI lookup never sits on the start-up path. A result younger than ``CHECK_TTL_SECONDS`` is
+read from a small JSON cache; otherwise the lookup runs on a daemon thread with a short socket
+deadline, refreshes the cache, and any upgrade notice is printed when the run exits (if the
+lookup has finished by then). Failed lookups are cached too, so an air-gapped builder tries at
+most once per TTL.
+
+Set ``CUPPA_VERSION_CHECK_CACHE`` to a file path to move the cache, or to an empty string to
+keep results in memory only.
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+
 try:
-    import xmlrpclib
+    from urllib.request import urlopen
 except ImportError:
-    import xmlrpc.client as xmlrpclib
+    from urllib2 import urlopen
 
 try:
     from packaging.version import parse as parse_version
@@ -22,18 +41,147 @@ from cuppa.log import logger
 from cuppa.utility.version import get_version
 
 
+PYPI_URL = 'https://pypi.org/pypi/cuppa/json'
+CACHE_ENV_VAR = 'CUPPA_VERSION_CHECK_CACHE'
+CACHE_FILE_NAME = 'pypi-version.json'
+CHECK_TTL_SECONDS = 24 * 60 * 60
+CHECK_TIMEOUT_SECONDS = 2.0
+
+
+def default_cache_path():
+    """Where the version check result lives, or ``None`` when persistence is disabled."""
+    override = os.environ.get( CACHE_ENV_VAR )
+    if override is not None:
+        return override.strip() and os.path.expanduser( override.strip() ) or None
+    base = os.environ.get( 'XDG_CACHE_HOME' ) or os.path.join( os.path.expanduser( '~' ), '.cache' )
+    return os.path.join( base, 'cuppa', CACHE_FILE_NAME )
+
+
+def read_cached_check( cache_path, now=None, ttl=CHECK_TTL_SECONDS ):
+    """The cached check ``{ 'checked_at', 'latest' }`` when it is younger than ``ttl``, else ``None``."""
+    if not cache_path:
+        return None
+    try:
+        with open( cache_path, encoding='utf-8' ) as handle:
+            entry = json.load( handle )
+    except ( OSError, ValueError, TypeError ):
+        return None
+    if not isinstance( entry, dict ):
+        return None
+    checked_at = entry.get( 'checked_at' )
+    if not isinstance( checked_at, ( int, float ) ):
+        return None
+    now = time.time() if now is None else now
+    if not 0 <= now - checked_at < ttl:
+        return None
+    return entry
+
+
+def write_cached_check( cache_path, latest, now=None ):
+    if not cache_path:
+        return
+    entry = { 'checked_at': time.time() if now is None else now, 'latest': latest }
+    directory = os.path.dirname( cache_path ) or '.'
+    try:
+        os.makedirs( directory, exist_ok=True )
+        fd, temporary = tempfile.mkstemp( prefix='.pypi-version-', suffix='.tmp', dir=directory )
+        try:
+            with os.fdopen( fd, 'w', encoding='utf-8' ) as handle:
+                json.dump( entry, handle )
+            os.replace( temporary, cache_path )
+        except Exception:
+            try:
+                os.unlink( temporary )
+            except OSError:
+                pass
+            raise
+    except OSError as error:
+        logger.debug( "Unable to write version check cache [{}]: {}".format(
+                as_info( cache_path ), as_warning( str( error ) )
+        ) )
+
+
+def fetch_latest_version( timeout=CHECK_TIMEOUT_SECONDS ):
+    """Latest cuppa release on PyPI, or ``None`` when it cannot be determined in time."""
+    try:
+        response = urlopen( PYPI_URL, timeout=timeout )
+        try:
+            payload = json.loads( response.read().decode( 'utf-8' ) )
+        finally:
+            response.close()
+        return payload['info']['version']
+    except Exception:
+        return None
+
+
+def report_newer_version( installed_version, latest_available ):
+    """Warn when ``latest_available`` is newer than ``installed_version``; return True if it is."""
+    if not latest_available:
+        return False
+    try:
+        newer = parse_version( installed_version ) < parse_version( latest_available )
+    except Exception:
+        return False
+    if newer:
+        logger.warn( "Newer version [{}] available. Upgrade using \"{}\"\n".format(
+                as_warning( latest_available ),
+                as_emphasised( "pip install -U cuppa" )
+        ) )
+    return newer
+
+
+class BackgroundVersionCheck(object):
+    """Look up the latest release on a daemon thread and report it at exit if it arrived."""
+
+    def __init__( self, installed_version, cache_path, fetch=fetch_latest_version ):
+        self._installed_version = installed_version
+        self._cache_path = cache_path
+        self._fetch = fetch
+        self._latest = None
+        self._reported = False
+        self._done = threading.Event()
+        self._thread = threading.Thread( target=self._run, name='cuppa-version-check' )
+        self._thread.daemon = True
+
+
+    def start( self ):
+        self._thread.start()
+        return self
+
+
+    def _run( self ):
+        try:
+            self._latest = self._fetch()
+            write_cached_check( self._cache_path, self._latest )
+        finally:
+            self._done.set()
+
+
+    def finished( self, wait=0 ):
+        return self._done.wait( wait )
+
+
+    def report( self ):
+        """Report a newer version if the lookup has already finished; never waits for it."""
+        if self._reported or not self._done.is_set():
+            return False
+        self._reported = True
+        return report_newer_version( self._installed_version, self._latest )
+
+
 def check_current_version( offline ):
 
     installed_version = get_version()
     logger.info( "cuppa: version {}".format( as_info( installed_version ) ) )
-    if not offline:
-        try:
-            pypi = xmlrpclib.ServerProxy('http://pypi.python.org/pypi')
-            latest_available = pypi.package_releases('cuppa')[0]
-            if parse_version( installed_version ) < parse_version( latest_available ):
-                logger.warn( "Newer version [{}] available. Upgrade using \"{}\"\n".format(
-                        as_warning( latest_available ),
-                        as_emphasised( "pip install -U cuppa" )
-                ) )
-        except:
-            pass
+    if offline:
+        return None
+
+    cache_path = default_cache_path()
+    cached = read_cached_check( cache_path )
+    if cached is not None:
+        report_newer_version( installed_version, cached.get( 'latest' ) )
+        return None
+
+    check = BackgroundVersionCheck( installed_version, cache_path ).start()
+    atexit.register( check.report )
+    return check
@@ -0,0 +1,93 @@
+"""Compare cold and warm C++ module dependency scans over a source tree.
+
+    python -m scripts.benchmark_module_scan path/to/sources
+    python -m scripts.benchmark_module_scan --files 5000
+
+Scans every C++ source under the given directories (or a generated tree of
+``--files`` synthetic translation units when none are given) three ways: with
+``scan_file`` as before, with an empty ``ModuleScanCache`` (cold), and again
+with the cache reloaded from disk (warm).
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from cuppa.cpp.module_scanner import ModuleScanCache, scan_file
+
+
+_SUFFIXES = ( '.cpp', '.cc', '.cxx', '.cppm', '.cxxm', '.ccm', '.ixx', '.hpp', '.h' )
+
+
+def _sources( roots ):
+    found = []
+    for root in roots:
+        for directory, _, files in os.walk( root ):
+            for name in files:
+                if name.endswith( _SUFFIXES ):
+                    found.append( os.path.abspath( os.path.join( directory, name ) ) )
+    return sorted( found )
+
+
+def _generate( root, count ):
+    body = "".join(
+        "// helper {0}\n/* block comment {0}\n   spanning lines */\nint helper_{0}( int x ) {{ return x * {0}; }}\n".format( index )
+        for index in range( 40 )
+    )
+    for index in range( count ):
+        with open( os.path.join( root, 'unit_{}.cppm'.format( index ) ), 'w' ) as handle:
+            handle.write( "export module unit_{};\nimport std;\nimport unit_{};\n".format( index, max( 0, index - 1 ) ) )
+            handle.write( body )
+
+
+def _time( callable_ ):
+    start = time.perf_counter()
+    callable_()
+    return time.perf_counter() - start
+
+
+def main( argv=None ):
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( 'roots', nargs='*', help='Directories containing C++ sources' )
+    parser.add_argument( '--files', type=int, default=2000, help='Synthetic sources to generate when no roots are given' )
+    arguments = parser.parse_args( argv )
+
+    scratch = tempfile.mkdtemp( prefix='cuppa-module-scan-' )
+    try:
+        roots = arguments.roots
+        if not roots:
+            roots = [ os.path.join( scratch, 'sources' ) ]
+            os.makedirs( roots[0] )
+            _generate( roots[0], arguments.files )
+        sources = _sources( roots )
+        if not sources:
+            print( "No C++ sources found" )
+            return 1
+
+        cache_path = os.path.join( scratch, 'module-scans.json' )
+
+        uncached = _time( lambda: [ scan_file( path ) for path in sources ] )
+
+        cold_cache = ModuleScanCache( cache_path )
+        cold = _time( lambda: [ cold_cache.scan( path ) for path in sources ] )
+        cold_cache.save()
+
+        warm_cache = ModuleScanCache( cache_path )
+        warm = _time( lambda: [ warm_cache.scan( path ) for path in sources ] )
+
+        print( "{} sources".format( len( sources ) ) )
+        print( "  scan_file      : {:8.3f}s".format( uncached ) )
+        print( "  cache (cold)   : {:8.3f}s".format( cold ) )
+        print( "  cache (warm)   : {:8.3f}s ({} hits, {:.1f}x faster than scan_file)".format(
+                warm, warm_cache.hits, uncached / warm if warm else float( 'inf' )
+        ) )
+        return 0
+    finally:
+        shutil.rmtree( scratch, ignore_errors=True )
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
@@ -0,0 +1,89 @@
+"""Micro-benchmark compiler output interpretation in ``ToolchainProcessor``.
+
+    python -m scripts.benchmark_output_processor --toolchain gcc path/to/build.log
+    python -m scripts.benchmark_output_processor --toolchain clang --repeat 200
+
+Each captured log (or the bundled samples under
+``tests/fixtures/compiler_output`` when none are given) is run through a
+``ToolchainProcessor`` and through the previous per-line ``re.match`` loop over
+``output_interpretors()``, and the throughput of each is printed.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+from cuppa.output_processor import ToolchainProcessor
+from cuppa.toolchains.cl import Cl
+from cuppa.toolchains.clang import Clang
+from cuppa.toolchains.gcc import Gcc
+
+
+_TOOLCHAINS = {
+    'gcc'  : Gcc,
+    'clang': Clang,
+    'cl'   : Cl,
+}
+
+_SAMPLES = os.path.join(
+    os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ),
+    'tests', 'fixtures', 'compiler_output',
+)
+
+
+def _read_lines( paths ):
+    lines = []
+    for path in paths:
+        with open( path, encoding='utf-8', errors='replace' ) as handle:
+            lines.extend( line.rstrip() for line in handle if line.strip() )
+    return lines
+
+
+def _sequential_interpret( toolchain, line ):
+    for interpretor in toolchain.output_interpretors():
+        matches = re.match( interpretor['regex'], line )
+        if matches:
+            return matches
+    return None
+
+
+def _time( function, lines, repeat ):
+    start = time.perf_counter()
+    for _ in range( repeat ):
+        for line in lines:
+            function( line )
+    return time.perf_counter() - start
+
+
+def main( argv=None ):
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( 'logs', nargs='*', help='Captured compiler output to replay' )
+    parser.add_argument( '--toolchain', choices=sorted( _TOOLCHAINS ), default='gcc' )
+    parser.add_argument( '--repeat', type=int, default=100, help='Passes over the captured lines' )
+    arguments = parser.parse_args( argv )
+
+    toolchain = _TOOLCHAINS[arguments.toolchain]
+    paths = arguments.logs or [ os.path.join( _SAMPLES, arguments.toolchain == 'clang' and 'clang_sample.txt' or 'gcc_sample.txt' ) ]
+    lines = _read_lines( paths )
+    if not lines:
+        print( "No lines to process" )
+        return 1
+
+    processor = ToolchainProcessor( toolchain, minimal_output=False, ignore_duplicates=False )
+    total = len( lines ) * arguments.repeat
+
+    sequential = _time( lambda line: _sequential_interpret( toolchain, line ), lines, arguments.repeat )
+    compiled = _time( processor.interpret, lines, arguments.repeat )
+    end_to_end = _time( processor, lines, arguments.repeat )
+
+    print( "{} lines x {} passes ({})".format( len( lines ), arguments.repeat, arguments.toolchain ) )
+    print( "  sequential interpret : {:10.0f} lines/s".format( total / sequential ) )
+    print( "  compiled interpret   : {:10.0f} lines/s ({:.1f}x)".format( total / compiled, sequential / compiled ) )
+    print( "  processor end-to-end : {:10.0f} lines/s".format( total / end_to_end ) )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
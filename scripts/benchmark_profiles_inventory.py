@@ -0,0 +1,157 @@
+"""Compare the memory held by the C++ Profiles inventory against a dict of location tuples.
+
+    python -m scripts.benchmark_profiles_inventory path/to/build-output.log
+    python -m scripts.benchmark_profiles_inventory --scale 50 path/to/build-output.log
+    python -m scripts.benchmark_profiles_inventory --files 500
+
+Replays a saved build capture (or a synthetic one of ``--files`` headers when none is given),
+replicating every ``Starting variant`` scope ``--scale`` times so the inventory grows the way a
+large toolchain/variant matrix does. The capture is replayed into ``ProfilesInventory`` (interned
+strings in ``array`` columns) and into a dict of ``ProfilesLocation`` tuples keyed by
+``location_dedupe_key``, as the inventory used to be held. ``tracemalloc`` reports the memory
+each retains once the replay is done; each line is parsed as it is recorded, as a build does.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from cuppa.cpp.profiles_report import (
+    ProfilesInventory,
+    ProfilesLocation,
+    ProfilesScopeStack,
+    location_dedupe_key,
+    parse_profiles_diagnostic,
+    parse_progress_line,
+)
+from cuppa.utility.preprocess import AnsiEscape
+
+
+_MESSAGES = (
+    "variable 'value_{0}' must be initialized or marked '[[uninit]]' under profile 'std::init'",
+    "non-local variable 'table_{0}' requires constant initialization under profile 'std::init'",
+    "constructor does not initialize member 'member_{0}_' under profile 'std::init'",
+)
+
+
+class DictInventory:
+    """Reference inventory: one ``ProfilesLocation`` per dedupe key, replaced on every repeat."""
+
+    def __init__( self ):
+        self._locations = {}
+
+    def record( self, scope, diagnostic, references=1 ):
+        key = location_dedupe_key( scope, diagnostic )
+        existing = self._locations.get( key )
+        if existing is not None:
+            self._locations[ key ] = existing._replace( reference_count=existing.reference_count + references )
+            return
+        self._locations[ key ] = ProfilesLocation(
+            scope=scope,
+            path=diagnostic.path,
+            line=diagnostic.line,
+            column=diagnostic.column,
+            profile=diagnostic.profile,
+            normalised_message=diagnostic.normalised_message,
+            rule_id=diagnostic.rule_id,
+            reference_count=references,
+            raw_message=diagnostic.message,
+        )
+
+    def locations( self ):
+        return tuple( self._locations.values() )
+
+
+def _synthetic_capture( files ):
+    lines = [
+        "Progress( Begin sconscript: [./widget/sconscript] )",
+        "Progress( Starting variant: [_build/widget/clang24_profiles/dbg/x86_64/cxx2c] )",
+    ]
+    for index in range( files ):
+        for offset, message in enumerate( _MESSAGES ):
+            lines.append( "/home/user/include/widget/header_{}.hpp:{}:{}: error: {}".format(
+                    index, 10 + offset * 7, 5 + offset, message.format( index )
+            ) )
+    # Each translation unit including a header reports its diagnostics again.
+    return lines + lines[ 2: ]
+
+
+def _replicated( lines, scale ):
+    """Repeat the capture ``scale`` times, each copy under its own variant dirs."""
+    if scale <= 1:
+        return list( lines )
+    replicated = []
+    for copy in range( scale ):
+        for line in lines:
+            if 'Starting variant: [' in line:
+                line = line.replace( ']', '/copy{}]'.format( copy ), 1 )
+            replicated.append( line )
+    return replicated
+
+
+def _records( lines ):
+    """Yield ``( scope, diagnostic )`` for every Profiles diagnostic in ``lines``."""
+    stack = ProfilesScopeStack()
+    for line in lines:
+        line = AnsiEscape.strip( line )
+        progress = parse_progress_line( line )
+        if progress is not None:
+            stack.apply_progress( *progress )
+            continue
+        diagnostic = parse_profiles_diagnostic( line, from_capture=True )
+        if diagnostic is not None:
+            yield stack.current_scope(), diagnostic
+
+
+def _measure( inventory_type, lines ):
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        inventory = inventory_type()
+        for scope, diagnostic in _records( lines ):
+            inventory.record( scope, diagnostic )
+        elapsed = time.perf_counter() - start
+        retained, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return inventory, retained, elapsed
+
+
+def main( argv=None ):
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( 'capture', nargs='?', help='Saved build output with Progress lines and Profiles diagnostics' )
+    parser.add_argument( '--files', type=int, default=2000, help='Synthetic headers to generate when no capture is given' )
+    parser.add_argument( '--scale', type=int, default=1, help='Copies of every variant scope to record' )
+    arguments = parser.parse_args( argv )
+
+    if arguments.capture:
+        if not os.path.isfile( arguments.capture ):
+            print( "Capture not found: {}".format( arguments.capture ), file=sys.stderr )
+            return 1
+        with open( arguments.capture, encoding='utf-8', errors='replace' ) as handle:
+            lines = handle.read().splitlines()
+    else:
+        lines = _synthetic_capture( arguments.files )
+
+    lines = _replicated( lines, arguments.scale )
+    columnar, columnar_bytes, columnar_time = _measure( ProfilesInventory, lines )
+    if not columnar.unique_locations():
+        print( "No Profiles diagnostics found" )
+        return 1
+    reference, reference_bytes, reference_time = _measure( DictInventory, lines )
+    if set( columnar.locations() ) != set( reference.locations() ):
+        print( "Inventories disagree", file=sys.stderr )
+        return 1
+
+    print( "{} diagnostics, {} unique locations".format( columnar.total_references(), columnar.unique_locations() ) )
+    print( "  dict of tuples : {:10.1f} KiB {:8.3f}s".format( reference_bytes / 1024.0, reference_time ) )
+    print( "  columnar       : {:10.1f} KiB {:8.3f}s ({:.1f}x smaller)".format(
+            columnar_bytes / 1024.0, columnar_time, reference_bytes / columnar_bytes if columnar_bytes else float( 'inf' )
+    ) )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
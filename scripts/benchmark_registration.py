@@ -0,0 +1,73 @@
+"""Compare walking the registration packages on every hook call with the cached registry.
+
+    python -m scripts.benchmark_registration
+    python -m scripts.benchmark_registration --calls 400
+
+Imports the registered packages the way ``cuppa.construct`` does, then resolves the
+``init_env_for_variant`` hooks under ``cuppa.methods`` (the hook called once per
+sconscript and variant) ``--calls`` times: by walking the package tree each time, as
+before, and through ``cuppa.modules.registration.registry()``. Also reports the time
+from a cold interpreter to a loaded ``cuppa.construct``.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+import warnings
+
+
+def _walk_hooks( registration, path, method ):
+    hooks = []
+    for member in registration._classes_in_module( 'cuppa', 'methods', path ):
+        function = getattr( member, method, None )
+        if callable( function ):
+            hooks.append( ( member, function ) )
+    return hooks
+
+
+def _import_time():
+    start = time.perf_counter()
+    subprocess.check_call( [ sys.executable, '-c', 'import cuppa.construct' ] )
+    return time.perf_counter() - start
+
+
+def main( argv=None ):
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( '--calls', type=int, default=200, help='Hook resolutions to time (sconscripts x variants)' )
+    parser.add_argument( '--method', default='init_env_for_variant', help='Registration hook to resolve' )
+    arguments = parser.parse_args( argv )
+
+    with warnings.catch_warnings():
+        warnings.simplefilter( 'ignore' )
+        import cuppa.construct  # noqa: F401 - registers the packages as a real run does
+    import cuppa.modules.registration as registration
+
+    path = getattr( registration, '__package' )( 'cuppa' )
+    registry = registration.ModuleRegistry()
+
+    start = time.perf_counter()
+    for _ in range( arguments.calls ):
+        walked = _walk_hooks( registration, path, arguments.method )
+    walk_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range( arguments.calls ):
+        cached = registry.hooks( 'cuppa', 'methods', path, arguments.method )
+    cached_seconds = time.perf_counter() - start
+
+    assert [ member for member, _ in walked ] == [ member for member, _ in cached ]
+
+    print( "{} hooks for [{}] under cuppa.methods".format( len( cached ), arguments.method ) )
+    print( "walk every call : {:8.2f} ms for {} calls ({:.3f} ms/call)".format(
+            walk_seconds * 1000, arguments.calls, walk_seconds * 1000 / arguments.calls
+    ) )
+    print( "cached registry : {:8.2f} ms for {} calls ({:.3f} ms/call)".format(
+            cached_seconds * 1000, arguments.calls, cached_seconds * 1000 / arguments.calls
+    ) )
+    print( "import cuppa.construct (cold interpreter): {:.2f} s".format( _import_time() ) )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
@@ -0,0 +1,74 @@
+"""Merge C++ Profiles report JSON from several build shards into one report.
+
+Typical CI workflow, with each node profiling part of the toolchain/variant matrix::
+
+    python -m scripts.merge_profiles_reports \\
+        --out _artefacts/cxx-profiles/cxx-profiles-index.json \\
+        shard-*/cxx-profiles/cxx-profiles-index.json
+
+Then render the merged HTML::
+
+    python -m scripts.regenerate_profiles_report \\
+        --from-json _artefacts/cxx-profiles/cxx-profiles-index.json
+
+Shards are unioned through their ``locations[]``; build logs are not re-parsed. A location
+reported by several shards sums its references. Session metadata (project, revision, link
+style) is taken from the first shard.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+
+from cuppa.cpp.profiles_report.report_json import merge_report_files
+
+
+def main( argv=None ):
+    parser = argparse.ArgumentParser( description=__doc__ )
+    parser.add_argument(
+        'input_files',
+        nargs='+',
+        help='cxx-profiles-index.json written by each shard',
+    )
+    parser.add_argument(
+        '--out',
+        dest='output_path',
+        required=True,
+        help='Merged cxx-profiles-index.json to write',
+    )
+    arguments = parser.parse_args( argv )
+
+    input_paths = [ os.path.abspath( path ) for path in arguments.input_files ]
+    missing = [ path for path in input_paths if not os.path.isfile( path ) ]
+    if missing:
+        print( 'Report JSON not found: {}'.format( ', '.join( missing ) ), file=sys.stderr )
+        return 1
+
+    try:
+        payload = merge_report_files( input_paths )
+    except ValueError as error:
+        print( 'Merge failed: {}'.format( error ), file=sys.stderr )
+        return 1
+
+    output_path = os.path.abspath( arguments.output_path )
+    output_dir = os.path.dirname( output_path )
+    if output_dir:
+        os.makedirs( output_dir, exist_ok=True )
+
+    with open( output_path, 'w', encoding='utf-8' ) as handle:
+        json.dump( payload, handle, indent=2, sort_keys=True )
+        handle.write( '\n' )
+
+    summary = payload[ 'summary' ]
+    print( 'Merged {} report(s) into {}'.format( len( input_paths ), output_path ) )
+    print( '  total references: {}'.format( summary[ 'total_references' ] ) )
+    print( '  unique locations: {}'.format( summary[ 'unique_locations' ] ) )
+    print( '  scopes: {}'.format( summary[ 'scope_count' ] ) )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
@@ -19,7 +19,9 @@ paths; prefer ``--from-json`` when a report was produced by a live build.
 ``--cxx-profiles-report`` and re-renders HTML deterministically. When
 ``--sconstruct-dir`` is omitted, session fields are taken from JSON ``metadata``.
 Source files must still exist on disk for ``by-source/`` pages unless
-``--skip-source-pages`` is set.
+``--skip-source-pages`` is set. Pages are rendered on ``--jobs`` processes, and
+pages whose source and violations are unchanged since the last run into the same
+report directory are not rendered again.
 """
 
 from __future__ import print_function
@@ -28,7 +30,7 @@ import argparse
 import os
 import sys
 
-from cuppa.cpp.cxx_profiles_report import format_capture_summary, replay_profiles_capture
+from cuppa.cpp.cxx_profiles_report import format_capture_summary, replay_profiles_capture_file
 from cuppa.cpp.profiles_report.report_html import write_profiles_reports, write_profiles_reports_from_json
 from cuppa.cpp.profiles_report.report_json import env_from_report_metadata, load_report_model
 from cuppa.reports.link_style import REPORT_LINK_STYLES
@@ -41,8 +43,7 @@ def _regenerate_from_capture( arguments ):
             'capture file not found: {}'.format( capture_path ),
         )
 
-    with open( capture_path, encoding='utf-8', errors='replace' ) as handle:
-        inventory, unscoped = replay_profiles_capture( handle )
+    inventory, unscoped = replay_profiles_capture_file( capture_path )
 
     if inventory.total_references() == 0:
         print( 'No Profiles violations found in capture.', file=sys.stderr )
@@ -56,6 +57,7 @@ def _regenerate_from_capture( arguments ):
             print( 'warning: {} unscoped diagnostic(s)'.format( unscoped ), file=sys.stderr )
 
     env = env_from_report_metadata( {}, arguments )
+    env[ 'job_count' ] = arguments.jobs
     return write_profiles_reports( inventory, env )
 
 
@@ -68,6 +70,7 @@ def _regenerate_from_json( arguments ):
 
     _model, metadata, _extras = load_report_model( json_path )
     env = env_from_report_metadata( metadata, arguments )
+    env[ 'job_count' ] = arguments.jobs
     from cuppa.cpp.profiles_report.anonymise import metadata_is_anonymised, set_env_anonymised
 
     anonymised = bool( getattr( arguments, 'anonymised', False ) ) or metadata_is_anonymised( metadata )
@@ -144,6 +147,13 @@ def main( argv=None ):
         action='store_true',
         help='Omit by-source/ marked-up source pages (JSON regen only)',
     )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Render by-source/ pages on up to this many processes (default: one per CPU)',
+    )
     parser.add_argument(
         '--anonymised',
         action='store_true',
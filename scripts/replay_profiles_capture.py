@@ -15,7 +15,7 @@ To regenerate HTML without recompiling:
 import argparse
 import sys
 
-from cuppa.cpp.cxx_profiles_report import format_capture_summary, replay_profiles_capture
+from cuppa.cpp.cxx_profiles_report import format_capture_summary, replay_profiles_capture_file
 
 
 def main( argv=None ):
@@ -26,8 +26,7 @@ def main( argv=None ):
     )
     arguments = parser.parse_args( argv )
 
-    with open( arguments.capture_file, encoding='utf-8', errors='replace' ) as handle:
-        inventory, unscoped = replay_profiles_capture( handle )
+    inventory, unscoped = replay_profiles_capture_file( arguments.capture_file )
 
     print( format_capture_summary( inventory, unscoped ) )
     return 0
@@ -78,6 +78,7 @@ setup(
             os.path.join( 'cpp','templates','cxx_profiles_table_styles.html' ),
             os.path.join( 'cpp','templates','cxx_profiles_scope.html' ),
             os.path.join( 'cpp','templates','cxx_profiles_source_file.html' ),
+            os.path.join( 'test_report','templates','benchmark_report.html' ),
             os.path.join( 'test_report','templates','test_report_index.html' ),
             os.path.join( 'test_report','templates','test_suite_index.html' ),
         ],
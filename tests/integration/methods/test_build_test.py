@@ -1,9 +1,12 @@
+import shutil
+
 import pytest
 
 from tests.helpers.cuppa_runner import (
     assert_failure,
     assert_success,
     find_final_binaries,
+    find_under_build,
     run_cuppa,
 )
 from tests.helpers.project import copy_dummy_project, write_sconstruct, write_sconscript
@@ -105,3 +108,53 @@ def test_test_method_on_built_binary(tmp_path):
     )
     result = run_cuppa(project, "--dbg", "--test")
     assert_success(result)
+
+
+def test_build_test_with_test_jobs(tmp_path):
+    project = copy_dummy_project(tmp_path)
+    write_sconstruct(project)
+    write_sconscript(
+        project,
+        "Import('env')\n"
+        "env.BuildTest('hello_test', 'tests/hello_test.cpp')\n"
+        "env.BuildTest('other_test', 'tests/hello_test.cpp')\n",
+    )
+    result = run_cuppa(project, "--dbg", "--test", "--test-jobs=2")
+    assert_success(result)
+    assert "test-jobs" in result.stdout
+
+
+def test_build_test_timeout_fails_a_hanging_test(tmp_path):
+    project = copy_dummy_project(tmp_path)
+    (project / "tests" / "sleep_test.cpp").write_text(
+        "#include <chrono>\n"
+        "#include <thread>\n"
+        "int main() { std::this_thread::sleep_for(std::chrono::seconds(60)); return 0; }\n"
+    )
+    write_sconstruct(project)
+    write_sconscript(
+        project,
+        "Import('env')\nenv.BuildTest('sleep_test', 'tests/sleep_test.cpp', timeout=1)\n",
+    )
+    result = run_cuppa(project, "--dbg", "--test")
+    assert_failure(result)
+    assert "timed out" in result.stdout
+
+
+def test_build_test_results_are_restored_from_the_test_cache(tmp_path):
+    project = copy_dummy_project(tmp_path)
+    write_sconstruct(project)
+    write_sconscript(
+        project,
+        "Import('env')\nenv.BuildTest('hello_test', 'tests/hello_test.cpp')\n",
+    )
+    cache = tmp_path / "test-cache"
+    first = run_cuppa(project, "--dbg", "--test", "--test-cache={}".format(cache))
+    assert_success(first)
+    assert "(cached)" not in first.stdout
+
+    shutil.rmtree(project / "_build")
+    second = run_cuppa(project, "--dbg", "--test", "--test-cache={}".format(cache))
+    assert_success(second)
+    assert "(cached)" in second.stdout
+    assert find_under_build(project, "hello_test.success")
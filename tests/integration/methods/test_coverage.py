@@ -47,6 +47,34 @@ def test_coverage_method(tmp_path):
     assert find_under_build(project, "*coverage*") or "COVERAGE" in result.stdout
 
 
+def test_coverage_runs_tests_instead_of_restoring_them_from_the_test_cache(tmp_path):
+    """A cached result writes no .gcda files, so ``--cov`` must run the test again."""
+    _skip_if_no_gcov_coverage()
+
+    project = copy_dummy_project(tmp_path)
+    write_sconstruct(project)
+    write_sconscript(
+        project,
+        "Import('env')\n"
+        "prog = env.BuildTest('hello_test', 'tests/hello_test.cpp')\n"
+        "env.Coverage(prog, 'tests/hello_test.cpp')\n",
+    )
+    cache = tmp_path / "test-cache"
+    first = run_cuppa(project, "--cov", "--test", "--test-cache={}".format(cache))
+    assert_success(first)
+
+    # Keep the instrumented program, so its cache key is unchanged, but drop its results.
+    results = ("hello_test.success", "hello_test.report.json", "hello_test.stdout.log", "hello_test.stderr.log")
+    for path in find_under_build(project, "*.gcda") + [
+        path for name in results for path in find_under_build(project, name)
+    ]:
+        path.unlink()
+    second = run_cuppa(project, "--cov", "--test", "--test-cache={}".format(cache))
+    assert_success(second)
+    assert "(cached)" not in second.stdout
+    assert find_under_build(project, "*.gcda")
+
+
 def test_collate_coverage_index_shared_destination(tmp_path):
     """Two sconscripts sharing an artifacts coverage dir must not clash on by-source Install."""
     _skip_if_no_gcov_coverage()
@@ -15,6 +15,7 @@ def reset_location_caches():
     import cuppa.build_with_package as bwp
 
     bwl.base._cached_locations = {}
+    bwl.base._prefetch_errors = {}
     bwl.base._includes = None
     bwl.base._sys_includes = None
     bwl.base._source_path = None
@@ -22,6 +23,7 @@ def reset_location_caches():
     bwp.base._cached_packages = {}
     yield
     bwl.base._cached_locations = {}
+    bwl.base._prefetch_errors = {}
     bwl.base._includes = None
     bwl.base._sys_includes = None
     bwl.base._source_path = None
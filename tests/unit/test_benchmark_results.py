@@ -0,0 +1,138 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import json
+import os
+import sys
+
+import pytest
+from SCons.Errors import BuildError
+
+from cuppa.cpp import run_benchmark
+from cuppa.methods.benchmark import BenchmarkMethod
+from cuppa.test_report import benchmark_results
+from cuppa.test_report.benchmark_results import BenchmarkStore
+from tests.helpers.fakes import FakeEnv
+
+
+pytestmark = pytest.mark.unit
+
+
+def samples( *walls ):
+    return [ { 'wall_time': wall, 'user_time': wall, 'sys_time': 0.0, 'max_rss': 1024 } for wall in walls ]
+
+
+def test_median_and_mad():
+    assert benchmark_results.median( [ 3, 1, 2 ] ) == 2
+    assert benchmark_results.median( [ 4, 1, 3, 2 ] ) == 2.5
+    assert benchmark_results.median_absolute_deviation( [ 1, 1, 2, 2, 4, 6, 9 ] ) == 1
+
+
+def test_summary_ignores_metrics_a_platform_cannot_measure():
+    summary = benchmark_results.summarise( [
+            { 'wall_time': 1.0, 'user_time': None, 'sys_time': None, 'max_rss': None },
+            { 'wall_time': 3.0, 'user_time': None, 'sys_time': None, 'max_rss': None },
+    ] )
+    assert list( summary ) == [ 'wall_time' ]
+    assert summary['wall_time']['median'] == 2.0
+    assert summary['wall_time']['samples'] == [ 1.0, 3.0 ]
+
+
+def test_a_slower_median_beyond_threshold_and_noise_regresses():
+    baseline = benchmark_results.summarise( samples( 1.0, 1.01, 0.99 ) )
+    slower = benchmark_results.summarise( samples( 1.2, 1.21, 1.19 ) )
+    comparison = benchmark_results.compare( slower, baseline, threshold=10 )
+    assert comparison['wall_time']['regressed']
+    assert round( comparison['wall_time']['percent'] ) == 20
+    assert not comparison['max_rss']['regressed']
+    assert benchmark_results.regressions( comparison ) == [ 'wall_time' ]
+
+
+def test_changes_within_the_noise_do_not_regress():
+    baseline = benchmark_results.summarise( samples( 1.0, 0.5, 1.5 ) )
+    slower = benchmark_results.summarise( samples( 1.2, 1.2, 1.2 ) )
+    assert not benchmark_results.compare( slower, baseline, threshold=10 )['wall_time']['regressed']
+
+
+def test_store_finds_a_commit_prefix_or_the_previous_commit( tmp_path ):
+    store = BenchmarkStore( str( tmp_path / "benchmarks.json" ) )
+    store.record( 'gcc/dbg', 'aaaa1111', 'bench', { 'wall_time': { 'median': 1.0 } } )
+    store.record( 'gcc/dbg', 'bbbb2222', 'bench', { 'wall_time': { 'median': 2.0 } } )
+    store.record( 'gcc/rel', 'cccc3333', 'bench', { 'wall_time': { 'median': 3.0 } } )
+
+    assert store.baseline( 'gcc/dbg', 'bench', 'aaaa' )['wall_time']['median'] == 1.0
+    assert store.baseline( 'gcc/dbg', 'bench', 'cccc' ) is None
+    assert store.baseline( 'gcc/dbg', 'other', 'aaaa' ) is None
+    previous = store.baseline( 'gcc/dbg', 'bench', 'previous', commit='bbbb2222' )
+    assert previous['wall_time']['median'] == 1.0
+
+    payload = json.loads( ( tmp_path / "benchmarks.json" ).read_text() )
+    assert sorted( payload['results'] ) == [ 'gcc/dbg', 'gcc/rel' ]
+
+
+class FakeNode(object):
+
+    def __init__( self, path ):
+        self.path = path
+        self.abspath = os.path.abspath( path )
+
+
+def benchmark_env( tmp_path ):
+    return FakeEnv( {
+        'tool_variant_dir': 'gcc/dbg',
+        'sconstruct_dir': str( tmp_path ),
+        'build_root': str( tmp_path / "build" ),
+    } )
+
+
+def run( tmp_path, monkeypatch, script, **kwargs ):
+    monkeypatch.chdir( tmp_path )
+    command = '"{}" -c "{}"'.format( sys.executable, script )
+    runner = run_benchmark.RunBenchmark(
+            'passed', str( tmp_path ), command=command, repeats=3, warmup=1,
+            store=str( tmp_path / "benchmarks.json" ), **kwargs
+    )
+    runner( [], [ FakeNode( "bench" ) ], benchmark_env( tmp_path ) )
+    with open( tmp_path / "bench.benchmark.json" ) as handle:
+        return json.load( handle )
+
+
+def test_runner_records_repeated_runs( tmp_path, monkeypatch ):
+    result = run( tmp_path, monkeypatch, "print( 42 )" )
+
+    assert result['repeats'] == 3 and result['commit'] == 'unknown'
+    assert len( result['summary']['wall_time']['samples'] ) == 3
+    if hasattr( os, 'wait4' ):
+        assert result['summary']['max_rss']['median'] > 0
+    assert ( tmp_path / "bench.stdout.log" ).read_text().strip() == "42"
+    assert ( tmp_path / "bench.success" ).exists()
+    assert "Benchmark Report" in ( tmp_path / "bench.benchmark.html" ).read_text()
+    store = BenchmarkStore( str( tmp_path / "benchmarks.json" ) )
+    assert store.baseline( 'gcc/dbg', 'bench', 'unknown' )
+
+
+def test_runner_fails_a_regression_against_the_baseline( tmp_path, monkeypatch ):
+    store = BenchmarkStore( str( tmp_path / "benchmarks.json" ) )
+    store.record( 'gcc/dbg', 'fast', 'bench', { 'wall_time': { 'median': 1e-6, 'mad': 0.0 } } )
+
+    with pytest.raises( BuildError ):
+        run( tmp_path, monkeypatch, "pass", baseline='fast' )
+
+    with open( tmp_path / "bench.benchmark.json" ) as handle:
+        assert json.load( handle )['regressions'] == [ 'wall_time' ]
+    assert not ( tmp_path / "bench.success" ).exists()
+
+
+def test_runner_fails_when_the_benchmark_fails( tmp_path, monkeypatch ):
+    with pytest.raises( BuildError ):
+        run( tmp_path, monkeypatch, "import sys; sys.exit( 3 )" )
+
+
+def test_method_settings_prefer_arguments_to_options():
+    env = FakeEnv( { 'benchmark-repeats': 9, 'benchmark-baseline': 'previous' } )
+    settings = BenchmarkMethod.settings( env, repeats=2 )
+    assert settings['repeats'] == 2
+    assert settings['baseline'] == 'previous'
+    assert settings['warmup'] is None
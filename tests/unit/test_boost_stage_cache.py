@@ -0,0 +1,186 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import os
+import threading
+
+import pytest
+
+from cuppa.core import dependency_actions
+from cuppa.dependencies.boost import boost_builder, stage_cache
+from cuppa.dependencies.boost.stage_cache import BoostStageCache
+from tests.helpers.fakes import FakeEnv
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Toolchain(object):
+
+    def __init__( self, version="13.2.0" ):
+        self._version = version
+
+    def name( self ):
+        return "gcc13"
+
+    def family( self ):
+        return "gcc"
+
+    def toolset_name( self ):
+        return "gcc"
+
+    def cxx_version( self ):
+        return "13"
+
+    def version( self ):
+        return self._version
+
+    def binary( self ):
+        return "g++-13"
+
+    def abi_flag( self, env ):
+        return "-std=c++20"
+
+    def stdlib_flag( self, env ):
+        return None
+
+
+class _Boost(object):
+
+    def __init__( self, defines=( 'BOOST_BIND_GLOBAL_PLACEHOLDERS', ) ):
+        self._defines = list( defines )
+
+    def full_version( self ):
+        return "1.86.0"
+
+    def revisions( self ):
+        return []
+
+    def patched_test( self ):
+        return False
+
+    def defines( self ):
+        return self._defines
+
+
+def inputs( boost=None, toolchain=None, variant='release', linktype='static' ):
+    return stage_cache.stage_inputs(
+            FakeEnv(), boost or _Boost(), toolchain or _Toolchain(), variant, 'x86_64', linktype
+    )
+
+
+def staged( directory, *names ):
+    directory.mkdir( parents=True, exist_ok=True )
+    paths = []
+    for name in names:
+        ( directory / name ).write_bytes( b"archive of " + name.encode() )
+        paths.append( str( directory / name ) )
+    return paths
+
+
+def test_the_key_follows_version_toolchain_variant_linktype_and_defines():
+    key = stage_cache.stage_key( inputs() )
+    assert key == stage_cache.stage_key( inputs() )
+    assert key != stage_cache.stage_key( inputs( variant='debug' ) )
+    assert key != stage_cache.stage_key( inputs( linktype='shared' ) )
+    assert key != stage_cache.stage_key( inputs( toolchain=_Toolchain( "13.3.0" ) ) )
+    assert key != stage_cache.stage_key( inputs( boost=_Boost( defines=() ) ) )
+
+
+def test_libraries_staged_in_one_workspace_are_linked_into_another( tmp_path ):
+    cache = BoostStageCache( str( tmp_path / "cache" ) )
+    key = stage_cache.stage_key( inputs() )
+    built = staged( tmp_path / "a" / "lib", "libboost_system.a", "libboost_thread.a" )
+    cache.store( key, built, inputs() )
+
+    wanted = [ str( tmp_path / "b" / "lib" / os.path.basename( path ) ) for path in built ]
+    assert cache.restore( key, wanted )
+    assert all( open( path, 'rb' ).read() == open( original, 'rb' ).read() for path, original in zip( wanted, built ) )
+    assert os.stat( wanted[0] ).st_nlink == 2
+
+
+def test_an_entry_missing_a_library_is_not_restored( tmp_path ):
+    cache = BoostStageCache( str( tmp_path / "cache" ) )
+    key = stage_cache.stage_key( inputs() )
+    cache.store( key, staged( tmp_path / "a", "libboost_system.a" ), inputs() )
+
+    wanted = [ str( tmp_path / "b" / name ) for name in ( "libboost_system.a", "libboost_log.a" ) ]
+    assert not cache.restore( key, wanted )
+    assert not os.path.exists( wanted[0] )
+
+
+def test_detach_protects_the_cache_from_b2_rewriting_a_library( tmp_path ):
+    cache = BoostStageCache( str( tmp_path / "cache" ) )
+    key = stage_cache.stage_key( inputs() )
+    cache.store( key, staged( tmp_path / "a", "libboost_system.a" ), inputs() )
+    target = tmp_path / "b" / "libboost_system.a"
+    assert cache.restore( key, [ str( target ) ] )
+
+    BoostStageCache.detach( [ str( tmp_path / "b" ) ] )
+    assert os.stat( str( target ) ).st_nlink == 1
+    with open( str( target ), 'wb' ) as rewritten:
+        rewritten.write( b"rebuilt" )
+    assert open( os.path.join( cache.entry_path( key ), "libboost_system.a" ), 'rb' ).read() == b"archive of libboost_system.a"
+
+
+def test_concurrent_writers_leave_a_complete_entry( tmp_path ):
+    cache = BoostStageCache( str( tmp_path / "cache" ) )
+    key = stage_cache.stage_key( inputs() )
+    names = [ "libboost_{}.a".format( n ) for n in range( 8 ) ]
+    workspaces = [ staged( tmp_path / str( n ), *names ) for n in range( 6 ) ]
+    threads = [ threading.Thread( target=cache.store, args=( key, built, inputs() ) ) for built in workspaces ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    entry = cache.entry_path( key )
+    assert sorted( os.listdir( entry ) ) == sorted( names + [ stage_cache.MANIFEST ] )
+    assert cache.restore( key, [ str( tmp_path / "restored" / name ) for name in names ] )
+
+
+def test_entries_are_listed_with_their_inputs( tmp_path ):
+    cache = BoostStageCache( str( tmp_path / "cache" ) )
+    cache.store( stage_cache.stage_key( inputs() ), staged( tmp_path / "a", "libboost_system.a" ), inputs() )
+    shared = inputs( linktype='shared' )
+    cache.store( stage_cache.stage_key( shared ), staged( tmp_path / "b", "libboost_system.so.1.86.0" ), shared )
+
+    entries = cache.entries()
+    assert sorted( entry['linktype'] for entry in entries ) == [ 'shared', 'static' ]
+    assert stage_cache.describe( entries[0] ).startswith( "boost 1.86.0 gcc13 release x86_64" )
+    assert all( entry['size_bytes'] > 0 for entry in entries )
+
+    listing = dependency_actions._boost_stage_cache_listing( FakeEnv( { 'boost-stage-cache': str( tmp_path / "cache" ) } ) )
+    assert listing['total_bytes'] == sum( entry['size_bytes'] for entry in entries )
+    assert dependency_actions._boost_stage_cache_listing( FakeEnv() ) is None
+
+
+def test_the_action_restores_instead_of_running_b2( tmp_path, monkeypatch ):
+    runs = []
+
+    def b2( processor, args, cwd=None ):
+        runs.append( args )
+        staged( tmp_path / "stage", "libboost_system.a" )
+        return 0
+
+    monkeypatch.setattr( boost_builder, 'b2_command', lambda *args: [ "b2" ] )
+    monkeypatch.setattr( boost_builder.IncrementalSubProcess, 'Popen', staticmethod( b2 ) )
+    monkeypatch.setattr( boost_builder, 'B2OutputProcessor', lambda *args: type( 'P', (), { 'summary': lambda self, code: None } )() )
+
+    action = boost_builder.BoostLibraryAction.__new__( boost_builder.BoostLibraryAction )
+    action.__dict__.update( {
+        '_libraries': [ 'system' ], '_boost_version': 1.86, '_location': str( tmp_path ), '_toolchain': None,
+        '_variant': 'release', '_target_arch': 'x86_64', '_linktype': 'static', '_stage_dir': 'stage',
+        '_verbose_build': False, '_verbose_config': False, '_job_count': 1, '_parallel': False, '_defines': [],
+        '_stage_cache': BoostStageCache( str( tmp_path / "cache" ) ), '_stage_inputs': inputs(),
+        '_stage_key': stage_cache.stage_key( inputs() ),
+    } )
+    target = [ str( tmp_path / "stage" / "libboost_system.a" ) ]
+
+    assert action( target, [], FakeEnv() ) is None
+    os.remove( target[0] )
+    assert action( target, [], FakeEnv() ) is None
+    assert len( runs ) == 1
+    assert os.path.exists( target[0] )
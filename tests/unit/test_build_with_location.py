@@ -90,6 +90,19 @@ def test_location_id_expands_user(monkeypatch):
     assert location_id[0] == os.path.expanduser("~/deps/liba")
 
 
+def test_expected_download_applies_defaults_only_to_default_location():
+    Dep = location_dependency(
+        "liba", location="https://example.com/liba.tar.gz", sha256="ab" * 32, size=42
+    )
+    env = FakeEnv(thirdparty=None, branch_root=None)
+    assert Dep.sha256_option() == "liba-sha256"
+    assert Dep.expected_download(env, "https://example.com/liba.tar.gz") == ("ab" * 32, 42)
+    assert Dep.expected_download(env, "https://mirror.example.com/liba.tar.gz") == (None, None)
+
+    env = FakeEnv({"liba-sha256": "cd" * 32})
+    assert Dep.expected_download(env, "https://mirror.example.com/liba.tar.gz") == ("cd" * 32, None)
+
+
 def test_abs_path_from(tmp_path):
     Dep = location_dependency("liba")
     local = str(tmp_path / "local")
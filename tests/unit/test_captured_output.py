@@ -0,0 +1,122 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import json
+
+import pytest
+
+import cuppa.test_report.cuppa_json
+from cuppa.cpp import run_boost_test, run_process_test
+from cuppa.test_report.captured_output import CapturedLines, parse_line_limits
+
+
+pytestmark = pytest.mark.unit
+
+
+def test_short_output_is_kept_whole():
+    captured = CapturedLines( 3, 2, log="test.stdout.log" )
+    for line in ( "a", "b", "c", "d", "e" ):
+        captured.append( line )
+    assert list( captured ) == [ "a", "b", "c", "d", "e" ]
+    assert captured.omitted == 0
+
+
+def test_long_output_keeps_head_and_tail_and_names_the_log():
+    captured = CapturedLines( 2, 3, log="test.stdout.log" )
+    for number in range( 100 ):
+        captured.append( str( number ) )
+    assert captured.total == 100
+    assert captured.omitted == 95
+    assert captured.lines() == [
+            "0", "1", "... 95 lines omitted, see test.stdout.log ...", "97", "98", "99",
+    ]
+
+
+def test_head_only_capture():
+    captured = CapturedLines( 2, 0 )
+    for number in range( 5 ):
+        captured.append( str( number ) )
+    assert captured.lines() == [ "0", "1", "... 3 lines omitted ..." ]
+
+
+def test_unbounded_capture_keeps_everything():
+    captured = CapturedLines( None, None )
+    for number in range( 5000 ):
+        captured.append( str( number ) )
+    assert len( captured ) == 5000 and captured.omitted == 0
+
+
+def test_empty_capture_is_falsy():
+    assert not CapturedLines()
+    assert list( CapturedLines() ) == []
+
+
+@pytest.mark.parametrize( "value, limits", [
+    ( None, ( 1000, 1000 ) ),
+    ( "50", ( 50, 50 ) ),
+    ( "10:200", ( 10, 200 ) ),
+    ( "ALL", ( None, None ) ),
+] )
+def test_parse_line_limits( value, limits ):
+    assert parse_line_limits( value ) == limits
+
+
+@pytest.mark.parametrize( "value", [ "lots", "1:2:3", "-1" ] )
+def test_parse_line_limits_rejects_nonsense( value ):
+    with pytest.raises( ValueError ):
+        parse_line_limits( value )
+
+
+def test_report_serialises_captured_lines_as_a_list( tmp_path ):
+    captured = CapturedLines( 1, 1, log="x.log" )
+    for line in ( "first", "middle", "last" ):
+        captured.append( line )
+    report = tmp_path / "report.json"
+    cuppa.test_report.cuppa_json.write_report( str(report), [ { 'name': 't', 'stdout': captured } ] )
+    assert json.loads( report.read_text() )[0]['stdout'] == [
+            "first", "... 1 lines omitted, see x.log ...", "last",
+    ]
+
+
+def test_process_test_logs_everything_and_keeps_the_ends( tmp_path ):
+    log = str( tmp_path / "test.stdout.log" )
+    test_case = { 'stdout': [] }
+    stdout = run_process_test.ProcessStdout( test_case, False, log, ( 2, 2 ) )
+    for number in range( 10 ):
+        stdout( str( number ) )
+    stdout.log.close()
+
+    assert test_case['stdout_log'] == log
+    assert test_case['stdout'].lines()[:2] == [ "0", "1" ]
+    assert test_case['stdout'].lines()[-2:] == [ "8", "9" ]
+    with open( log ) as handle:
+        assert handle.read().split() == [ str( number ) for number in range( 10 ) ]
+
+
+class SilentNotify(object):
+
+    def __getattr__( self, name ):
+        return lambda *args, **kwargs: None
+
+
+def test_boost_test_case_output_is_bounded_and_logged( tmp_path ):
+    log = str( tmp_path / "test.stdout.log" )
+    stdout = run_boost_test.ProcessStdout( log, SilentNotify(), lambda line: line, line_limits=( 1, 1 ) )
+    lines = [
+        'Entering test suite "suite"',
+        'Entering test case "case"',
+        'one',
+        'two',
+        'three',
+    ]
+    for line in lines:
+        stdout( line )
+    stdout.log.close()
+
+    test_case = stdout.test_suites['suite']['tests'][-1]
+    assert test_case['stdout'].lines() == [ "one", "... 1 lines omitted, see {} ...".format( log ), "three" ]
+    assert test_case['stdout_log'] == log
+    with open( log ) as handle:
+        assert handle.read().splitlines() == lines
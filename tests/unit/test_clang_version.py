@@ -3,7 +3,7 @@
 #    (See accompanying file LICENSE_1_0.txt or copy at
 #          http://www.boost.org/LICENSE_1_0.txt)
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -41,13 +41,8 @@ def test_is_apple_clang_version_text():
 
 
 @pytest.mark.unit
-@patch("cuppa.toolchains.clang.command_available", return_value=True)
-@patch("cuppa.toolchains.clang.Popen")
-def test_apple_clang_version_from_command_sets_apple_flag(mock_popen, _available):
-    proc = MagicMock()
-    proc.communicate.return_value = (APPLE_CLANG_VERSION.encode("utf-8"), b"")
-    mock_popen.return_value = proc
-
+@patch("cuppa.toolchains.clang.probe_cache.version_output", return_value=APPLE_CLANG_VERSION)
+def test_apple_clang_version_from_command_sets_apple_flag(_version_output):
     reported = Clang.version_from_command("clang++")
     assert reported is not None
     assert reported["apple"] is True
@@ -56,13 +51,8 @@ def test_apple_clang_version_from_command_sets_apple_flag(mock_popen, _available
 
 
 @pytest.mark.unit
-@patch("cuppa.toolchains.clang.command_available", return_value=True)
-@patch("cuppa.toolchains.clang.Popen")
-def test_llvm_clang_version_from_command_not_apple(mock_popen, _available):
-    proc = MagicMock()
-    proc.communicate.return_value = (LLVM_CLANG_VERSION.encode("utf-8"), b"")
-    mock_popen.return_value = proc
-
+@patch("cuppa.toolchains.clang.probe_cache.version_output", return_value=LLVM_CLANG_VERSION)
+def test_llvm_clang_version_from_command_not_apple(_version_output):
     reported = Clang.version_from_command("clang++")
     assert reported is not None
     assert reported["apple"] is False
@@ -0,0 +1,161 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import os
+import threading
+import time
+
+import pytest
+import SCons.Errors
+
+from cuppa import build_with_conan
+from cuppa.build_with_conan import conan_dependency
+from cuppa.core import conan_prefetch
+from tests.helpers.fakes import FakeEnv
+from tests.unit.test_build_with_conan import SCONSDEPS_FIXTURE, FakeToolchain, RecordingEnv
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Variant(object):
+
+    def __init__( self, name ):
+        self._name = name
+
+    def name( self ):
+        return self._name
+
+
+def _toolchain_envs( tmp_path, variants=( 'dbg', 'rel' ), stdcpp=( 'c++20', ) ):
+    toolchain = FakeToolchain()
+    toolchain.name = lambda: 'gcc15'
+    build_envs = []
+    for variant in variants:
+        for standard in stdcpp:
+            env = RecordingEnv(
+                    sconstruct_dir=str( tmp_path ),
+                    dependencies_root=str( tmp_path / 'dl' ),
+                    stdcpp=standard,
+                    target_arch='x86_64',
+                    variant=_Variant( variant ),
+            )
+            build_envs.append( { 'env': env, 'variant': variant } )
+    return [ ( toolchain, build_envs ) ]
+
+
+class FakeConan(object):
+    """Stands in for ``conan install``, recording how many run at once."""
+
+    def __init__( self, fails=(), delay=0.05 ):
+        self.installs = []
+        self.most = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._fails = fails
+        self._delay = delay
+
+    def __call__( self, stdout_processor, stderr_processor, args_list, **kwargs ):
+        install_dir = args_list[ args_list.index( '-of' ) + 1 ]
+        with self._lock:
+            self._active += 1
+            self.most = max( self.most, self._active )
+            self.installs.append( args_list )
+        time.sleep( self._delay )
+        with self._lock:
+            self._active -= 1
+        stdout_processor( 'Installing into ' + install_dir )
+        if any( fail in args_list for fail in self._fails ):
+            stderr_processor( 'ERROR: cannot build' )
+            return 1
+        with open( os.path.join( install_dir, 'SConscript_conandeps' ), 'w', encoding='utf-8' ) as script:
+            script.write( SCONSDEPS_FIXTURE )
+        return 0
+
+
+@pytest.fixture
+def fake_conan( monkeypatch ):
+    def install( **options ):
+        conan = FakeConan( **options )
+        monkeypatch.setattr( build_with_conan, '_find_conan_executable', lambda: 'conan' )
+        monkeypatch.setattr( build_with_conan.IncrementalSubProcess, 'Popen2', conan )
+        return conan
+    return install
+
+
+def test_distinct_fingerprints_install_concurrently_and_once( tmp_path, fake_conan, capsys ):
+    conan = fake_conan()
+    Dep = conan_dependency( 'fmt' )
+    toolchain_envs = _toolchain_envs( tmp_path, variants=( 'dbg', 'rel', 'dbg' ), stdcpp=( 'c++20', 'c++23' ) )
+    cuppa_env = FakeEnv( dependencies={ 'fmt': Dep.create } )
+
+    assert conan_prefetch.prefetch_conan_installs( cuppa_env, [ 'fmt' ], toolchain_envs, max_workers=4 ) == 4
+    assert len( conan.installs ) == 4
+    assert conan.most > 1
+    assert 'Installing into' not in capsys.readouterr().out
+
+    # The sconscripts then find every install in the cache.
+    for toolchain, build_envs in toolchain_envs:
+        for build_env in build_envs:
+            env = build_env['env']
+            Dep.create( env )( env, toolchain, env['variant'].name() )
+    assert len( conan.installs ) == 4
+
+
+def test_a_failed_install_is_raised_by_the_first_build_needing_it( tmp_path, fake_conan ):
+    fake_conan( fails=( 'build_type=Release', ) )
+    Dep = conan_dependency( 'fmt' )
+    toolchain_envs = _toolchain_envs( tmp_path )
+    cuppa_env = FakeEnv( dependencies={ 'fmt': Dep.create } )
+
+    assert conan_prefetch.prefetch_conan_installs( cuppa_env, [ 'fmt' ], toolchain_envs, max_workers=2 ) == 1
+    assert len( Dep._install_failures ) == 1
+
+    toolchain, build_envs = toolchain_envs[0]
+    release = build_envs[1]['env']
+    with pytest.raises( SCons.Errors.StopError, match='cannot build' ):
+        Dep.create( release )( release, toolchain, 'rel' )
+    assert not Dep._install_failures
+
+
+def test_nothing_is_installed_by_default_with_one_job_or_when_cleaning( tmp_path, fake_conan ):
+    conan = fake_conan()
+    Dep = conan_dependency( 'fmt' )
+    toolchain_envs = _toolchain_envs( tmp_path )
+
+    assert conan_prefetch.prefetch_conan_installs( FakeEnv( dependencies={ 'fmt': Dep.create } ), [ 'fmt' ], toolchain_envs ) == 0
+    assert conan_prefetch.prefetch_conan_installs( FakeEnv( dependencies={ 'fmt': Dep.create }, conan_jobs=1 ), [ 'fmt' ], toolchain_envs ) == 0
+    assert conan_prefetch.prefetch_conan_installs( FakeEnv( dependencies={ 'fmt': Dep.create }, clean=True ), [ 'fmt' ], toolchain_envs ) == 0
+    assert conan.installs == []
+
+
+def test_only_conan_dependencies_that_install_are_planned( tmp_path ):
+    dependencies = {
+        'fmt'   : conan_dependency( 'fmt' ).create,
+        'local' : conan_dependency( 'local', generators_folder='gen' ).create,
+        'other' : object(),
+    }
+    plan = conan_prefetch.collect_install_plan(
+            FakeEnv( dependencies=dependencies ), [ 'fmt', 'local', 'other', 'missing' ], _toolchain_envs( tmp_path )
+    )
+    assert [ ( name, variant ) for name, _, _, _, variant in plan ] == [ ( 'fmt', 'dbg' ), ( 'fmt', 'rel' ) ]
+
+
+def test_installs_of_one_dependency_lock_per_fingerprint( tmp_path, fake_conan ):
+    fake_conan( delay=0.5 )
+    Dep = conan_dependency( 'fmt' )
+    toolchain, build_envs = _toolchain_envs( tmp_path )[0]
+    started = time.time()
+    threads = [
+        threading.Thread( target=lambda env=build_env['env']: Dep.create( env )( env, toolchain, env['variant'].name() ) )
+        for build_env in build_envs
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.time() - started < 0.9
+    locks = sorted( name for name in os.listdir( str( tmp_path / 'dl' / 'conan' / 'fmt' ) ) if name.endswith( '.lock' ) )
+    assert len( locks ) == 2
@@ -201,3 +201,41 @@ def test_get_sub_sconscripts_with_only_absolute_excludes_still_finds_scripts(tmp
     found = construct.get_sub_sconscripts(str(root), [str(tmp_path / "elsewhere")])
     found_str = [str(p).replace("\\", "/") for p in found]
     assert any(p.endswith("lib/sconscript") for p in found_str)
+
+
+def test_get_sub_sconscripts_skips_vcs_and_hidden_folders(tmp_path):
+    construct = Construct.__new__(Construct)
+    root = tmp_path / "proj"
+    for folder in ("lib", ".git/hooks", ".hidden", "CVS"):
+        (root / folder).mkdir(parents=True)
+        (root / folder / "sconscript").write_text("", encoding="utf-8")
+
+    found = construct.get_sub_sconscripts(str(root), [])
+    found_str = [str(p).replace("\\", "/") for p in found]
+    assert found_str == [str(root / "lib" / "sconscript").replace("\\", "/")]
+
+
+def test_get_sub_sconscripts_reuses_manifest_until_a_folder_changes(tmp_path, monkeypatch):
+    import cuppa.recursive_glob as recursive_glob
+
+    monkeypatch.setattr(recursive_glob.GlobManifest, "RACY_WINDOW_NS", 0)
+    construct = Construct.__new__(Construct)
+    root = tmp_path / "proj"
+    (root / "lib").mkdir(parents=True)
+    (root / "lib" / "sconscript").write_text("", encoding="utf-8")
+    manifest_path = str(tmp_path / "build" / "sub-sconscripts.json")
+
+    manifest = recursive_glob.GlobManifest(manifest_path)
+    first = construct.get_sub_sconscripts(str(root), [], manifest)
+    manifest.save()
+
+    manifest = recursive_glob.GlobManifest(manifest_path)
+    assert construct.get_sub_sconscripts(str(root), [], manifest) == first
+    assert (manifest.reused, manifest.scanned) == (1, 0)
+
+    (root / "app").mkdir()
+    (root / "app" / "sconscript").write_text("", encoding="utf-8")
+    manifest = recursive_glob.GlobManifest(manifest_path)
+    found = construct.get_sub_sconscripts(str(root), [], manifest)
+    assert manifest.scanned == 1
+    assert str(root / "app" / "sconscript") in found
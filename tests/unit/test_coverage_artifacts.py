@@ -8,7 +8,12 @@ import os
 
 import pytest
 
-from cuppa.cpp.coverage_by_source import generate_by_source_coverage, source_coverage_entry
+from cuppa.cpp.coverage_by_source import (
+    generate_by_source_coverage,
+    resolve_source_path,
+    source_basename_index,
+    source_coverage_entry,
+)
 from cuppa.cpp.run_gcov_coverage import (
     CoverageIndexBuilder,
     _copy_coverage_artifact,
@@ -105,3 +110,43 @@ def test_generate_by_source_uses_index_subdir_and_copies_independently(tmp_path)
     assert (
         destination / "by-source" / "coverage-index--suite.beta" / "lib--widget.hpp.html"
     ).is_file()
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("", encoding="utf-8")
+
+
+def test_source_basename_index_prunes_excluded_directories_and_ranks(tmp_path):
+    repo = tmp_path / "repo"
+    _touch(repo / "src" / "detail" / "widget.hpp")
+    _touch(repo / "include" / "widget.hpp")
+    _touch(repo / "src" / "_build" / "gen" / "widget.hpp")
+    _touch(repo / "src" / "node_modules" / "only_here.hpp")
+    roots = [str(repo / "include"), str(repo / "src")]
+
+    index = source_basename_index(str(repo), roots)
+
+    assert index.candidates("widget.hpp") == ["include/widget.hpp", "src/detail/widget.hpp"]
+    assert index.resolve("only_here.hpp") is None
+    assert resolve_source_path(str(repo), "widget.hpp", roots, index) == "include/widget.hpp"
+    assert resolve_source_path(str(repo), "widget.hpp", roots) == "include/widget.hpp"
+
+
+def test_source_basename_index_walks_roots_once(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    _touch(repo / "src" / "a.cpp")
+    _touch(repo / "src" / "b.cpp")
+    walks = []
+    real_walk = os.walk
+
+    def counting_walk(top, *args, **kwargs):
+        walks.append(top)
+        return real_walk(top, *args, **kwargs)
+
+    monkeypatch.setattr("cuppa.cpp.coverage_by_source.os.walk", counting_walk)
+    index = source_basename_index(str(repo), [str(repo / "src")])
+    for name in ("a.cpp", "b.cpp", "missing.cpp", "a.cpp"):
+        resolve_source_path(str(repo), name, [str(repo / "src")], index)
+
+    assert walks == [str(repo / "src")]
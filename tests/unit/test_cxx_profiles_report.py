@@ -19,7 +19,9 @@ from cuppa.cpp.cxx_profiles_report import (
     parse_profiles_diagnostic,
     parse_variant_scope_fields,
     profiles_scope_from_construction_env,
+    capture_line_key,
     replay_profiles_capture,
+    replay_profiles_capture_file,
     unscoped_profiles_scope,
 )
 
@@ -158,6 +160,25 @@ def test_inventory_dedupes_within_scope():
     assert location.reference_count == 2
 
 
+def test_inventory_locations_keep_first_scope_and_insertion_order():
+    inventory = ProfilesInventory()
+    static_init = parse_profiles_diagnostic( _STATIC_INIT_LINE )
+    uninit = parse_profiles_diagnostic( _UNINIT_LINE )
+    other_toolchain = _SAMPLE_SCOPE._replace( toolchain='clang25_profiles' )
+    inventory.record( _SAMPLE_SCOPE, static_init )
+    inventory.record( _SAMPLE_SCOPE, uninit, references=3 )
+    inventory.record( other_toolchain, static_init )
+
+    first, second = inventory.locations()
+    assert first.scope is _SAMPLE_SCOPE
+    assert ( first.path, first.line, first.column ) == ( static_init.path, static_init.line, static_init.column )
+    assert ( first.rule_id, first.raw_message ) == ( static_init.rule_id, static_init.message )
+    assert first.reference_count == 2
+    assert second.normalised_message == uninit.normalised_message
+    assert second.reference_count == 3
+    assert inventory.total_references() == 5
+
+
 def test_inventory_keeps_same_file_in_two_scopes_separate():
     inventory = ProfilesInventory()
     diagnostic = parse_profiles_diagnostic( _STATIC_INIT_LINE )
@@ -405,6 +426,21 @@ def test_replay_profiles_capture_builds_scope_from_progress_markers():
     assert scope.variant_label == 'dbg'
 
 
+def test_replay_profiles_capture_file_matches_in_memory_replay( tmp_path ):
+    capture = tmp_path / 'capture.txt'
+    capture.write_text( _FIXTURE_CAPTURE.read_text() + _UNINIT_LINE + '\n', encoding='utf-8' )
+    streamed, streamed_unscoped = replay_profiles_capture_file( str( capture ) )
+    listed, listed_unscoped = replay_profiles_capture( capture.read_text().splitlines() )
+    assert streamed.locations() == listed.locations()
+    assert streamed_unscoped == listed_unscoped
+
+
+def test_capture_line_key_ignores_line_endings():
+    assert capture_line_key( _UNINIT_LINE + '\r\n' ) == capture_line_key( _UNINIT_LINE )
+    assert len( capture_line_key( _UNINIT_LINE ) ) == 16
+    assert capture_line_key( _UNINIT_LINE ) != capture_line_key( _UNINIT_LINE + ' ' )
+
+
 def test_replay_profiles_capture_records_unscoped_without_progress():
     inventory, unscoped = replay_profiles_capture( [ _UNINIT_LINE ] )
     assert unscoped == 1
@@ -417,3 +453,10 @@ def test_format_capture_summary_lists_rules():
     assert 'total_references: 3' in summary
     assert 'static_runtime_init' in summary
     assert './widget/sconscript' in summary
+
+
+def test_benchmark_profiles_inventory_replays_the_fixture( capsys ):
+    from scripts.benchmark_profiles_inventory import main
+
+    assert main( [ '--scale', '3', str( _FIXTURE_CAPTURE ) ] ) == 0
+    assert '9 diagnostics, 9 unique locations' in capsys.readouterr().out
@@ -163,3 +163,116 @@ def test_delete_entry_for_path( tmp_path ):
     assert dependency_inventory.load_all_entries( str( dependencies_root ) )
     dependency_inventory.delete_entry_for_path( str( dependencies_root ), str( tree ) )
     assert dependency_inventory.load_all_entries( str( dependencies_root ) ) == []
+
+
+def _settled( monkeypatch ):
+    """Trust directory mtimes straight away; tests write trees moments before measuring them."""
+    from cuppa.utility import size_index
+    monkeypatch.setattr( size_index, 'RACY_WINDOW_NS', 0 )
+
+
+def test_measure_size_is_exact_for_large_trees( tmp_path ):
+    tree = tmp_path / 'dependencies' / 'big'
+    for folder in range( 30 ):
+        directory = tree / 'd{}'.format( folder )
+        directory.mkdir( parents=True )
+        for name in range( 200 ):
+            ( directory / 'f{}'.format( name ) ).write_bytes( b'x' * 3 )
+
+    size = dependency_inventory.measure_size(
+            str( tree ), dependencies_root=str( tmp_path / 'dependencies' )
+    )
+    assert size['method'] == 'exact'
+    assert size['bytes'] == 30 * 200 * 3
+
+
+def test_size_index_reads_only_changed_directories( tmp_path, monkeypatch ):
+    _settled( monkeypatch )
+    dependencies_root = tmp_path / 'dependencies'
+    tree = dependencies_root / 'widget'
+    for folder in ( 'a', 'a/deep', 'b', 'c' ):
+        ( tree / folder ).mkdir( parents=True )
+        ( tree / folder / 'file' ).write_bytes( b'12345' )
+
+    index = dependency_inventory.size_index_for( str( dependencies_root ), str( tree ) )
+    assert index.measure( str( tree ) ).bytes == 20
+    assert index.read == 5
+
+    ( tree / 'a' / 'deep' / 'more' ).write_bytes( b'123' )
+    index = dependency_inventory.size_index_for( str( dependencies_root ), str( tree ) )
+    assert index.changed( str( tree ) )
+    assert index.measure( str( tree ) ).bytes == 23
+    assert ( index.read, index.reused ) == ( 1, 4 )
+    assert storage.directory_stats( str( tree ) ).bytes == 23
+
+
+def test_size_index_drops_removed_directories( tmp_path, monkeypatch ):
+    import shutil
+
+    _settled( monkeypatch )
+    dependencies_root = tmp_path / 'dependencies'
+    tree = dependencies_root / 'widget'
+    for folder in ( 'keep', 'gone/nested' ):
+        ( tree / folder ).mkdir( parents=True )
+        ( tree / folder / 'file' ).write_bytes( b'1234' )
+
+    index = dependency_inventory.size_index_for( str( dependencies_root ), str( tree ) )
+    assert index.measure( str( tree ) ).bytes == 8
+    shutil.rmtree( str( tree / 'gone' ) )
+    assert index.measure( str( tree ) ).bytes == 4
+
+
+def test_size_index_matches_directory_stats_for_symlinks( tmp_path ):
+    dependencies_root = tmp_path / 'dependencies'
+    tree = dependencies_root / 'widget'
+    ( tree / 'real' ).mkdir( parents=True )
+    ( tree / 'real' / 'file' ).write_bytes( b'123456' )
+    os.symlink( str( tree / 'real' ), str( tree / 'linked_dir' ) )
+    os.symlink( str( tree / 'real' / 'file' ), str( tree / 'linked_file' ) )
+    os.symlink( str( tree / 'missing' ), str( tree / 'dangling' ) )
+
+    index = dependency_inventory.size_index_for( str( dependencies_root ), str( tree ) )
+    assert index.measure( str( tree ) ) == storage.directory_stats( str( tree ) )
+
+
+def test_size_needs_refresh_sees_changes_below_the_root( tmp_path, monkeypatch ):
+    _settled( monkeypatch )
+    dependencies_root = tmp_path / 'dependencies'
+    tree = dependencies_root / 'widget'
+    ( tree / 'src' / 'deep' ).mkdir( parents=True )
+    ( tree / 'src' / 'deep' / 'file' ).write_bytes( b'1' )
+
+    entry = dependency_inventory.touch_entry(
+            str( dependencies_root ), str( tree ), storage_type='repository', dependency='widget',
+    )
+    assert not dependency_inventory.size_needs_refresh( entry, str( tree ), str( dependencies_root ) )
+
+    ( tree / 'src' / 'deep' / 'added' ).write_bytes( b'12' )
+    assert dependency_inventory.size_needs_refresh( entry, str( tree ), str( dependencies_root ) )
+
+    entry = dependency_inventory.touch_entry(
+            str( dependencies_root ), str( tree ), storage_type='repository', dependency='widget',
+    )
+    assert entry['size']['bytes'] == 3
+
+
+def test_size_needs_refresh_without_an_index_uses_the_root_mtime( tmp_path ):
+    tree = tmp_path / 'dependencies' / 'widget'
+    tree.mkdir( parents=True )
+    entry = { 'size': { 'bytes': 0, 'measured': '2000-01-01T00:00:00Z', 'method': 'sampled' } }
+    assert dependency_inventory.size_needs_refresh( entry, str( tree ), str( tmp_path / 'dependencies' ) )
+    entry['size']['measured'] = '2999-01-01T00:00:00Z'
+    assert not dependency_inventory.size_needs_refresh( entry, str( tree ) )
+
+
+def test_delete_entry_removes_the_size_index( tmp_path ):
+    dependencies_root = tmp_path / 'dependencies'
+    tree = dependencies_root / 'gadget'
+    tree.mkdir( parents=True )
+    dependency_inventory.touch_entry(
+            str( dependencies_root ), str( tree ), storage_type='gitlab', dependency='gadget',
+    )
+    sizes = dependencies_root / dependency_inventory.INVENTORY_DIR_NAME / dependency_inventory.SIZE_INDEX_DIR_NAME
+    assert list( sizes.glob( '*.json' ) )
+    dependency_inventory.delete_entry_for_path( str( dependencies_root ), str( tree ) )
+    assert not list( sizes.glob( '*.json' ) )
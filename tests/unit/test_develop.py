@@ -632,6 +632,96 @@ def test_a_dry_run_changes_nothing_and_exits_zero( tmp_path, monkeypatch ):
     assert update_develop( env ) == 0
 
 
+#-------------------------------------------------------------------------------
+#   Concurrent fetch and inspection
+#-------------------------------------------------------------------------------
+
+def _concurrency_probe( delay_for ):
+    """Wrap a function so calls sleep for `delay_for( argument )` and the peak overlap is kept."""
+    import threading
+    import time
+
+    state = { 'running': 0, 'peak': 0 }
+    lock = threading.Lock()
+
+    def wrap( function ):
+        def probed( *args ):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max( state['peak'], state['running'] )
+            try:
+                time.sleep( delay_for( *args ) )
+                return function( *args )
+            finally:
+                with lock:
+                    state['running'] -= 1
+        return probed
+
+    return wrap, state
+
+
+def test_survey_inspects_concurrently_but_keeps_dependency_order( tmp_path, monkeypatch ):
+    import cuppa.develop as develop
+
+    names = [ 'alpha', 'beta', 'gamma', 'delta' ]
+    delays = { 'alpha': 0.06, 'beta': 0.0, 'gamma': 0.04, 'delta': 0.02 }
+    wrap, state = _concurrency_probe( lambda name, path: delays[name] )
+    monkeypatch.setattr( develop, 'inspect', wrap( lambda name, path: Copy( name, path ) ) )
+
+    env = fake_env( { name: dependency_with_develop( name, str(tmp_path / name) ) for name in names } )
+    copies, _ = survey( env )
+
+    assert [ copy.name for copy in copies ] == sorted( names )
+    assert state['peak'] > 1
+
+
+def test_survey_respects_the_location_jobs_cap( tmp_path, monkeypatch ):
+    import cuppa.develop as develop
+
+    wrap, state = _concurrency_probe( lambda name, path: 0.01 )
+    monkeypatch.setattr( develop, 'inspect', wrap( lambda name, path: Copy( name, path ) ) )
+
+    env = fake_env( { name: dependency_with_develop( name, str(tmp_path / name) ) for name in 'abcdef' },
+                    location_jobs=1 )
+    survey( env )
+    assert state['peak'] == 1
+
+
+def test_update_reports_fetch_failures_in_table_order( tmp_path, monkeypatch ):
+    import cuppa.develop as develop
+
+    names = [ 'alpha', 'beta', 'gamma' ]
+    monkeypatch.setattr( develop, 'inspect', lambda name, path: Copy(
+            name, path, exists=True, is_working_copy=True, scm='git', branch=DEFAULT,
+            upstream="origin/" + DEFAULT, ahead=0, behind=0, modified=False ) )
+
+    delays = { 'alpha': 0.05, 'beta': 0.0, 'gamma': 0.02 }
+    wrap, state = _concurrency_probe( lambda path: delays[os.path.basename( path )] )
+
+    def fail( path ):
+        raise Git.Error( "unreachable " + os.path.basename( path ) )
+
+    monkeypatch.setattr( Git, 'fetch', wrap( fail ) )
+
+    env = fake_env( { name: dependency_with_develop( name, str(tmp_path / name) ) for name in names } )
+    lines = []
+    assert update_develop( env, out=lambda text="": lines.append( text ) ) == 1
+
+    failures = [ line for line in lines if "Could not fetch" in line ]
+    assert [ name for line in failures for name in names if "[" + name + "]" in line ] == names
+    assert state['peak'] > 1
+
+
+def test_concurrent_fetches_do_not_show_git_progress( tmp_path, monkeypatch ):
+    import cuppa.develop as develop
+
+    seen = []
+    monkeypatch.setattr( logger, 'isEnabledFor', lambda level: True )
+    results = develop.in_order( lambda item: seen.append( Git._progress_enabled() ), [ 1, 2, 3 ], 3 )
+    assert len( results ) == 3 and seen == [ False, False, False ]
+    assert Git._progress_enabled()
+
+
 #-------------------------------------------------------------------------------
 #   Observation against a real working copy
 #-------------------------------------------------------------------------------
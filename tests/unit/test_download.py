@@ -254,6 +254,277 @@ def test_download_file_cleans_partial_on_failure( tmp_path, monkeypatch ):
     assert not os.path.isfile( str( dest ) + '.partial' )
 
 
+def _serve( handler ):
+    from http.server import HTTPServer
+    import threading
+
+    server = HTTPServer( ( '127.0.0.1', 0 ), handler )
+    thread = threading.Thread( target=server.serve_forever )
+    thread.daemon = True
+    thread.start()
+    return server, thread
+
+
+def _range_handler( payload, seen, honour_range=True, cut_first_at=None, etag=None ):
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler( BaseHTTPRequestHandler ):
+        def do_GET( self ):
+            requested = self.headers.get( 'Range' )
+            seen.append( requested )
+            if_range = self.headers.get( 'If-Range' )
+            if if_range is not None and if_range != etag:
+                requested = None
+            start = 0
+            if honour_range and requested and requested.startswith( 'bytes=' ):
+                start = int( requested[len( 'bytes=' ):].split( '-' )[0] )
+                if start >= len( payload ):
+                    self.send_response( 416 )
+                    self.send_header( 'Content-Range', 'bytes */{}'.format( len( payload ) ) )
+                    self.end_headers()
+                    return
+                self.send_response( 206 )
+                self.send_header(
+                        'Content-Range',
+                        'bytes {}-{}/{}'.format( start, len( payload ) - 1, len( payload ) ),
+                )
+            else:
+                self.send_response( 200 )
+            if etag:
+                self.send_header( 'ETag', etag )
+            body = payload[start:]
+            self.send_header( 'Content-Length', str( len( body ) ) )
+            self.end_headers()
+            if cut_first_at is not None and len( seen ) == 1:
+                # Promise the whole body, deliver a prefix, then drop the connection.
+                self.wfile.write( body[:cut_first_at] )
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.wfile.write( body )
+
+        def log_message( self, format, *args ):
+            return
+
+    return Handler
+
+
+def _sha256( data ):
+    import hashlib
+    return hashlib.sha256( data ).hexdigest()
+
+
+def test_download_file_resumes_existing_partial_with_range( tmp_path ):
+    payload = os.urandom( 300 * 1024 )
+    seen = []
+    server, thread = _serve( _range_handler( payload, seen ) )
+    try:
+        url = 'http://127.0.0.1:{}/blob.bin'.format( server.server_address[1] )
+        dest = tmp_path / 'blob.bin'
+        ( tmp_path / 'blob.bin.partial' ).write_bytes( payload[:100000] )
+        dl.download_file(
+                url, str( dest ), show_progress=False, expected_sha256=_sha256( payload ),
+        )
+        assert dest.read_bytes() == payload
+        assert seen == [ 'bytes=100000-' ]
+        assert not os.path.isfile( str( dest ) + '.partial' )
+    finally:
+        server.shutdown()
+        thread.join( timeout=5 )
+
+
+def test_download_file_retries_interrupted_transfer_from_where_it_stopped( tmp_path ):
+    payload = os.urandom( 600 * 1024 )
+    seen = []
+    server, thread = _serve( _range_handler( payload, seen, cut_first_at=200 * 1024 ) )
+    try:
+        url = 'http://127.0.0.1:{}/blob.bin'.format( server.server_address[1] )
+        dest = tmp_path / 'blob.bin'
+        dl.download_file(
+                url,
+                str( dest ),
+                show_progress=False,
+                expected_sha256=_sha256( payload ),
+                expected_size=len( payload ),
+        )
+        assert dest.read_bytes() == payload
+        assert seen[0] is None
+        assert seen[1] == 'bytes={}-'.format( 200 * 1024 )
+    finally:
+        server.shutdown()
+        thread.join( timeout=5 )
+
+
+def test_download_file_restarts_when_server_ignores_range( tmp_path ):
+    payload = b'0123456789' * 5000
+    seen = []
+    server, thread = _serve( _range_handler( payload, seen, honour_range=False ) )
+    try:
+        url = 'http://127.0.0.1:{}/blob.bin'.format( server.server_address[1] )
+        dest = tmp_path / 'blob.bin'
+        ( tmp_path / 'blob.bin.partial' ).write_bytes( b'stale bytes' )
+        dl.download_file( url, str( dest ), show_progress=False, expected_sha256=_sha256( payload ) )
+        assert dest.read_bytes() == payload
+        assert seen == [ 'bytes=11-' ]
+    finally:
+        server.shutdown()
+        thread.join( timeout=5 )
+
+
+def test_download_file_restarts_when_range_not_satisfiable( tmp_path ):
+    payload = b'abc' * 100
+    seen = []
+    server, thread = _serve( _range_handler( payload, seen ) )
+    try:
+        url = 'http://127.0.0.1:{}/blob.bin'.format( server.server_address[1] )
+        dest = tmp_path / 'blob.bin'
+        ( tmp_path / 'blob.bin.partial' ).write_bytes( b'x' * 1000 )
+        dl.download_file( url, str( dest ), show_progress=False, expected_sha256=_sha256( payload ) )
+        assert dest.read_bytes() == payload
+        assert seen == [ 'bytes=1000-', None ]
+    finally:
+        server.shutdown()
+        thread.join( timeout=5 )
+
+
+def test_download_file_resumes_only_the_file_the_partial_came_from( tmp_path ):
+    payload = os.urandom( 200 * 1024 )
+    seen = []
+    server, thread = _serve( _range_handler( payload, seen, etag='"v2"' ) )
+    try:
+        url = 'http://127.0.0.1:{}/blob.bin'.format( server.server_address[1] )
+        dest = tmp_path / 'blob.bin'
+
+        ( tmp_path / 'blob.bin.partial' ).write_bytes( payload[:1000] )
+        ( tmp_path / 'blob.bin.partial.validator' ).write_text( '"v2"', encoding='utf-8' )
+        dl.download_file( url, str( dest ), show_progress=False )
+        assert dest.read_bytes() == payload
+
+        # Changed on the server since the partial was written: sent whole, not appended to.
+        ( tmp_path / 'blob.bin.partial' ).write_bytes( b'old bytes' )
+        ( tmp_path / 'blob.bin.partial.validator' ).write_text( '"v1"', encoding='utf-8' )
+        dl.download_file( url, str( dest ), show_progress=False )
+        assert dest.read_bytes() == payload
+        assert seen == [ 'bytes=1000-', 'bytes=9-' ]
+        assert not os.path.isfile( str( dest ) + '.partial.validator' )
+    finally:
+        server.shutdown()
+        thread.join( timeout=5 )
+
+
+def test_download_file_keeps_the_validator_of_an_interrupted_transfer( tmp_path ):
+    payload = os.urandom( 600 * 1024 )
+    seen = []
+    server, thread = _serve( _range_handler( payload, seen, cut_first_at=200 * 1024, etag='"v1"' ) )
+    try:
+        url = 'http://127.0.0.1:{}/blob.bin'.format( server.server_address[1] )
+        dest = tmp_path / 'blob.bin'
+        dl.download_file( url, str( dest ), show_progress=False )
+        assert dest.read_bytes() == payload
+        assert seen == [ None, 'bytes={}-'.format( 200 * 1024 ) ]
+    finally:
+        server.shutdown()
+        thread.join( timeout=5 )
+
+
+def test_download_file_does_not_resume_a_partial_it_cannot_validate( tmp_path ):
+    payload = b'new contents' * 100
+    seen = []
+    server, thread = _serve( _range_handler( payload, seen ) )
+    try:
+        url = 'http://127.0.0.1:{}/blob.bin'.format( server.server_address[1] )
+        dest = tmp_path / 'blob.bin'
+        ( tmp_path / 'blob.bin.partial' ).write_bytes( b'old contents' )
+        dl.download_file( url, str( dest ), show_progress=False )
+        assert dest.read_bytes() == payload
+        assert seen == [ None ]
+    finally:
+        server.shutdown()
+        thread.join( timeout=5 )
+
+
+def test_download_file_accepts_a_partial_that_is_already_complete( tmp_path ):
+    payload = b'abc' * 100
+    seen = []
+    server, thread = _serve( _range_handler( payload, seen ) )
+    try:
+        url = 'http://127.0.0.1:{}/blob.bin'.format( server.server_address[1] )
+        dest = tmp_path / 'blob.bin'
+        ( tmp_path / 'blob.bin.partial' ).write_bytes( payload )
+        dl.download_file( url, str( dest ), show_progress=False, expected_sha256=_sha256( payload ) )
+        assert dest.read_bytes() == payload
+        assert seen == [ 'bytes=300-' ]
+    finally:
+        server.shutdown()
+        thread.join( timeout=5 )
+
+
+def test_download_file_checksum_mismatch_discards_partial( tmp_path ):
+    payload = b'payload' * 1000
+    seen = []
+    server, thread = _serve( _range_handler( payload, seen ) )
+    try:
+        url = 'http://127.0.0.1:{}/blob.bin'.format( server.server_address[1] )
+        dest = tmp_path / 'blob.bin'
+        with pytest.raises( dl.DownloadError ) as error:
+            dl.download_file( url, str( dest ), show_progress=False, expected_sha256='0' * 64 )
+        assert 'sha256 mismatch' in str( error.value )
+        assert not dest.exists()
+        assert not os.path.isfile( str( dest ) + '.partial' )
+    finally:
+        server.shutdown()
+        thread.join( timeout=5 )
+
+
+def test_download_file_size_mismatch_is_rejected_before_streaming( tmp_path ):
+    payload = b'payload' * 1000
+    seen = []
+    server, thread = _serve( _range_handler( payload, seen ) )
+    try:
+        url = 'http://127.0.0.1:{}/blob.bin'.format( server.server_address[1] )
+        dest = tmp_path / 'blob.bin'
+        with pytest.raises( dl.DownloadError ) as error:
+            dl.download_file( url, str( dest ), show_progress=False, expected_size=len( payload ) + 1 )
+        assert 'size mismatch' in str( error.value )
+        assert not os.path.isfile( str( dest ) + '.partial' )
+    finally:
+        server.shutdown()
+        thread.join( timeout=5 )
+
+
+def test_download_file_keeps_partial_for_resume_after_failure( tmp_path, monkeypatch ):
+    dest = tmp_path / 'broken.bin'
+
+    class Truncated( object ):
+        headers = { 'Content-Length': '100' }
+
+        def __init__( self ):
+            self._sent = False
+
+        def read( self, size=-1 ):
+            if self._sent:
+                raise IOError( 'connection reset' )
+            self._sent = True
+            return b'x' * 40
+
+        def close( self ):
+            return
+
+    monkeypatch.setattr( dl, 'urlopen', lambda request: Truncated() )
+    with pytest.raises( dl.DownloadError ):
+        dl.download_file( 'http://example.com/broken.bin', str( dest ), show_progress=False, retries=0 )
+    assert not dest.exists()
+    assert ( tmp_path / 'broken.bin.partial' ).read_bytes() == b'x' * 40
+
+
+def test_verify_download_checks_existing_file( tmp_path ):
+    path = tmp_path / 'file.bin'
+    path.write_bytes( b'hello' )
+    dl.verify_download( str( path ), expected_sha256=_sha256( b'hello' ).upper(), expected_size=5 )
+    with pytest.raises( dl.DownloadError ):
+        dl.verify_download( str( path ), expected_size=6 )
+
+
 def test_transfer_file_reports_extract_progress( tmp_path ):
     src = tmp_path / 'payload.bin'
     payload = b'xyz' * 10000
@@ -0,0 +1,234 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import shutil
+import subprocess
+
+import pytest
+
+from cuppa.cpp import run_benchmark
+from cuppa.scms import git as git_scm
+from cuppa.scms.git import Git
+
+
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.skipif( shutil.which( "git" ) is None, reason="git is not installed" ),
+]
+
+
+def git( path, *arguments ):
+    return subprocess.check_output(
+        [ "git", "-c", "user.email=test@example.com", "-c", "user.name=test",
+          "-c", "commit.gpgsign=false" ] + list( arguments ),
+        cwd = str(path),
+        stderr = subprocess.STDOUT
+    ).decode().strip()
+
+
+def commit( path, name ):
+    ( path / name ).write_text( name )
+    git( path, "add", name )
+    git( path, "commit", "-m", name )
+
+
+@pytest.fixture( autouse=True )
+def forget_snapshots():
+    Git.forget_snapshots()
+    yield
+    Git.forget_snapshots()
+
+
+@pytest.fixture
+def working_copy( tmp_path ):
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    git( origin, "init", "--initial-branch=master", "." )
+    commit( origin, "first" )
+    clone = tmp_path / "clone"
+    subprocess.check_output( [ "git", "clone", str(origin), str(clone) ], stderr=subprocess.STDOUT )
+    return origin, clone
+
+
+@pytest.fixture
+def spawned( monkeypatch ):
+    commands = []
+    execute = Git.execute_command.__func__
+
+    def counting( cls, command, path=None ):
+        commands.append( command )
+        return execute( cls, command, path )
+
+    monkeypatch.setattr( Git, 'execute_command', classmethod( counting ) )
+    return commands
+
+
+def test_snapshot_reads_a_clone_in_two_processes( working_copy, spawned ):
+    origin, clone = working_copy
+    snapshot = Git.snapshot( str(clone) )
+
+    assert snapshot.branch == "master" and not snapshot.detached
+    assert snapshot.upstream == "origin/master"
+    assert ( snapshot.ahead, snapshot.behind, snapshot.modified ) == ( 0, 0, False )
+    assert snapshot.commit == git( clone, "rev-parse", "HEAD" )
+    assert snapshot.url == str(origin)
+    assert len( spawned ) <= 3
+
+
+def test_snapshot_is_remembered_until_the_working_copy_moves( working_copy, spawned ):
+    origin, clone = working_copy
+    first = Git.snapshot( str(clone) )
+    count = len( spawned )
+    assert Git.snapshot( str(clone) ) is first
+    assert len( spawned ) == count
+
+    commit( clone, "local" )
+    moved = Git.snapshot( str(clone) )
+    assert moved.ahead == 1
+    assert moved.commit != first.commit
+
+
+def test_refresh_sees_unstaged_edits( working_copy ):
+    origin, clone = working_copy
+    assert not Git.snapshot( str(clone) ).modified
+    ( clone / "first" ).write_text( "changed" )
+    assert Git.snapshot( str(clone), refresh=True ).modified
+
+
+def test_revision_prefers_a_tag_name( working_copy ):
+    origin, clone = working_copy
+    git( clone, "tag", "v1.0" )
+    assert Git.get_revision( str(clone) ) == "v1.0"
+
+
+def test_revision_falls_back_to_describe( working_copy ):
+    origin, clone = working_copy
+    assert Git.get_revision( str(clone) ) == git( clone, "describe", "--always" )
+
+
+def test_info_matches_the_working_copy( working_copy ):
+    origin, clone = working_copy
+    url, repository, branch, remote, revision = Git.info( str(clone) )
+    assert url == repository == str(origin)
+    assert ( branch, remote ) == ( "master", "origin/master" )
+    assert revision == git( clone, "describe", "--always" )
+
+
+def test_detached_head_takes_its_branch_from_remote_refs( working_copy ):
+    origin, clone = working_copy
+    git( clone, "checkout", "--detach", "HEAD" )
+    snapshot = Git.snapshot( str(clone) )
+    assert snapshot.detached and snapshot.branch is None
+    assert Git.get_branch( str(clone) ) == ( "master", "origin/master" )
+
+
+def test_detached_head_at_a_tag_has_no_branch( working_copy ):
+    origin, clone = working_copy
+    git( clone, "tag", "v1.0" )
+    git( clone, "checkout", "--detach", "v1.0" )
+    branch, remote = Git.get_branch( str(clone) )
+    assert branch is None
+    assert remote == "origin/master"
+
+
+def test_rebasing_reports_the_branch_being_rebased( working_copy ):
+    origin, clone = working_copy
+    git( clone, "checkout", "--detach", "HEAD" )
+    state = clone / ".git" / "rebase-merge"
+    state.mkdir()
+    ( state / "head-name" ).write_text( "refs/heads/feature\n" )
+    assert Git.get_branch( str(clone) ) == ( "feature", None )
+    assert Git.get_working_copy_state( str(clone) ).detached
+
+
+def test_info_without_origin_raises( tmp_path ):
+    git( tmp_path, "init", "--initial-branch=master", "." )
+    commit( tmp_path, "first" )
+    assert Git.snapshot( str(tmp_path) ).url is None
+    with pytest.raises( Git.Error ):
+        Git.info( str(tmp_path) )
+
+
+def test_info_before_the_first_commit_raises( tmp_path ):
+    git( tmp_path, "init", "--initial-branch=master", "." )
+    snapshot = Git.snapshot( str(tmp_path) )
+    assert snapshot.commit is None and snapshot.branch == "master"
+    with pytest.raises( Git.Error ):
+        Git.info( str(tmp_path) )
+
+
+def test_not_a_working_copy_raises( tmp_path ):
+    with pytest.raises( Git.Error ):
+        Git.snapshot( str(tmp_path) )
+
+
+def test_origin_url_is_read_from_config( tmp_path ):
+    config = tmp_path / "config"
+    config.write_text(
+        '[core]\n\tbare = false\n'
+        '[remote "upstream"]\n\turl = https://example.com/other.git\n'
+        '[remote "origin"]\n\turl = "https://example.com/widget.git" ; comment\n'
+    )
+    assert git_scm._origin_url_from_config( str(config) ) == ( True, "https://example.com/widget.git" )
+
+
+def test_origin_url_defers_to_git_when_config_includes_files( tmp_path ):
+    config = tmp_path / "config"
+    config.write_text( '[include]\n\tpath = other\n[remote "origin"]\n\turl = x\n' )
+    assert git_scm._origin_url_from_config( str(config) ) == ( None, None )
+
+
+def test_origin_url_is_read_from_the_deprecated_section_spelling( tmp_path ):
+    config = tmp_path / "config"
+    config.write_text( '[remote.origin]\n\turl = https://example.com/widget.git\n' )
+    assert git_scm._origin_url_from_config( str(config) ) == ( True, "https://example.com/widget.git" )
+
+
+def test_origin_url_missing_from_config_is_asked_of_git( working_copy, monkeypatch ):
+    origin, clone = working_copy
+    monkeypatch.setattr( git_scm, '_origin_url_from_config', lambda config_path: ( True, None ) )
+    assert Git.snapshot( str(clone) ).url == str(origin)
+
+
+def test_detached_head_takes_its_branch_from_the_first_decoration( working_copy ):
+    origin, clone = working_copy
+    git( clone, "checkout", "-b", "feature" )
+    commit( clone, "local" )
+    git( clone, "checkout", "--detach", "HEAD" )
+    assert Git.get_branch( str(clone) ) == ( "feature", None )
+
+
+def test_detached_head_at_a_slashed_remote_branch_keeps_its_first_segment( working_copy ):
+    origin, clone = working_copy
+    git( origin, "checkout", "-b", "feature/x" )
+    commit( origin, "remote" )
+    git( clone, "fetch" )
+    git( clone, "checkout", "--detach", "origin/feature/x" )
+    assert Git.get_branch( str(clone) ) == ( "feature", "origin/feature/x" )
+
+
+def test_snapshot_is_not_remembered_without_a_gitdir( working_copy, monkeypatch ):
+    origin, clone = working_copy
+    monkeypatch.setattr( git_scm, '_git_dirs', lambda path: ( None, None ) )
+    taken = []
+    take = Git._take_snapshot.__func__
+
+    def counting( cls, path ):
+        taken.append( path )
+        return take( cls, path )
+
+    monkeypatch.setattr( Git, '_take_snapshot', classmethod( counting ) )
+    Git.snapshot( str(clone) )
+    Git.snapshot( str(clone) )
+    assert len( taken ) == 2
+
+
+def test_benchmark_commit_is_found_from_below_the_repository_root( working_copy ):
+    origin, clone = working_copy
+    project = clone / "projects" / "widget"
+    project.mkdir( parents=True )
+
+    assert Git.working_copy_root( str(project) ) == str(clone)
+    assert run_benchmark.current_commit( str(project) ) == git( clone, "rev-parse", "HEAD" )
@@ -0,0 +1,118 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from cuppa.package_managers import gitlab
+
+
+pytestmark = pytest.mark.unit
+
+
+def staged_package( root ):
+    package = root / "widget" / "1.0.0"
+    ( package / "include" / "widget" ).mkdir( parents=True )
+    ( package / "lib" ).mkdir( parents=True )
+    ( package / "include" / "widget" / "widget.hpp" ).write_text( "header\n" )
+    ( package / "include" / "widget" / "api.hpp" ).write_text( "api\n" )
+    ( package / "lib" / "libwidget.a" ).write_bytes( os.urandom( 4096 ) )
+    return package
+
+
+def archive_twice( tmp_path, codec, monkeypatch, use_tools=True ):
+    if not use_tools:
+        monkeypatch.setattr( gitlab, '_compressor_command', lambda codec, jobs: None )
+    extension = gitlab.package_archive_extension( codec )
+    first = tmp_path / "a" / ( "widget" + extension )
+    second = tmp_path / "b" / ( "widget" + extension )
+
+    package = staged_package( tmp_path / "a" )
+    assert gitlab.create_package_archive( str( first ), str( tmp_path / "a" ), "widget", jobs=2 ) == 0
+
+    staged_package( tmp_path / "b" )
+    ( tmp_path / "b" / "widget" / "1.0.0" / "lib" / "libwidget.a" ).write_bytes(
+            ( package / "lib" / "libwidget.a" ).read_bytes()
+    )
+    os.utime( str( tmp_path / "b" / "widget" / "1.0.0" / "include" / "widget" / "api.hpp" ), ( 1, 1 ) )
+    os.chmod( str( tmp_path / "b" / "widget" / "1.0.0" / "include" / "widget" / "api.hpp" ), 0o600 )
+    assert gitlab.create_package_archive( str( second ), str( tmp_path / "b" ), "widget", jobs=4 ) == 0
+    return first, second
+
+
+def test_xz_blocks_do_not_depend_on_the_thread_count( monkeypatch ):
+    monkeypatch.setattr( gitlab.shutil, 'which', lambda tool: '/usr/bin/' + tool )
+    for jobs in ( None, 2, 16 ):
+        command = gitlab._compressor_command( 'xz', jobs )
+        assert '--block-size=' + gitlab.XZ_BLOCK_SIZE in command
+
+
+@pytest.mark.parametrize( "codec", [ "gzip", "xz", "zstd" ] )
+@pytest.mark.parametrize( "use_tools", [ True, False ] )
+def test_tar_archives_are_reproducible( tmp_path, monkeypatch, codec, use_tools ):
+    if codec == "zstd" and not use_tools:
+        pytest.importorskip( "zstandard" )
+    if use_tools and not gitlab._compressor_command( codec, 1 ):
+        if codec != "gzip":
+            pytest.skip( "no {} compressor installed".format( codec ) )
+    first, second = archive_twice( tmp_path, codec, monkeypatch, use_tools )
+    assert first.read_bytes() == second.read_bytes()
+
+    if codec == "zstd":
+        return
+    with tarfile.open( str( first ) ) as archive:
+        members = archive.getmembers()
+    assert [ member.name for member in members ] == [
+            "widget",
+            "widget/1.0.0",
+            "widget/1.0.0/include",
+            "widget/1.0.0/include/widget",
+            "widget/1.0.0/include/widget/api.hpp",
+            "widget/1.0.0/include/widget/widget.hpp",
+            "widget/1.0.0/lib",
+            "widget/1.0.0/lib/libwidget.a",
+    ]
+    assert { member.mtime for member in members } == { gitlab.PACKAGE_ARCHIVE_MTIME }
+    assert { member.uname for member in members } == { "" }
+
+
+def test_zip_archives_are_reproducible( tmp_path, monkeypatch ):
+    first, second = archive_twice( tmp_path, "zip", monkeypatch )
+    assert first.read_bytes() == second.read_bytes()
+    with zipfile.ZipFile( str( first ) ) as archive:
+        assert archive.namelist() == [
+                "widget/1.0.0/include/widget/api.hpp",
+                "widget/1.0.0/include/widget/widget.hpp",
+                "widget/1.0.0/lib/libwidget.a",
+        ]
+
+
+def test_source_date_epoch_sets_the_member_mtime( tmp_path, monkeypatch ):
+    monkeypatch.setenv( "SOURCE_DATE_EPOCH", "1700000000" )
+    staged_package( tmp_path )
+    archive = tmp_path / "widget.tar.gz"
+    assert gitlab.create_package_archive( str( archive ), str( tmp_path ), "widget" ) == 0
+    with tarfile.open( str( archive ) ) as handle:
+        assert { member.mtime for member in handle.getmembers() } == { 1700000000 }
+
+
+def test_a_failed_archive_leaves_no_partial_file( tmp_path, monkeypatch ):
+    monkeypatch.setattr( gitlab, '_compressor_command', lambda codec, jobs: None )
+    monkeypatch.setattr( gitlab, '_python_compressor', lambda codec, output, jobs: None )
+    staged_package( tmp_path )
+    archive = tmp_path / "widget.tar.zst"
+    assert gitlab.create_package_archive( str( archive ), str( tmp_path ), "widget" ) == 1
+    assert sorted( os.listdir( str( tmp_path ) ) ) == [ "widget" ]
+
+
+def test_codecs_name_their_archives():
+    assert gitlab.package_archive_extension( "zstd" ) == ".tar.zst"
+    assert gitlab.package_archive_extension( "xz" ) == ".tar.xz"
+    assert gitlab.package_archive_codec( "widget_debian_gcc15_rel.tar.zst" ) == "zstd"
+    assert gitlab.package_archive_codec( "widget.tar.bz2" ) is None
+    assert gitlab.strip_package_archive_extension( "widget_debian_gcc15_rel.tar.xz" ) == "widget_debian_gcc15_rel"
@@ -1,4 +1,4 @@
-import time
+import os
 
 import pytest
 
@@ -39,27 +39,39 @@ def test_package_archive_is_up_to_date(tmp_path):
     lib_dir.mkdir( parents=True )
     ( include_dir / "widget.hpp" ).write_text( "header\n", encoding="utf-8" )
     ( lib_dir / "libwidget.a" ).write_text( "lib\n", encoding="utf-8" )
-    time.sleep( 0.02 )
+    roots = [ str( include_dir ), str( lib_dir ) ]
 
     archive = tmp_path / "widget_debian_gcc15_rel.tar.gz"
     archive.write_bytes( b"archive" )
+    assert not gitlab.package_archive_is_up_to_date( str( archive ), roots )
 
-    assert gitlab.package_archive_is_up_to_date(
-            str( archive ),
-            [ str( include_dir ), str( lib_dir ) ],
-    )
+    gitlab.write_package_manifest( str( archive ), roots )
+    assert gitlab.package_archive_is_up_to_date( str( archive ), roots )
+
+    # Touching a file without changing it does not make the archive stale.
+    os.utime( str( lib_dir / "libwidget.a" ), ns=( 0, 10 ** 9 ) )
+    assert gitlab.package_archive_is_up_to_date( str( archive ), roots )
 
     ( lib_dir / "libwidget.a" ).write_text( "updated\n", encoding="utf-8" )
-    assert not gitlab.package_archive_is_up_to_date(
-            str( archive ),
-            [ str( include_dir ), str( lib_dir ) ],
-    )
+    assert not gitlab.package_archive_is_up_to_date( str( archive ), roots )
+
+
+def test_a_replaced_archive_is_not_up_to_date(tmp_path):
+    include_dir = tmp_path / "include"
+    include_dir.mkdir()
+    ( include_dir / "widget.hpp" ).write_text( "header\n", encoding="utf-8" )
+    archive = tmp_path / "widget.tar.gz"
+    archive.write_bytes( b"archive" )
+    gitlab.write_package_manifest( str( archive ), [ str( include_dir ) ] )
+
+    archive.write_bytes( b"another archive" )
+    assert not gitlab.package_archive_is_up_to_date( str( archive ), [ str( include_dir ) ] )
 
 
 def test_build_package_skips_create_when_archive_current( tmp_path, monkeypatch ):
     create_calls = []
 
-    def _record_create( archive_path, working_dir, source_dir ):
+    def _record_create( archive_path, working_dir, source_dir, codec=None, jobs=None ):
         create_calls.append( ( archive_path, working_dir, source_dir ) )
         return 0
 
@@ -72,10 +84,10 @@ def test_build_package_skips_create_when_archive_current( tmp_path, monkeypatch
     lib_dir.mkdir( parents=True )
     ( include_dir / "widget.hpp" ).write_text( "header\n", encoding="utf-8" )
     ( lib_dir / "libwidget.a" ).write_text( "lib\n", encoding="utf-8" )
-    time.sleep( 0.02 )
 
     archive = tmp_path / "widget_debian_gcc15_rel.tar.gz"
     archive.write_bytes( b"archive" )
+    gitlab.write_package_manifest( str( archive ), [ str( include_dir ), str( lib_dir ) ] )
 
     stamp = tmp_path / "widget_debian_gcc15_rel.packaged"
     publisher = gitlab.GitlabPackagePublisher.__new__( gitlab.GitlabPackagePublisher )
@@ -86,6 +98,8 @@ def test_build_package_skips_create_when_archive_current( tmp_path, monkeypatch
     publisher._package_source_dir = "widget"
     publisher._package_file_name = archive.name
     publisher._source_lib_dir = str( lib_dir )
+    publisher._codec = 'gzip'
+    publisher._jobs = None
 
     touched = []
     env = _publisher_env( tmp_path, touched )
@@ -95,13 +109,13 @@ def test_build_package_skips_create_when_archive_current( tmp_path, monkeypatch
     assert touched
 
 
-def test_build_package_creates_archive_when_staging_newer( tmp_path, monkeypatch ):
+def test_build_package_creates_archive_when_staging_changed( tmp_path, monkeypatch ):
     create_calls = []
 
     monkeypatch.setattr(
             gitlab,
             'create_package_archive',
-            lambda archive_path, working_dir, source_dir: create_calls.append(
+            lambda archive_path, working_dir, source_dir, codec=None, jobs=None: create_calls.append(
                     ( archive_path, working_dir, source_dir )
             ) or 0,
     )
@@ -116,7 +130,7 @@ def test_build_package_creates_archive_when_staging_newer( tmp_path, monkeypatch
 
     archive = tmp_path / "widget_debian_gcc15_rel.tar.gz"
     archive.write_bytes( b"old" )
-    time.sleep( 0.02 )
+    gitlab.write_package_manifest( str( archive ), [ str( include_dir ), str( lib_dir ) ] )
     ( lib_dir / "libwidget.a" ).write_text( "new\n", encoding="utf-8" )
 
     stamp = tmp_path / "widget_debian_gcc15_rel.packaged"
@@ -128,6 +142,8 @@ def test_build_package_creates_archive_when_staging_newer( tmp_path, monkeypatch
     publisher._package_source_dir = "widget"
     publisher._package_file_name = archive.name
     publisher._source_lib_dir = str( lib_dir )
+    publisher._codec = 'gzip'
+    publisher._jobs = None
 
     env = _publisher_env( tmp_path )
 
@@ -135,3 +151,4 @@ def test_build_package_creates_archive_when_staging_newer( tmp_path, monkeypatch
     assert create_calls == [
             ( str( archive ), str( tmp_path ), "widget" ),
     ]
+    assert gitlab.package_archive_is_up_to_date( str( archive ), [ str( include_dir ), str( lib_dir ) ] )
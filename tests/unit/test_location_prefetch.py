@@ -0,0 +1,111 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import threading
+import time
+
+import pytest
+
+from cuppa.build_with_location import location_dependency
+from cuppa.core import location_prefetch
+from cuppa.location import LocationException
+from tests.helpers.fakes import FakeEnv
+
+
+pytestmark = pytest.mark.unit
+
+
+def _env( dependencies, **options ):
+    values = {
+        'thirdparty': None,
+        'branch_root': None,
+        'dependencies': dependencies,
+        'storage_roots_reported': True,
+    }
+    values.update( options )
+    return FakeEnv( values )
+
+
+def _dependencies( *pairs ):
+    return dict( ( name, location_dependency( name, location=location ) ) for name, location in pairs )
+
+
+def test_plan_keeps_remote_locations_once( reset_location_caches ):
+    dependencies = _dependencies(
+        ( 'liba', 'git+https://example.com/liba.git' ),
+        ( 'libb', 'https://example.com/libb.tar.gz' ),
+        ( 'libc', '/opt/libc' ),
+        ( 'libd', 'git+https://example.com/liba.git' ),
+    )
+    env = _env( dependencies )
+    plan = location_prefetch.collect_prefetch_plan( env, [ 'liba', 'libb', 'libc', 'libd', 'missing' ] )
+    assert [ name for name, _, _ in plan ] == [ 'liba', 'libb' ]
+
+
+def test_plan_skips_locations_replaced_by_develop( reset_location_caches ):
+    Dep = location_dependency( 'liba', location='git+https://example.com/liba.git', develop='~/dev/liba' )
+    env = _env( { 'liba': Dep }, develop=True )
+    assert location_prefetch.collect_prefetch_plan( env, [ 'liba' ] ) == []
+
+
+def test_prefetch_retrieves_concurrently_and_fills_cache( reset_location_caches, monkeypatch ):
+    dependencies = _dependencies(
+        ( 'liba', 'git+https://example.com/liba.git' ),
+        ( 'libb', 'git+https://example.com/libb.git' ),
+        ( 'libc', 'git+https://example.com/libc.git' ),
+    )
+    env = _env( dependencies )
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_location( cuppa_env, location, **kwargs ):
+        with lock:
+            active.append( location )
+            peak.append( len( active ) )
+        time.sleep( 0.05 )
+        with lock:
+            active.remove( location )
+        return ( 'retrieved', location )
+
+    monkeypatch.setattr( 'cuppa.location.Location', fake_location )
+
+    assert location_prefetch.prefetch_locations( env, [ 'liba', 'libb', 'libc' ], max_workers=3 ) == 3
+    assert max( peak ) > 1
+
+    monkeypatch.setattr( 'cuppa.location.Location', lambda *args, **kwargs: pytest.fail( 'retrieved twice' ) )
+    assert dependencies['libb']._get_location( env ) == ( 'retrieved', 'git+https://example.com/libb.git' )
+
+
+def test_prefetch_failure_is_raised_at_first_use( reset_location_caches, monkeypatch ):
+    import SCons.Errors
+
+    dependencies = _dependencies(
+        ( 'liba', 'git+https://example.com/liba.git' ),
+        ( 'libb', 'git+https://example.com/libb.git' ),
+    )
+    env = _env( dependencies )
+
+    def fake_location( cuppa_env, location, **kwargs ):
+        if 'libb' in location:
+            raise LocationException( 'clone failed' )
+        return location
+
+    monkeypatch.setattr( 'cuppa.location.Location', fake_location )
+
+    assert location_prefetch.prefetch_locations( env, [ 'liba', 'libb' ], max_workers=2 ) == 1
+    with pytest.raises( SCons.Errors.StopError ):
+        dependencies['libb']._get_location( env )
+
+
+def test_prefetch_is_off_for_one_job_or_offline( reset_location_caches, monkeypatch ):
+    dependencies = _dependencies(
+        ( 'liba', 'git+https://example.com/liba.git' ),
+        ( 'libb', 'git+https://example.com/libb.git' ),
+    )
+    monkeypatch.setattr( 'cuppa.location.Location', lambda *args, **kwargs: pytest.fail( 'retrieved' ) )
+
+    assert location_prefetch.prefetch_locations( _env( dependencies, location_jobs=1 ), [ 'liba', 'libb' ] ) == 0
+    assert location_prefetch.prefetch_locations( _env( dependencies, offline=True ), [ 'liba', 'libb' ] ) == 0
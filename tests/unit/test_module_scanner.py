@@ -3,10 +3,13 @@
 #    (See accompanying file LICENSE_1_0.txt or copy at
 #          http://www.boost.org/LICENSE_1_0.txt)
 
+import os
+
 import pytest
 
 from cuppa.cpp.module_scanner import (
     ModuleImport,
+    ModuleScanCache,
     is_interface_source,
     module_bmi_name,
     owning_module_name,
@@ -159,3 +162,88 @@ def test_is_interface_source_by_suffix_and_scan( tmp_path ):
     path = tmp_path / "util.cppm"
     path.write_text( "export module util;\n" )
     assert scan_file( str( path ) ).export_module == "util"
+
+
+def _strip_comments_by_character( text ):
+    out = []
+    i = 0
+    n = len( text )
+    while i < n:
+        if text[i:i+2] == '//':
+            while i < n and text[i] != '\n':
+                i += 1
+            continue
+        if text[i:i+2] == '/*':
+            i += 2
+            while i + 1 < n and text[i:i+2] != '*/':
+                i += 1
+            i = min( i + 2, n )
+            continue
+        out.append( text[i] )
+        i += 1
+    return ''.join( out )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize( 'text', [
+    "",
+    "import std;",
+    "a // b /* c\nd */ e",
+    "a /* b // c */ d // e\nf",
+    "a /* unterminated",
+    "a /*/ b",
+    "a /**/ b //",
+    "x / y; z */ w",
+    "/* one */ /* two */\n// three\nimport util;",
+] )
+def test_strip_comments_matches_character_walk( text ):
+    assert strip_comments( text ) == _strip_comments_by_character( text )
+
+
+@pytest.mark.unit
+def test_scan_cache_reuses_stat_hits_and_rehashes_touched_sources( tmp_path ):
+    source = tmp_path / "math.cppm"
+    source.write_text( "export module math;\nimport util;\n" )
+    cache_path = str( tmp_path / "scans.json" )
+
+    cache = ModuleScanCache( cache_path )
+    first = cache.scan( str( source ) )
+    assert first.export_module == "math"
+    assert cache.scanned == 1
+    cache.save()
+
+    warm = ModuleScanCache( cache_path )
+    assert warm.scan( str( source ) ) == first
+    assert ( warm.hits, warm.rehashed, warm.scanned ) == ( 1, 0, 0 )
+    assert not warm.dirty()
+
+    status = source.stat()
+    os.utime( str( source ), ns=( status.st_atime_ns, status.st_mtime_ns + 1000000000 ) )
+    assert warm.scan( str( source ) ) == first
+    assert ( warm.hits, warm.rehashed, warm.scanned ) == ( 1, 1, 0 )
+
+
+@pytest.mark.unit
+def test_scan_cache_rescans_changed_content( tmp_path ):
+    source = tmp_path / "math.cppm"
+    source.write_text( "export module math;\n" )
+    cache = ModuleScanCache( str( tmp_path / "scans.json" ) )
+    cache.scan( str( source ) )
+
+    source.write_text( "export module math;\nimport <vector>;\n" )
+    status = source.stat()
+    os.utime( str( source ), ns=( status.st_atime_ns, status.st_mtime_ns + 1000000000 ) )
+
+    scan = cache.scan( str( source ) )
+    assert scan.imports == [ ModuleImport( "header_angle", "vector" ) ]
+    assert cache.scanned == 2
+
+
+@pytest.mark.unit
+def test_scan_cache_ignores_unreadable_cache_file( tmp_path ):
+    cache_path = tmp_path / "scans.json"
+    cache_path.write_text( "not json" )
+    source = tmp_path / "util.cppm"
+    source.write_text( "export module util;\n" )
+
+    assert ModuleScanCache( str( cache_path ) ).scan( str( source ) ).export_module == "util"
@@ -0,0 +1,78 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import os
+import re
+
+import pytest
+
+from cuppa.output_processor import CompiledInterpretors, ToolchainProcessor
+from cuppa.toolchains.cl import Cl
+from cuppa.toolchains.clang import Clang
+from cuppa.toolchains.gcc import Gcc
+
+pytestmark = pytest.mark.unit
+
+_FIXTURES = os.path.join( os.path.dirname( __file__ ), '..', 'fixtures', 'compiler_output' )
+
+
+def _sample_lines( name ):
+    with open( os.path.join( _FIXTURES, name ), encoding='utf-8' ) as handle:
+        return [ line.rstrip( '\n' ) for line in handle ]
+
+
+def _sequential_match( toolchain, line ):
+    for interpretor in toolchain.output_interpretors():
+        matches = re.match( interpretor['regex'], line )
+        if matches:
+            return ( matches, interpretor )
+    return ( None, None )
+
+
+@pytest.mark.parametrize( 'toolchain, sample', [
+    ( Gcc, 'gcc_sample.txt' ),
+    ( Clang, 'clang_sample.txt' ),
+    ( Cl, 'gcc_sample.txt' ),
+] )
+def test_compiled_table_matches_sequential_interpretation( toolchain, sample ):
+    table = CompiledInterpretors.for_toolchain( toolchain )
+
+    for line in _sample_lines( sample ):
+        expected, expected_interpretor = _sequential_match( toolchain, line )
+        matches, interpretor = table.match( line )
+        if expected is None:
+            assert matches is None
+            continue
+        assert interpretor['title'] == expected_interpretor['title']
+        assert matches.groups() == expected.groups()
+
+
+def test_compiled_table_is_built_once_per_toolchain_class():
+    assert CompiledInterpretors.for_toolchain( Gcc ) is CompiledInterpretors.for_toolchain( Gcc )
+    assert CompiledInterpretors.for_toolchain( Gcc ) is not CompiledInterpretors.for_toolchain( Clang )
+
+
+def test_uncombinable_interpretors_fall_back_to_sequential_matching():
+    interpretors = [
+        { 'title': 'Repeat', 'regex': r"(\w+) \1", 'meaning': 'message' },
+        { 'title': 'Any', 'regex': r"(.*)", 'meaning': 'message' },
+    ]
+    table = CompiledInterpretors( interpretors )
+
+    matches, interpretor = table.match( "again again" )
+    assert interpretor['title'] == 'Repeat'
+
+    matches, interpretor = table.match( "once only" )
+    assert interpretor['title'] == 'Any'
+    assert matches.group( 1 ) == "once only"
+
+
+def test_processor_counts_errors_and_warnings_from_captured_log():
+    processor = ToolchainProcessor( Gcc, minimal_output=False, ignore_duplicates=False )
+    for line in _sample_lines( 'gcc_sample.txt' ):
+        processor( line )
+
+    assert processor.errors == 3
+    assert processor.warnings == 1
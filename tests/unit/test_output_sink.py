@@ -0,0 +1,106 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import sys
+import threading
+
+import pytest
+
+from cuppa.output_processor import CommandOutput, IncrementalSubProcess, LineConsumer, OutputSink
+
+pytestmark = pytest.mark.unit
+
+
+class CountingStdout(object):
+
+    def __init__( self ):
+        self.writes = []
+
+    def write( self, text ):
+        self.writes.append( text )
+
+    def flush( self ):
+        pass
+
+    def text( self ):
+        return "".join( self.writes )
+
+
+@pytest.fixture( autouse=True )
+def buffered( monkeypatch ):
+    monkeypatch.setattr( OutputSink, 'streaming', False )
+
+
+def counting_stdout( monkeypatch ):
+    # Patched inside the test: pytest's own capture replaces sys.stdout after fixtures run.
+    counting = CountingStdout()
+    monkeypatch.setattr( sys, 'stdout', counting )
+    return counting
+
+
+def test_lines_are_written_once_when_the_command_finishes( monkeypatch ):
+    stdout = counting_stdout( monkeypatch )
+    output = CommandOutput()
+    for number in range( 100 ):
+        output.write( "line {}".format( number ) )
+    assert stdout.writes == []
+    output.close()
+    assert len( stdout.writes ) == 1
+    assert stdout.text().splitlines() == [ "line {}".format( number ) for number in range( 100 ) ]
+
+
+def test_a_full_buffer_is_written_early( monkeypatch ):
+    stdout = counting_stdout( monkeypatch )
+    output = CommandOutput( threshold=20 )
+    output.write( "0123456789" )
+    assert stdout.writes == []
+    output.write( "0123456789" )
+    assert stdout.writes == [ "0123456789\n0123456789\n" ]
+    output.close()
+    assert len( stdout.writes ) == 1
+
+
+def test_streaming_writes_every_line( monkeypatch ):
+    stdout = counting_stdout( monkeypatch )
+    output = CommandOutput( streaming=True )
+    output.write( "first" )
+    output.write( "second" )
+    assert stdout.writes == [ "first\n", "second\n" ]
+
+
+def test_sink_hands_out_streaming_outputs_when_configured( monkeypatch ):
+    stdout = counting_stdout( monkeypatch )
+    OutputSink.configure( streaming=True )
+    output = OutputSink.command()
+    output.write( "now" )
+    assert stdout.writes == [ "now\n" ]
+
+
+def test_consumers_share_one_buffer( monkeypatch ):
+    stdout = counting_stdout( monkeypatch )
+    output = CommandOutput()
+    lines = iter( [ "a\n", "\n", "b\n", "" ] )
+    LineConsumer( lambda: next( lines ), lambda line: line.upper(), output )()
+    assert stdout.writes == []
+    output.close()
+    assert stdout.writes == [ "A\nB\n" ]
+
+
+def test_concurrent_commands_do_not_interleave( monkeypatch ):
+    stdout = counting_stdout( monkeypatch )
+    script = "import sys, time\nfor n in range( 20 ):\n    print( sys.argv[1] ); sys.stdout.flush(); time.sleep( 0.001 )\n"
+
+    def run( name ):
+        IncrementalSubProcess.Popen( lambda line: line, [ sys.executable, "-c", script, name ], suppress_output=True )
+
+    threads = [ threading.Thread( target=run, args=( name, ) ) for name in ( "left", "right" ) ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len( stdout.writes ) == 2
+    for block in stdout.writes:
+        assert len( set( block.split() ) ) == 1
@@ -17,6 +17,7 @@ from cuppa.cpp.profiles_report.report_json import (
     load_report_model,
     location_key_from_dedupe,
     location_key_from_location,
+    merge_report_files,
     unwrap_report_payload,
     wrap_report_payload,
 )
@@ -191,3 +192,74 @@ def test_load_report_model_from_file( tmp_path ):
     assert loaded_model[ 'rollup' ][ 'total_references' ] == 1
     assert metadata[ 'link_style' ] == 'gitlab'
     assert len( extras[ 'locations' ] ) == 1
+
+
+_REL_SCOPE = _SAMPLE_SCOPE._replace(
+    variant_dir='_build/widget/clang24_profiles/rel/x86_64/cxx2c',
+    variant_label='rel',
+)
+
+_OTHER_LINE = _LINE.replace( 'widget.cpp:10:12', 'gadget.cpp:3:4' )
+
+
+def _write_shard( path, records, **metadata ):
+    inventory = ProfilesInventory()
+    for scope, line in records:
+        inventory.record( scope, parse_profiles_diagnostic( line ) )
+    payload = wrap_report_payload(
+        inventory.as_report_model(),
+        { 'sconstruct_dir': str( path.parent ), 'cxx_profiles_report_context': 'off' },
+        inventory=inventory,
+        context=None,
+    )
+    payload[ 'metadata' ].update( metadata )
+    path.write_text( json.dumps( payload ), encoding='utf-8' )
+    return str( path )
+
+
+def test_merge_report_files_unions_shards( tmp_path ):
+    debug = _write_shard(
+        tmp_path / 'dbg.json',
+        [ ( _SAMPLE_SCOPE, _LINE ), ( _SAMPLE_SCOPE, _LINE ), ( _SAMPLE_SCOPE, _OTHER_LINE ) ],
+        variant_labels=[ 'dbg' ],
+    )
+    release = _write_shard(
+        tmp_path / 'rel.json',
+        [ ( _REL_SCOPE, _LINE ), ( _SAMPLE_SCOPE, _OTHER_LINE ) ],
+        variant_labels=[ 'rel' ],
+        incomplete_scopes=[ './gadget/sconscript' ],
+    )
+
+    payload = merge_report_files( [ debug, release ] )
+    model, metadata, extras = unwrap_report_payload( payload )
+    assert metadata[ 'variant_labels' ] == [ 'dbg', 'rel' ]
+    assert metadata[ 'incomplete_scopes' ] == [ './gadget/sconscript' ]
+    assert metadata[ 'partial' ] is True
+    assert metadata[ 'merged_shards' ] == 2
+    assert payload[ 'summary' ][ 'scope_count' ] == 2
+    assert model[ 'rollup' ][ 'raw_total_references' ] == 5
+    references = { ( row[ 'variant_label' ], row[ 'path' ].rsplit( '/', 1 )[ -1 ] ): row[ 'references' ] for row in extras[ 'locations' ] }
+    assert references == { ( 'dbg', 'widget.cpp' ): 2, ( 'dbg', 'gadget.cpp' ): 2, ( 'rel', 'widget.cpp' ): 1 }
+    assert 'profiles' in payload[ 'context' ]
+
+
+def test_merge_report_files_rejects_mixed_anonymisation( tmp_path ):
+    plain = _write_shard( tmp_path / 'plain.json', [ ( _SAMPLE_SCOPE, _LINE ) ] )
+    hidden = _write_shard( tmp_path / 'hidden.json', [ ( _SAMPLE_SCOPE, _LINE ) ], anonymised=True )
+    with pytest.raises( ValueError, match='anonymised' ):
+        merge_report_files( [ plain, hidden ] )
+
+
+def test_merge_profiles_reports_script_writes_a_renderable_report( tmp_path ):
+    from scripts import merge_profiles_reports
+
+    shards = [
+        _write_shard( tmp_path / 'dbg.json', [ ( _SAMPLE_SCOPE, _LINE ) ] ),
+        _write_shard( tmp_path / 'rel.json', [ ( _REL_SCOPE, _LINE ) ] ),
+    ]
+    merged = tmp_path / 'merged' / 'cxx-profiles-index.json'
+    assert merge_profiles_reports.main( [ '--out', str( merged ) ] + shards ) == 0
+    model, _metadata, extras = load_report_model( str( merged ) )
+    assert model[ 'rollup' ][ 'raw_total_references' ] == 2
+    assert len( extras[ 'locations' ] ) == 2
+    assert merge_profiles_reports.main( [ '--out', str( merged ), str( tmp_path / 'missing.json' ) ] ) == 1
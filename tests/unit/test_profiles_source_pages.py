@@ -4,9 +4,12 @@
 #          http://www.boost.org/LICENSE_1_0.txt)
 
 import os
+import shutil
 
 import pytest
 
+import cuppa
+
 from cuppa.cpp.profiles_report.source_pages import (
     BY_SOURCE_DIR,
     build_source_page_title,
@@ -521,3 +524,115 @@ def test_write_source_pages_remote_dependency_link( tmp_path, monkeypatch ):
     assert 'href="{}"'.format( expected ) in html
     assert 'github.com/org/app' not in html
 
+
+
+def _source_template():
+    from cuppa.cpp.profiles_report.report_html import jinja2_templates
+    return jinja2_templates().get_template( 'cxx_profiles_source_file.html' )
+
+
+def _write_sources( tmp_path, count ):
+    sources = []
+    for index in range( count ):
+        source = tmp_path / 'src' / 'widget_{}.cpp'.format( index )
+        source.parent.mkdir( exist_ok=True )
+        source.write_text( 'int* p{};\n'.format( index ), encoding='utf-8' )
+        sources.append( str( source ) )
+    return sources
+
+
+def _write_pages( tmp_path, inventory, jobs=None ):
+    env = { 'sconstruct_dir': str( tmp_path ) }
+    return write_source_pages(
+        inventory,
+        str( tmp_path / 'report' ),
+        env,
+        'local',
+        None,
+        'cxx-profiles-index.html',
+        _source_template,
+        jobs=jobs,
+    )
+
+
+def test_write_source_pages_skips_unchanged_pages( tmp_path ):
+    sources = _write_sources( tmp_path, 3 )
+    inventory = ProfilesInventory()
+    for source in sources:
+        _record_line( inventory, source, line=1, column=6 )
+    _page_map, written = _write_pages( tmp_path, inventory )
+    for page in written:
+        with open( page, 'a', encoding='utf-8' ) as handle:
+            handle.write( '<!-- kept -->' )
+
+    with open( sources[ 1 ], 'a', encoding='utf-8' ) as handle:
+        handle.write( 'int* q;\n' )
+    _page_map, rewritten = _write_pages( tmp_path, inventory )
+
+    assert rewritten == written
+    kept = [ '<!-- kept -->' in open( page, encoding='utf-8' ).read() for page in written ]
+    assert kept == [ True, False, True ]
+
+
+def test_write_source_pages_removes_pages_without_violations( tmp_path ):
+    sources = _write_sources( tmp_path, 2 )
+    inventory = ProfilesInventory()
+    for source in sources:
+        _record_line( inventory, source, line=1, column=6 )
+    _page_map, written = _write_pages( tmp_path, inventory )
+
+    inventory = ProfilesInventory()
+    _record_line( inventory, sources[ 0 ], line=1, column=6 )
+    _page_map, rewritten = _write_pages( tmp_path, inventory )
+    assert rewritten == written[ :1 ]
+    assert not os.path.exists( written[ 1 ] )
+
+
+def test_write_source_pages_in_a_process_pool_matches_inline( tmp_path ):
+    sources = _write_sources( tmp_path, 20 )
+    inventory = ProfilesInventory()
+    for index, source in enumerate( sources ):
+        _record_line( inventory, source, line=1, column=6 + index % 3 )
+
+    _page_map, inline = _write_pages( tmp_path / 'inline', inventory )
+    inline_html = [ open( page, encoding='utf-8' ).read() for page in inline ]
+    for page in inline:
+        os.remove( page )
+    _page_map, pooled = _write_pages( tmp_path / 'inline', inventory, jobs=4 )
+
+    assert pooled == inline
+    assert [ open( page, encoding='utf-8' ).read() for page in pooled ] == inline_html
+
+
+def test_write_source_pages_rerenders_when_an_included_template_changes( tmp_path ):
+    import jinja2
+
+    templates = tmp_path / 'templates'
+    shutil.copytree( os.path.join( os.path.dirname( cuppa.__file__ ), 'cpp', 'templates' ), str( templates ) )
+
+    def template():
+        return jinja2.Environment(
+            loader=jinja2.FileSystemLoader( str( templates ) ),
+            autoescape=jinja2.select_autoescape( [ 'html', 'xml' ] ),
+        ).get_template( 'cxx_profiles_source_file.html' )
+
+    sources = _write_sources( tmp_path, 2 )
+    inventory = ProfilesInventory()
+    for source in sources:
+        _record_line( inventory, source, line=1, column=6 )
+
+    def write():
+        return write_source_pages(
+            inventory, str( tmp_path / 'report' ), { 'sconstruct_dir': str( tmp_path ) },
+            'local', None, 'cxx-profiles-index.html', template,
+        )[ 1 ]
+
+    written = write()
+    for page in written:
+        with open( page, 'a', encoding='utf-8' ) as handle:
+            handle.write( '<!-- kept -->' )
+
+    with open( str( templates / 'cxx_profiles_breadcrumb.html' ), 'a', encoding='utf-8' ) as handle:
+        handle.write( '\n' )
+    write()
+    assert not any( '<!-- kept -->' in open( page, encoding='utf-8' ).read() for page in written )
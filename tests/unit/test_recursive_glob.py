@@ -0,0 +1,121 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import json
+import os
+
+import pytest
+
+import cuppa.recursive_glob as recursive_glob
+from cuppa.recursive_glob import GlobManifest
+
+
+pytestmark = pytest.mark.unit
+
+
+def _walk_glob(start, pattern):
+    """The os.walk based discovery this module used before scandir, for order comparison."""
+    import fnmatch
+    matches = []
+    for root, dirnames, filenames in os.walk(start):
+        for filename in filenames:
+            if fnmatch.fnmatch(filename, pattern):
+                matches.append(os.path.join(root, filename))
+    return matches
+
+
+def _tree(root, paths):
+    for path in paths:
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text("", encoding="utf-8")
+
+
+def test_glob_matches_os_walk_order(tmp_path):
+    _tree(tmp_path, ["a.txt", "b/c.txt", "b/d/e.txt", "f/g.txt", "f/h/i.txt", "f/h/j.txt", "k.log"])
+    assert recursive_glob.glob(str(tmp_path), "*.txt") == _walk_glob(str(tmp_path), "*.txt")
+
+
+def test_glob_does_not_follow_directory_symlinks(tmp_path):
+    _tree(tmp_path, ["project/sconscript", "project/lib/sconscript"])
+    os.symlink("..", str(tmp_path / "project" / "lib" / "loop"))
+    os.symlink(str(tmp_path / "project" / "lib"), str(tmp_path / "project" / "lib_link"))
+
+    start = str(tmp_path / "project")
+    matches = recursive_glob.glob(start, "sconscript")
+    assert matches == _walk_glob(start, "sconscript")
+    assert len(matches) == 2
+
+
+def test_glob_prune_skips_directories(tmp_path):
+    _tree(tmp_path, ["keep/a.txt", ".git/objects/b.txt", ".cache/c.txt", "_darcs/d.txt"])
+    found = recursive_glob.glob(str(tmp_path), "*.txt", prune=recursive_glob.prune_hidden_and_vcs)
+    assert found == [str(tmp_path / "keep" / "a.txt")]
+
+
+def test_glob_discard_pattern_drops_sub_projects(tmp_path):
+    _tree(tmp_path, ["a.txt", "sub/b.txt", "sub/marker", "sub/deeper/c.txt"])
+    found = recursive_glob.glob(str(tmp_path), "*.txt", discard_pattern="marker")
+    assert found == [str(tmp_path / "a.txt")]
+
+
+def test_glob_records_visited_directories(tmp_path):
+    _tree(tmp_path, ["a/x.txt", "b/y.txt", ".git/z.txt"])
+    visited = []
+    recursive_glob.glob(str(tmp_path), "*.txt", prune=recursive_glob.prune_hidden_and_vcs, visited=visited)
+    assert sorted(visited) == sorted([str(tmp_path), str(tmp_path / "a"), str(tmp_path / "b")])
+
+
+def test_manifest_rescans_recently_modified_directories(tmp_path):
+    _tree(tmp_path, ["src/a.txt"])
+    manifest = GlobManifest(str(tmp_path / "manifest.json"))
+    manifest.glob(str(tmp_path / "src"), "*.txt")
+    # The tree was written moments ago, inside the racy window, so it is not trusted yet.
+    manifest.glob(str(tmp_path / "src"), "*.txt")
+    assert (manifest.reused, manifest.scanned) == (0, 2)
+
+
+def test_manifest_reuses_results_for_settled_directories(tmp_path, monkeypatch):
+    monkeypatch.setattr(GlobManifest, "RACY_WINDOW_NS", 0)
+    _tree(tmp_path, ["src/a.txt", "src/deep/b.txt"])
+    path = str(tmp_path / "manifest.json")
+    manifest = GlobManifest(path)
+    first = manifest.glob(str(tmp_path / "src"), "*.txt")
+    manifest.save()
+
+    reloaded = GlobManifest(path)
+    assert reloaded.glob(str(tmp_path / "src"), "*.txt") == first
+    assert reloaded.reused == 1
+
+    # A new file in a nested folder changes that folder's mtime and invalidates the entry.
+    (tmp_path / "src" / "deep" / "c.txt").write_text("", encoding="utf-8")
+    reloaded = GlobManifest(path)
+    assert str(tmp_path / "src" / "deep" / "c.txt") in reloaded.glob(str(tmp_path / "src"), "*.txt")
+    assert reloaded.scanned == 1
+
+
+def test_manifest_keys_on_patterns(tmp_path, monkeypatch):
+    monkeypatch.setattr(GlobManifest, "RACY_WINDOW_NS", 0)
+    _tree(tmp_path, ["a.txt", "b.log"])
+    manifest = GlobManifest(str(tmp_path / "manifest.json"))
+    assert manifest.glob(str(tmp_path), "*.txt") == [str(tmp_path / "a.txt")]
+    assert manifest.glob(str(tmp_path), "*.log") == [str(tmp_path / "b.log")]
+    assert manifest.scanned == 2
+
+
+def test_manifest_ignores_unreadable_or_foreign_files(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text("not json", encoding="utf-8")
+    assert GlobManifest(str(path)).glob(str(tmp_path), "*.none") == []
+    path.write_text(json.dumps({"format": 99, "entries": {}}), encoding="utf-8")
+    manifest = GlobManifest(str(path))
+    manifest.glob(str(tmp_path), "*.none")
+    assert manifest.scanned == 1
+
+
+def test_manifest_save_is_a_no_op_when_nothing_was_scanned(tmp_path):
+    path = tmp_path / "out" / "manifest.json"
+    GlobManifest(str(path)).save()
+    assert not path.exists()
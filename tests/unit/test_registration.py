@@ -4,6 +4,7 @@
 #          http://www.boost.org/LICENSE_1_0.txt)
 
 import sys
+import textwrap
 
 import pytest
 
@@ -61,3 +62,79 @@ def test_try_load_module_invokes_add_options(tmp_path):
     )
     assert recorded == ["--plugin-flag"]
     sys.modules.pop("with_options", None)
+
+
+@pytest.fixture
+def plugin_package( tmp_path, monkeypatch ):
+    root = tmp_path / 'regpkg'
+    ( root / 'things' / 'nested' ).mkdir( parents=True )
+    ( root / '__init__.py' ).write_text( '' )
+    ( root / 'things' / '__init__.py' ).write_text( textwrap.dedent( '''
+        from regpkg.things import alpha, nested
+    ''' ) )
+    ( root / 'things' / 'alpha.py' ).write_text( textwrap.dedent( '''
+        import os
+
+        calls = []
+
+        class Alpha( object ):
+            @classmethod
+            def add_to_env( cls, env ):
+                calls.append( ( 'Alpha', env ) )
+
+        class Broken( object ):
+            @classmethod
+            def add_to_env( cls, env ):
+                raise AttributeError( 'tolerated' )
+
+        class Quiet( object ):
+            pass
+    ''' ) )
+    ( root / 'things' / 'nested' / '__init__.py' ).write_text( 'from regpkg.things.nested import beta\n' )
+    ( root / 'things' / 'nested' / 'beta.py' ).write_text( textwrap.dedent( '''
+        from regpkg.things.alpha import calls
+
+        class Beta( object ):
+            @classmethod
+            def add_to_env( cls, env ):
+                calls.append( ( 'Beta', env ) )
+    ''' ) )
+    monkeypatch.syspath_prepend( str( tmp_path ) )
+    yield str( root )
+    for name in list( sys.modules ):
+        if name == 'regpkg' or name.startswith( 'regpkg.' ):
+            del sys.modules[name]
+
+
+def test_try_load_module_finds_packages_and_modules( plugin_package ):
+    module, pathname = registration.try_load_module( 'regpkg', 'things', plugin_package )
+    assert module.__name__ == 'regpkg.things'
+    assert pathname.endswith( 'things' )
+    assert registration.try_load_module( 'regpkg', 'missing', plugin_package ) == ( None, None )
+    assert registration.try_load_module( 'regpkg.things.alpha', 'os', pathname + '/alpha.py' ) == ( None, None )
+
+
+def test_registry_walks_sub_packages_once( plugin_package, monkeypatch ):
+    registry = registration.ModuleRegistry()
+    hooks = registry.hooks( 'regpkg', 'things', plugin_package, 'add_to_env' )
+    assert [ member.__name__ for member, _ in hooks ] == [ 'Alpha', 'Broken', 'Beta' ]
+
+    monkeypatch.setattr( registration, '_classes_in_module', lambda *args: pytest.fail( 'walked again' ) )
+    assert registry.hooks( 'regpkg', 'things', plugin_package, 'add_to_env' ) is hooks
+    assert registry.hooks( 'regpkg', 'things', plugin_package, 'add_options' ) == []
+
+
+def test_hooks_are_called_and_attribute_errors_tolerated( plugin_package, monkeypatch ):
+    monkeypatch.setattr( registration, '_registry', registration.ModuleRegistry() )
+    call = getattr( registration, '__call_classmethod_for_classes_in_module' )
+    call( 'regpkg', 'things', plugin_package, 'add_to_env', 'env' )
+
+    from regpkg.things.alpha import calls
+    assert calls == [ ( 'Alpha', 'env' ), ( 'Beta', 'env' ) ]
+
+
+def test_hook_errors_propagate( plugin_package, monkeypatch ):
+    monkeypatch.setattr( registration, '_registry', registration.ModuleRegistry() )
+    call = getattr( registration, '__call_classmethod_for_classes_in_module' )
+    with pytest.raises( TypeError ):
+        call( 'regpkg', 'things', plugin_package, 'add_to_env' )
@@ -0,0 +1,137 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import cuppa.cpp.run_gcov_coverage as run_gcov_coverage
+from cuppa.cpp.run_gcov_coverage import RunGcovCoverage
+from tests.helpers.fakes import FakeEnv
+
+
+pytestmark = pytest.mark.unit
+
+
+def _coverage_env( tmp_path, job_count ):
+    build_dir = tmp_path / "_build" / "cov"
+    build_dir.mkdir( parents=True )
+    return FakeEnv(
+        base_path=str( tmp_path ),
+        build_dir=str( build_dir ),
+        working_dir=str( tmp_path ),
+        offset_dir=".",
+        job_count=job_count,
+    )
+
+
+def _nodes( env, count, program="app" ):
+    sources = []
+    targets = []
+    for index in range( count ):
+        source = os.path.join( env['build_dir'], "{}_{}.o".format( program, index ) )
+        log = os.path.join( env['build_dir'], "{}_{}.o##{}_gcov.log".format( program, index, program ) )
+        with open( log, 'w' ) as handle:
+            handle.write( "" )
+        sources.append( SimpleNamespace( path=source ) )
+        targets.append( SimpleNamespace( path=log ) )
+    return targets, sources
+
+
+@pytest.mark.parametrize( 'job_count', [ 1, 4 ] )
+def test_gcov_runs_for_every_source_and_gcovr_once_per_program( tmp_path, monkeypatch, job_count ):
+    env = _coverage_env( tmp_path, job_count )
+    target, source = _nodes( env, 6 )
+    commands = []
+    threads = set()
+    suites = []
+
+    def fake_run_command( command, working_dir, scons_env ):
+        commands.append( command )
+        threads.add( threading.get_ident() )
+        return 0, "File 'unit.cpp'\nLines executed:100.00% of 1\n"
+
+    monkeypatch.setattr( run_gcov_coverage, 'run_command', fake_run_command )
+    monkeypatch.setattr( run_gcov_coverage.CoverageSuite, 'run_suite', lambda self, target: suites.append( self ) )
+
+    RunGcovCoverage( [ "app" ], "final", "gcov" )( target, source, env )
+
+    assert sorted( command.split()[-1] for command in commands ) == sorted( node.path for node in source )
+    assert len( suites ) == 1
+    assert all( os.path.exists( node.path ) for node in target )
+    if job_count == 1:
+        assert threads == { threading.get_ident() }
+
+
+def test_gcovr_is_skipped_when_every_gcov_run_fails( tmp_path, monkeypatch, capsys ):
+    env = _coverage_env( tmp_path, 2 )
+    target, source = _nodes( env, 2 )
+    suites = []
+
+    monkeypatch.setattr( run_gcov_coverage, 'run_command', lambda command, working_dir, scons_env: ( 1, "gcov failed" ) )
+    monkeypatch.setattr( run_gcov_coverage.CoverageSuite, 'run_suite', lambda self, target: suites.append( self ) )
+
+    RunGcovCoverage( [ "app" ], "final", "gcov" )( target, source, env )
+
+    assert suites == []
+    assert not any( os.path.exists( node.path ) for node in target )
+    assert "gcov failed" in capsys.readouterr().out
+
+
+def test_concurrent_coverage_actions_share_job_count_gcov_slots( tmp_path, monkeypatch ):
+    env = _coverage_env( tmp_path, 2 )
+    running = [ 0 ]
+    most = [ 0 ]
+    lock = threading.Lock()
+
+    def fake_run_command( command, working_dir, scons_env ):
+        with lock:
+            running[0] += 1
+            most[0] = max( most[0], running[0] )
+        time.sleep( 0.02 )
+        with lock:
+            running[0] -= 1
+        return 1, ""
+
+    monkeypatch.setattr( run_gcov_coverage, 'run_command', fake_run_command )
+
+    actions = []
+    for program in ( "app", "lib", "tool" ):
+        nodes = _nodes( env, 4, program )
+        actions.append( threading.Thread(
+                target=lambda nodes=nodes, program=program: RunGcovCoverage( [ program ], "final", "gcov" )( nodes[0], nodes[1], env )
+        ) )
+    for action in actions:
+        action.start()
+    for action in actions:
+        action.join()
+
+    assert most[0] == 2
+
+
+def test_gcov_output_files_match_only_their_own_source( tmp_path, monkeypatch ):
+    monkeypatch.chdir( tmp_path )
+    for name in (
+            "src#foo.c.gcov",
+            "src#foo.c##src#foo.h.gcov",
+            "src#foo.cpp.gcov",
+            "src#foo.cpp##src#foo.h.gcov",
+            "src#foo.c.orig.gcov",
+    ):
+        ( tmp_path / name ).write_text( "" )
+
+    source = os.path.join( "src", "foo.c" )
+    assert run_gcov_coverage.gcov_output_files( source ) == [ "src#foo.c.gcov", "src#foo.c##src#foo.h.gcov" ]
+    assert run_gcov_coverage.gcov_output_files( source + "pp" ) == [ "src#foo.cpp.gcov", "src#foo.cpp##src#foo.h.gcov" ]
+    assert run_gcov_coverage.gcov_output_files( os.path.join( "src", "bar.c" ) ) == []
+
+
+def test_gcov_workers_are_capped_by_sources_and_job_count():
+    assert RunGcovCoverage._gcov_workers( FakeEnv( job_count=8 ), 3 ) == 3
+    assert RunGcovCoverage._gcov_workers( FakeEnv( job_count=2 ), 30 ) == 2
+    assert RunGcovCoverage._gcov_workers( FakeEnv(), 30 ) == 1
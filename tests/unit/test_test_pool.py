@@ -0,0 +1,303 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from SCons.Errors import BuildError
+
+from cuppa.cpp.run_boost_test import RunBoostTest
+from cuppa.cpp.run_patched_boost_test import RunPatchedBoostTest
+from cuppa.cpp.run_process_test import RunProcessTest
+from cuppa.method_helpers.run_process import RunProcessAction
+from cuppa.output_processor import IncrementalSubProcess
+from cuppa.utility import test_pool
+from cuppa.utility.test_pool import ExecutionPool
+from tests.helpers.fakes import FakeEnv
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture( autouse=True )
+def unconfigured():
+    test_pool.configure()
+    yield
+    test_pool.configure()
+
+
+def wait_for( condition ):
+    deadline = time.time() + 10
+    while not condition():
+        assert time.time() < deadline
+        time.sleep( 0.001 )
+
+
+def test_waiting_holders_start_unknown_then_longest_first():
+    pool = ExecutionPool( 1 )
+    started = []
+    release = threading.Event()
+
+    def hold( name, expected ):
+        with pool.slot( expected ):
+            started.append( name )
+            if name == 'first':
+                release.wait()
+
+    threads = [ threading.Thread( target=hold, args=( 'first', 1.0 ) ) ]
+    threads[0].start()
+    wait_for( lambda: started == [ 'first' ] )
+    for name, expected in ( ( 'short', 1.0 ), ( 'new', None ), ( 'long', 30.0 ), ( 'middle', 5.0 ) ):
+        threads.append( threading.Thread( target=hold, args=( name, expected ) ) )
+        threads[-1].start()
+    wait_for( lambda: len( pool._waiting ) == 4 )
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert started == [ 'first', 'new', 'long', 'middle', 'short' ]
+
+
+def test_no_more_than_jobs_hold_a_slot_at_once():
+    pool = ExecutionPool( 3 )
+    lock = threading.Lock()
+    counts = { 'now': 0, 'most': 0 }
+
+    def hold( expected ):
+        with pool.slot( expected ):
+            with lock:
+                counts['now'] += 1
+                counts['most'] = max( counts['most'], counts['now'] )
+            time.sleep( 0.005 )
+            with lock:
+                counts['now'] -= 1
+
+    threads = [ threading.Thread( target=hold, args=( float( n ), ) ) for n in range( 12 ) ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counts['most'] == 3
+
+
+def test_slots_do_not_limit_anything_until_configured():
+    assert test_pool.test_jobs() is None
+    with test_pool.test_slot( 1.0 ), test_pool.test_slot( 2.0 ), test_pool.build_slot(), test_pool.build_slot():
+        pass
+
+    test_pool.configure( test_jobs=2, build_jobs=1 )
+    assert test_pool.test_jobs() == 2
+    acquired = []
+
+    def build():
+        with test_pool.build_slot():
+            acquired.append( 1 )
+
+    with test_pool.build_slot():
+        other = threading.Thread( target=build )
+        other.start()
+        other.join( 0.05 )
+        assert acquired == []
+    other.join()
+    assert acquired == [ 1 ]
+
+
+def test_previous_wall_time_sums_the_report( tmp_path ):
+    report = tmp_path / "test.report.json"
+    assert test_pool.previous_wall_time( str( report ) ) is None
+
+    report.write_text( json.dumps( [ { 'wall_time': 1.5 }, { 'wall_time': 2 }, { 'name': 'no time' } ] ) )
+    assert test_pool.previous_wall_time( str( report ) ) == 3.5
+    assert test_pool.previous_wall_time( str( report ), scale=0.5 ) == 1.75
+
+    report.write_text( "not json" )
+    assert test_pool.previous_wall_time( str( report ) ) is None
+
+
+def test_a_test_timeout_takes_precedence_over_the_option():
+    env = FakeEnv( test_timeout=30.0 )
+    assert test_pool.timeout_from( None, env ) == 30.0
+    assert test_pool.timeout_from( 2, env ) == 2
+    assert test_pool.timeout_from( 0, env ) is None
+    assert test_pool.timeout_from( None, FakeEnv() ) is None
+
+
+def test_popen_kills_a_process_that_runs_too_long():
+    # The child starts a grandchild that holds the output pipes open as well.
+    script = (
+        "import subprocess, sys, time\n"
+        "subprocess.Popen( [ sys.executable, '-c', 'import time; time.sleep( 30 )' ] )\n"
+        "print( 'started' ); sys.stdout.flush(); time.sleep( 30 )\n"
+    )
+    lines = []
+    started = time.time()
+    with pytest.raises( subprocess.TimeoutExpired ):
+        IncrementalSubProcess.Popen2(
+                lines.append, lines.append, [ sys.executable, "-c", script ], suppress_output=True, timeout=1
+        )
+    assert time.time() - started < 20
+    assert lines == [ 'started' ]
+
+
+@pytest.fixture
+def forwarded_interrupts():
+    from cuppa import output_processor
+    if not hasattr( os, 'killpg' ) or not output_processor.forward_interrupts():
+        pytest.skip( "interrupts cannot be forwarded here" )
+    yield
+    receive, send = output_processor._signal_wakeup
+    signal.set_wakeup_fd( -1 )
+    output_processor._signal_wakeup = None
+    send.close()
+    receive.close()
+
+
+def test_interrupting_a_timed_test_kills_its_process_group( tmp_path, forwarded_interrupts ):
+    pid_file = tmp_path / "grandchild.pid"
+    script = (
+        "import subprocess, sys, time\n"
+        "grandchild = subprocess.Popen( [ sys.executable, '-c', 'import time; time.sleep( 60 )' ] )\n"
+        "open( sys.argv[1], 'w' ).write( str( grandchild.pid ) )\n"
+        "time.sleep( 60 )\n"
+    )
+    results = []
+    command = threading.Thread( target=lambda: results.append( IncrementalSubProcess.Popen2(
+            lambda line: None, lambda line: None, [ sys.executable, "-c", script, str( pid_file ) ],
+            suppress_output=True, timeout=120
+    ) ) )
+
+    # SCons replaces the SIGINT handler for the build; forwarding must not depend on it.
+    interrupted = []
+    previous = signal.signal( signal.SIGINT, lambda signum, frame: interrupted.append( signum ) )
+    try:
+        command.start()
+        deadline = time.time() + 20
+        while not ( pid_file.exists() and pid_file.read_text() ) and time.time() < deadline:
+            time.sleep( 0.05 )
+        grandchild = int( pid_file.read_text() )
+        os.kill( os.getpid(), signal.SIGINT )
+        command.join( 20 )
+    finally:
+        signal.signal( signal.SIGINT, previous )
+
+    assert not command.is_alive()
+    assert interrupted == [ signal.SIGINT ]
+    assert results == [ -signal.SIGINT ]
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            os.kill( grandchild, 0 )
+        except ProcessLookupError:
+            break
+        time.sleep( 0.05 )
+    else:
+        os.kill( grandchild, signal.SIGKILL )
+        pytest.fail( "the grandchild outlived the interrupt" )
+
+
+def test_popen_returns_normally_within_the_timeout():
+    assert IncrementalSubProcess.Popen(
+            lambda line: None, [ sys.executable, "-c", "pass" ], suppress_output=True, timeout=30
+    ) == 0
+
+
+class FakeNode(object):
+
+    def __init__( self, path ):
+        self.path = path
+        self.abspath = os.path.abspath( path )
+
+
+def runner_env( tmp_path, **values ):
+    values.setdefault( 'build_dir', str( tmp_path ) )
+    values.setdefault( 'show_test_output', False )
+    values.setdefault( 'suppress_process_output', True )
+    return FakeEnv( values )
+
+
+def test_a_test_that_times_out_is_aborted_and_reported( tmp_path, monkeypatch ):
+    monkeypatch.chdir( tmp_path )
+    command = '"{}" -c "import time; time.sleep( 30 )"'.format( sys.executable )
+    runner = RunProcessTest( 'passed', str( tmp_path ), command=command, expected_exit_code=0, timeout=0.5 )
+
+    with pytest.raises( BuildError, match="timed out" ):
+        runner( [], [ FakeNode( "slow" ) ], runner_env( tmp_path ) )
+
+    with open( tmp_path / "slow.report.json" ) as report:
+        test_case = json.load( report )[-1]
+    assert test_case['status'] == 'aborted'
+    assert test_case['timed_out'] is True
+    assert not ( tmp_path / "slow.success" ).exists()
+
+
+def test_a_run_action_times_out_with_the_test_timeout_option( tmp_path, monkeypatch ):
+    monkeypatch.chdir( tmp_path )
+    command = '"{}" -c "import time; time.sleep( 30 )"'.format( sys.executable )
+    action = RunProcessAction( str( tmp_path ), command=command, expected_exit_code=0 )
+    target = [ FakeNode( str( tmp_path / "sleep.success" ) ) ]
+
+    with pytest.raises( BuildError, match="timed out" ):
+        action( target, [], runner_env( tmp_path, test_timeout=0.5 ) )
+    assert not ( tmp_path / "sleep.success" ).exists()
+
+
+class FakeToolchain(object):
+
+    def error_format( self ):
+        return "{}({}): {}"
+
+
+def boost_test_program( tmp_path, lines ):
+    program = tmp_path / "slow_boost"
+    program.write_text(
+        "#!{}\nimport sys, time\nprint( {!r}, flush=True )\ntime.sleep( 30 )\n".format( sys.executable, "\n".join( lines ) ),
+        encoding="utf-8"
+    )
+    program.chmod( 0o755 )
+    return FakeNode( "slow_boost" )
+
+
+@pytest.mark.skipif( sys.platform == "win32", reason="runs a script as the test program" )
+@pytest.mark.parametrize( "runner_type", [ RunBoostTest, RunPatchedBoostTest ] )
+@pytest.mark.parametrize( "lines, expected_key", [
+    ( [ 'Entering test suite "widgets"', 'Entering test case "spins"' ], "[widgets] spins" ),
+    ( [], "[slow_boost] slow_boost" ),
+] )
+def test_a_boost_test_that_times_out_reports_the_killed_test_case_as_aborted( tmp_path, monkeypatch, runner_type, lines, expected_key ):
+    monkeypatch.chdir( tmp_path )
+    source = boost_test_program( tmp_path, lines )
+    runner = runner_type( 'passed', str( tmp_path ), timeout=0.5 )
+    env = runner_env( tmp_path, toolchain=FakeToolchain(), dependencies={}, branch_root=str( tmp_path ) )
+
+    with pytest.raises( BuildError, match="timed out" ):
+        runner( [], [ source ], env )
+
+    with open( tmp_path / "slow_boost.report.json" ) as report:
+        test_case = json.load( report )[-1]
+    assert test_case['key'] == expected_key
+    assert test_case['status'] == 'aborted'
+    assert test_case['timed_out'] is True
+    assert not ( tmp_path / "slow_boost.success" ).exists()
+
+
+def test_coverage_tools_run_in_a_build_slot( monkeypatch ):
+    from cuppa.cpp import run_gcov_coverage
+
+    test_pool.configure( test_jobs=2, build_jobs=1 )
+    held = []
+
+    def popen( processor, args_list, **kwargs ):
+        held.append( not test_pool._build_slots.acquire( blocking=False ) )
+        return 0
+
+    monkeypatch.setattr( IncrementalSubProcess, 'Popen', popen )
+    assert run_gcov_coverage.run_command( 'gcov -v', '.', {} ) == ( 0, '' )
+    assert held == [ True ]
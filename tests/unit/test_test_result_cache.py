@@ -0,0 +1,140 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import os
+
+import pytest
+
+from cuppa.utility import test_result_cache
+from cuppa.utility.test_result_cache import CachedTest
+from tests.helpers.fakes import FakeEnv
+
+
+pytestmark = pytest.mark.unit
+
+
+class FakeNode(object):
+
+    def __init__( self, path ):
+        self.path = str( path )
+        self.abspath = os.path.abspath( str( path ) )
+
+    def __str__( self ):
+        return self.path
+
+
+def checkout( root ):
+    """A program, a data directory and the targets a test runner writes, under ``root``."""
+    root.mkdir( parents=True, exist_ok=True )
+    ( root / "unit_test" ).write_bytes( b"\x7fELF program" )
+    ( root / "data" ).mkdir( exist_ok=True )
+    ( root / "data" / "input.txt" ).write_text( "input" )
+    final = root / "final"
+    final.mkdir( exist_ok=True )
+    targets = [ final / ( "unit_test" + suffix ) for suffix in ( ".stdout.log", ".stderr.log", ".report.json", ".success" ) ]
+    source = [ FakeNode( root / "unit_test" ), FakeNode( root / "data" ) ]
+    env = FakeEnv( sconstruct_dir=str( root ), ENV={ 'PATH': '/usr/bin' } )
+    return source, [ FakeNode( target ) for target in targets ], env
+
+
+def key_of( source, env, **settings ):
+    settings.setdefault( 'runner', 'process' )
+    return test_result_cache.test_key( source, env, settings )
+
+
+class RecordingRunner(object):
+
+    def __init__( self, passes=True ):
+        self.calls = 0
+        self._passes = passes
+
+    def __call__( self, target, source, env ):
+        self.calls += 1
+        for node in target:
+            if str( node ).endswith( '.success' ) and not self._passes:
+                continue
+            with open( str( node ), 'w' ) as output:
+                output.write( "run {}".format( self.calls ) )
+        return None if self._passes else 1
+
+
+def test_the_key_follows_program_data_environment_and_settings( tmp_path ):
+    source, _, env = checkout( tmp_path / "a" )
+    key = key_of( source, env )
+    assert key == key_of( source, env )
+
+    assert key != key_of( source, env, command="unit_test --fast" )
+    assert key != key_of( source, FakeEnv( env, ENV={ 'PATH': '/opt/bin' } ) )
+
+    ( tmp_path / "a" / "data" / "input.txt" ).write_text( "changed" )
+    changed_data = key_of( source, env )
+    assert changed_data != key
+
+    ( tmp_path / "a" / "unit_test" ).write_bytes( b"\x7fELF rebuilt" )
+    assert key_of( source, env ) != changed_data
+
+
+def test_the_key_does_not_depend_on_where_the_tree_is_checked_out( tmp_path ):
+    source_a, _, env_a = checkout( tmp_path / "a" )
+    source_b, _, env_b = checkout( tmp_path / "b" )
+    assert key_of( source_a, env_a, working_dir=str( tmp_path / "a" / "data" ) ) == \
+           key_of( source_b, env_b, working_dir=str( tmp_path / "b" / "data" ) )
+
+
+def test_passing_results_are_restored_instead_of_run( tmp_path ):
+    source, target, env = checkout( tmp_path / "tree" )
+    runner = RecordingRunner()
+    cached = CachedTest( runner, str( tmp_path / "cache" ), runner='process' )
+
+    assert cached( target, source, env ) is None
+    assert runner.calls == 1
+
+    # A clean build removes the outputs.
+    for node in target:
+        os.remove( str( node ) )
+
+    assert cached( target, source, env ) is None
+    assert runner.calls == 1
+    assert all( open( str( node ) ).read() == "run 1" for node in target )
+
+
+def test_results_are_shared_between_checkouts( tmp_path ):
+    source_a, target_a, env_a = checkout( tmp_path / "a" )
+    source_b, target_b, env_b = checkout( tmp_path / "b" )
+    runner = RecordingRunner()
+    cache = str( tmp_path / "cache" )
+
+    CachedTest( runner, cache )( target_a, source_a, env_a )
+    CachedTest( runner, cache )( target_b, source_b, env_b )
+    assert runner.calls == 1
+    assert os.path.exists( str( target_b[-1] ) )
+
+
+def test_failing_results_are_not_cached( tmp_path ):
+    source, target, env = checkout( tmp_path / "tree" )
+    runner = RecordingRunner( passes=False )
+    cached = CachedTest( runner, str( tmp_path / "cache" ) )
+
+    assert cached( target, source, env ) == 1
+    assert cached( target, source, env ) == 1
+    assert runner.calls == 2
+
+
+def test_an_incomplete_entry_is_not_restored( tmp_path ):
+    source, target, env = checkout( tmp_path / "tree" )
+    cache = test_result_cache.TestResultCache( str( tmp_path / "cache" ) )
+    key = key_of( source, env )
+    for node in target[:-1]:
+        with open( str( node ), 'w' ) as output:
+            output.write( "partial" )
+
+    cache.store( key, [ str( node ) for node in target[:-1] ] )
+    assert not cache.restore( key, [ str( node ) for node in target ] )
+    assert cache.restore( key, [ str( node ) for node in target[:-1] ] )
+
+
+def test_runner_name_is_kept_for_scons():
+    runner = RecordingRunner()
+    assert CachedTest( runner, "cache" ).__name__ == 'RecordingRunner'
@@ -0,0 +1,112 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import os
+import stat
+from unittest.mock import patch
+
+import pytest
+
+from cuppa.toolchains import probe_cache
+from cuppa.toolchains.clang import Clang
+from cuppa.toolchains.gcc import Gcc
+from cuppa.toolchains.probe_cache import ToolchainProbeCache
+
+
+pytestmark = pytest.mark.unit
+
+
+def _fake_compiler( directory, name, version ):
+    path = directory / name
+    path.write_text( "#!/bin/sh\necho '{} (GCC) {}'\n".format( name, version ) )
+    path.chmod( path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH )
+    return path
+
+
+@pytest.fixture
+def bin_dir( tmp_path ):
+    directory = tmp_path / 'bin'
+    directory.mkdir()
+    return directory
+
+
+def test_missing_executable_is_not_spawned( tmp_path, bin_dir ):
+    cache = ToolchainProbeCache( str( tmp_path / 'probes.json' ), search_path=str( bin_dir ) )
+
+    with patch( 'cuppa.toolchains.probe_cache._run_probe' ) as run_probe:
+        assert cache.version_output( "g++-99 --version" ) is None
+    run_probe.assert_not_called()
+
+
+def test_repeat_invocation_reads_probe_from_disk( tmp_path, bin_dir ):
+    _fake_compiler( bin_dir, 'g++-13', '13.2.0' )
+    cache_path = str( tmp_path / 'probes.json' )
+
+    first = ToolchainProbeCache( cache_path, search_path=str( bin_dir ) )
+    assert '13.2.0' in first.version_output( "g++-13 --version" )
+
+    second = ToolchainProbeCache( cache_path, search_path=str( bin_dir ) )
+    with patch( 'cuppa.toolchains.probe_cache._run_probe' ) as run_probe:
+        assert '13.2.0' in second.version_output( "g++-13 --version" )
+    run_probe.assert_not_called()
+
+
+def test_changed_binary_is_probed_again( tmp_path, bin_dir ):
+    compiler = _fake_compiler( bin_dir, 'g++-13', '13.2.0' )
+    cache_path = str( tmp_path / 'probes.json' )
+    ToolchainProbeCache( cache_path, search_path=str( bin_dir ) ).version_output( "g++-13 --version" )
+
+    _fake_compiler( bin_dir, 'g++-13', '13.3.0' )
+    status = compiler.stat()
+    os.utime( str( compiler ), ns=( status.st_atime_ns, status.st_mtime_ns + 1000000000 ) )
+
+    cache = ToolchainProbeCache( cache_path, search_path=str( bin_dir ) )
+    assert '13.3.0' in cache.version_output( "g++-13 --version" )
+
+
+def test_changed_search_path_discards_cache( tmp_path, bin_dir ):
+    _fake_compiler( bin_dir, 'g++-13', '13.2.0' )
+    cache_path = str( tmp_path / 'probes.json' )
+    ToolchainProbeCache( cache_path, search_path=str( bin_dir ) ).version_output( "g++-13 --version" )
+
+    other = tmp_path / 'other'
+    other.mkdir()
+    cache = ToolchainProbeCache( cache_path, search_path=os.pathsep.join( [ str( other ), str( bin_dir ) ] ) )
+    with patch( 'cuppa.toolchains.probe_cache._run_probe', return_value='g++-13 (GCC) 13.2.0' ) as run_probe:
+        cache.version_output( "g++-13 --version" )
+    run_probe.assert_called_once()
+
+
+def test_prefetch_probes_every_command_and_saves_once( tmp_path, bin_dir ):
+    for major in ( 11, 12, 13, 14 ):
+        _fake_compiler( bin_dir, 'g++-{}'.format( major ), '{}.1.0'.format( major ) )
+    cache_path = tmp_path / 'probes.json'
+    cache = ToolchainProbeCache( str( cache_path ), search_path=str( bin_dir ) )
+
+    commands = [ "g++-{} --version".format( major ) for major in range( 9, 16 ) ]
+    with patch.object( ToolchainProbeCache, 'save', wraps=cache.save ) as save:
+        cache.prefetch( commands )
+    assert save.call_count == 1
+    assert cache_path.exists()
+
+    with patch( 'cuppa.toolchains.probe_cache._run_probe' ) as run_probe:
+        outputs = [ cache.version_output( command ) for command in commands ]
+    run_probe.assert_not_called()
+    assert [ output is not None for output in outputs ] == [ False, False, True, True, True, True, False ]
+
+
+def test_empty_override_disables_persistence( monkeypatch ):
+    monkeypatch.setenv( probe_cache.CACHE_ENV_VAR, '' )
+    assert probe_cache.default_cache_path() is None
+
+
+def test_probe_commands_cover_supported_versions():
+    gcc_commands = Gcc._probe_commands()
+    assert "g++-13 --version" in gcc_commands
+    assert "g++-4.9 --version" in gcc_commands
+
+    clang_commands = Clang._probe_commands()
+    assert "clang++-18 --version" in clang_commands
+    assert "clang++-3.9 --version" in clang_commands
@@ -0,0 +1,129 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import os
+import threading
+
+import pytest
+
+from cuppa.core import dependency_removal
+from cuppa.utility import storage, tree_scanner
+
+
+pytestmark = pytest.mark.unit
+
+
+def make_tree( root, files ):
+    for relative, size in files.items():
+        path = root / relative
+        path.parent.mkdir( parents=True, exist_ok=True )
+        path.write_bytes( b"x" * size )
+    return root
+
+
+@pytest.fixture
+def walks( monkeypatch ):
+    walked = []
+    lock = threading.Lock()
+    measure = storage.directory_stats
+
+    def counting( path ):
+        with lock:
+            walked.append( path )
+        return measure( path )
+
+    monkeypatch.setattr( storage, 'directory_stats', counting )
+    return walked
+
+
+def test_stats_match_a_direct_walk( tmp_path ):
+    make_tree( tmp_path / "tree", { "a": 3, "sub/b": 5, "sub/deeper/c": 7 } )
+    os.symlink( str( tmp_path / "tree" / "sub" ), str( tmp_path / "tree" / "link" ) )
+    with tree_scanner.scanning() as scanner:
+        assert scanner.stats( str( tmp_path / "tree" ) ) == storage.directory_stats( str( tmp_path / "tree" ) )
+
+
+def test_a_tree_is_walked_once_per_scan( tmp_path, walks ):
+    tree = str( make_tree( tmp_path / "tree", { "a": 3 } ) )
+    with tree_scanner.scanning() as scanner:
+        tree_scanner.directory_stats( tree )
+        tree_scanner.directory_stats( tree + os.sep )
+        tree_scanner.prefetch( [ tree ] )
+        assert scanner.walked == 1
+    assert len( walks ) == 1
+
+
+def test_prefetch_walks_trees_concurrently( tmp_path, monkeypatch ):
+    trees = [ str( make_tree( tmp_path / name, { "f": 1 } ) ) for name in ( "a", "b", "c" ) ]
+    barrier = threading.Barrier( len( trees ), timeout=5 )
+    measure = storage.directory_stats
+
+    def waiting( path ):
+        # Every walk must be in flight at once to get past the barrier.
+        barrier.wait()
+        return measure( path )
+
+    monkeypatch.setattr( storage, 'directory_stats', waiting )
+    with tree_scanner.scanning( max_workers=len( trees ) ) as scanner:
+        tree_scanner.prefetch( trees + trees )
+        assert scanner.walked == len( trees )
+        assert [ tree_scanner.directory_stats( tree ).bytes for tree in trees ] == [ 1, 1, 1 ]
+
+
+def test_nested_scans_share_the_outer_scanner( tmp_path, walks ):
+    tree = str( make_tree( tmp_path / "tree", { "a": 3 } ) )
+    with tree_scanner.scanning() as outer:
+        tree_scanner.directory_stats( tree )
+        with tree_scanner.scanning() as inner:
+            assert inner is outer
+            tree_scanner.directory_stats( tree )
+        assert tree_scanner.active() is outer
+    assert tree_scanner.active() is None
+    assert len( walks ) == 1
+
+
+def test_without_a_scan_every_call_walks( tmp_path, walks ):
+    tree = str( make_tree( tmp_path / "tree", { "a": 3 } ) )
+    tree_scanner.prefetch( [ tree ] )
+    assert walks == []
+    tree_scanner.directory_stats( tree )
+    tree_scanner.directory_stats( tree )
+    assert len( walks ) == 2
+
+
+def test_forget_measures_a_tree_again( tmp_path ):
+    tree = make_tree( tmp_path / "tree", { "a": 3 } )
+    with tree_scanner.scanning() as scanner:
+        assert scanner.stats( str( tree ) ).bytes == 3
+        ( tree / "b" ).write_bytes( b"yy" )
+        assert scanner.stats( str( tree ) ).bytes == 3
+        scanner.forget( str( tree ) )
+        assert scanner.stats( str( tree ) ).bytes == 5
+
+
+def test_in_parallel_keeps_order():
+    assert tree_scanner.in_parallel( lambda value: value * 2, range( 20 ), max_workers=4 ) == [
+            value * 2 for value in range( 20 )
+    ]
+
+
+def test_leftover_sizes_are_filled_from_the_scan( tmp_path, walks ):
+    root = tmp_path / "deps"
+    make_tree( root / "widget@1.0", { "a": 4 } )
+    make_tree( root / "widget@2.0", { "a": 6, "b/c": 1 } )
+    make_tree( root / "widget@3.0", { "a": 1 } )
+    target = dependency_removal.RemovalTarget(
+            dependency='widget', path=str( root / "widget@3.0" ), qualifier='3.0',
+            tool_variant=None, storage_type='repository', size_bytes=1, label=None,
+            extra_paths=(),
+    )
+    with tree_scanner.scanning():
+        leftovers = dependency_removal._sibling_leftovers(
+                str( root ), target, { storage.real_path( target.path ) }
+        )
+    assert sorted( ( leftover.qualifier, leftover.size_bytes ) for leftover in leftovers ) == [
+            ( '@1.0', 4 ), ( '@2.0', 7 ),
+    ]
+    assert len( walks ) == 2
@@ -0,0 +1,72 @@
+#          Copyright Jamie Allsop 2026-2026
+# Distributed under the Boost Software License, Version 1.0.
+#    (See accompanying file LICENSE_1_0.txt or copy at
+#          http://www.boost.org/LICENSE_1_0.txt)
+
+import pytest
+
+import cuppa.version as version
+
+
+pytestmark = pytest.mark.unit
+
+
+def test_cached_check_honours_ttl( tmp_path ):
+    cache_path = str( tmp_path / 'pypi-version.json' )
+    version.write_cached_check( cache_path, '9.9.9', now=1000.0 )
+    assert version.read_cached_check( cache_path, now=1000.0 + 60 )['latest'] == '9.9.9'
+    assert version.read_cached_check( cache_path, now=1000.0 + version.CHECK_TTL_SECONDS ) is None
+    assert version.read_cached_check( cache_path, now=500.0 ) is None
+
+
+def test_cached_check_ignores_unreadable_cache( tmp_path ):
+    cache_path = tmp_path / 'pypi-version.json'
+    cache_path.write_text( 'not json' )
+    assert version.read_cached_check( str( cache_path ) ) is None
+    assert version.read_cached_check( None ) is None
+
+
+def test_default_cache_path_can_be_disabled( monkeypatch ):
+    monkeypatch.setenv( version.CACHE_ENV_VAR, '' )
+    assert version.default_cache_path() is None
+    monkeypatch.setenv( version.CACHE_ENV_VAR, '/tmp/versions.json' )
+    assert version.default_cache_path() == '/tmp/versions.json'
+
+
+def test_offline_never_starts_a_check( monkeypatch ):
+    monkeypatch.setattr( version, 'fetch_latest_version', lambda: pytest.fail( 'fetched' ) )
+    assert version.check_current_version( True ) is None
+
+
+def test_fresh_cache_answers_without_a_lookup( tmp_path, monkeypatch ):
+    cache_path = str( tmp_path / 'pypi-version.json' )
+    version.write_cached_check( cache_path, '0.0.1' )
+    monkeypatch.setenv( version.CACHE_ENV_VAR, cache_path )
+    monkeypatch.setattr( version, 'BackgroundVersionCheck', lambda *args: pytest.fail( 'looked up' ) )
+    assert version.check_current_version( False ) is None
+
+
+def test_background_check_refreshes_cache_and_reports_once( tmp_path, monkeypatch ):
+    cache_path = str( tmp_path / 'pypi-version.json' )
+    check = version.BackgroundVersionCheck( '1.0.0', cache_path, fetch=lambda: '2.0.0' ).start()
+    assert check.finished( wait=5 )
+    assert version.read_cached_check( cache_path )['latest'] == '2.0.0'
+
+    warnings = []
+    monkeypatch.setattr( version.logger, 'warn', lambda message: warnings.append( message ) )
+    assert check.report() is True
+    assert check.report() is False
+    assert len( warnings ) == 1
+
+
+def test_unfinished_check_does_not_block_report( tmp_path ):
+    import threading
+
+    release = threading.Event()
+    check = version.BackgroundVersionCheck(
+            '1.0.0', str( tmp_path / 'pypi-version.json' ), fetch=lambda: release.wait( 5 ) and None
+    ).start()
+    assert check.report() is False
+    release.set()
+    assert check.finished( wait=5 )
+    assert version.read_cached_check( str( tmp_path / 'pypi-version.json' ) )['latest'] is None